@@ -3,8 +3,12 @@
 """
 
 import streamlit as st
+import json
+import logging
 import os
 import sys
+import time
+import uuid
 from pathlib import Path
 
 # 프로젝트 루트 경로 추가
@@ -12,12 +16,37 @@ BASE_DIR = Path(__file__).resolve().parent.parent  # .../dev-pilot
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from modules.azure_client import AzureOpenAIClient
-from modules.setup_analyzer import SetupAnalyzer
-from modules.code_reviewer import CodeReviewer
+from modules.admission import get_admission_controller
+from modules.app_resources import (
+    configure_process, create_session_analyzers, get_azure_client, get_history_store, get_job_queue,
+    get_search_client, get_semantic_cache, start_process_warmup
+)
+from modules.rate_limiter import RateLimitExceededError, client_ip_from_headers, get_rate_limiter
+from modules.usage_tracker import get_usage_tracker, usage_context
+from modules.review_findings import (
+    SEVERITY_ICONS, SEVERITY_ORDER, count_by_severity, format_finding_title, render_findings_markdown
+)
 
-from modules.azure_search_client import AzureSearchClient  
 from modules.rag_service import RAGService
+from modules.history_store import KIND_GUIDE, KIND_REVIEW
+from modules.job_queue import (
+    JobQueueFullError, JOB_CANCELLED, JOB_DONE, JOB_FAILED, JOB_FINISHED_STATUSES,
+    PRIORITY_HIGH, PRIORITY_NORMAL
+)
+
+logger = logging.getLogger(__name__)
+
+# .env, 로깅, trace exporter, 사용량 추적기 설정 (프로세스당 1회, 재실행 시에는 아무것도 하지 않음)
+configure_process()
+
+# 작업 결과를 기다리는 최대 시간(초) - 초과 시 작업은 백그라운드에서 계속 진행
+JOB_WAIT_TIMEOUT = 120
+
+# 구조화된 리뷰 결과를 한 번에 그리는 지적 사항 수
+FINDINGS_PAGE_SIZE = 20
+
+# 기록 패널 페이지당 기록 수
+HISTORY_PAGE_SIZE = 10
 
 st.set_page_config(
     page_title="BlueBell", 
@@ -237,9 +266,12 @@ st.markdown("""
 
 def initialize_session_state():
     """세션 상태 초기화 함수"""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
     if 'azure_client' not in st.session_state:
         try:
-            st.session_state.azure_client = AzureOpenAIClient()
+            st.session_state.azure_client = get_azure_client()
             st.session_state.client_status = "connected"
         except Exception as e:
             st.session_state.client_status = f"error: {str(e)}"
@@ -249,7 +281,7 @@ def initialize_session_state():
     if 'search_client' not in st.session_state:
         try:
             if st.session_state.azure_client is not None:
-                st.session_state.search_client = AzureSearchClient()
+                st.session_state.search_client = get_search_client()
                 st.session_state.search_status = "connected"
             else:
                 st.session_state.search_status = "azure_client_failed"
@@ -275,20 +307,14 @@ def initialize_session_state():
             st.session_state.rag_service = None
 
     # 기존 분석기들 초기화 (RAG 서비스 포함)
-    if ('setup_analyzer' not in st.session_state and 
+    if (('setup_analyzer' not in st.session_state or 'code_reviewer' not in st.session_state) and
         'azure_client' in st.session_state and 
         st.session_state.azure_client is not None):
-        st.session_state.setup_analyzer = SetupAnalyzer(
+        st.session_state.setup_analyzer, st.session_state.code_reviewer = create_session_analyzers(
             st.session_state.azure_client,
-            st.session_state.rag_service  # RAG 서비스 추가
-        )
-
-    if ('code_reviewer' not in st.session_state and 
-        'azure_client' in st.session_state and 
-        st.session_state.azure_client is not None):
-        st.session_state.code_reviewer = CodeReviewer(
-            st.session_state.azure_client,
-            st.session_state.rag_service  # RAG 서비스 추가
+            st.session_state.rag_service,  # RAG 서비스 추가
+            get_semantic_cache(),
+            get_history_store()
         )
 
 def show_connection_status():
@@ -311,7 +337,279 @@ def show_connection_status():
             3. 네트워크 연결을 확인해주세요
             """)
         
+def get_client_ip():
+    """
+    브라우저 접속 IP (알 수 없으면 None)
+    BLUEBELL_TRUSTED_PROXY_HOPS개의 신뢰하는 프록시가 붙인 X-Forwarded-For 항목만 사용 (0이면 IP 제한 안 함)
+    """
+    trusted_hops = int(os.getenv("BLUEBELL_TRUSTED_PROXY_HOPS") or "0")
+    if trusted_hops <= 0:
+        return None
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        headers = _get_websocket_headers() or {}
+    except Exception:
+        return None
+    return client_ip_from_headers(headers, trusted_hops)
+
+def client_alive_check():
+    """
+    현재 브라우저 세션이 아직 연결되어 있는지 확인하는 함수 (탭을 닫으면 False)
+    작업 큐가 취소 여부를 확인할 때 호출하므로 버려진 탭의 작업은 다음 검색/LLM 호출 전에 중단됨
+    """
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        runtime = get_instance()
+    except Exception:
+        return None
+    if ctx is None:
+        return None
+    streamlit_session_id = ctx.session_id
+    return lambda: runtime.is_active_session(streamlit_session_id)
+
+def rate_limit_identities() -> list:
+    """속도 제한을 적용할 식별자 (세션 + 접속 IP)"""
+    identities = [f"session:{st.session_state.session_id}"]
+    client_ip = get_client_ip()
+    if client_ip:
+        identities.append(f"ip:{client_ip}")
+    return identities
+
+def submit_job(state_key: str, kind: str, func, *args, priority: int = PRIORITY_NORMAL, **kwargs):
+    """작업 큐에 작업을 제출하고 작업 ID를 세션에 기록"""
+    identities = rate_limit_identities()
+    try:
+        # 세션/IP별 요청 속도 제한 (토큰 사용량은 작업의 LLM 호출이 끝날 때마다 차감)
+        get_rate_limiter().acquire(identities)
+    except RateLimitExceededError as e:
+        st.warning(f"⏱️ {e}")
+        return
+
+    try:
+        # 세션 라벨은 작업 실행 시에도 유지되어 세션별 사용량/예산/속도 제한에 반영됨
+        with usage_context(session_id=st.session_state.session_id, rate_limit_keys=identities):
+            job_id = get_job_queue().submit(
+                kind, func, *args,
+                priority=priority,
+                owner=st.session_state.session_id,
+                alive_check=client_alive_check(),
+                **kwargs
+            )
+        st.session_state[state_key] = job_id
+    except JobQueueFullError as e:
+        st.error(f"❌ 작업을 받을 수 없습니다: {e}")
+
+def show_usage_summary():
+    """사이드바에 이 세션의 토큰 사용량 표시 (사용량 추적이 켜진 경우)"""
+    tracker = get_usage_tracker()
+    if not tracker.enabled:
+        return
+    totals = tracker.store.totals(session_id=st.session_state.session_id)
+    if totals["calls"] == 0:
+        return
+    st.markdown("#### 📊 사용량")
+    st.caption(
+        f"호출 {totals['calls']}회 · 토큰 {totals['total_tokens']:,} "
+        f"(프롬프트 캐시 {totals['cached_ratio']:.0%})"
+    )
+    if totals["wasted_tokens"]:
+        st.caption(f"취소된 작업에서 버려진 토큰 {totals['wasted_tokens']:,}")
+    if tracker.session_token_budget:
+        st.progress(min(1.0, totals["total_tokens"] / tracker.session_token_budget))
+
+def show_job_result(state_key: str, success_message: str, download_label: str, file_name: str):
+    """
+    세션에 기록된 작업의 결과 표시
+    다른 탭으로 이동했다 돌아와도 작업 ID가 남아 있어 결과를 다시 볼 수 있음
+    """
+    job_id = st.session_state.get(state_key)
+    if not job_id:
+        return
+
+    job_queue = get_job_queue()
+    job = job_queue.get_status(job_id)
+    if job is None:
+        st.warning("⚠️ 작업 결과가 만료되었습니다. 다시 요청해주세요.")
+        del st.session_state[state_key]
+        return
+
+    if job["status"] not in JOB_FINISHED_STATUSES:
+        # 누르면 스크립트가 다시 실행되어 대기를 멈추고 작업을 취소
+        if st.button("⏹️ 작업 취소", key=f"cancel_{state_key}"):
+            job_queue.cancel(job_id)
+            job = job_queue.get_status(job_id) or job
+
+    if job["status"] not in JOB_FINISHED_STATUSES:
+        message = "🧚‍♂️ BlueBell이 분석하고 있습니다... (약 10-15초)"
+        position = job_queue.position(job_id)
+        llm_position = get_admission_controller().position(st.session_state.session_id)
+        if position:
+            message = f"⏳ 작업 대기 중입니다... (대기 순서 {position}번째 / 전체 {job_queue.pending_count()}개)"
+        elif llm_position:
+            message += f" · AI 호출 대기 순서 {llm_position}번째"
+        elapsed = st.empty()
+        with st.spinner(message):
+            # 짧게 나눠 기다리며 화면을 갱신해야 취소 버튼 클릭이 바로 반영됨
+            for waited in range(JOB_WAIT_TIMEOUT):
+                job = job_queue.wait(job_id, timeout=1)
+                if job is None or job["status"] in JOB_FINISHED_STATUSES:
+                    break
+                elapsed.caption(f"{waited + 1}초 경과")
+        elapsed.empty()
+        if job is None:
+            st.warning("⚠️ 작업 결과가 만료되었습니다. 다시 요청해주세요.")
+            del st.session_state[state_key]
+            return
+
+    if job["status"] == JOB_DONE and isinstance(job["result"], dict):
+        st.success(success_message)
+        show_structured_review(job["result"], state_key, file_name)
+    elif job["status"] == JOB_DONE:
+        st.success(success_message)
+        st.markdown(job["result"])
+        st.download_button(
+            label=download_label,
+            data=job["result"],
+            file_name=file_name,
+            mime="text/markdown"
+        )
+    elif job["status"] == JOB_FAILED:
+        st.error(f"❌ 작업 중 오류가 발생했습니다: {job['error']}")
+    elif job["status"] == JOB_CANCELLED:
+        st.info(f"⏹️ {job['error']}")
+    else:
+        st.info(f"⏳ 작업이 아직 진행 중입니다. 잠시 후 새로고침해주세요. (작업 ID: {job_id})")
+        st.button("🔄 결과 확인")
+
+def show_structured_review(result: dict, state_key: str, file_name: str):
+    """
+    구조화된 리뷰 결과 표시
+    전체를 하나의 마크다운으로 그리지 않고 심각도 필터 + 페이지 단위로 필요한 지적 사항만 그림
+    """
+    findings = result["findings"]
+    counts = count_by_severity(findings)
+    columns = st.columns(len(SEVERITY_ORDER))
+    for column, severity in zip(columns, SEVERITY_ORDER):
+        column.metric(f"{SEVERITY_ICONS[severity]} {severity}", counts[severity])
+
+    if result.get("summary"):
+        st.markdown(result["summary"])
+    if result.get("failed_regions"):
+        st.warning(f"⚠️ 코드 영역 {result['failed_regions']}개는 리뷰하지 못했습니다. 다시 시도해주세요.")
+    if result.get("skipped_regions"):
+        st.warning(
+            f"⚠️ 코드가 길어 {result['skipped_from_line']}번째 줄부터 (영역 {result['skipped_regions']}개)는 "
+            "리뷰하지 않았습니다. 나머지 부분은 나눠서 리뷰해주세요."
+        )
+
+    selected = st.multiselect(
+        "심각도 필터",
+        SEVERITY_ORDER,
+        default=SEVERITY_ORDER,
+        format_func=lambda severity: f"{SEVERITY_ICONS[severity]} {severity}",
+        key=f"{state_key}_severity"
+    )
+    visible = [finding for finding in findings if finding["severity"] in selected]
+    if not visible:
+        st.info("표시할 지적 사항이 없습니다.")
+    else:
+        pages = (len(visible) - 1) // FINDINGS_PAGE_SIZE + 1
+        page = st.number_input("페이지", min_value=1, max_value=pages, value=1, key=f"{state_key}_page") if pages > 1 else 1
+        for finding in visible[(page - 1) * FINDINGS_PAGE_SIZE: page * FINDINGS_PAGE_SIZE]:
+            with st.expander(format_finding_title(finding).lstrip("- "), expanded=finding["severity"] == SEVERITY_ORDER[0]):
+                st.markdown(f"**문제**: {finding['message']}")
+                if finding["suggestion"]:
+                    st.markdown(f"**개선**: {finding['suggestion']}")
+                if finding["patch"]:
+                    st.code(finding["patch"], language="diff")
+        st.caption(f"지적 사항 {len(visible)}건 (영역 {result['regions']}개 중 캐시 재사용 {result['cached_regions']}개)")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 리뷰 결과 다운로드 (Markdown)",
+            data=render_findings_markdown(result),
+            file_name=file_name,
+            mime="text/markdown"
+        )
+    with col2:
+        st.download_button(
+            label="📥 리뷰 결과 다운로드 (JSON)",
+            data=json.dumps(result, ensure_ascii=False, indent=2),
+            file_name=Path(file_name).with_suffix(".json").name,
+            mime="application/json"
+        )
+
+def show_history_panel():
+    """
+    이전에 생성한 가이드/리뷰 기록 조회
+    목록은 결과 본문 없이 페이지 단위로 읽고, 선택한 기록만 본문을 불러와 표시
+    저장소는 프로세스 전역이므로 현재 세션이 만든 기록만 조회/삭제
+    """
+    history_store = get_history_store()
+    if history_store is None:
+        st.info("기록 저장소가 비활성화되어 있습니다. (BLUEBELL_HISTORY=0)")
+        return
+    owner = st.session_state.session_id
+
+    kind_labels = {"전체": None, "⚙️ 환경 설정 가이드": KIND_GUIDE, "🔍 코드 리뷰": KIND_REVIEW}
+    col1, col2 = st.columns(2)
+    with col1:
+        kind = kind_labels[st.selectbox("종류", list(kind_labels))]
+    with col2:
+        if kind == KIND_GUIDE:
+            value = st.selectbox("OS", ["전체", "windows", "macos", "linux", "all"])
+            language, os_type = None, (None if value == "전체" else value)
+        elif kind == KIND_REVIEW:
+            value = st.selectbox("언어", ["전체", "python", "javascript", "java", "csharp", "go", "typescript"])
+            language, os_type = (None if value == "전체" else value), None
+        else:
+            language = os_type = None
+
+    page = st.session_state.get("history_page", 1)
+    entries, total = history_store.list(kind, language, os_type, page=page, page_size=HISTORY_PAGE_SIZE, owner=owner)
+    if total == 0:
+        st.info("저장된 기록이 없습니다.")
+        return
+
+    # 필터를 바꿔 전체 페이지 수가 줄면 마지막 페이지로 이동
+    pages = (total - 1) // HISTORY_PAGE_SIZE + 1
+    if page > pages:
+        st.session_state["history_page"] = page = pages
+        entries, _ = history_store.list(kind, language, os_type, page=page, page_size=HISTORY_PAGE_SIZE, owner=owner)
+    if pages > 1:
+        st.number_input("페이지", min_value=1, max_value=pages, key="history_page")
+    st.caption(f"총 {total}건 · {page}/{pages} 페이지")
+
+    labels = {
+        entry["id"]: f"{'⚙️' if entry['kind'] == KIND_GUIDE else '🔍'} {entry['title']} "
+                     f"({entry['os_type'] or entry['language'] or '-'}, "
+                     f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created_at']))})"
+        for entry in entries
+    }
+    selected = st.radio("기록 선택", list(labels), format_func=labels.get, label_visibility="collapsed")
+    entry = history_store.get(selected, owner=owner)
+    if entry is None:
+        st.warning("⚠️ 기록이 삭제되었습니다.")
+        return
+
+    st.markdown("---")
+    file_name = "setup_guide.md" if entry["kind"] == KIND_GUIDE else "code_review_result.md"
+    if isinstance(entry["result"], dict):
+        show_structured_review(entry["result"], f"history_{entry['id']}", file_name)
+    else:
+        st.markdown(entry["result"])
+        st.download_button("📥 다운로드", data=entry["result"], file_name=file_name, mime="text/markdown")
+    if st.button("🗑️ 이 기록 삭제"):
+        history_store.delete(entry["id"], owner=owner)
+        st.rerun()
+
 def main():
+    # 프로세스 워밍업 (serve.py로 실행하면 이미 시작됨, streamlit run이면 첫 실행 때 시작 / 백그라운드 진행)
+    start_process_warmup()
+
     # 세션 상태 초기화
     initialize_session_state()
     
@@ -327,10 +625,11 @@ def main():
         st.markdown("#### 기능 선택")
         feature = st.radio(
             "",
-            ["🏠 홈", "⚙️ 개발 환경 설정", "🔍 코드 리뷰", "ℹ️ 정보"],
+            ["🏠 홈", "⚙️ 개발 환경 설정", "🔍 코드 리뷰", "🕘 기록", "ℹ️ 정보"],
             index=0,
             label_visibility="collapsed" 
         )
+        show_usage_summary()
         
     # 메인 컨텐츠
     if feature == "🏠 홈":
@@ -417,43 +716,36 @@ def main():
             help="특정 OS를 선택하면 해당 OS에 맞춤화된 가이드를 생성합니다."
         )
         
+        # OS 타입 매핑
+        os_map = {
+            "전체": "all",
+            "Windows": "windows",
+            "macOS": "macos",
+            "Linux": "linux"
+        }
+
         # 가이드 생성 버튼
         if st.button("가이드 생성", type="primary"):
             if readme_content:
-                with st.spinner("🧚‍♂️ BlueBell이 README를 분석하고 있습니다... (약 10-15초)"):
-                    try:
-                        # OS 타입 매핑
-                        os_map = {
-                            "전체": "all",
-                            "Windows": "windows",
-                            "macOS": "macos",
-                            "Linux": "linux"
-                        }
-                        
-                        # 가이드 생성
-                        guide = st.session_state.setup_analyzer.generate_guide(
-                            readme_content,
-                            os_type=os_map[target_os]
-                        )
-                        
-                        st.success("✨ 환경 설정 가이드가 생성되었습니다!")
-                        
-                        # 결과 표시
-                        st.markdown(guide)
-                        
-                        # 다운로드 버튼
-                        st.download_button(
-                            label="📥 가이드 다운로드 (Markdown)",
-                            data=guide,
-                            file_name=f"setup_guide_{os_map[target_os]}.md",
-                            mime="text/markdown"
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"❌ 가이드 생성 중 오류가 발생했습니다: {str(e)}")
+                # 가이드 생성 작업 제출 (짧은 README는 우선 처리)
+                submit_job(
+                    "setup_job_id",
+                    "guide",
+                    st.session_state.setup_analyzer.generate_guide,
+                    readme_content,
+                    os_type=os_map[target_os],
+                    priority=PRIORITY_HIGH if len(readme_content) < 2000 else PRIORITY_NORMAL
+                )
             else:
                 st.warning("⚠️ README 내용을 입력해주세요.")
 
+        show_job_result(
+            "setup_job_id",
+            "✨ 환경 설정 가이드가 생성되었습니다!",
+            "📥 가이드 다운로드 (Markdown)",
+            f"setup_guide_{os_map[target_os]}.md"
+        )
+
     elif feature == "🔍 코드 리뷰":
         st.markdown("## 🔍 코드 리뷰")
         st.markdown("코드를 분석하여 개선 사항을 제안합니다.")
@@ -466,6 +758,7 @@ def main():
         
         code_content = None
         language = "자동 감지"
+        file_path = "snippet"
         
         if input_method == "✏️ 직접 입력":
             language = st.selectbox(
@@ -488,6 +781,7 @@ def main():
             
             if uploaded_file:
                 code_content = uploaded_file.read().decode('utf-8')
+                file_path = uploaded_file.name
                 # 파일 확장자로 언어 감지
                 ext = uploaded_file.name.split('.')[-1]
                 language_map = {
@@ -519,57 +813,71 @@ def main():
             check_security = st.checkbox("보안 취약점 검사", value=True)
             suggest_refactoring = st.checkbox("리팩토링", value=True)
         
+        structured_output = st.checkbox(
+            "구조화된 결과 (심각도별 지적 사항 목록)",
+            value=False,
+            help="코드를 영역별로 나눠 리뷰하고 결과를 줄 번호/규칙/심각도별 목록으로 보여줍니다. 바뀐 영역만 다시 리뷰합니다."
+        )
+        
         # 코드 리뷰 버튼
         if st.button("코드 리뷰 시작", type="primary"):
             if code_content:
-                with st.spinner("🧚‍♂️ BlueBell이 코드를 분석하고 있습니다... (약 10-15초)"):
-                    try:
-                        # 언어 매핑
-                        lang_map = {
-                            "자동 감지": "auto",
-                            "Python": "python",
-                            "JavaScript": "javascript",
-                            "Java": "java",
-                            "C#": "csharp",
-                            "Go": "go",
-                            "TypeScript": "typescript"
-                        }
-                        
-                        # 리뷰 옵션 설정
-                        options = {
-                            'check_naming': check_naming,
-                            'check_structure': check_structure,
-                            'check_bugs': check_bugs,
-                            'check_performance': check_performance,
-                            'check_security': check_security,
-                            'suggest_refactoring': suggest_refactoring
-                        }
-                        
-                        # 코드 리뷰 실행
-                        review_result = st.session_state.code_reviewer.review(
-                            code_content,
-                            language=lang_map[language],
-                            options=options
-                        )
-                        
-                        st.success("✨ 코드 리뷰가 완료되었습니다!")
-                        
-                        # 결과 표시
-                        st.markdown(review_result)
-                        
-                        # 다운로드 버튼
-                        st.download_button(
-                            label="📥 리뷰 결과 다운로드",
-                            data=review_result,
-                            file_name="code_review_result.md",
-                            mime="text/markdown"
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"❌ 코드 리뷰 중 오류가 발생했습니다: {str(e)}")
+                # 언어 매핑
+                lang_map = {
+                    "자동 감지": "auto",
+                    "Python": "python",
+                    "JavaScript": "javascript",
+                    "Java": "java",
+                    "C#": "csharp",
+                    "Go": "go",
+                    "TypeScript": "typescript"
+                }
+
+                # 리뷰 옵션 설정
+                options = {
+                    'check_naming': check_naming,
+                    'check_structure': check_structure,
+                    'check_bugs': check_bugs,
+                    'check_performance': check_performance,
+                    'check_security': check_security,
+                    'suggest_refactoring': suggest_refactoring
+                }
+
+                # 코드 리뷰 작업 제출
+                if structured_output:
+                    submit_job(
+                        "review_job_id",
+                        "review",
+                        st.session_state.code_reviewer.review_structured,
+                        code_content,
+                        language=lang_map[language],
+                        options=options,
+                        file_path=file_path
+                    )
+                else:
+                    submit_job(
+                        "review_job_id",
+                        "review",
+                        st.session_state.code_reviewer.review,
+                        code_content,
+                        language=lang_map[language],
+                        options=options
+                    )
             else:
                 st.warning("⚠️ 코드를 입력해주세요.")
 
+        show_job_result(
+            "review_job_id",
+            "✨ 코드 리뷰가 완료되었습니다!",
+            "📥 리뷰 결과 다운로드",
+            "code_review_result.md"
+        )
+
+    elif feature == "🕘 기록":
+        st.markdown("## 🕘 기록")
+        st.markdown("이전에 생성한 환경 설정 가이드와 코드 리뷰를 다시 확인합니다. 같은 입력은 다시 생성하지 않고 기록을 재사용합니다.")
+        show_history_panel()
+
     elif feature == "ℹ️ 정보":
         
         st.markdown("""
@@ -0,0 +1,71 @@
+"""
+외부 코딩 컨벤션/환경 설정 템플릿 코퍼스 가져오기
+마크다운, YAML, JSONL 파일 디렉터리를 검증 후 청크 분할 + 일괄 임베딩/업로드
+
+$ python data/import_corpus.py conventions ./style-guide --company acme
+$ python data/import_corpus.py templates ./templates.jsonl --dry-run
+
+청크 필드(parent_id, chunk_index, section)가 추가되기 전에 만든 인덱스는 먼저 삭제 후 다시 생성해야 함
+(이전 스키마에는 업로드가 실패함) / 같은 문서를 다시 가져오면 이전 청크는 자동으로 삭제
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.corpus_importer import KIND_CONVENTIONS, KIND_TEMPLATES, CorpusImporter
+from modules.ingestion import EMBED_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell 코퍼스 가져오기")
+    parser.add_argument("kind", choices=[KIND_CONVENTIONS, KIND_TEMPLATES], help="가져올 문서 종류")
+    parser.add_argument("paths", nargs="+", help="파일 또는 디렉터리")
+    parser.add_argument("--company", default=None, help="company 필드가 없는 컨벤션에 채울 회사명")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="임베딩/업로드 배치 크기 (청크 수)")
+    parser.add_argument("--dry-run", action="store_true", help="검증만 하고 업로드하지 않음")
+    args = parser.parse_args()
+
+    defaults = {"company": args.company} if args.company and args.kind == KIND_CONVENTIONS else {}
+    importer = CorpusImporter(args.kind, defaults)
+    documents = importer.iter_documents(args.paths)
+
+    print(f"🚀 {args.kind} 가져오기 시작: {', '.join(args.paths)}\n")
+    if args.dry_run:
+        for _ in documents:
+            pass
+        ingest_stats = None
+    else:
+        from modules.azure_client import AzureOpenAIClient
+        from modules.azure_search_client import AzureSearchClient
+        from modules.ingestion import BulkIngestor
+
+        ingestor = BulkIngestor(AzureSearchClient(), AzureOpenAIClient().create_embeddings, batch_size=args.batch_size)
+        if args.kind == KIND_CONVENTIONS:
+            ingest_stats = ingestor.ingest_conventions(documents)
+        else:
+            ingest_stats = ingestor.ingest_templates(documents)
+
+    report = importer.report()
+    print(f"📂 파일 {report['files']}개, 문서 {report['read']}개 읽음")
+    print(f"✅ 유효 {report['valid']}개 / ❌ 스키마 오류 {report['invalid']}개 / 🔁 중복 {report['duplicates']}개")
+    if ingest_stats:
+        print(f"📊 청크 {ingest_stats['chunks']}개 중 {ingest_stats['uploaded']}개 업로드, 실패 {ingest_stats['failed']}개")
+    for error in report["errors"]:
+        print(f"   - {error}")
+
+    success = not report["errors"] and (ingest_stats is None or ingest_stats["failed"] == 0)
+    if not success:
+        print("\n⚠️ 일부 문서를 가져오지 못했습니다. 위 오류를 확인하세요.")
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -17,6 +17,7 @@ sys.path.insert(0, str(modules_dir))
 
 from modules.azure_search_client import AzureSearchClient
 from modules.azure_client import AzureOpenAIClient
+from modules.ingestion import BulkIngestor
 
 class SampleDataUploader:
     """샘플 데이터 업로드 클래스"""
@@ -24,6 +25,7 @@ class SampleDataUploader:
     def __init__(self):
         self.search_client = AzureSearchClient()
         self.openai_client = AzureOpenAIClient()
+        self.ingestor = BulkIngestor(self.search_client, self.openai_client.create_embeddings)
     
     def get_sample_conventions(self):
         """코딩 컨벤션 샘플 데이터"""
@@ -289,62 +291,23 @@ docker-compose up --build
             }
         ]
     
-    def create_embedding(self, text: str):
-        """텍스트를 벡터로 변환"""
-        try:
-            response = self.openai_client.client.embeddings.create(
-                model='minseo-embedding915',
-                input=text
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"⚠️ 임베딩 생성 실패: {e}")
-            # 더미 벡터 반환 (1536차원)
-            return [0.0] * 1536
-    
     def upload_conventions(self):
-        """코딩 컨벤션 데이터 업로드"""
+        """코딩 컨벤션 데이터 업로드 (섹션 청크 분할 + 일괄 임베딩/업로드)"""
         print("🔄 코딩 컨벤션 데이터 업로드 중...")
         
-        conventions = self.get_sample_conventions()
-        success_count = 0
-        
-        for conv in conventions:
-            # 벡터 생성
-            embedding_text = f"{conv['title']} {conv['content']}"
-            conv['content_vector'] = self.create_embedding(embedding_text)
-            
-            # 업로드
-            if self.search_client.upload_document("coding-conventions", conv):
-                print(f"✅ 업로드 성공: {conv['title']}")
-                success_count += 1
-            else:
-                print(f"❌ 업로드 실패: {conv['title']}")
+        stats = self.ingestor.ingest_conventions(self.get_sample_conventions())
         
-        print(f"📊 코딩 컨벤션 업로드 완료: {success_count}/{len(conventions)}")
-        return success_count == len(conventions)
+        print(f"📊 코딩 컨벤션 업로드 완료: 문서 {stats['documents']}개 → 청크 {stats['uploaded']}/{stats['chunks']}")
+        return stats["failed"] == 0
     
     def upload_templates(self):
-        """환경 설정 템플릿 데이터 업로드"""
+        """환경 설정 템플릿 데이터 업로드 (섹션 청크 분할 + 일괄 임베딩/업로드)"""
         print("🔄 환경 설정 템플릿 데이터 업로드 중...")
         
-        templates = self.get_sample_templates()
-        success_count = 0
-        
-        for template in templates:
-            # 벡터 생성
-            embedding_text = f"{template['title']} {template['content']}"
-            template['content_vector'] = self.create_embedding(embedding_text)
-            
-            # 업로드
-            if self.search_client.upload_document("setup-templates", template):
-                print(f"✅ 업로드 성공: {template['title']}")
-                success_count += 1
-            else:
-                print(f"❌ 업로드 실패: {template['title']}")
+        stats = self.ingestor.ingest_templates(self.get_sample_templates())
         
-        print(f"📊 환경 설정 템플릿 업로드 완료: {success_count}/{len(templates)}")
-        return success_count == len(templates)
+        print(f"📊 환경 설정 템플릿 업로드 완료: 문서 {stats['documents']}개 → 청크 {stats['uploaded']}/{stats['chunks']}")
+        return stats["failed"] == 0
 
 def main():
     print("🚀 샘플 데이터 업로드 시작...\n")
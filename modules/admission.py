@@ -0,0 +1,215 @@
+"""
+LLM 호출 승인(admission) 제어 모듈
+프로세스 전체에서 동시에 진행되는 LLM 호출 수를 제한하고, 넘치는 호출은 사용자별 대기열에 넣어
+사용자 간 라운드 로빈으로 순서를 배정 (한 사용자가 여러 호출을 몰아 보내도 다른 사용자가 밀리지 않음)
+
+대기열이 너무 길거나 대기 시간이 길어지면 AdmissionRejectedError로 거부 (429를 기다리는 대신 바로 안내)
+
+설정 (환경 변수):
+- BLUEBELL_MAX_CONCURRENT_LLM: 동시 LLM 호출 수 (0이면 제한 없음)
+- BLUEBELL_LLM_MAX_WAITING: 전체 대기 호출 수 상한
+- BLUEBELL_LLM_MAX_WAITING_PER_USER: 사용자당 대기 호출 수 상한
+- BLUEBELL_LLM_QUEUE_TIMEOUT: 최대 대기 시간(초)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_WAITING = 32
+DEFAULT_MAX_WAITING_PER_USER = 8
+DEFAULT_QUEUE_TIMEOUT = 60.0
+
+# 사용자 식별자가 없는 호출(배치 스크립트 등)의 대기열 이름
+ANONYMOUS_USER = "anonymous"
+
+
+class AdmissionRejectedError(RuntimeError):
+    """대기열이 가득 찼거나 대기 시간이 초과되어 호출을 거부할 때 발생"""
+
+
+class _Waiter:
+    __slots__ = ("user", "event", "granted")
+
+    def __init__(self, user: str):
+        self.user = user
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    """
+    동시 실행 수 제한 + 사용자별 공정 대기열
+    슬롯이 반납되면 대기열 맨 앞 사용자의 가장 오래된 호출에 슬롯을 넘기고 그 사용자를 맨 뒤로 보냄
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_waiting: int = DEFAULT_MAX_WAITING,
+        max_waiting_per_user: int = DEFAULT_MAX_WAITING_PER_USER,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT
+    ):
+        """
+        초기화
+
+        Args:
+            max_concurrent: 동시 실행 상한 (0 이하이면 제한 없음)
+            max_waiting: 전체 대기 상한 (초과 시 즉시 거부)
+            max_waiting_per_user: 사용자당 대기 상한
+            queue_timeout: 최대 대기 시간(초)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_waiting_per_user = max_waiting_per_user
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._counters = {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    @contextmanager
+    def admit(self, user: Optional[str] = None, timeout: float = None):
+        """
+        슬롯을 얻을 때까지 대기한 뒤 블록 실행, 끝나면 반납
+
+        Args:
+            user: 사용자(세션) 식별자
+            timeout: 최대 대기 시간(초), None이면 queue_timeout
+
+        Yields:
+            대기 시간(밀리초)
+
+        Raises:
+            AdmissionRejectedError: 대기열 초과 또는 대기 시간 초과
+        """
+        if not self.enabled:
+            yield 0.0
+            return
+
+        started = time.perf_counter()
+        self._acquire(user or ANONYMOUS_USER, self.queue_timeout if timeout is None else timeout)
+        try:
+            yield (time.perf_counter() - started) * 1000
+        finally:
+            self._release()
+
+    def position(self, user: Optional[str]) -> int:
+        """
+        사용자의 가장 오래된 대기 호출 순서 (1부터, 대기 중이 아니면 0)
+        라운드 로빈이므로 앞선 사용자 수 + 1
+        """
+        user = user or ANONYMOUS_USER
+        with self._lock:
+            for index, queued_user in enumerate(self._queues):
+                if queued_user == user:
+                    return index + 1
+        return 0
+
+    def stats(self) -> Dict:
+        """현재 상태와 누적 집계"""
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "waiting_users": len(self._queues),
+                "max_concurrent": self.max_concurrent,
+                **self._counters,
+            }
+
+    def _acquire(self, user: str, timeout: float):
+        with self._lock:
+            if self._active < self.max_concurrent and not self._queues:
+                self._active += 1
+                self._counters["admitted"] += 1
+                return
+            if self._waiting >= self.max_waiting:
+                self._counters["rejected"] += 1
+                raise AdmissionRejectedError("현재 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+            user_queue = self._queues.get(user)
+            if user_queue is not None and len(user_queue) >= self.max_waiting_per_user:
+                self._counters["rejected"] += 1
+                raise AdmissionRejectedError("이미 대기 중인 요청이 많습니다. 이전 요청이 끝난 뒤 다시 시도해주세요.")
+
+            waiter = _Waiter(user)
+            self._queues.setdefault(user, deque()).append(waiter)
+            self._waiting += 1
+            self._counters["queued"] += 1
+
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            # 시간 초과와 슬롯 배정이 동시에 일어난 경우 배정을 우선
+            if waiter.granted:
+                return
+            user_queue = self._queues.get(user)
+            if user_queue is not None:
+                user_queue.remove(waiter)
+                if not user_queue:
+                    del self._queues[user]
+            self._waiting -= 1
+            self._counters["timed_out"] += 1
+        logger.warning(f"LLM 호출 대기 시간 초과: {user} ({timeout:g}초)")
+        raise AdmissionRejectedError(f"대기 시간({timeout:g}초)이 초과되었습니다. 잠시 후 다시 시도해주세요.")
+
+    def _release(self):
+        with self._lock:
+            if not self._queues:
+                self._active -= 1
+                return
+            # 맨 앞 사용자에게 슬롯을 넘기고(실행 수 유지) 그 사용자는 맨 뒤로
+            user, user_queue = self._queues.popitem(last=False)
+            waiter = user_queue.popleft()
+            if user_queue:
+                self._queues[user] = user_queue
+            self._waiting -= 1
+            self._counters["admitted"] += 1
+            waiter.granted = True
+            waiter.event.set()
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """프로세스 전역 승인 제어기 (최초 호출 시 환경 변수로 생성)"""
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(
+                    max_concurrent=int(os.getenv("BLUEBELL_MAX_CONCURRENT_LLM", str(DEFAULT_MAX_CONCURRENT))),
+                    max_waiting=int(os.getenv("BLUEBELL_LLM_MAX_WAITING", str(DEFAULT_MAX_WAITING))),
+                    max_waiting_per_user=int(
+                        os.getenv("BLUEBELL_LLM_MAX_WAITING_PER_USER", str(DEFAULT_MAX_WAITING_PER_USER))
+                    ),
+                    queue_timeout=float(os.getenv("BLUEBELL_LLM_QUEUE_TIMEOUT", str(DEFAULT_QUEUE_TIMEOUT)))
+                )
+    return _controller
+
+
+def configure_admission(controller: AdmissionController = None) -> AdmissionController:
+    """
+    전역 승인 제어기 교체 (테스트 또는 설정 변경용)
+
+    Args:
+        controller: 사용할 제어기 (None이면 다음 호출 시 환경 변수로 다시 생성)
+    """
+    global _controller
+    with _controller_lock:
+        _controller = controller
+    return controller
@@ -0,0 +1,199 @@
+"""
+프로세스 전역 앱 리소스 모듈
+Azure 클라이언트, 작업 큐, 캐시, 기록 저장소와 워밍업을 프로세스당 하나씩 만들어 모든 세션이 공유
+
+Streamlit 스크립트(app.py)와 실행 스크립트(serve.py)가 같은 객체를 써야 하므로
+st.cache_resource 대신 모듈 전역에 보관 (모듈은 스크립트 재실행과 관계없이 한 번만 import됨)
+- serve.py: streamlit이 트래픽을 받기 전에 configure_process()와 start_process_warmup() 호출
+- app.py: 같은 함수를 매 실행마다 호출 (이미 실행된 경우 아무것도 하지 않음)
+
+생성에 실패한 리소스(환경 변수 누락 등)는 저장하지 않으므로 다음 호출에서 다시 시도
+"""
+
+import functools
+import os
+import threading
+from typing import Callable, Optional, Tuple
+import logging
+
+from modules.azure_client import AzureOpenAIClient
+from modules.azure_search_client import AzureSearchClient, DEFAULT_SEARCH_CACHE_PATH
+from modules.cache_snapshot import cache_version, index_version, start_periodic_snapshots
+from modules.code_reviewer import MAX_REVIEW_REGIONS, CodeReviewer
+from modules.config import load_config
+from modules.history_store import HistoryStore, create_history_store
+from modules.job_queue import JobQueue
+from modules.prompt_builder import prompt_version
+from modules.semantic_cache import SemanticCache, DEFAULT_CACHE_PATH
+from modules.setup_analyzer import SetupAnalyzer
+from modules.tracing import configure_tracing
+from modules.usage_tracker import configure_usage_tracking
+from modules.warmup import start_health_server, start_warmup
+
+logger = logging.getLogger(__name__)
+
+def process_singleton(func: Callable[[], object]) -> Callable[[], object]:
+    """인자 없는 함수의 첫 성공 결과를 프로세스 전역으로 보관 (예외는 보관하지 않음)"""
+    missing = object()
+    result = missing
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper():
+        nonlocal result
+        if result is missing:
+            with lock:
+                if result is missing:
+                    result = func()
+        return result
+
+    return wrapper
+
+
+@process_singleton
+def configure_process():
+    """
+    프로세스당 1회 전역 설정 (.env, trace exporter, 사용량 추적기)
+    Streamlit은 상호작용마다 스크립트를 다시 실행하므로 매번 설정하면
+    재실행마다 exporter와 사용량 저장소(SQLite 연결)를 새로 만들고 작업 중인 워커의 전역 객체를 교체함
+    """
+    load_config()
+    configure_tracing()
+    configure_usage_tracking()
+
+
+@process_singleton
+def get_azure_client() -> AzureOpenAIClient:
+    """프로세스 전역 Azure OpenAI 클라이언트 (모든 세션이 연결 풀과 배포 상태를 공유)"""
+    return AzureOpenAIClient()
+
+
+@process_singleton
+def get_search_client() -> AzureSearchClient:
+    """프로세스 전역 Azure Search 클라이언트 (모든 세션이 연결 풀과 결과 캐시를 공유)"""
+    return AzureSearchClient()
+
+
+@process_singleton
+def get_job_queue() -> JobQueue:
+    """프로세스 전역 작업 큐 (모든 세션이 공유)"""
+    return JobQueue(
+        max_workers=int(os.getenv("BLUEBELL_JOB_WORKERS", "2")),
+        max_pending=int(os.getenv("BLUEBELL_JOB_MAX_PENDING", "100")),
+        max_pending_per_owner=int(os.getenv("BLUEBELL_JOB_MAX_PENDING_PER_USER", "3")),
+        stale_job_seconds=float(os.getenv("BLUEBELL_JOB_STALE_SECONDS", "3600"))
+    )
+
+
+def result_version(azure_client: AzureOpenAIClient) -> dict:
+    """생성 결과 버전 키 (채팅 모델 배포, 프롬프트, 인덱스 데이터가 바뀌면 예전 결과를 재사용하지 않음)"""
+    deployments = {backend.deployment for router in azure_client.routers.values() for backend in router.backends}
+    return cache_version(
+        chat=",".join(sorted(deployments)),
+        prompt=prompt_version(),
+        index=index_version()
+    )
+
+
+def semantic_cache_version(azure_client: AzureOpenAIClient) -> dict:
+    """시맨틱 캐시 스냅샷 버전 키 (결과 버전 + 임베딩 모델)"""
+    return cache_version(embedding=azure_client.embedding_deployment, **result_version(azure_client))
+
+
+@process_singleton
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    프로세스 전역 시맨틱 캐시 (모든 세션이 공유)
+    BLUEBELL_SEMANTIC_CACHE=1 이고 임베딩 배포가 설정된 경우에만 사용
+    """
+    azure_client = get_azure_client()
+    if os.getenv("BLUEBELL_SEMANTIC_CACHE", "0") != "1" or not azure_client.embedding_deployment:
+        return None
+    return SemanticCache(
+        azure_client.create_embedding,
+        threshold=float(os.getenv("BLUEBELL_SEMANTIC_CACHE_THRESHOLD", "0.97")),
+        max_entries=int(os.getenv("BLUEBELL_SEMANTIC_CACHE_SIZE", "1000")),
+        persist_path=os.getenv("BLUEBELL_SEMANTIC_CACHE_PATH", DEFAULT_CACHE_PATH),
+        version=semantic_cache_version(azure_client)
+    )
+
+
+@process_singleton
+def get_history_store() -> Optional[HistoryStore]:
+    """
+    프로세스 전역 기록 저장소 (모든 세션이 공유)
+    BLUEBELL_HISTORY=0 이면 None
+    """
+    try:
+        version = result_version(get_azure_client())
+    except Exception:
+        # 클라이언트가 없으면 새 결과를 만들지 않으므로 기록 패널 조회만 가능
+        version = None
+    return create_history_store(version)
+
+
+def create_session_analyzers(
+    azure_client: AzureOpenAIClient,
+    rag_service=None,
+    semantic_cache: Optional[SemanticCache] = None,
+    history_store: Optional[HistoryStore] = None
+) -> Tuple[SetupAnalyzer, CodeReviewer]:
+    """
+    세션별 가이드 생성기와 코드 리뷰어 생성 (캐시/기록 저장소는 프로세스 전역 객체 공유)
+    구조화된 리뷰 영역 수 상한은 BLUEBELL_REVIEW_MAX_REGIONS (코드 리뷰어에만 적용)
+    """
+    setup_analyzer = SetupAnalyzer(azure_client, rag_service, semantic_cache, history_store=history_store)
+    code_reviewer = CodeReviewer(
+        azure_client, rag_service, semantic_cache,
+        history_store=history_store,
+        max_regions=int(os.getenv("BLUEBELL_REVIEW_MAX_REGIONS", str(MAX_REVIEW_REGIONS)))
+    )
+    return setup_analyzer, code_reviewer
+
+
+@process_singleton
+def start_process_warmup() -> Optional[threading.Thread]:
+    """
+    프로세스당 1회 워밍업 시작 + 준비 상태 엔드포인트 (BLUEBELL_HEALTH_PORT)
+    연결 풀과 디스크 캐시를 미리 준비해 첫 요청 지연을 줄임
+    캐시 스냅샷은 주기적으로(BLUEBELL_CACHE_SNAPSHOT_INTERVAL), 그리고 종료 시 저장
+
+    serve.py로 실행하면 streamlit이 트래픽을 받기 전에 호출되므로 첫 사용자 접속 전에 준비 상태가 됨
+    (streamlit run app.py로 직접 실행하면 첫 세션이 스크립트를 실행할 때 시작)
+    """
+    configure_process()
+
+    port = int(os.getenv("BLUEBELL_HEALTH_PORT") or "0")
+    if port:
+        try:
+            start_health_server(port)
+        except OSError as e:
+            # 여러 워커가 같은 포트를 쓰는 경우 등 - 엔드포인트 없이 워밍업만 진행
+            logger.error(f"준비 상태 엔드포인트 시작 실패: {str(e)}")
+
+    try:
+        azure_client = get_azure_client()
+        search_client = get_search_client()
+    except Exception as e:
+        logger.error(f"워밍업 대상 클라이언트 생성 실패: {str(e)}")
+        azure_client, search_client = None, None
+
+    preloaders = {"history_store": get_history_store, "job_queue": get_job_queue}
+    savers = {}
+    if azure_client is not None:
+        preloaders["semantic_cache"] = get_semantic_cache
+
+        def save_semantic_cache():
+            semantic_cache = get_semantic_cache()
+            if semantic_cache is not None:
+                semantic_cache.save()
+        savers["semantic_cache"] = save_semantic_cache
+
+    # 검색 결과 캐시 스냅샷 (빈 값이면 저장/복원 안 함)
+    search_cache_path = os.getenv("BLUEBELL_SEARCH_CACHE_PATH", DEFAULT_SEARCH_CACHE_PATH)
+    if search_client is not None and search_cache_path:
+        preloaders["search_cache"] = lambda: search_client.load_cache_snapshot(search_cache_path)
+        savers["search_cache"] = lambda: search_client.save_cache_snapshot(search_cache_path)
+
+    start_periodic_snapshots(savers)
+    return start_warmup(azure_client, search_client, preloaders)
@@ -3,17 +3,38 @@ Azure OpenAI 클라이언트 모듈
 개발 환경 분석 및 코드 리뷰를 위한 AI 통신 담당
 """
 
+import io
+import json
 import os
+import time
 from typing import Dict, List, Optional
-from openai import AzureOpenAI
-from dotenv import load_dotenv
 import logging
 
-# 환경 변수 로드
-load_dotenv()
+from modules.admission import AdmissionRejectedError, get_admission_controller
+from modules.config import load_config
+from modules.deadlines import (
+    STAGE_COMPLETION, STAGE_EMBEDDING, RequestCancelledError, current_scope, deadline_timeout, stage_timeout
+)
+from modules.deployment_router import (
+    Backend, CircuitBreaker, DeploymentRouter, STRATEGY_LEAST_OUTSTANDING, TIER_LARGE, TIER_SMALL,
+    build_tier_routers, load_backends
+)
+from modules.model_tiering import choose_guide_tier, extract_tech_stack, get_tier_metrics
+from modules.prompt_builder import build_review_messages, build_setup_messages
+from modules.output_budget import MAX_CONTINUATIONS, estimate_guide_tokens, estimate_review_tokens
+from modules.rate_limiter import get_rate_limiter
+from modules.tracing import get_tracer
+from modules.usage_tracker import BUDGET_REJECT, current_usage_labels, get_usage_tracker
+
+# get_completion 실패 시 반환되는 메시지 접두어 (캐시 저장 제외 판단에 사용)
+COMPLETION_ERROR_PREFIX = "오류가 발생했습니다."
+
+# Batch API 작업 종료 상태
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# 응답이 max_tokens에서 잘렸을 때 이어서 생성을 요청하는 메시지
+CONTINUATION_PROMPT = "응답이 중간에 끊겼습니다. 앞 내용을 반복하지 말고 끊긴 부분부터 바로 이어서 작성해주세요."
 
-# 로깅 설정 (모듈 단위로 로그 관리 기능)
-logging.basicConfig(level=logging.INFO) # 로그 레벨을 INFO(일반적인 정보 메시지)로 설정
 logger = logging.getLogger(__name__) # 특정 이름을 가진 로거 객체 생성 (__name_은 현재 모듈(파일 기반)의 이름으로 생성)
 
 class AzureOpenAIClient:
@@ -24,24 +45,65 @@ class AzureOpenAIClient:
     def __init__(self):
         """
         클라이언트 초기화
+        SDK 클라이언트는 첫 호출 시점에 생성 (openai 패키지 import가 무거워 콜드 스타트 지연)
         """
+        load_config()
+
         self.api_key = os.getenv("AZURE_OPENAI_API_KEY")
         self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         self.api_version = os.getenv("AZURE_OPENAI_API_VERSION")
         self.api_type = os.getenv("AZURE_OPENAI_API_TYPE")
         self.deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
-
+        self.embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        # Batch API는 Global-Batch 타입 배포가 따로 필요 (없으면 기본 배포 사용)
+        self.batch_deployment_name = os.getenv("AZURE_OPENAI_BATCH_DEPLOYMENT") or self.deployment_name
 
         # 필수 환경변수 확인
         self._validate_config()
 
-        # Azure OpenAI 클라이언트 생성
-        self.client = AzureOpenAI(
+        failure_threshold = int(os.getenv("BLUEBELL_CIRCUIT_FAILURES", "3"))
+        reset_timeout = float(os.getenv("BLUEBELL_CIRCUIT_RESET_SECONDS", "30"))
+
+        # 기본 배포 (임베딩/Batch API와 설정 파일이 없을 때의 채팅 요청에 사용)
+        self.default_backend = Backend(
+            name="default",
+            endpoint=self.endpoint,
             api_key=self.api_key,
-            azure_endpoint=self.endpoint,
-            api_version=self.api_version
+            deployment=self.deployment_name,
+            api_version=self.api_version,
+            breaker=CircuitBreaker(failure_threshold, reset_timeout)
         )
-        logger.info("Azure OpenAI 클라이언트 초기화 완료")
+        # 채팅 요청은 계층별 라우터가 여러 배포로 분산 (BLUEBELL_DEPLOYMENTS_FILE)
+        strategy = os.getenv("BLUEBELL_ROUTING_STRATEGY", STRATEGY_LEAST_OUTSTANDING)
+        backends = load_backends(self.default_backend, failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+        self.routers = build_tier_routers(backends, self.default_backend, strategy)
+
+        # 설정 파일 없이 같은 리소스의 작은 모델 배포만 지정한 경우
+        small_deployment = os.getenv("AZURE_OPENAI_SMALL_DEPLOYMENT_NAME")
+        if small_deployment and TIER_SMALL not in self.routers:
+            self.routers[TIER_SMALL] = DeploymentRouter([Backend(
+                name="default-small",
+                endpoint=self.endpoint,
+                api_key=self.api_key,
+                deployment=small_deployment,
+                api_version=self.api_version,
+                breaker=CircuitBreaker(failure_threshold, reset_timeout),
+                tier=TIER_SMALL
+            )], strategy=strategy)
+
+    @property
+    def router(self) -> DeploymentRouter:
+        """기본(large) 계층 라우터"""
+        return self.routers[TIER_LARGE]
+
+    @router.setter
+    def router(self, router: DeploymentRouter):
+        self.routers[TIER_LARGE] = router
+
+    @property
+    def client(self):
+        """기본 배포의 Azure OpenAI SDK 클라이언트 (최초 접근 시 생성)"""
+        return self.default_backend.client
 
     def _validate_config(self):
         """
@@ -68,7 +130,10 @@ class AzureOpenAIClient:
        messages : List[Dict[str, str]],
        temperature : float = 0.7,
        max_tokens : int = 4000,
-       top_p: float = 0.95     
+       top_p: float = 0.95,
+       max_continuations : int = 0,
+       tier : str = TIER_LARGE,
+       response_format : Optional[Dict] = None
     ) -> str :
         """
         ChatGPT 응답 생성
@@ -76,64 +141,207 @@ class AzureOpenAIClient:
         Args(대화메시지 + 파라미터) :
             messages : 대화 메시지 리스트
             temperatture : 창의성 정도 (0.0~1.0)
-            max_tokens : 최대 토큰 수
+            max_tokens : 최대 토큰 수 (호출 1회 기준, 배포 TPM 쿼터는 이 값으로 차감됨)
             top_p : 토큰 선택 확률
+            max_continuations : 응답이 max_tokens에서 잘렸을 때(finish_reason == "length")
+                                이어서 생성할 최대 횟수
+            tier : 모델 계층 (small 계층 배포가 없으면 large 사용)
+            response_format : 출력 형식 지정 (예: JSON 스키마), 이어 생성하면 JSON이 깨지므로
+                              지정 시 max_continuations는 무시
         Returns :
-            생성된 응답 텍스트
+            생성된 응답 텍스트 (이어 생성한 부분 포함)
             
         """
 
-        try : 
-            response = self.client.chat.completions.create(
-                model = self.deployment_name,
+        if tier not in self.routers:
+            tier = TIER_LARGE
+        router = self.routers[tier]
+
+        with get_tracer().span(
+            "openai.chat_completion",
+            deployment=self.deployment_name,
+            tier=tier,
+            max_tokens=max_tokens
+        ) as span:
+            # 예산 한도 확인 (초과 시 거부, 한도 근접 시 응답 길이 축소)
+            usage_tracker = get_usage_tracker()
+            decision = usage_tracker.check_budget()
+            if decision.action == BUDGET_REJECT:
+                span.set("budget", decision.action)
+                logger.warning(f"예산 한도로 호출 거부: {decision.reason}")
+                return f"{COMPLETION_ERROR_PREFIX} {decision.reason}"
+            if decision.max_tokens:
+                max_tokens = decision.limit_max_tokens(max_tokens)
+                span.set("budget", decision.action)
+                span.set("max_tokens", max_tokens)
+
+            if response_format:
+                max_continuations = 0
+            started = time.perf_counter()
+            finish_reason = None
+            try : 
+                # 동시 호출 수 제한 (넘치면 세션별 공정 대기열에서 순서를 기다림, 요청 마감 시간까지만)
+                admission = get_admission_controller()
+                with admission.admit(current_usage_labels().get("session_id"),
+                                     timeout=deadline_timeout(admission.queue_timeout)) as wait_ms:
+                    if wait_ms >= 1:
+                        span.set("admission_wait_ms", round(wait_ms, 1))
+                    started = time.perf_counter()
+                    parts = []
+                    conversation = list(messages)
+                    for attempt in range(max_continuations + 1):
+                        content, finish_reason = self._create_completion(
+                            router, conversation, temperature, max_tokens, top_p, span, usage_tracker,
+                            response_format
+                        )
+                        parts.append(content or "")
+                        if finish_reason != "length" or attempt == max_continuations:
+                            break
+
+                        # 잘린 응답 뒤에서 이어서 생성
+                        span.add("continuations")
+                        conversation = list(messages) + [
+                            {"role": "assistant", "content": "".join(parts)},
+                            {"role": "user", "content": CONTINUATION_PROMPT}
+                        ]
+                get_tier_metrics().record(
+                    tier, (time.perf_counter() - started) * 1000, finish_reason,
+                    continuations=span.attributes.get("continuations", 0)
+                )
+                return "".join(parts)
+            except AdmissionRejectedError as e:
+                span.set("admission", "rejected")
+                logger.warning(f"동시 호출 제한으로 거부: {str(e)}")
+                return f"{COMPLETION_ERROR_PREFIX} {str(e)}"
+            except RequestCancelledError as e:
+                # 취소/마감 시간 초과는 배포 장애가 아니므로 계층 지표에 오류로 남기지 않음
+                span.set("cancelled", type(e).__name__)
+                logger.info(f"요청 중단으로 호출 생략: {str(e)}")
+                return f"{COMPLETION_ERROR_PREFIX} {str(e)}"
+            except Exception as e :
+                get_tier_metrics().record(tier, (time.perf_counter() - started) * 1000, error=True)
+                span.record_error(e)
+                logger.error(f"API 호출 오류 : {str(e)}")
+                return f"{COMPLETION_ERROR_PREFIX} {str(e)}"
+
+    def _create_completion(self, router, messages, temperature, max_tokens, top_p, span, usage_tracker,
+                           response_format=None):
+        """
+        Chat Completions API 1회 호출 (라우터가 고른 배포로, 실패 시 다른 배포로 전환)
+
+        Returns :
+            (응답 텍스트, finish_reason)
+        """
+        extra = {"response_format": response_format} if response_format else {}
+
+        def call(backend: Backend):
+            started = time.perf_counter()
+            raw_response = backend.client.chat.completions.with_raw_response.create(
+                model = backend.deployment,
                 messages = messages,
                 temperature =  temperature,
                 max_tokens = max_tokens,
-                top_p = top_p
+                top_p = top_p,
+                timeout = stage_timeout(STAGE_COMPLETION),
+                **extra
             )
-            return response.choices[0].message.content
-        except Exception as e :
-            logger.error(f"API 호출 오류 : {str(e)}")
-            return f"오류가 발생했습니다. {str(e)}"
+            span.set("backend", backend.name)
+            return raw_response, backend, (time.perf_counter() - started) * 1000
+
+        raw_response, backend, latency_ms = router.execute(
+            call, on_failover=lambda failed, error: span.add("failovers")
+        )
+        response = raw_response.parse()
+        span.add("retries", _retries_taken(raw_response))
+        usage = _record_usage(span, response)
+        total_tokens = usage["prompt_tokens"] + usage["completion_tokens"]
+        # 호출 중에 요청이 취소되었으면 응답을 쓰지 않으므로 사용 토큰을 낭비로 집계
+        scope = current_scope()
+        wasted = scope is not None and scope.token.cancelled
+        if scope is not None:
+            scope.add_tokens(total_tokens, wasted=wasted)
+        if wasted:
+            span.add("wasted_tokens", total_tokens)
+        usage_tracker.record(
+            model=response.model or backend.deployment,
+            latency_ms=latency_ms,
+            wasted=wasted,
+            **usage
+        )
+        # 요청한 사용자(세션/IP)의 토큰 버킷에서 실제 사용량 차감
+        get_rate_limiter().charge(current_usage_labels().get("rate_limit_keys"), total_tokens)
+        return response.choices[0].message.content, response.choices[0].finish_reason
         
-    def analyze_readme(self, readme_content : str, os_type : str = "all") -> str :
+    def create_embedding(self, text: str) -> List[float]:
         """
-        README 파일을 분석하여 환경 설정 가이드 생성
+        텍스트 임베딩 생성
 
         Args :
-            readme_content : README 파일 내용
-            os_type : 대상 운영체제 (all, windows, linux, macos)
+            text : 임베딩할 텍스트
+        Returns :
+            임베딩 벡터 (실패 시 예외 발생)
+        """
+        if not self.embedding_deployment:
+            raise ValueError("필수 환경 변수가 없습니다 : AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+
+        with get_tracer().span("openai.embedding", deployment=self.embedding_deployment) as span:
+            response = self.client.embeddings.create(
+                model=self.embedding_deployment,
+                input=text,
+                timeout=stage_timeout(STAGE_EMBEDDING)
+            )
+            if response.usage is not None:
+                span.set("prompt_tokens", response.usage.prompt_tokens)
+            return response.data[0].embedding
 
+    def create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 텍스트 임베딩을 한 번의 요청으로 생성 (청크 일괄 색인용)
+
+        Args :
+            texts : 임베딩할 텍스트 리스트
         Returns :
-            생성된 환경설정 가이드
-        
+            입력 순서와 같은 임베딩 벡터 리스트 (실패 시 예외 발생)
         """
+        if not self.embedding_deployment:
+            raise ValueError("필수 환경 변수가 없습니다 : AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        if not texts:
+            return []
 
-        system_prompt = """당신은 숙련된 DevOps 엔지니어입니다.
-        주어진 README 파일을 분석하여 개발자가 빠르게 프로젝트를 시작할 수 있는
-        상세한 환경 설정 가이드를 작성해주세요.
+        with get_tracer().span("openai.embedding", deployment=self.embedding_deployment, batch=len(texts)) as span:
+            response = self.client.embeddings.create(
+                model=self.embedding_deployment,
+                input=list(texts),
+                timeout=stage_timeout(STAGE_EMBEDDING)
+            )
+            if response.usage is not None:
+                span.set("prompt_tokens", response.usage.prompt_tokens)
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
 
-        포함해야 할 내용 :
-        1. 필수 소프트웨어 설치
-        2. 프로젝트 클론 및 설정
-        3. 의존성 패키지 설치
-        4. 환경변수 설정
-        5. 실행 방법
-        6. 자주 발생하는 문제와 해결법                 
+    def analyze_readme(self, readme_content : str, os_type : str = "all", tech_stack : List[str] = None) -> str :
         """
-                        
-        user_prompt = f"""
-        다음의 README를 분석하여 {os_type} 운영체제용 환경설정 가이드를 작성해주세요 :
+        README 파일을 분석하여 환경 설정 가이드 생성
 
-        {readme_content[:3000]} #토큰 제한
+        Args :
+            readme_content : README 파일 내용
+            os_type : 대상 운영체제 (all, windows, linux, macos)
+            tech_stack : 추출된 기술 스택 (None이면 README에서 추출, 계층 선택/응답 길이 추정에 사용)
+
+        Returns :
+            생성된 환경설정 가이드
+        
         """
 
-        messages = [
-            {"role" : "system", "content" : system_prompt},
-            {"role" : "user", "content" : user_prompt}
-        ]
+        messages = build_setup_messages(readme_content, os_type)
+        if tech_stack is None:
+            tech_stack = extract_tech_stack(readme_content)
 
-        return self.get_completion(messages, temperature=0.3)
+        return self.get_completion(
+            messages, temperature=0.3,
+            max_tokens=estimate_guide_tokens(os_type, tech_stack),
+            max_continuations=MAX_CONTINUATIONS,
+            tier=choose_guide_tier(readme_content, os_type, tech_stack)
+        )
     
 
     def review_code(self, code: str, language : str = "auto") -> str :
@@ -146,33 +354,169 @@ class AzureOpenAIClient:
         Returns :
             코드 리뷰 결과
         """
-        system_prompt = """당신은 경험 많은 코드 리뷰어입니다.
-        주어진 코드를 분석하여 다음 항목들을 검사하고 개선사항을 제안해주세요:
-        
-        1. 네이밍 컨벤션
-        2. 코드 구조와 가독성
-        3. 잠재적 버그
-        4. 성능 개선 가능 부분
-        5. 보안 취약점
+        messages = build_review_messages(code, language)
+
+        return self.get_completion(
+            messages, temperature=0.3,
+            max_tokens=estimate_review_tokens(code),
+            max_continuations=MAX_CONTINUATIONS
+        )
+    
 
-        건설적이고 교육적인 톤으로 피드백을 제공해주세요.
+    def build_batch_request(
+        self,
+        custom_id: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        top_p: float = 0.95
+    ) -> Dict:
         """
+        Batch API 입력 JSONL의 한 줄(요청) 생성
 
-        user_prompt = f"""
-        다음 {language} 코드를 검토해주세요 :
+        Args:
+            custom_id: 결과를 원래 입력과 매칭하기 위한 ID
+            messages: 대화 메시지 리스트
+        Returns:
+            배치 요청 딕셔너리
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": self.batch_deployment_name,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "top_p": top_p
+            }
+        }
 
-        '''{language}
-        {code[:3000]} #토큰 제한
-        '''
+    def submit_batch(self, requests: List[Dict]) -> str:
         """
+        배치 요청들을 JSONL 파일로 업로드하고 배치 작업 생성
 
-        messages = [
-            {"role" : "system", "content" : system_prompt},
-            {"role" : "user", "content" : user_prompt}
-        ]
+        Args:
+            requests: build_batch_request로 만든 요청 리스트
+        Returns:
+            배치 작업 ID
+        """
+        jsonl = "\n".join(json.dumps(request, ensure_ascii=False) for request in requests)
+        batch_file = self.client.files.create(
+            file=("batch_input.jsonl", io.BytesIO(jsonl.encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"배치 작업 생성: {batch.id} ({len(requests)}개 요청)")
+        return batch.id
+
+    def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ):
+        """
+        배치 작업이 끝날 때까지 폴링
+
+        Args:
+            batch_id: 배치 작업 ID
+            poll_interval: 상태 확인 간격(초)
+            timeout: 최대 대기 시간(초), None이면 종료될 때까지
+        Returns:
+            마지막으로 조회한 배치 객체
+        """
+        started = time.time()
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                logger.info(f"배치 작업 종료: {batch_id} ({batch.status})")
+                return batch
+            if timeout is not None and time.time() - started > timeout:
+                logger.warning(f"배치 작업 대기 시간 초과: {batch_id} ({batch.status})")
+                return batch
+            time.sleep(poll_interval)
+
+    def get_batch_results(self, batch) -> Dict[str, str]:
+        """
+        배치 출력 파일을 읽어 custom_id별 응답 텍스트로 변환
+
+        Args:
+            batch: wait_for_batch가 반환한 배치 객체
+        Returns:
+            {custom_id: 응답 텍스트} (실패한 요청은 오류 메시지)
+        """
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = self.client.files.content(file_id).text
+            results.update(parse_batch_output(content))
+        return results
+
+
+def _retries_taken(raw_response) -> int:
+    """SDK 내부 재시도 횟수 (최종 요청의 x-stainless-retry-count 헤더)"""
+    retries = getattr(raw_response, "retries_taken", None)
+    if retries is None:
+        retries = raw_response.http_request.headers.get("x-stainless-retry-count", 0)
+    return int(retries)
+
+
+def _record_usage(span, response) -> Dict[str, int]:
+    """
+    응답의 토큰 사용량과 종료 사유를 span에 기록
+
+    Returns:
+        {"prompt_tokens", "completion_tokens", "cached_tokens"}
+    """
+    tokens = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    usage = response.usage
+    if usage is not None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        tokens = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+        }
+        # 이어 생성 시 여러 번 호출되므로 누적
+        for key, value in tokens.items():
+            span.add(key, value)
+        # 서버 측 프롬프트 캐시 적중 비율 (정적 접두부가 캐시되면 입력 지연/비용 감소)
+        if span.attributes["prompt_tokens"]:
+            span.set("cached_ratio", round(span.attributes["cached_tokens"] / span.attributes["prompt_tokens"], 3))
+    span.set("finish_reason", response.choices[0].finish_reason)
+    return tokens
+
+
+def parse_batch_output(content: str) -> Dict[str, str]:
+    """
+    Batch API 출력 JSONL 파싱
+
+    Args:
+        content: 출력 파일 내용
+    Returns:
+        {custom_id: 응답 텍스트 또는 오류 메시지}
+    """
+    results = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        body = response.get("body") or {}
+        if item.get("error") or response.get("status_code", 200) != 200:
+            error = item.get("error") or body.get("error") or {}
+            results[item["custom_id"]] = f"{COMPLETION_ERROR_PREFIX} {error.get('message', error)}"
+        else:
+            results[item["custom_id"]] = body["choices"][0]["message"]["content"]
+    return results
 
-        return self.get_completion(messages, temperature=0.3, max_tokens=4000)
-    
 
 def test_connection():
     """연결 테스트"""
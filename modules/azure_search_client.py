@@ -5,28 +5,23 @@ RAG 파이프라인을 위한 벡터 검색 및 문서 인덱싱 담당
 
 import os
 import json
+import threading
 from typing import Dict, List, Optional
-from azure.search.documents import SearchClient
-from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents.indexes.models import (
-    SearchIndex,
-    SearchField,
-    SearchFieldDataType,
-    SimpleField,
-    SearchableField,
-    VectorSearch,
-    VectorSearchProfile,
-    VectorSearchAlgorithmKind,
-    VectorSearchAlgorithmMetric,
-    HnswAlgorithmConfiguration
-)
-from azure.core.credentials import AzureKeyCredential
-from dotenv import load_dotenv
 import logging
 
-load_dotenv()
+from modules.cache_snapshot import cache_version, decode_json, encode_json, index_version, read_snapshot, write_snapshot
+from modules.config import load_config
+from modules.deadlines import STAGE_SEARCH, RequestCancelledError, stage_timeout
+from modules.lru_cache import LRUCache
+from modules.search_filters import ODataFilter, conventions_filter, templates_filter
+from modules.tenant_router import load_tenant_router, normalize_tenant
+from modules.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SEARCH_CACHE_PATH = os.path.join(".bluebell", "search_cache.snap")
+SEARCH_SNAPSHOT_KIND = "search_results"
+
 class AzureSearchClient:
     """
     Azure AI Search와 통신하는 클라이언트
@@ -34,7 +29,12 @@ class AzureSearchClient:
     """
     
     def __init__(self):
-        """클라이언트 초기화"""
+        """
+        클라이언트 초기화
+        SDK 클라이언트는 첫 검색 시점에 생성 (azure SDK import가 무거워 콜드 스타트 지연)
+        """
+        load_config()
+
         self.search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
         self.search_key = os.getenv("AZURE_SEARCH_KEY")
         self.search_api_version = os.getenv("AZURE_SEARCH_API_VERSION", "2023-11-01")
@@ -45,14 +45,29 @@ class AzureSearchClient:
         
         self._validate_config()
         
-        # 클라이언트 초기화
-        self.credential = AzureKeyCredential(self.search_key)
-        self.index_client = SearchIndexClient(
-            endpoint=self.search_endpoint,
-            credential=self.credential
-        )
+        self._credential = None
+        self._index_admin = None
+        self._search_clients: Dict = {}
+        self._clients_lock = threading.Lock()
+        
+        # 회사별 컨벤션 인덱스/필터 라우팅
+        self.tenant_router = load_tenant_router(default_index=self.conventions_index)
         
-        logger.info("Azure AI Search 클라이언트 초기화 완료")
+        # 검색 결과 캐시 (키: 인덱스 + 검색어 + 정규화된 필터 + top)
+        # 회사별 컨벤션 검색은 회사마다 별도 캐시 (한 회사의 검색이 다른 회사 캐시를 밀어내지 않도록)
+        self._cache_size = int(os.getenv("BLUEBELL_SEARCH_CACHE_SIZE", "256"))
+        self._cache_ttl = float(os.getenv("BLUEBELL_SEARCH_CACHE_TTL", "300"))
+        self.result_cache = LRUCache(max_entries=self._cache_size, ttl_seconds=self._cache_ttl)
+        self._tenant_caches: Dict[str, LRUCache] = {}
+    
+    @property
+    def credential(self):
+        """검색 키 자격 증명 (최초 접근 시 생성)"""
+        if self._credential is None:
+            from azure.core.credentials import AzureKeyCredential
+
+            self._credential = AzureKeyCredential(self.search_key)
+        return self._credential
     
     def _validate_config(self):
         """환경변수 검증"""
@@ -65,139 +80,114 @@ class AzureSearchClient:
         if missing_vars:
             raise ValueError(f"필수 환경 변수가 없습니다: {', '.join(missing_vars)}")
     
-    def create_conventions_index(self) -> bool:
-        """코딩 컨벤션 인덱스 생성"""
-        try:
-            # 벡터 검색 설정
-            vector_search = VectorSearch(
-                profiles=[
-                    VectorSearchProfile(
-                        name="conventions-profile",
-                        algorithm_configuration_name="conventions-hnsw"
-                    )
-                ],
-                algorithms=[
-                    HnswAlgorithmConfiguration(
-                        name="conventions-hnsw",
-                        kind=VectorSearchAlgorithmKind.HNSW,
-                        parameters={
-                            "m": 4,
-                            "efConstruction": 400,
-                            "efSearch": 500,
-                            "metric": VectorSearchAlgorithmMetric.COSINE
-                        }
-                    )
-                ]
-            )
-            
-            # 필드 정의
-            fields = [
-                SimpleField(name="id", type=SearchFieldDataType.String, key=True),
-                SearchableField(name="title", type=SearchFieldDataType.String),
-                SearchableField(name="content", type=SearchFieldDataType.String),
-                SimpleField(name="category", type=SearchFieldDataType.String, filterable=True),
-                SimpleField(name="language", type=SearchFieldDataType.String, filterable=True),
-                SimpleField(name="company", type=SearchFieldDataType.String, filterable=True),
-                SimpleField(name="project_type", type=SearchFieldDataType.String, filterable=True),
-                SimpleField(name="tags", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
-                SimpleField(name="priority", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
-                SearchField(
-                    name="content_vector",
-                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-                    searchable=True,
-                    vector_search_dimensions=1536,
-                    vector_search_profile_name="conventions-profile"
-                )
-            ]
-            
-            # 인덱스 생성
-            index = SearchIndex(
-                name=self.conventions_index,
-                fields=fields,
-                vector_search=vector_search
+    @property
+    def index_admin(self):
+        """인덱스 관리 클라이언트 (인덱스 스키마 모델은 관리 작업 시에만 import)"""
+        if self._index_admin is None:
+            from modules.search_index_admin import SearchIndexAdmin
+
+            self._index_admin = SearchIndexAdmin(
+                self.search_endpoint,
+                self.credential,
+                self.conventions_index,
+                self.templates_index
             )
-            
-            result = self.index_client.create_or_update_index(index)
-            logger.info(f"코딩 컨벤션 인덱스 생성 완료: {result.name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"인덱스 생성 실패: {str(e)}")
-            return False
+        return self._index_admin
+    
+    def create_conventions_index(self) -> bool:
+        """코딩 컨벤션 인덱스 생성 (테넌트 전용 인덱스 포함)"""
+        return all([self.index_admin.create_conventions_index(index_name)
+                    for index_name in self.tenant_router.all_indexes()])
     
     def create_templates_index(self) -> bool:
         """환경 설정 템플릿 인덱스 생성"""
-        try:
-            # 벡터 검색 설정
-            vector_search = VectorSearch(
-                profiles=[
-                    VectorSearchProfile(
-                        name="templates-profile",
-                        algorithm_configuration_name="templates-hnsw"
-                    )
-                ],
-                algorithms=[
-                    HnswAlgorithmConfiguration(
-                        name="templates-hnsw",
-                        kind=VectorSearchAlgorithmKind.HNSW,
-                        parameters={
-                            "m": 4,
-                            "efConstruction": 400,
-                            "efSearch": 500,
-                            "metric": VectorSearchAlgorithmMetric.COSINE
-                        }
+        return self.index_admin.create_templates_index()
+    
+    def get_search_client(self, index_name: str):
+        """
+        특정 인덱스용 검색 클라이언트 반환
+        인덱스별로 한 번 생성해 재사용 (HTTP 연결 풀 공유)
+        """
+        search_client = self._search_clients.get(index_name)
+        if search_client is None:
+            with self._clients_lock:
+                search_client = self._search_clients.get(index_name)
+                if search_client is None:
+                    from azure.search.documents import SearchClient
+
+                    search_client = SearchClient(
+                        endpoint=self.search_endpoint,
+                        index_name=index_name,
+                        credential=self.credential
                     )
-                ]
-            )
-            
-            # 필드 정의
-            fields = [
-                SimpleField(name="id", type=SearchFieldDataType.String, key=True),
-                SearchableField(name="title", type=SearchFieldDataType.String),
-                SearchableField(name="content", type=SearchFieldDataType.String),
-                SimpleField(name="category", type=SearchFieldDataType.String, filterable=True),
-                SimpleField(name="tech_stack", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
-                SimpleField(name="os_support", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
-                SimpleField(name="prerequisites", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
-                SimpleField(name="difficulty", type=SearchFieldDataType.String, filterable=True),
-                SearchField(
-                    name="content_vector",
-                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
-                    searchable=True,
-                    vector_search_dimensions=1536,
-                    vector_search_profile_name="templates-profile"
+                    self._search_clients[index_name] = search_client
+                    logger.info(f"Azure AI Search 클라이언트 초기화 완료: {index_name}")
+        return search_client
+    
+    def tenant_cache(self, company: Optional[str]) -> LRUCache:
+        """회사별 검색 결과 캐시 (회사 미지정이면 공용 캐시)"""
+        tenant = normalize_tenant(company)
+        if tenant is None:
+            return self.result_cache
+        cache = self._tenant_caches.get(tenant)
+        if cache is None:
+            with self._clients_lock:
+                cache = self._tenant_caches.setdefault(
+                    tenant, LRUCache(max_entries=self._cache_size, ttl_seconds=self._cache_ttl)
                 )
-            ]
-            
-            # 인덱스 생성
-            index = SearchIndex(
-                name=self.templates_index,
-                fields=fields,
-                vector_search=vector_search
+        return cache
+    
+    def cache_version(self) -> Dict[str, str]:
+        """검색 결과 스냅샷 버전 키 (인덱스 데이터 버전, 인덱스 구성, API 버전)"""
+        indexes = sorted(set(self.tenant_router.all_indexes()) | {self.templates_index})
+        return cache_version(index=index_version(), indexes=",".join(indexes), api=self.search_api_version)
+    
+    def save_cache_snapshot(self, path: str) -> bool:
+        """공용/회사별 검색 결과 캐시를 스냅샷 파일로 저장 (남은 TTL 유지)"""
+        with self._clients_lock:
+            tenant_caches = dict(self._tenant_caches)
+        snapshot = {
+            "default": [[list(key), value, expires_at] for key, value, expires_at in self.result_cache.items()],
+            "tenants": {
+                tenant: [[list(key), value, expires_at] for key, value, expires_at in cache.items()]
+                for tenant, cache in tenant_caches.items()
+            },
+        }
+        entries = len(snapshot["default"]) + sum(len(items) for items in snapshot["tenants"].values())
+        return write_snapshot(path, SEARCH_SNAPSHOT_KIND, self.cache_version(), encode_json(snapshot), entries)
+    
+    def load_cache_snapshot(self, path: str) -> int:
+        """
+        스냅샷 파일에서 검색 결과 캐시 복원 (버전 키가 다르거나 손상/만료된 항목은 무시)
+        
+        Returns:
+            복원한 항목 수
+        """
+        payload = read_snapshot(path, SEARCH_SNAPSHOT_KIND, self.cache_version())
+        if payload is None:
+            return 0
+        try:
+            snapshot = decode_json(payload)
+            restored = self.result_cache.restore(
+                (tuple(key), value, expires_at) for key, value, expires_at in snapshot["default"]
             )
-            
-            result = self.index_client.create_or_update_index(index)
-            logger.info(f"환경 설정 템플릿 인덱스 생성 완료: {result.name}")
-            return True
-            
+            for tenant, items in snapshot["tenants"].items():
+                restored += self.tenant_cache(tenant).restore(
+                    (tuple(key), value, expires_at) for key, value, expires_at in items
+                )
         except Exception as e:
-            logger.error(f"인덱스 생성 실패: {str(e)}")
-            return False
-    
-    def get_search_client(self, index_name: str) -> SearchClient:
-        """특정 인덱스용 검색 클라이언트 반환"""
-        return SearchClient(
-            endpoint=self.search_endpoint,
-            index_name=index_name,
-            credential=self.credential
-        )
+            logger.error(f"검색 결과 캐시 복원 실패: {str(e)}")
+            return 0
+        logger.info(f"검색 결과 캐시 복원 완료: {restored}개 항목")
+        return restored
     
     def search_conventions(
         self,
         query: str,
         language: str = None,
         category: str = None,
-        top: int = 5
+        top: int = 5,
+        company: str = None
     ) -> List[Dict]:
         """
         코딩 컨벤션 검색
@@ -207,46 +197,58 @@ class AzureSearchClient:
             language: 프로그래밍 언어 필터
             category: 카테고리 필터
             top: 반환할 결과 수
+            company: 회사명 (테넌트 라우터로 인덱스/company 필터 결정, None이면 전체)
             
         Returns:
             검색 결과 리스트
         """
         try:
-            search_client = self.get_search_client(self.conventions_index)
-            
-            # 필터 생성
-            filters = []
-            if language:
-                filters.append(f"language eq '{language}'")
-            if category:
-                filters.append(f"category eq '{category}'")
+            # 인덱스 결정 및 필터 생성 (값 이스케이프, 같은 조건은 같은 문자열)
+            index_name, companies = self.tenant_router.route(company)
+            filter_expression = conventions_filter(language, category, companies)
+            cache = self.tenant_cache(company)
+            cache_key = (index_name, query, filter_expression, top)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
             
-            filter_expression = " and ".join(filters) if filters else None
-            
-            # 검색 실행
-            results = search_client.search(
-                search_text=query,
-                filter=filter_expression,
-                top=top,
-                include_total_count=True
-            )
+            search_client = self.get_search_client(index_name)
             
-            # 결과 변환
-            documents = []
-            for result in results:
-                documents.append({
-                    "id": result["id"],
-                    "title": result["title"],
-                    "content": result["content"],
-                    "language": result["language"],
-                    "category": result["category"],
-                    "tags": result.get("tags", []),
-                    "score": result["@search.score"]
-                })
+            with get_tracer().span("search.conventions", top=top, filter=filter_expression,
+                                   index=index_name) as span:
+                # 검색 실행
+                results = search_client.search(
+                    search_text=query,
+                    filter=filter_expression,
+                    top=top,
+                    include_total_count=True,
+                    timeout=stage_timeout(STAGE_SEARCH)
+                )
+                
+                # 결과 변환 (결과를 순회할 때 실제 요청이 전송됨)
+                documents = []
+                for result in results:
+                    documents.append({
+                        "id": result["id"],
+                        "title": result["title"],
+                        "content": result["content"],
+                        "language": result["language"],
+                        "category": result["category"],
+                        "tags": result.get("tags", []),
+                        "priority": result.get("priority"),
+                        "parent_id": result.get("parent_id"),
+                        "section": result.get("section"),
+                        "score": result["@search.score"]
+                    })
+                span.set("result_count", len(documents))
             
             logger.info(f"컨벤션 검색 완료: {len(documents)}개 결과")
-            return documents
+            cache.put(cache_key, documents)
+            return list(documents)
             
+        except RequestCancelledError as e:
+            logger.info(f"요청 중단으로 컨벤션 검색 생략: {str(e)}")
+            return []
         except Exception as e:
             logger.error(f"컨벤션 검색 실패: {str(e)}")
             return []
@@ -271,42 +273,48 @@ class AzureSearchClient:
             검색 결과 리스트
         """
         try:
-            search_client = self.get_search_client(self.templates_index)
-            
-            # 필터 생성
-            filters = []
-            if tech_stack:
-                tech_filters = [f"tech_stack/any(t: t eq '{tech}')" for tech in tech_stack]
-                filters.append(f"({' or '.join(tech_filters)})")
-            if os_type:
-                filters.append(f"os_support/any(os: os eq '{os_type}')")
+            # 필터 생성 (기술 스택은 or 체인 대신 search.in 하나로)
+            filter_expression = templates_filter(tech_stack, os_type)
+            cache_key = (self.templates_index, query, filter_expression, top)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
             
-            filter_expression = " and ".join(filters) if filters else None
-            
-            # 검색 실행
-            results = search_client.search(
-                search_text=query,
-                filter=filter_expression,
-                top=top,
-                include_total_count=True
-            )
+            search_client = self.get_search_client(self.templates_index)
             
-            # 결과 변환
-            documents = []
-            for result in results:
-                documents.append({
-                    "id": result["id"],
-                    "title": result["title"],
-                    "content": result["content"],
-                    "tech_stack": result["tech_stack"],
-                    "os_support": result["os_support"],
-                    "difficulty": result["difficulty"],
-                    "score": result["@search.score"]
-                })
+            with get_tracer().span("search.templates", top=top, filter=filter_expression) as span:
+                # 검색 실행
+                results = search_client.search(
+                    search_text=query,
+                    filter=filter_expression,
+                    top=top,
+                    include_total_count=True,
+                    timeout=stage_timeout(STAGE_SEARCH)
+                )
+                
+                # 결과 변환 (결과를 순회할 때 실제 요청이 전송됨)
+                documents = []
+                for result in results:
+                    documents.append({
+                        "id": result["id"],
+                        "title": result["title"],
+                        "content": result["content"],
+                        "tech_stack": result["tech_stack"],
+                        "os_support": result["os_support"],
+                        "difficulty": result["difficulty"],
+                        "parent_id": result.get("parent_id"),
+                        "section": result.get("section"),
+                        "score": result["@search.score"]
+                    })
+                span.set("result_count", len(documents))
             
             logger.info(f"템플릿 검색 완료: {len(documents)}개 결과")
-            return documents
+            self.result_cache.put(cache_key, documents)
+            return list(documents)
             
+        except RequestCancelledError as e:
+            logger.info(f"요청 중단으로 템플릿 검색 생략: {str(e)}")
+            return []
         except Exception as e:
             logger.error(f"템플릿 검색 실패: {str(e)}")
             return []
@@ -329,15 +337,66 @@ class AzureSearchClient:
             logger.error(f"문서 업로드 오류: {str(e)}")
             return False
     
-    def delete_index(self, index_name: str) -> bool:
-        """인덱스 삭제"""
+    def upload_documents(self, index_name: str, documents: List[Dict]) -> int:
+        """
+        문서 일괄 업로드 (같은 id는 덮어씀)
+        
+        Returns:
+            업로드에 성공한 문서 수
+        """
+        if not documents:
+            return 0
         try:
-            self.index_client.delete_index(index_name)
-            logger.info(f"인덱스 삭제 완료: {index_name}")
-            return True
+            search_client = self.get_search_client(index_name)
+            
+            with get_tracer().span("search.upload", index=index_name, documents=len(documents)) as span:
+                results = search_client.merge_or_upload_documents(documents)
+                failed = [result for result in results if not result.succeeded]
+                span.set("failed", len(failed))
+            
+            for result in failed[:5]:
+                logger.error(f"문서 업로드 실패: {result.key} - {result.error_message}")
+            logger.info(f"문서 일괄 업로드 완료: {index_name} {len(documents) - len(failed)}/{len(documents)}")
+            return len(documents) - len(failed)
+            
         except Exception as e:
-            logger.error(f"인덱스 삭제 실패: {str(e)}")
-            return False
+            logger.error(f"문서 일괄 업로드 오류: {str(e)}")
+            return 0
+    
+    def delete_stale_chunks(self, index_name: str, keep_ids: Dict[str, set]) -> int:
+        """
+        다시 색인한 문서의 이전 청크 삭제
+        청크 수가 줄면 번호가 큰 이전 청크가, 청크 분할 전에 올린 문서는 id가 원본 id인 문서 전체가 남으므로 제거
+
+        Args:
+            index_name: 인덱스 이름
+            keep_ids: 원본 문서 id → 새로 올린 청크 id 집합
+
+        Returns:
+            삭제한 문서 수
+        """
+        if not keep_ids:
+            return 0
+        try:
+            search_client = self.get_search_client(index_name)
+            results = search_client.search(
+                search_text="*",
+                filter=ODataFilter().in_("parent_id", keep_ids).build(),
+                select=["id", "parent_id"]
+            )
+            stale = [result["id"] for result in results if result["id"] not in keep_ids.get(result["parent_id"], ())]
+            # 청크 분할 전 문서 (없는 키 삭제는 성공으로 처리됨)
+            stale.extend(parent_id for parent_id, ids in keep_ids.items() if parent_id not in ids)
+            with get_tracer().span("search.delete", index=index_name, documents=len(stale)):
+                search_client.delete_documents([{"id": key} for key in stale])
+            return len(stale)
+        except Exception as e:
+            logger.error(f"이전 청크 삭제 오류: {str(e)}")
+            return 0
+
+    def delete_index(self, index_name: str) -> bool:
+        """인덱스 삭제"""
+        return self.index_admin.delete_index(index_name)
 
 def test_search_client():
     """Azure AI Search 연결 테스트"""
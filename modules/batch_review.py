@@ -0,0 +1,190 @@
+"""
+일괄(배치) 코드 리뷰 모듈
+야간 전체 저장소 리뷰처럼 대화형 지연이 필요 없는 작업을 Azure OpenAI Batch API로 처리
+
+$ python -m modules.batch_review <저장소 경로> --output review_results.jsonl
+"""
+
+import argparse
+import json
+import os
+import uuid
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+import logging
+
+from modules.azure_client import parse_batch_output
+
+logger = logging.getLogger(__name__)
+
+# 리뷰 대상 확장자
+REVIEW_EXTENSIONS = (".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".cs", ".go")
+
+# 탐색에서 제외할 디렉토리
+EXCLUDED_DIRS = {".git", "node_modules", "venv", ".venv", "__pycache__", "dist", "build"}
+
+
+class LocalBatchClient:
+    """
+    Batch API 로컬 대역
+    AzureOpenAIClient와 같은 배치 인터페이스를 제공하고
+    요청을 즉시 처리해 Batch API와 같은 형식의 출력 JSONL을 만듦 (테스트/오프라인용)
+    """
+
+    def __init__(self, responder: Callable[[List[Dict[str, str]]], str] = None):
+        """
+        초기화
+
+        Args:
+            responder: 메시지 리스트를 받아 응답 텍스트를 반환하는 함수
+                       (예: AzureOpenAIClient.get_completion, 없으면 고정 응답)
+        """
+        self.responder = responder or (lambda messages: "🟢 로컬 배치 리뷰 결과")
+        self.deployment_name = "local"
+        self._batches: Dict[str, SimpleNamespace] = {}
+        self._files: Dict[str, str] = {}
+
+    def build_batch_request(
+        self,
+        custom_id: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        top_p: float = 0.95
+    ) -> Dict:
+        """Batch API 입력 JSONL의 한 줄(요청) 생성"""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": self.deployment_name,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "top_p": top_p
+            }
+        }
+
+    def submit_batch(self, requests: List[Dict]) -> str:
+        """요청을 즉시 처리하고 배치 ID 반환"""
+        output_lines = []
+        error_lines = []
+        for request in requests:
+            try:
+                content = self.responder(request["body"]["messages"])
+                output_lines.append(json.dumps({
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}
+                    },
+                    "error": None
+                }, ensure_ascii=False))
+            except Exception as e:
+                error_lines.append(json.dumps({
+                    "custom_id": request["custom_id"],
+                    "response": None,
+                    "error": {"code": "local_error", "message": str(e)}
+                }, ensure_ascii=False))
+
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        output_file_id = self._store_file("\n".join(output_lines)) if output_lines else None
+        error_file_id = self._store_file("\n".join(error_lines)) if error_lines else None
+        self._batches[batch_id] = SimpleNamespace(
+            id=batch_id,
+            status="completed",
+            output_file_id=output_file_id,
+            error_file_id=error_file_id
+        )
+        return batch_id
+
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 0.0, timeout: Optional[float] = None):
+        """로컬 배치는 제출 즉시 완료"""
+        return self._batches[batch_id]
+
+    def get_batch_results(self, batch) -> Dict[str, str]:
+        """출력 파일을 파싱해 custom_id별 응답 반환"""
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                results.update(parse_batch_output(self._files[file_id]))
+        return results
+
+    def _store_file(self, content: str) -> str:
+        """출력 파일 저장"""
+        file_id = f"file_{uuid.uuid4().hex}"
+        self._files[file_id] = content
+        return file_id
+
+
+def collect_review_files(
+    root: str,
+    extensions: tuple = REVIEW_EXTENSIONS,
+    max_bytes: int = 200_000
+) -> Dict[str, str]:
+    """
+    저장소에서 리뷰 대상 소스 파일 수집
+
+    Args:
+        root: 저장소 루트 경로
+        extensions: 리뷰 대상 확장자
+        max_bytes: 이보다 큰 파일은 제외
+
+    Returns:
+        {상대 경로: 코드}
+    """
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        for filename in sorted(filenames):
+            if not filename.endswith(extensions):
+                continue
+            path = os.path.join(dirpath, filename)
+            if os.path.getsize(path) > max_bytes:
+                logger.info(f"파일이 너무 커서 제외: {path}")
+                continue
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                code = f.read()
+            if code.strip():
+                files[os.path.relpath(path, root)] = code
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell 일괄 코드 리뷰 (Azure OpenAI Batch API)")
+    parser.add_argument("roots", nargs="+", help="리뷰할 저장소 경로")
+    parser.add_argument("--output", default="review_results.jsonl", help="결과 JSONL 파일")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="상태 확인 간격(초)")
+    parser.add_argument("--local", action="store_true", help="Azure 대신 로컬 대역 사용")
+    args = parser.parse_args()
+
+    from modules.code_reviewer import CodeReviewer
+
+    if args.local:
+        batch_client = LocalBatchClient()
+        reviewer = CodeReviewer(azure_client=batch_client)
+    else:
+        from modules.azure_client import AzureOpenAIClient
+        azure_client = AzureOpenAIClient()
+        batch_client = azure_client
+        reviewer = CodeReviewer(azure_client)
+
+    with open(args.output, "w", encoding="utf-8") as out:
+        for root in args.roots:
+            files = collect_review_files(root)
+            print(f"🔄 {root}: {len(files)}개 파일 배치 리뷰 중...")
+            results = reviewer.review_batch(
+                files,
+                batch_client=batch_client,
+                poll_interval=args.poll_interval
+            )
+            for path, review in results.items():
+                out.write(json.dumps({"repo": root, "file": path, "review": review}, ensure_ascii=False) + "\n")
+            print(f"✅ {root}: {len(results)}개 파일 리뷰 완료")
+
+    print(f"📄 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
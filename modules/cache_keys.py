@@ -0,0 +1,29 @@
+"""
+캐시 키 유틸리티
+캐시 조회 전 입력 정규화와 캐시 범위(scope) 문자열 생성
+(numpy 등 무거운 의존성 없이 분석기 모듈에서 import 가능)
+"""
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키용 입력 정규화
+    줄바꿈 문자(CRLF/LF)와 줄 끝 공백 차이만 같은 입력으로 취급
+    (대소문자와 들여쓰기는 코드의 의미/리뷰 대상이므로 유지: userName과 username, 들여쓰기만 다른 코드는 다른 입력)
+    """
+    return "\n".join(line.rstrip() for line in text.splitlines()).rstrip("\n")
+
+
+def make_scope(**kwargs) -> str:
+    """
+    캐시 범위 문자열 생성
+    OS/언어/옵션이 다른 결과끼리는 유사도와 관계없이 공유하지 않음
+
+    예: make_scope(kind="guide", os_type="linux") -> "kind=guide|os_type=linux"
+    """
+    parts = []
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        if isinstance(value, dict):
+            value = ",".join(f"{k}:{value[k]}" for k in sorted(value))
+        parts.append(f"{key}={value}")
+    return "|".join(parts)
@@ -0,0 +1,181 @@
+"""
+캐시 스냅샷 모듈
+메모리 캐시(시맨틱 캐시, 검색 결과 캐시)를 로컬 파일 또는 공유 마운트 저장소에 저장하고
+새 프로세스/인스턴스가 시작할 때 다시 불러와 처음부터 높은 적중률로 시작
+
+파일 형식:
+    [매직 8바이트][헤더 길이 uint32][헤더 JSON][본문]
+    헤더: 형식 버전, 캐시 종류, 버전 키, 항목 수, 본문 SHA-256
+
+- 버전 키(모델 이름, 프롬프트 버전, 인덱스 버전 등)가 현재 설정과 하나라도 다르면 불러오지 않음
+  (모델/프롬프트/색인 데이터가 바뀐 뒤 예전 결과가 재사용되지 않도록)
+- 본문 해시가 맞지 않으면(쓰다 끊긴 파일, 손상) 불러오지 않음
+- 임시 파일에 쓴 뒤 교체하므로 여러 인스턴스가 같은 경로에 써도 읽는 쪽은 항상 완전한 파일을 봄
+
+설정 (환경 변수):
+- BLUEBELL_INDEX_VERSION: 검색 인덱스 데이터 버전 (코퍼스를 다시 색인하면 올림)
+- BLUEBELL_CACHE_SNAPSHOT_INTERVAL: 주기 저장 간격(초, 0이면 종료 시에만 저장)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_MAGIC = b"BBSNAP01"
+_HEADER_LENGTH = struct.Struct("<I")
+
+DEFAULT_INDEX_VERSION = "1"
+DEFAULT_SNAPSHOT_INTERVAL = 300.0
+
+
+def cache_version(**parts) -> Dict[str, str]:
+    """
+    버전 키 생성 (값은 문자열로 통일, None은 빈 문자열)
+
+    예: cache_version(model="gpt-4o", prompt=prompt_version(), index=index_version())
+    """
+    return {key: "" if value is None else str(value) for key, value in sorted(parts.items())}
+
+
+def index_version() -> str:
+    """검색 인덱스 데이터 버전 (BLUEBELL_INDEX_VERSION)"""
+    return os.getenv("BLUEBELL_INDEX_VERSION") or DEFAULT_INDEX_VERSION
+
+
+def write_snapshot(path: str, kind: str, version: Dict[str, str], payload: bytes, entries: int = 0) -> bool:
+    """
+    스냅샷 파일 저장 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        path: 저장 경로
+        kind: 캐시 종류 (다른 캐시 파일을 잘못 읽지 않도록 확인용)
+        version: 버전 키
+        payload: 본문 바이트
+        entries: 항목 수 (로그/확인용)
+
+    Returns:
+        성공 여부
+    """
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "kind": kind,
+        "version": version,
+        "entries": entries,
+        "created_at": time.time(),
+        "sha256": hashlib.sha256(payload).hexdigest(),
+    }, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+    # 공유 저장소에서 여러 인스턴스가 동시에 저장해도 임시 파일이 겹치지 않도록 PID/스레드 포함
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, path)
+        logger.info(f"캐시 스냅샷 저장 완료 ({kind}): {entries}개 항목, {len(payload):,}바이트")
+        return True
+    except Exception as e:
+        logger.error(f"캐시 스냅샷 저장 실패 ({kind}): {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def read_snapshot(path: str, kind: str, version: Dict[str, str]) -> Optional[bytes]:
+    """
+    스냅샷 파일 읽기 (형식/종류/버전 키/해시를 모두 확인)
+
+    Returns:
+        본문 바이트 (파일이 없거나 확인에 실패하면 None)
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(_MAGIC)] != _MAGIC:
+            logger.warning(f"캐시 스냅샷 형식이 아니어서 무시합니다 ({kind}): {path}")
+            return None
+        offset = len(_MAGIC)
+        (header_length,) = _HEADER_LENGTH.unpack_from(data, offset)
+        offset += _HEADER_LENGTH.size
+        header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+        payload = data[offset + header_length:]
+    except Exception as e:
+        logger.error(f"캐시 스냅샷 읽기 실패 ({kind}): {str(e)}")
+        return None
+
+    if header.get("format") != SNAPSHOT_FORMAT_VERSION or header.get("kind") != kind:
+        logger.warning(f"캐시 스냅샷 형식/종류가 달라 무시합니다 ({kind}): {path}")
+        return None
+    if header.get("version") != version:
+        logger.info(f"캐시 스냅샷 버전이 달라 무시합니다 ({kind}): {header.get('version')} → {version}")
+        return None
+    if hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        logger.error(f"캐시 스냅샷 무결성 확인 실패 ({kind}): {path}")
+        return None
+    return payload
+
+
+def encode_json(obj) -> bytes:
+    """JSON 본문 압축 (검색 결과 등 텍스트 캐시용)"""
+    return zlib.compress(json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+
+def decode_json(payload: bytes):
+    """encode_json의 역변환"""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def start_periodic_snapshots(
+    savers: Dict[str, Callable[[], object]],
+    interval: float = None
+) -> Optional[threading.Thread]:
+    """
+    캐시 저장 함수를 주기적으로, 그리고 프로세스 종료 시 한 번 호출
+
+    Args:
+        savers: {이름: 저장 함수}
+        interval: 저장 간격(초, None이면 BLUEBELL_CACHE_SNAPSHOT_INTERVAL, 0이면 종료 시에만)
+
+    Returns:
+        주기 저장 스레드 (종료 시에만 저장하면 None)
+    """
+    def save_all():
+        for name, saver in savers.items():
+            try:
+                saver()
+            except Exception as e:
+                logger.error(f"캐시 스냅샷 저장 실패 ({name}): {str(e)}")
+
+    atexit.register(save_all)
+
+    if interval is None:
+        interval = float(os.getenv("BLUEBELL_CACHE_SNAPSHOT_INTERVAL") or DEFAULT_SNAPSHOT_INTERVAL)
+    if interval <= 0:
+        return None
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            save_all()
+
+    thread = threading.Thread(target=loop, name="bluebell-cache-snapshot", daemon=True)
+    thread.start()
+    return thread
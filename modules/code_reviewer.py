@@ -2,27 +2,75 @@
 코드 리뷰 및 스타일 검사 모듈
 """
 
+import contextvars
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import logging
 
+from modules.azure_client import COMPLETION_ERROR_PREFIX
+from modules.cache_keys import make_scope
+from modules.model_tiering import choose_review_tier
+from modules.prompt_builder import build_review_messages
+from modules.review_findings import (
+    REVIEW_RESPONSE_FORMAT, FindingsCache, merge_findings, parse_review_json,
+    region_cache_key, shift_findings, split_code_regions
+)
+from modules.output_budget import MAX_CONTINUATIONS, estimate_review_tokens
+from modules.tracing import get_tracer
+from modules.history_store import KIND_REVIEW
+from modules.usage_tracker import current_usage_labels, usage_context
+
 logger = logging.getLogger(__name__)
 
+# 구조화된 리뷰에서 영역을 동시에 리뷰할 최대 개수
+MAX_PARALLEL_REGIONS = 4
+
+# 구조화된 리뷰 1회에서 리뷰할 최대 영역 수 (넘는 영역은 건너뛰고 결과에 표시)
+# 영역마다 LLM 호출이 1번씩 필요하므로 아주 긴 코드 한 번이 호출 수십 번으로 번지지 않게 제한
+MAX_REVIEW_REGIONS = 20
+
+# 리뷰 옵션 키 (기본값은 모두 활성화)
+REVIEW_OPTION_KEYS = [
+    'check_naming',
+    'check_structure',
+    'check_bugs',
+    'check_performance',
+    'check_security',
+    'suggest_refactoring'
+]
+
 class CodeReviewer:
     """
     코드를 분석하고 개선 사항을 제안하는 클래스
     """
     
-    def __init__(self, azure_client, rag_service=None):
+    def __init__(
+        self,
+        azure_client,
+        rag_service=None,
+        semantic_cache=None,
+        findings_cache=None,
+        history_store=None,
+        max_regions: int = MAX_REVIEW_REGIONS
+    ):
         """
         초기화
         
         Args:
             azure_client: AzureOpenAIClient 인스턴스
             rag_service: RAGService 인스턴스 (선택사항)
+            semantic_cache: SemanticCache 인스턴스 (선택사항)
+            findings_cache: 구조화된 리뷰의 영역별 결과 캐시 (없으면 메모리 LRU 생성)
+            history_store: HistoryStore 인스턴스 (선택사항)
+            max_regions: 구조화된 리뷰 1회에서 리뷰할 최대 영역 수 (0 이하면 제한 없음)
         """
         self.azure_client = azure_client
         self.rag_service = rag_service
+        self.semantic_cache = semantic_cache
+        self.findings_cache = findings_cache or FindingsCache()
+        self.history_store = history_store
+        self.max_regions = max_regions
         
         # 언어별 네이밍 규칙
         self.naming_conventions = {
@@ -58,52 +106,230 @@ class CodeReviewer:
         Returns:
             리뷰 결과
         """
-        try:
-            # 기본 옵션 설정
-            if options is None:
-                options = {
-                    'check_naming': True,
-                    'check_structure': True,
-                    'check_bugs': True,
-                    'check_performance': True,
-                    'check_security': True,
-                    'suggest_refactoring': True
-                }
+        with usage_context(feature="review"), get_tracer().span("code_review.review", code_chars=len(code)) as span:
+            try:
+                # 기본 옵션 설정
+                if options is None:
+                    options = dict.fromkeys(REVIEW_OPTION_KEYS, True)
+            
+                # 언어 자동 감지
+                if language == "auto":
+                    language = self._detect_language(code)
+                span.set("language", language)
+        
+                # 시맨틱 캐시 조회 (거의 같은 코드는 이전 리뷰 재사용)
+                cache_scope = make_scope(kind="review", language=language, options=options)
+                cached = self._find_history(code, cache_scope, span)
+                if cached:
+                    return cached
+                if self.semantic_cache:
+                    cached = self.semantic_cache.get(code, cache_scope)
+                    span.set("cache_hit", cached is not None)
+                    if cached:
+                        logger.info("시맨틱 캐시에서 리뷰 반환")
+                        return cached
+        
+                # RAG 서비스가 있으면 RAG 사용, 없으면 기본 방식
+                if self.rag_service:
+                    logger.info("RAG 서비스를 사용하여 코드 리뷰")
+                    result = self.rag_service.enhance_code_review(code, language, options=options)
+                
+                    span.set("mode", "rag" if result["success"] else "rag_fallback")
+                    if result["success"]:
+                        # RAG 결과 포맷팅
+                        review_result = self._format_rag_review_result(result, language)
+                    else:
+                        logger.warning("RAG 실패, 기본 방식으로 폴백")
+                        # 폴백: 기본 방식
+                        review_result = self._perform_basic_review(code, language, options)
+                else:
+                    logger.info("기본 방식으로 코드 리뷰")
+                    span.set("mode", "basic")
+                    # 기본 방식
+                    review_result = self._perform_basic_review(code, language, options)
+            
+                # 정상 응답만 캐시/기록에 저장
+                if COMPLETION_ERROR_PREFIX not in review_result:
+                    if self.semantic_cache:
+                        self.semantic_cache.put(code, cache_scope, review_result)
+                    self._save_history(code, cache_scope, review_result, language)
+            
+                return review_result
+            
+            except Exception as e:
+                span.record_error(e)
+                logger.error(f"코드 리뷰 실패: {str(e)}")
+                return self._generate_basic_review(code, language)
+        
+
+    def review_structured(
+        self,
+        code: str,
+        language: str = "auto",
+        options: Dict = None,
+        file_path: str = "snippet"
+    ) -> Dict:
+        """
+        구조화된(JSON) 코드 리뷰 수행
+        코드를 영역 단위로 나눠 병렬로 리뷰하고, 영역별 결과는 캐시하여 바뀐 영역만 다시 리뷰
+        
+        Args:
+            code: 리뷰할 코드
+            language: 프로그래밍 언어
+            options: 리뷰 옵션
+            file_path: 결과에 표시할 파일 경로
             
-            # 언어 자동 감지
+        Returns:
+            {"language", "file", "summary", "findings", "regions", "cached_regions", "failed_regions",
+             "skipped_regions", "skipped_from_line"}
+            (JSON 직렬화 가능, 지적 사항은 심각도 → 줄 순으로 정렬)
+            영역이 max_regions를 넘으면 앞쪽 영역만 리뷰하고, 건너뛴 영역 수와 건너뛴 첫 줄 번호를 표시
+        """
+        with usage_context(feature="review"), get_tracer().span(
+            "code_review.review_structured", code_chars=len(code)
+        ) as span:
+            options = options or dict.fromkeys(REVIEW_OPTION_KEYS, True)
             if language == "auto":
                 language = self._detect_language(code)
-        
-            # RAG 서비스가 있으면 RAG 사용, 없으면 기본 방식
+            span.set("language", language)
+
+            history_scope = make_scope(kind="review_structured", language=language, options=options, file=file_path)
+            cached = self._find_history(code, history_scope, span)
+            if cached:
+                return cached
+
+            conventions = []
             if self.rag_service:
-                logger.info("RAG 서비스를 사용하여 코드 리뷰")
-                result = self.rag_service.enhance_code_review(code, language)
-                
-                if result["success"]:
-                    # RAG 결과 포맷팅
-                    formatted_result = self._format_rag_review_result(result, language)
-                    return formatted_result
+                try:
+                    conventions = self.rag_service.find_conventions(code, language)
+                except Exception as e:
+                    logger.warning(f"컨벤션 검색 실패, 컨벤션 없이 리뷰: {str(e)}")
+
+            scope = make_scope(
+                kind="review_region", language=language, options=options,
+                conventions=",".join(str(conv.get("id", conv.get("title"))) for conv in conventions)
+            )
+            regions = split_code_regions(code)
+            skipped = []
+            if self.max_regions > 0 and len(regions) > self.max_regions:
+                regions, skipped = regions[:self.max_regions], regions[self.max_regions:]
+                logger.warning(f"영역 {len(regions) + len(skipped)}개 중 앞쪽 {len(regions)}개만 리뷰")
+            span.set("regions", len(regions))
+            span.set("skipped_regions", len(skipped))
+
+            # 캐시된 영역은 줄 번호만 옮겨서 재사용
+            region_results = {}
+            pending = []
+            for start_line, region_code in regions:
+                cached = self.findings_cache.get(region_cache_key(region_code, scope))
+                if cached is not None:
+                    region_results[start_line] = shift_findings(cached, start_line - 1, file_path)
                 else:
-                    logger.warning("RAG 실패, 기본 방식으로 폴백")
-                    # 폴백: 기본 방식
-                    return self._perform_basic_review(code, language, options)
-            else:
-                logger.info("기본 방식으로 코드 리뷰")
-                # 기본 방식
-                return self._perform_basic_review(code, language, options)
-            
-        except Exception as e:
-            logger.error(f"코드 리뷰 실패: {str(e)}")
-            return self._generate_basic_review(code, language)
+                    pending.append((start_line, region_code))
+            span.set("cached_regions", len(regions) - len(pending))
+
+            summaries = []
+            failed = 0
+            if pending:
+                # 사용량/트레이싱 컨텍스트를 작업 스레드로 전달
+                with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_REGIONS, len(pending))) as executor:
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run, self._review_region,
+                            region_code, language, options, conventions, file_path, start_line
+                        )
+                        for start_line, region_code in pending
+                    ]
+                    for (start_line, region_code), future in zip(pending, futures):
+                        parsed = future.result()
+                        if parsed is None:
+                            failed += 1
+                            continue
+                        region_results[start_line] = parsed["findings"]
+                        if parsed["summary"]:
+                            summaries.append(parsed["summary"])
+                        self.findings_cache.put(
+                            region_cache_key(region_code, scope),
+                            shift_findings(parsed["findings"], 1 - start_line)
+                        )
+            span.set("failed_regions", failed)
+
+            findings = merge_findings(*region_results.values())
+            span.set("findings", len(findings))
+            result = {
+                "language": language,
+                "file": file_path,
+                "summary": "\n\n".join(summaries),
+                "findings": findings,
+                "regions": len(regions),
+                "cached_regions": len(regions) - len(pending),
+                "failed_regions": failed,
+                "skipped_regions": len(skipped),
+                "skipped_from_line": skipped[0][0] if skipped else None,
+            }
+            if not failed:
+                self._save_history(code, history_scope, result, language)
+            return result
+
+    def _find_history(self, code: str, scope: str, span):
+        """기록 저장소에서 같은 코드/범위의 이전 리뷰 조회 (없으면 None)"""
+        if not self.history_store:
+            return None
+        entry = self.history_store.find(code, scope)
+        span.set("history_hit", entry is not None)
+        if entry:
+            logger.info("기록 저장소에서 리뷰 반환")
+            return entry["result"]
+        return None
+
+    def _save_history(self, code: str, scope: str, result, language: str):
+        """정상 완료된 리뷰를 기록 저장소에 저장"""
+        if self.history_store:
+            self.history_store.add(
+                KIND_REVIEW, code, scope, result,
+                language=language, owner=current_usage_labels().get("session_id")
+            )
+
+    def _review_region(
+        self,
+        region_code: str,
+        language: str,
+        options: Dict,
+        conventions: List[Dict],
+        file_path: str,
+        start_line: int
+    ) -> Optional[Dict]:
+        """
+        코드 영역 1개를 JSON 모드로 리뷰
         
+        Returns:
+            parse_review_json 결과 (호출/파싱 실패 시 None, 실패한 영역은 캐시하지 않음)
+        """
+        messages = build_review_messages(
+            region_code, language, options, conventions,
+            structured=True, file_path=file_path, start_line=start_line
+        )
+        response = self.azure_client.get_completion(
+            messages, temperature=0.2,
+            max_tokens=estimate_review_tokens(region_code, options),
+            tier=choose_review_tier(region_code, options),
+            response_format=REVIEW_RESPONSE_FORMAT
+        )
+        if response.startswith(COMPLETION_ERROR_PREFIX):
+            logger.error(f"영역 리뷰 실패 ({file_path}:{start_line}): {response}")
+            return None
+        
+        end_line = start_line + max(len(region_code.splitlines()), 1) - 1
+        try:
+            return parse_review_json(response, file_path, (start_line, end_line))
+        except ValueError as e:
+            logger.error(f"영역 리뷰 결과 파싱 실패 ({file_path}:{start_line}): {str(e)}")
+            return None
 
     def _perform_basic_review(self, code: str, language: str, options: Dict) -> str:
         """기본 코드 리뷰 수행"""
-        # 맞춤형 프롬프트 생성
-        prompt = self._create_review_prompt(code, language, options)
-        
         # Azure OpenAI를 사용하여 리뷰 수행
-        review_result = self._perform_ai_review(prompt, code, language)
+        review_result = self._perform_ai_review(code, language, options)
         
         # 포맷팅 및 추가 분석
         formatted_result = self._format_review_result(review_result, language)
@@ -160,62 +386,85 @@ class CodeReviewer:
         
         return formatted
         
-    def _create_review_prompt(self, code: str, language: str, options: Dict) -> str:
+    def _perform_ai_review(self, code: str, language: str, options: Dict = None) -> str:
         """
-        리뷰 프롬프트 생성
+        AI를 사용한 코드 리뷰
         
         Args:
             code: 코드
             language: 언어
-            options: 옵션
+            options: 옵션 (검사 항목, 응답 길이 추정용)
             
         Returns:
-            프롬프트
+            리뷰 결과
         """
-        prompt = f"""당신은 {language} 전문 코드 리뷰어입니다.
-다음 코드를 분석하고 개선 사항을 제안해주세요.
-
-리뷰 항목:
-"""
-        
-        if options.get('check_naming'):
-            prompt += "- 네이밍 컨벤션 (변수명, 함수명, 클래스명)\n"
-        if options.get('check_structure'):
-            prompt += "- 코드 구조와 가독성\n"
-        if options.get('check_bugs'):
-            prompt += "- 잠재적 버그 및 에러 처리\n"
-        if options.get('check_performance'):
-            prompt += "- 성능 최적화 가능 부분\n"
-        if options.get('check_security'):
-            prompt += "- 보안 취약점\n"
-        if options.get('suggest_refactoring'):
-            prompt += "- 리팩토링 제안\n"
-        
-        prompt += """
-각 항목에 대해 구체적인 예시와 개선 코드를 제시해주세요.
-심각도를 🔴 (심각), 🟡 (주의), 🟢 (권장) 로 표시해주세요.
-"""
-        
-        return prompt
+        messages = self._build_review_messages(code, language, options)
+        
+        # 리뷰 항목 수와 코드 길이에 맞춰 max_tokens 설정 (잘리면 이어서 생성)
+        return self.azure_client.get_completion(
+            messages, temperature=0.3,
+            max_tokens=estimate_review_tokens(code, options),
+            max_continuations=MAX_CONTINUATIONS,
+            tier=choose_review_tier(code, options)
+        )
+    
+    def _build_review_messages(self, code: str, language: str, options: Dict = None) -> List[Dict[str, str]]:
+        """리뷰 요청 메시지 생성 (단건/배치 리뷰 공용, 정적 지시문을 앞에 두어 프롬프트 캐시 활용)"""
+        return build_review_messages(code, language, options)
     
-    def _perform_ai_review(self, prompt: str, code: str, language: str) -> str:
+    def review_batch(
+        self,
+        files: Dict[str, str],
+        options: Dict = None,
+        batch_client=None,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
         """
-        AI를 사용한 코드 리뷰
+        여러 파일을 Batch API로 한 번에 리뷰 (야간 일괄 리뷰 등 비대화형 작업용)
         
         Args:
-            prompt: 프롬프트
-            code: 코드
-            language: 언어
+            files: {파일 경로: 코드}
+            options: 리뷰 옵션 (모든 파일에 동일 적용)
+            batch_client: 배치 클라이언트 (없으면 azure_client 사용, 테스트 시 LocalBatchClient)
+            poll_interval: 상태 확인 간격(초)
+            timeout: 최대 대기 시간(초)
             
         Returns:
-            리뷰 결과
+            {파일 경로: 포맷팅된 리뷰 결과}
         """
-        messages = [
-            {"role": "system", "content": prompt},
-            {"role": "user", "content": f"다음 {language} 코드를 리뷰해주세요:\n\n```{language}\n{code[:2000]}\n```"}
-        ]
+        if not files:
+            return {}
+        
+        options = options or dict.fromkeys(REVIEW_OPTION_KEYS, True)
+        batch_client = batch_client or self.azure_client
+        
+        # custom_id -> (파일 경로, 언어) 매핑 보관
+        requests = []
+        file_map = {}
+        for i, (path, code) in enumerate(files.items()):
+            custom_id = f"review-{i}"
+            language = self._detect_language(code)
+            messages = self._build_review_messages(code, language, options)
+            requests.append(batch_client.build_batch_request(
+                custom_id, messages, temperature=0.3, max_tokens=estimate_review_tokens(code, options)
+            ))
+            file_map[custom_id] = (path, language)
+        
+        batch_id = batch_client.submit_batch(requests)
+        batch = batch_client.wait_for_batch(batch_id, poll_interval=poll_interval, timeout=timeout)
+        raw_results = batch_client.get_batch_results(batch)
+        
+        results = {}
+        for custom_id, (path, language) in file_map.items():
+            if custom_id in raw_results:
+                results[path] = self._format_review_result(raw_results[custom_id], language)
+            else:
+                logger.warning(f"배치 결과 없음: {path} (상태: {batch.status})")
+                results[path] = self._generate_basic_review(files[path], language)
         
-        return self.azure_client.get_completion(messages, temperature=0.3)
+        logger.info(f"배치 리뷰 완료: {len(results)}개 파일")
+        return results
     
     def _format_review_result(self, review_result: str, language: str) -> str:
         """
@@ -0,0 +1,33 @@
+"""
+공통 설정 모듈
+.env 로드와 로깅 설정을 프로세스당 한 번만 수행
+(각 모듈이 import 시점마다 load_dotenv/basicConfig를 호출하던 것을 대체)
+"""
+
+import logging
+import threading
+
+_config_lock = threading.Lock()
+_config_loaded = False
+
+
+def load_config():
+    """
+    환경 변수(.env)와 로깅 설정 로드
+    여러 번 호출해도 최초 1회만 실행됨
+    """
+    global _config_loaded
+    if _config_loaded:
+        return
+
+    with _config_lock:
+        if _config_loaded:
+            return
+
+        # python-dotenv는 실제로 설정이 필요한 시점에만 import
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        # 로깅 설정 (모듈 단위로 로그 관리 기능)
+        logging.basicConfig(level=logging.INFO)  # 로그 레벨을 INFO(일반적인 정보 메시지)로 설정
+        _config_loaded = True
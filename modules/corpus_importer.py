@@ -0,0 +1,286 @@
+"""
+외부 컨벤션/템플릿 코퍼스 가져오기 모듈
+디렉터리(예: 회사 스타일 가이드 저장소)의 마크다운, YAML, JSONL 파일을 한 문서씩 읽어
+인덱스 스키마로 검증한 뒤 BulkIngestor로 넘김 (파일 전체를 메모리에 올리지 않음)
+
+파일 형식:
+- .md: 파일 하나가 문서 하나. 앞부분 --- 사이의 front matter에 메타데이터, 본문이 content
+       (id가 없으면 상대 경로로 생성, title이 없으면 첫 번째 # 제목 또는 파일 이름)
+- .yaml/.yml: 문서 하나, 문서 리스트, 또는 ---로 구분된 여러 문서 (PyYAML 필요)
+- .jsonl: 한 줄에 문서 하나
+
+검증에 실패한 문서는 건너뛰고 위치(파일:줄)와 사유를 기록
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from modules.tenant_router import normalize_tenant
+
+logger = logging.getLogger(__name__)
+
+KIND_CONVENTIONS = "conventions"
+KIND_TEMPLATES = "templates"
+
+# 인덱스 스키마 (필드 → (타입, 필수 여부)), search_index_admin의 필드 정의와 일치
+_COMMON_FIELDS = {
+    "id": (str, True),
+    "title": (str, True),
+    "content": (str, True),
+    "category": (str, False),
+}
+SCHEMAS = {
+    KIND_CONVENTIONS: {
+        **_COMMON_FIELDS,
+        "language": (str, False),
+        "company": (str, False),
+        "project_type": (str, False),
+        "tags": (list, False),
+        "priority": (int, False),
+    },
+    KIND_TEMPLATES: {
+        **_COMMON_FIELDS,
+        "tech_stack": (list, False),
+        "os_support": (list, False),
+        "prerequisites": (list, False),
+        "difficulty": (str, False),
+    },
+}
+
+MARKDOWN_SUFFIXES = {".md", ".markdown"}
+YAML_SUFFIXES = {".yaml", ".yml"}
+JSONL_SUFFIXES = {".jsonl"}
+SUPPORTED_SUFFIXES = MARKDOWN_SUFFIXES | YAML_SUFFIXES | JSONL_SUFFIXES
+
+# 보고서에 남길 최대 오류 수 (오류 개수는 전부 집계)
+MAX_REPORTED_ERRORS = 100
+
+# Azure AI Search 문서 키에 허용되는 문자
+_INVALID_KEY_CHARS = re.compile(r"[^A-Za-z0-9_\-=]")
+_TITLE_PATTERN = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+class ValidationError(ValueError):
+    """문서가 인덱스 스키마와 맞지 않을 때 발생"""
+
+
+def make_document_key(value: str) -> str:
+    """Azure AI Search 키로 쓸 수 없는 문자를 _로 바꿈"""
+    return _INVALID_KEY_CHARS.sub("_", value.strip()).strip("_")
+
+
+def validate_document(document: Dict, kind: str) -> Dict:
+    """
+    스키마 검증 및 정규화
+
+    - 모르는 필드, 필수 필드 누락, 타입 불일치는 ValidationError
+    - 리스트 필드는 문자열 하나도 허용 (쉼표로 구분), 원소는 문자열로 변환
+    - 숫자 문자열 priority는 int로 변환
+    - company는 테넌트 라우터와 같은 방식으로 정규화 (검색 필터 값과 일치해야 함)
+
+    Returns:
+        인덱스에 올릴 수 있는 문서 (새 딕셔너리)
+    """
+    schema = SCHEMAS[kind]
+    unknown = sorted(set(document) - set(schema))
+    if unknown:
+        raise ValidationError(f"스키마에 없는 필드: {', '.join(unknown)}")
+
+    validated = {}
+    for field, (field_type, required) in schema.items():
+        value = document.get(field)
+        if value is None or value == "" or value == []:
+            if required:
+                raise ValidationError(f"필수 필드 누락: {field}")
+            continue
+
+        if field_type is list:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(",") if item.strip()]
+            if not isinstance(value, list) or any(isinstance(item, (dict, list)) for item in value):
+                raise ValidationError(f"{field}는 문자열 리스트여야 합니다")
+            value = [str(item) for item in value]
+        elif field_type is int:
+            if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).strip().lstrip("-").isdigit():
+                raise ValidationError(f"{field}는 정수여야 합니다: {value!r}")
+            value = int(value)
+        elif not isinstance(value, str):
+            if isinstance(value, (dict, list)):
+                raise ValidationError(f"{field}는 문자열이어야 합니다")
+            value = str(value)
+        validated[field] = value
+
+    key = make_document_key(validated["id"])
+    if not key:
+        raise ValidationError(f"문서 키로 쓸 수 없는 id: {validated['id']!r}")
+    validated["id"] = key
+    if "company" in validated:
+        validated["company"] = normalize_tenant(validated["company"])
+    return validated
+
+
+def _load_yaml_module():
+    try:
+        import yaml
+    except ImportError as e:
+        raise ImportError("YAML 파일을 가져오려면 PyYAML을 설치해주세요 (pip install pyyaml)") from e
+    return yaml
+
+
+def _parse_front_matter(text: str) -> Dict:
+    """front matter 파싱 (PyYAML이 없으면 key: value / key: [a, b] 형식만 지원)"""
+    try:
+        yaml = _load_yaml_module()
+    except ImportError:
+        metadata = {}
+        for line in text.splitlines():
+            if ":" not in line or line.lstrip().startswith("#"):
+                continue
+            key, value = line.split(":", 1)
+            value = value.strip().strip("'\"")
+            if value.startswith("[") and value.endswith("]"):
+                value = [item.strip().strip("'\"") for item in value[1:-1].split(",") if item.strip()]
+            metadata[key.strip()] = value
+        return metadata
+
+    metadata = yaml.safe_load(text) or {}
+    if not isinstance(metadata, dict):
+        raise ValidationError("front matter는 key: value 형식이어야 합니다")
+    return metadata
+
+
+def _read_markdown(path: Path, relative: str) -> Iterator[Tuple[int, Dict]]:
+    text = path.read_text(encoding="utf-8")
+    metadata: Dict = {}
+    body_line = 1
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            metadata = _parse_front_matter(text[3:end])
+            body_start = text.find("\n", end + 4)
+            body_line = text.count("\n", 0, end + 4) + 2
+            text = text[body_start + 1:] if body_start != -1 else ""
+
+    document = dict(metadata)
+    document.setdefault("id", str(Path(relative).with_suffix("")))
+    if not document.get("title"):
+        match = _TITLE_PATTERN.search(text)
+        document["title"] = match.group(1) if match else path.stem
+    document.setdefault("content", text.strip())
+    yield body_line, document
+
+
+def _read_yaml(path: Path) -> Iterator[Tuple[int, Dict]]:
+    yaml = _load_yaml_module()
+    with open(path, "r", encoding="utf-8") as f:
+        for number, loaded in enumerate(yaml.safe_load_all(f), 1):
+            items = loaded if isinstance(loaded, list) else [loaded]
+            for item in items:
+                if item is not None:
+                    # YAML 문서는 줄 대신 파일 내 문서 순번으로 위치 표시
+                    yield number, item
+
+
+def _read_jsonl(path: Path) -> Iterator[Tuple[int, Dict]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, ValidationError(f"JSON 파싱 실패: {e.msg}")
+
+
+class CorpusImporter:
+    """
+    디렉터리/파일에서 문서를 하나씩 읽어 검증된 문서를 내보내는 가져오기 도구
+    iter_documents()는 제너레이터이므로 BulkIngestor.ingest에 바로 넘기면
+    읽기 → 청크 분할 → 임베딩 → 업로드가 배치 단위로 이어짐
+    """
+
+    def __init__(self, kind: str, defaults: Dict = None):
+        """
+        초기화
+
+        Args:
+            kind: conventions 또는 templates
+            defaults: 모든 문서에 기본으로 채울 필드 (예: {"company": "acme"})
+        """
+        if kind not in SCHEMAS:
+            raise ValueError(f"알 수 없는 코퍼스 종류입니다: {kind} (사용 가능: {', '.join(SCHEMAS)})")
+        self.kind = kind
+        self.defaults = defaults or {}
+        self.stats = {"files": 0, "read": 0, "valid": 0, "invalid": 0, "duplicates": 0}
+        self.errors: List[str] = []
+        self._seen_ids = set()
+
+    def iter_files(self, paths: Iterable[str]) -> Iterator[Tuple[Path, str]]:
+        """(파일 경로, 기준 디렉터리 상대 경로) 순회 (디렉터리는 정렬된 순서로 재귀 탐색)"""
+        for root in paths:
+            root = Path(root)
+            if root.is_file():
+                yield root, root.name
+                continue
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+                for filename in sorted(filenames):
+                    path = Path(directory) / filename
+                    if path.suffix.lower() in SUPPORTED_SUFFIXES:
+                        yield path, path.relative_to(root).as_posix()
+
+    def iter_documents(self, paths: Iterable[str]) -> Iterator[Dict]:
+        """검증된 문서 순회 (잘못된 문서는 건너뛰고 errors에 기록)"""
+        for path, relative in self.iter_files(paths):
+            self.stats["files"] += 1
+            try:
+                for position, document in self._read(path, relative):
+                    validated = self._validate(document, f"{relative}:{position}")
+                    if validated is not None:
+                        yield validated
+            except (OSError, UnicodeDecodeError, ImportError, ValueError) as e:
+                # 파일 단위 오류 (읽기 실패, YAML 문법 오류, PyYAML 미설치 등)
+                self._record_error(relative, str(e))
+            except Exception as e:
+                self._record_error(relative, f"파일 파싱 실패: {str(e)}")
+
+    def report(self) -> Dict:
+        """가져오기 결과 요약"""
+        return {**self.stats, "errors": list(self.errors)}
+
+    def _read(self, path: Path, relative: str) -> Iterator[Tuple[int, Dict]]:
+        suffix = path.suffix.lower()
+        if suffix in MARKDOWN_SUFFIXES:
+            return _read_markdown(path, relative)
+        if suffix in YAML_SUFFIXES:
+            return _read_yaml(path)
+        return _read_jsonl(path)
+
+    def _validate(self, document, location: str) -> Optional[Dict]:
+        self.stats["read"] += 1
+        try:
+            if isinstance(document, Exception):
+                raise document
+            if not isinstance(document, dict):
+                raise ValidationError("문서는 객체여야 합니다")
+            validated = validate_document({**self.defaults, **document}, self.kind)
+        except ValidationError as e:
+            self.stats["invalid"] += 1
+            self._record_error(location, str(e))
+            return None
+
+        if validated["id"] in self._seen_ids:
+            self.stats["duplicates"] += 1
+            self._record_error(location, f"중복 id: {validated['id']}")
+            return None
+        self._seen_ids.add(validated["id"])
+        self.stats["valid"] += 1
+        return validated
+
+    def _record_error(self, location: str, message: str):
+        logger.warning(f"가져오기 건너뜀 ({location}): {message}")
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{location}: {message}")
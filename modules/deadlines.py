@@ -0,0 +1,232 @@
+"""
+요청 마감 시간/취소 모듈
+한 요청(가이드 생성, 코드 리뷰 작업)에 전체 마감 시간과 취소 토큰을 두고
+검색/LLM/임베딩 단계마다 "단계 타임아웃과 남은 시간 중 작은 값"을 SDK 호출 타임아웃으로 사용
+
+- 마감 시간과 취소 토큰은 contextvars로 전달되므로 작업 큐 워커, RAGService, 각 클라이언트가
+  인자를 추가로 주고받지 않아도 같은 요청의 제한을 따름
+- 각 단계는 시작 전에 취소/마감 여부를 확인하고, 이미 취소되었으면 네트워크 호출 없이 중단
+- 진행 중인 HTTP 호출은 중간에 끊지 않으므로, 취소 후 끝난 LLM 호출의 토큰은 낭비(wasted)로 집계
+
+설정 (환경 변수, 초):
+- BLUEBELL_TIMEOUT_SEARCH / BLUEBELL_TIMEOUT_COMPLETION / BLUEBELL_TIMEOUT_EMBEDDING: 단계별 SDK 타임아웃
+- BLUEBELL_REQUEST_DEADLINE: 요청 하나의 전체 마감 시간 (0이면 없음)
+
+사용 예:
+    with request_scope(timeout=120, token=token):
+        rag_service.enhance_code_review(code, "python")
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+STAGE_SEARCH = "search"
+STAGE_COMPLETION = "completion"
+STAGE_EMBEDDING = "embedding"
+
+DEFAULT_STAGE_TIMEOUTS = {
+    STAGE_SEARCH: 10.0,
+    STAGE_COMPLETION: 90.0,
+    STAGE_EMBEDDING: 20.0,
+}
+DEFAULT_REQUEST_DEADLINE = 180.0
+
+CANCEL_REASON_USER = "사용자가 작업을 취소했습니다"
+CANCEL_REASON_DISCONNECTED = "브라우저 연결이 끊어져 작업을 취소했습니다"
+
+
+class RequestCancelledError(RuntimeError):
+    """요청이 취소되어 다음 단계를 진행하지 않을 때 발생"""
+
+
+class DeadlineExceededError(RequestCancelledError):
+    """요청 전체 마감 시간이 지났을 때 발생"""
+
+
+class CancellationToken:
+    """
+    요청 취소 신호
+    alive_check를 주면 취소 여부를 확인할 때마다 호출해, False이면(클라이언트 연결 끊김) 스스로 취소
+    """
+
+    def __init__(self, alive_check: Callable[[], bool] = None):
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._alive_check = alive_check
+
+    def cancel(self, reason: str = CANCEL_REASON_USER):
+        """취소 (처음 사유만 유지)"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._alive_check is not None:
+            try:
+                alive = self._alive_check()
+            except Exception as e:
+                logger.error(f"클라이언트 연결 확인 실패: {str(e)}")
+                return False
+            if not alive:
+                self.cancel(CANCEL_REASON_DISCONNECTED)
+                return True
+        return False
+
+
+class RequestScope:
+    """요청 하나의 마감 시각, 취소 토큰, 사용 토큰 집계"""
+
+    def __init__(self, token: CancellationToken = None, deadline: float = None, parent: "RequestScope" = None):
+        """
+        Args:
+            token: 취소 토큰
+            deadline: 마감 시각 (time.monotonic 기준, None이면 없음)
+            parent: 바깥 범위 (사용 토큰을 함께 집계)
+        """
+        self.token = token or CancellationToken()
+        self.deadline = deadline
+        self.parent = parent
+        self.tokens_used = 0
+        self.wasted_tokens = 0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """남은 시간(초), 마감 시간이 없으면 None"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        """
+        취소/마감 확인
+
+        Raises:
+            RequestCancelledError: 취소됨
+            DeadlineExceededError: 마감 시간 초과
+        """
+        if self.token.cancelled:
+            raise RequestCancelledError(self.token.reason)
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError("요청 처리 시간이 초과되었습니다")
+
+    def add_tokens(self, tokens: int, wasted: bool = False):
+        """LLM 호출 사용 토큰 집계 (바깥 범위에도 반영)"""
+        scope = self
+        while scope is not None:
+            with scope._lock:
+                scope.tokens_used += tokens
+                if wasted:
+                    scope.wasted_tokens += tokens
+            scope = scope.parent
+
+
+_current_scope: contextvars.ContextVar = contextvars.ContextVar("bluebell_request_scope", default=None)
+
+
+@contextmanager
+def request_scope(timeout: float = None, token: CancellationToken = None):
+    """
+    이 블록 안의 검색/LLM 호출에 마감 시간과 취소 토큰 적용
+
+    바깥 범위가 있으면 더 이른 마감 시각과 바깥 취소 토큰을 이어받음
+
+    Args:
+        timeout: 지금부터의 마감 시간(초), None 또는 0 이하이면 바깥 범위 기준
+        token: 취소 토큰 (None이면 바깥 범위의 토큰 또는 새 토큰)
+
+    Yields:
+        RequestScope
+    """
+    parent = _current_scope.get()
+    deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+    if parent is not None:
+        if parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        token = token or parent.token
+
+    scope = RequestScope(token=token, deadline=deadline, parent=parent)
+    context_token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(context_token)
+
+
+def current_scope() -> Optional[RequestScope]:
+    """현재 요청 범위 (없으면 None)"""
+    return _current_scope.get()
+
+
+def check_cancelled():
+    """현재 요청이 취소되었거나 마감 시간이 지났으면 예외 발생 (범위 밖이면 아무것도 안 함)"""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.check()
+
+
+def deadline_timeout(timeout: float) -> float:
+    """timeout과 현재 요청의 남은 시간 중 작은 값 (취소/마감 시 예외)"""
+    scope = _current_scope.get()
+    if scope is None:
+        return timeout
+    scope.check()
+    remaining = scope.remaining()
+    return timeout if remaining is None else min(timeout, remaining)
+
+
+def stage_timeout(stage: str) -> float:
+    """단계별 SDK 호출 타임아웃 (남은 요청 시간 반영, 취소/마감 시 예외)"""
+    return deadline_timeout(get_stage_timeouts()[stage])
+
+
+_stage_timeouts: Optional[Dict[str, float]] = None
+
+
+def get_stage_timeouts() -> Dict[str, float]:
+    """단계별 타임아웃 (최초 호출 시 환경 변수로 결정)"""
+    global _stage_timeouts
+    if _stage_timeouts is None:
+        configure_stage_timeouts()
+    return _stage_timeouts
+
+
+def configure_stage_timeouts(timeouts: Dict[str, float] = None) -> Dict[str, float]:
+    """
+    단계별 타임아웃 설정
+
+    Args:
+        timeouts: {단계: 초} (None이면 환경 변수, 빠진 단계는 기본값)
+    """
+    global _stage_timeouts
+    if timeouts is None:
+        timeouts = {}
+        for stage in DEFAULT_STAGE_TIMEOUTS:
+            value = os.getenv(f"BLUEBELL_TIMEOUT_{stage.upper()}")
+            if value:
+                timeouts[stage] = float(value)
+
+    merged = dict(DEFAULT_STAGE_TIMEOUTS)
+    for stage, value in timeouts.items():
+        if stage not in DEFAULT_STAGE_TIMEOUTS:
+            raise ValueError(f"알 수 없는 단계입니다: {stage} (사용 가능: {', '.join(DEFAULT_STAGE_TIMEOUTS)})")
+        if value <= 0:
+            raise ValueError(f"{stage} 타임아웃은 0보다 커야 합니다: {value}")
+        merged[stage] = float(value)
+    _stage_timeouts = merged
+    return merged
+
+
+def request_deadline() -> float:
+    """요청 전체 마감 시간(초) (BLUEBELL_REQUEST_DEADLINE, 0이면 없음)"""
+    return float(os.getenv("BLUEBELL_REQUEST_DEADLINE") or DEFAULT_REQUEST_DEADLINE)
@@ -0,0 +1,359 @@
+"""
+Azure OpenAI 다중 배포 라우터
+여러 리전/배포(백엔드)에 요청을 분산하고, 실패가 이어지는 백엔드는 서킷 브레이커로 잠시 제외한 뒤
+다른 백엔드로 자동 전환(failover)
+
+배포 목록은 BLUEBELL_DEPLOYMENTS_FILE(JSON)로 지정:
+    [
+        {"name": "koreacentral", "endpoint": "https://<kr>.openai.azure.com",
+         "deployment": "gpt-4o", "api_key_env": "AZURE_OPENAI_API_KEY_KR", "weight": 2},
+        {"name": "japaneast", "endpoint": "https://<jp>.openai.azure.com",
+         "deployment": "gpt-4o", "api_key_env": "AZURE_OPENAI_API_KEY_JP"}
+    ]
+"tier": "small"인 배포는 가벼운 작업 전용 계층으로 분리 (기본값 "large")
+파일이 없으면 AZURE_OPENAI_* 환경변수의 단일 배포만 사용
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from modules.deadlines import STAGE_COMPLETION, get_stage_timeouts
+
+logger = logging.getLogger(__name__)
+
+# 선택 전략
+STRATEGY_ROUND_ROBIN = "round_robin"
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+
+# 모델 계층 (small: 작고 빠른 배포, large: 기본 배포)
+TIER_SMALL = "small"
+TIER_LARGE = "large"
+
+# 서킷 브레이커 상태
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# 다른 백엔드로 넘길 HTTP 상태 코드 (쿼터 초과, 일시적 서버 오류)
+FAILOVER_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class NoHealthyBackendError(RuntimeError):
+    """사용 가능한 백엔드가 없을 때 발생"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커
+    failure_threshold번 연속 실패하면 reset_timeout초 동안 차단(open),
+    이후 요청 1건만 시험적으로 허용(half_open)하고 성공하면 복구
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인 (half_open이면 시험 요청 1건만 허용)"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CIRCUIT_HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def is_available(self) -> bool:
+        """상태를 바꾸지 않고 선택 후보인지 확인"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN:
+                return time.monotonic() - self.opened_at >= self.reset_timeout
+            return not self._trial_in_flight
+
+    def record_success(self):
+        with self._lock:
+            self.state = CIRCUIT_CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+
+
+class Backend:
+    """
+    하나의 Azure OpenAI 배포 (엔드포인트 + 배포 이름)
+    SDK 클라이언트는 첫 호출 시점에 생성
+    """
+
+    def __init__(
+        self,
+        name: str,
+        endpoint: str,
+        api_key: str,
+        deployment: str,
+        api_version: str,
+        weight: int = 1,
+        max_retries: int = 2,
+        breaker: CircuitBreaker = None,
+        tier: str = TIER_LARGE
+    ):
+        self.name = name
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.deployment = deployment
+        self.api_version = api_version
+        self.weight = max(1, int(weight))
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self.tier = tier
+
+        self.outstanding = 0
+        self.current_weight = 0
+        self.total_requests = 0
+        self.total_failures = 0
+
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Azure OpenAI SDK 클라이언트 (최초 접근 시 생성)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import AzureOpenAI
+
+                    self._client = AzureOpenAI(
+                        api_key=self.api_key,
+                        azure_endpoint=self.endpoint,
+                        api_version=self.api_version,
+                        max_retries=self.max_retries,
+                        # 호출별 timeout을 주지 않은 요청(Batch API 등)의 기본값
+                        timeout=get_stage_timeouts()[STAGE_COMPLETION]
+                    )
+                    logger.info(f"Azure OpenAI 클라이언트 초기화 완료 ({self.name})")
+        return self._client
+
+    def stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "deployment": self.deployment,
+            "tier": self.tier,
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "requests": self.total_requests,
+            "failures": self.total_failures,
+            "circuit": self.breaker.state,
+        }
+
+
+def is_failover_error(error: Exception) -> bool:
+    """다른 백엔드로 재시도할 만한 오류인지 판단 (쿼터 초과, 연결 실패, 일시적 서버 오류)"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in FAILOVER_STATUS_CODES
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class DeploymentRouter:
+    """
+    백엔드 선택 + 실패 시 전환
+    - round_robin: 가중치 비율대로 순환 (smooth weighted round-robin)
+    - least_outstanding: 진행 중 요청 수 / 가중치가 가장 작은 백엔드 (동률이면 가중 순환 순서)
+
+    백엔드가 1개뿐이면 서킷 브레이커를 쓰지 않음 (전환할 곳이 없으므로 차단하면 모든 요청이
+    reset_timeout 동안 실패함, 일시적인 429는 SDK 재시도/백오프가 처리)
+    """
+
+    def __init__(self, backends: List[Backend], strategy: str = STRATEGY_LEAST_OUTSTANDING):
+        if not backends:
+            raise ValueError("배포(백엔드)가 최소 1개 필요합니다")
+        if strategy not in (STRATEGY_ROUND_ROBIN, STRATEGY_LEAST_OUTSTANDING):
+            raise ValueError(f"알 수 없는 라우팅 전략: {strategy}")
+        self.backends = backends
+        self.strategy = strategy
+        self.use_breakers = len(backends) > 1
+        self._lock = threading.Lock()
+
+    def select(self, exclude: set = None) -> Optional[Backend]:
+        """
+        요청을 보낼 백엔드 선택 (진행 중 요청 수 증가)
+
+        Args:
+            exclude: 이번 요청에서 이미 실패한 백엔드 이름
+
+        Returns:
+            선택된 백엔드 (사용 가능한 백엔드가 없으면 None)
+        """
+        exclude = exclude or set()
+        with self._lock:
+            candidates = [b for b in self.backends
+                          if b.name not in exclude and (not self.use_breakers or b.breaker.is_available())]
+            while candidates:
+                backend = self._pick(candidates)
+                if not self.use_breakers or backend.breaker.allow():
+                    backend.outstanding += 1
+                    backend.total_requests += 1
+                    return backend
+                candidates.remove(backend)
+            return None
+
+    def _pick(self, candidates: List[Backend]) -> Backend:
+        """smooth weighted round-robin (least_outstanding이면 부하가 가장 낮은 백엔드 중에서)"""
+        if self.strategy == STRATEGY_LEAST_OUTSTANDING:
+            lowest = min(b.outstanding / b.weight for b in candidates)
+            candidates = [b for b in candidates if b.outstanding / b.weight == lowest]
+
+        total_weight = sum(b.weight for b in candidates)
+        for backend in candidates:
+            backend.current_weight += backend.weight
+        chosen = max(candidates, key=lambda b: b.current_weight)
+        chosen.current_weight -= total_weight
+        return chosen
+
+    def release(self, backend: Backend, success: bool):
+        """요청 종료 처리 (서킷 브레이커 갱신)"""
+        with self._lock:
+            backend.outstanding -= 1
+            if not success:
+                backend.total_failures += 1
+        if not self.use_breakers:
+            return
+        if success:
+            backend.breaker.record_success()
+        else:
+            was_open = backend.breaker.state == CIRCUIT_OPEN
+            backend.breaker.record_failure()
+            if not was_open and backend.breaker.state == CIRCUIT_OPEN:
+                logger.warning(
+                    f"배포 {backend.name} 차단 ({backend.breaker.failures}회 연속 실패, "
+                    f"{backend.breaker.reset_timeout:.0f}초 후 재시도)"
+                )
+
+    def execute(self, func: Callable[[Backend], object], on_failover: Callable[[Backend, Exception], None] = None):
+        """
+        백엔드를 골라 func(backend) 실행, 전환 대상 오류면 다른 백엔드로 재시도
+
+        Args:
+            func: 백엔드를 받아 API를 호출하는 함수
+            on_failover: 전환 직전에 호출되는 콜백 (로그/트레이싱용)
+
+        Returns:
+            func의 반환값
+        """
+        tried = set()
+        last_error = None
+        while True:
+            backend = self.select(exclude=tried)
+            if backend is None:
+                if last_error is not None:
+                    raise last_error
+                raise NoHealthyBackendError("사용 가능한 Azure OpenAI 배포가 없습니다 (모든 서킷 차단)")
+
+            try:
+                result = func(backend)
+            except Exception as e:
+                if not is_failover_error(e):
+                    # 요청 자체의 문제(400 등)는 백엔드 장애가 아니므로 서킷에 반영하지 않음
+                    self.release(backend, success=True)
+                    raise
+                self.release(backend, success=False)
+                tried.add(backend.name)
+                last_error = e
+                logger.warning(f"배포 {backend.name} 호출 실패, 다른 배포로 전환: {str(e)}")
+                if on_failover:
+                    on_failover(backend, e)
+                continue
+
+            self.release(backend, success=True)
+            return result
+
+    def stats(self) -> List[Dict]:
+        """백엔드별 상태 (모니터링용)"""
+        return [backend.stats() for backend in self.backends]
+
+
+def load_backends(
+    default_backend: Backend,
+    config_path: str = None,
+    failure_threshold: int = 3,
+    reset_timeout: float = 30.0
+) -> List[Backend]:
+    """
+    배포 설정 파일에서 백엔드 목록 생성
+
+    Args:
+        default_backend: 설정 파일이 없을 때 사용할 백엔드 (AZURE_OPENAI_* 환경변수 기반)
+        config_path: JSON 설정 파일 경로 (None이면 BLUEBELL_DEPLOYMENTS_FILE)
+
+    Returns:
+        백엔드 리스트
+    """
+    config_path = config_path or os.getenv("BLUEBELL_DEPLOYMENTS_FILE")
+    if not config_path:
+        return [default_backend]
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"배포 설정 파일을 읽을 수 없습니다 ({config_path}): {e}") from e
+
+    backends = []
+    # 여러 백엔드가 있으면 SDK 재시도는 1회로 줄이고 나머지는 다른 백엔드로 전환
+    max_retries = 1 if len(entries) > 1 else default_backend.max_retries
+    for i, entry in enumerate(entries):
+        api_key = entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), default_backend.api_key)
+        backends.append(Backend(
+            name=entry.get("name", f"backend-{i}"),
+            endpoint=entry.get("endpoint", default_backend.endpoint),
+            api_key=api_key,
+            deployment=entry.get("deployment", default_backend.deployment),
+            api_version=entry.get("api_version", default_backend.api_version),
+            weight=entry.get("weight", 1),
+            max_retries=max_retries,
+            breaker=CircuitBreaker(failure_threshold, reset_timeout),
+            tier=entry.get("tier", TIER_LARGE)
+        ))
+
+    if not backends:
+        raise ValueError(f"배포 설정 파일에 배포가 없습니다: {config_path}")
+    return backends
+
+
+def build_tier_routers(
+    backends: List[Backend],
+    default_backend: Backend,
+    strategy: str = STRATEGY_LEAST_OUTSTANDING
+) -> Dict[str, DeploymentRouter]:
+    """
+    백엔드를 계층별 라우터로 묶음
+
+    Returns:
+        {계층: 라우터} (large 계층 배포가 없으면 기본 배포 사용)
+    """
+    grouped: Dict[str, List[Backend]] = {}
+    for backend in backends:
+        grouped.setdefault(backend.tier, []).append(backend)
+    grouped.setdefault(TIER_LARGE, [default_backend])
+    return {tier: DeploymentRouter(members, strategy=strategy) for tier, members in grouped.items()}
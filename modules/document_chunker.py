@@ -0,0 +1,231 @@
+"""
+문서 청크 분할 모듈
+긴 코딩 컨벤션/환경 설정 문서를 마크다운 제목 단위 섹션으로 나누고, 섹션이 길면 문단 경계에서 다시 나눔
+- 코드 블록(```/~~~)은 중간에서 자르지 않음 (한 청크보다 길면 줄 단위로 나눠 각 조각을 다시 펜스로 감쌈)
+- 같은 섹션의 연속 청크는 앞 청크 끝부분을 overlap만큼 겹쳐 문맥 유지
+- 각 청크는 원본 문서의 메타데이터와 parent_id/chunk_index/section을 가짐
+
+청크 본문 길이 기본값은 프롬프트에 넣는 참조 문서 길이(CONTEXT_CHAR_LIMIT)와 같아
+검색된 섹션이 잘리지 않고 그대로 프롬프트에 들어감
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from modules.prompt_builder import CONTEXT_CHAR_LIMIT
+
+CHUNK_MAX_CHARS = CONTEXT_CHAR_LIMIT
+CHUNK_OVERLAP_CHARS = 60
+
+# 제목 경로 구분자 (예: "네이밍 > 함수")
+SECTION_SEPARATOR = " > "
+
+# 청크에 복사하지 않는 원본 필드
+_PARENT_ONLY_FIELDS = {"id", "content", "content_vector"}
+
+_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+def _split_sections(content: str) -> Iterator[Tuple[str, List[Tuple[str, bool]]]]:
+    """
+    (제목 경로, [(블록 텍스트, 코드 블록 여부)]) 순회
+    블록은 빈 줄로 구분된 문단 또는 펜스 전체
+    """
+    headings: List[str] = []
+    blocks: List[Tuple[str, bool]] = []
+    paragraph: List[str] = []
+    fence: List[str] = []
+    fence_marker = None
+
+    def end_paragraph():
+        if paragraph:
+            blocks.append(("\n".join(paragraph).strip(), False))
+            paragraph.clear()
+
+    for line in content.splitlines():
+        if fence_marker:
+            fence.append(line)
+            if line.strip().startswith(fence_marker):
+                blocks.append(("\n".join(fence), True))
+                fence.clear()
+                fence_marker = None
+            continue
+
+        fence_match = _FENCE_PATTERN.match(line)
+        if fence_match:
+            end_paragraph()
+            fence_marker = fence_match.group(1)
+            fence.append(line)
+            continue
+
+        heading = _HEADING_PATTERN.match(line)
+        if heading:
+            end_paragraph()
+            if blocks:
+                yield SECTION_SEPARATOR.join(headings), blocks
+            blocks = []
+            level = len(heading.group(1))
+            headings = headings[:level - 1] + [heading.group(2)]
+            continue
+
+        if line.strip():
+            paragraph.append(line)
+        else:
+            end_paragraph()
+
+    # 닫히지 않은 펜스는 그대로 코드 블록으로 취급
+    if fence:
+        blocks.append(("\n".join(fence), True))
+    end_paragraph()
+    if blocks:
+        yield SECTION_SEPARATOR.join(headings), blocks
+
+
+def _split_code(block: str, max_chars: int) -> List[str]:
+    """긴 코드 블록을 줄 단위로 나누고 각 조각을 원래 펜스로 다시 감쌈"""
+    lines = block.splitlines()
+    opening = lines[0]
+    closing = lines[-1] if len(lines) > 1 and _FENCE_PATTERN.match(lines[-1]) else opening.strip()[:3]
+    body = lines[1:-1] if closing == lines[-1] else lines[1:]
+    budget = max(1, max_chars - len(opening) - len(closing) - 2)
+
+    pieces, current, size = [], [], 0
+    for line in body:
+        if current and size + len(line) + 1 > budget:
+            pieces.append(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current or not pieces:
+        pieces.append(current)
+    return ["\n".join([opening] + piece + [closing]) for piece in pieces]
+
+
+def _split_text(block: str, max_chars: int) -> List[str]:
+    """긴 문단을 공백 경계에서 max_chars 이하로 나눔"""
+    pieces = []
+    while len(block) > max_chars:
+        cut = block.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(block[:cut].rstrip())
+        block = block[cut:].lstrip()
+    if block:
+        pieces.append(block)
+    return pieces
+
+
+def _overlap_tail(text: str, overlap_chars: int) -> str:
+    """앞 청크 끝에서 overlap_chars 이내의 단어 경계 이후 부분"""
+    if overlap_chars <= 0 or not text:
+        return ""
+    tail = text[-overlap_chars:]
+    if len(text) > overlap_chars and " " in tail:
+        tail = tail[tail.index(" ") + 1:]
+    return tail.strip()
+
+
+def split_content(
+    content: str,
+    max_chars: int = CHUNK_MAX_CHARS,
+    overlap_chars: int = CHUNK_OVERLAP_CHARS
+) -> List[Tuple[str, str]]:
+    """
+    본문 분할
+
+    Args:
+        content: 마크다운 본문
+        max_chars: 청크 최대 길이 (겹침 포함, 문자 수)
+        overlap_chars: 같은 섹션 연속 청크의 겹침 길이
+
+    Returns:
+        [(제목 경로, 청크 본문)]
+    """
+    if max_chars <= overlap_chars:
+        raise ValueError("max_chars는 overlap_chars보다 커야 합니다")
+
+    chunks: List[Tuple[str, str]] = []
+    for section, blocks in _split_sections(content or ""):
+        # (텍스트, 코드 블록 여부, 앞 조각과 같은 문단인지)
+        pieces: List[Tuple[str, bool, bool]] = []
+        for text, is_code in blocks:
+            if len(text) <= max_chars:
+                pieces.append((text, is_code, False))
+            elif is_code:
+                pieces.extend((piece, True, False) for piece in _split_code(text, max_chars))
+            else:
+                pieces.extend((piece, False, i > 0)
+                              for i, piece in enumerate(_split_text(text, max_chars - overlap_chars - 1)))
+
+        current: List[str] = []
+        last_is_code = False
+        for text, is_code, continues in pieces:
+            size = sum(len(part) + 2 for part in current)
+            if current and size + len(text) > max_chars:
+                chunks.append((section, "\n\n".join(current)))
+                # 코드 블록 조각은 겹치지 않음 (펜스가 깨지지 않도록)
+                tail = "" if last_is_code or is_code else _overlap_tail(current[-1], overlap_chars)
+                current = []
+                if tail and len(tail) + len(text) + 2 <= max_chars:
+                    if continues:
+                        text = f"{tail} {text}"
+                    else:
+                        current.append(tail)
+            current.append(text)
+            last_is_code = is_code
+        if current:
+            chunks.append((section, "\n\n".join(current)))
+    return chunks
+
+
+def chunk_document(
+    document: Dict,
+    max_chars: int = CHUNK_MAX_CHARS,
+    overlap_chars: int = CHUNK_OVERLAP_CHARS
+) -> List[Dict]:
+    """
+    문서 하나를 검색용 청크 문서로 분할
+
+    Args:
+        document: 원본 문서 (id, title, content와 인덱스 메타데이터)
+
+    Returns:
+        청크 문서 리스트 (id = "{parent_id}-{chunk_index}", 제목에 섹션 경로 포함)
+    """
+    parent_id = document["id"]
+    metadata = {key: value for key, value in document.items() if key not in _PARENT_ONLY_FIELDS}
+    title = document.get("title", "")
+
+    chunks = []
+    for index, (section, text) in enumerate(split_content(document.get("content", ""), max_chars, overlap_chars)):
+        chunks.append(dict(
+            metadata,
+            id=f"{parent_id}-{index}",
+            parent_id=parent_id,
+            chunk_index=index,
+            section=section,
+            title=_section_title(title, section),
+            content=text
+        ))
+    return chunks
+
+
+def _section_title(title: str, section: str) -> str:
+    """문서 제목 + 섹션 경로 (섹션 경로가 문서 제목으로 시작하면 중복 생략)"""
+    if not section or section == title:
+        return title
+    if not title or section.startswith(f"{title}{SECTION_SEPARATOR}"):
+        return section
+    return f"{title}{SECTION_SEPARATOR}{section}"
+
+
+def chunk_documents(documents: Iterable[Dict], **options) -> Iterator[Dict]:
+    """여러 문서를 순서대로 청크 분할 (제너레이터, 한 번에 한 문서만 메모리에 유지)"""
+    for document in documents:
+        yield from chunk_document(document, **options)
+
+
+def embedding_text(chunk: Dict) -> str:
+    """청크 임베딩 입력 (섹션 경로가 포함된 제목 + 본문)"""
+    return f"{chunk.get('title', '')}\n{chunk.get('content', '')}"
@@ -0,0 +1,348 @@
+"""
+로컬 임베딩 저장소 모듈
+create_embedding이 반환하는 파이썬 float 리스트(1536차원 기준 문서당 약 50KB)를
+연속된 float32 또는 int8(벡터별 scale) NumPy 배열로 보관하여 메모리 사용량을 1/4~1/16로 줄임
+
+파일 형식 (단일 파일, np.memmap으로 열어 필요한 페이지만 메모리에 올림):
+    [헤더 64바이트][scale float32 x capacity][벡터 dtype x capacity x dim]
+ID → 행 번호 색인은 같은 경로의 ".ids.json" 파일에 보관
+
+모든 벡터는 단위 벡터로 정규화하여 저장하므로 내적 = 코사인 유사도
+
+라이브러리 전용 모듈: 현재 앱(app.py, 시맨틱 캐시, RAG 재정렬)은 이 저장소를 쓰지 않음
+벤치마크(tests/benchmark_embedding_store.py, tests/benchmark_hnsw_profiles.py --store)와
+로컬에서 문서 임베딩을 모아 둘 때 사용
+"""
+
+import json
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식
+DTYPE_FLOAT32 = "float32"
+DTYPE_INT8 = "int8"
+_DTYPE_CODES = {DTYPE_FLOAT32: 1, DTYPE_INT8: 2}
+
+# 헤더: 매직(8) + 형식 코드, 차원, 용량, 개수 (uint32 x 4), 나머지는 예약
+_MAGIC = b"BBEMB001"
+_HEADER = struct.Struct("<8sIIII")
+HEADER_BYTES = 64
+
+# int8 양자화 최대값
+INT8_MAX = 127
+
+# 검색 시 한 번에 float32로 변환하는 행 수 (int8 전체를 한꺼번에 변환하지 않도록)
+SEARCH_CHUNK_ROWS = 8192
+
+DEFAULT_CAPACITY = 1024
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    벡터별 대칭 int8 양자화
+
+    Args:
+        vectors: (n, dim) float 배열
+
+    Returns:
+        (int8 배열, 벡터별 scale float32) - 원래 값 ≈ int8 값 * scale
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / INT8_MAX
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(vectors / scales[:, None]), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """단위 벡터로 정규화 (영벡터는 그대로)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingStore:
+    """
+    ID로 조회/검색 가능한 임베딩 저장소 (float32 또는 int8 양자화)
+    - path를 주면 메모리 맵 파일에 저장하고 재시작 후에도 그대로 열어 사용
+    - path가 없으면 메모리에만 보관
+    - 같은 ID를 다시 추가하면 덮어씀, 삭제는 마지막 행을 빈자리로 옮겨 연속성 유지
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        dim: int = None,
+        dtype: str = DTYPE_FLOAT32,
+        capacity: int = DEFAULT_CAPACITY
+    ):
+        """
+        초기화
+
+        Args:
+            path: 저장 파일 경로 (None이면 메모리 전용, 파일이 있으면 기존 형식/차원으로 열기)
+            dim: 벡터 차원 (None이면 첫 벡터 추가 시 결정)
+            dtype: 저장 형식 (DTYPE_FLOAT32, DTYPE_INT8)
+            capacity: 초기 행 수 (가득 차면 두 배로 확장)
+        """
+        if dtype not in _DTYPE_CODES:
+            raise ValueError(f"지원하지 않는 저장 형식입니다: {dtype}")
+
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self._capacity = max(1, capacity)
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._scales: Optional[np.ndarray] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._mmap: Optional[np.memmap] = None
+
+        if path and os.path.exists(path):
+            self._open()
+        elif dim:
+            self._allocate(self._capacity)
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.path}.ids.json"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def ids(self) -> List[str]:
+        """저장된 ID 목록 (행 순서)"""
+        return list(self._ids)
+
+    def add(self, item_id: str, vector: Sequence[float]):
+        """벡터 1개 추가 (같은 ID가 있으면 덮어씀)"""
+        self.add_many([item_id], [vector])
+
+    def add_many(self, item_ids: Sequence[str], vectors: Iterable[Sequence[float]]):
+        """
+        벡터 여러 개 추가
+
+        Args:
+            item_ids: ID 목록
+            vectors: 벡터 목록 (리스트의 리스트 또는 (n, dim) 배열)
+        """
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(item_ids):
+            raise ValueError("ID 수와 벡터 수가 다르거나 벡터 형식이 올바르지 않습니다")
+        if len(matrix) == 0:
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+            if matrix.shape[1] != self.dim:
+                raise ValueError(f"벡터 차원이 다릅니다: {matrix.shape[1]} (저장소 {self.dim})")
+            if self._vectors is None:
+                self._allocate(self._capacity)
+
+            rows = []
+            for item_id in item_ids:
+                row = self._rows.get(item_id)
+                if row is None:
+                    row = len(self._ids)
+                    if row >= self._capacity:
+                        self._allocate(self._capacity * 2)
+                    self._ids.append(item_id)
+                    self._rows[item_id] = row
+                rows.append(row)
+
+            encoded, scales = self._encode(_normalize(matrix))
+            self._vectors[rows] = encoded
+            self._scales[rows] = scales
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """ID로 벡터 조회 (단위 벡터, float32로 복원, 없으면 None)"""
+        with self._lock:
+            row = self._rows.get(item_id)
+            if row is None:
+                return None
+            return self._decode(self._vectors[row:row + 1], self._scales[row:row + 1])[0]
+
+    def remove(self, item_id: str) -> bool:
+        """벡터 삭제 (마지막 행을 삭제된 자리로 이동)"""
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._scales[row] = self._scales[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            return True
+
+    def search(
+        self,
+        query: Sequence[float],
+        top: int = 5,
+        candidates: Iterable[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        코사인 유사도 상위 top개 검색 (전수 비교)
+
+        Args:
+            query: 질의 벡터
+            top: 반환 개수
+            candidates: 검색 대상 ID (None이면 전체)
+
+        Returns:
+            [(ID, 유사도)] 유사도 내림차순
+        """
+        query = _normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+        with self._lock:
+            count = len(self._ids)
+            if count == 0 or top <= 0:
+                return []
+            if candidates is not None:
+                rows = np.array(sorted(self._rows[c] for c in candidates if c in self._rows), dtype=np.int64)
+                if len(rows) == 0:
+                    return []
+                scores = self._scores(self._vectors[rows], self._scales[rows], query)
+            else:
+                rows = None
+                scores = np.concatenate([
+                    self._scores(self._vectors[start:start + SEARCH_CHUNK_ROWS],
+                                 self._scales[start:start + SEARCH_CHUNK_ROWS], query)
+                    for start in range(0, count, SEARCH_CHUNK_ROWS)
+                ])
+            ids = self._ids if rows is None else [self._ids[row] for row in rows]
+
+        top = min(top, len(scores))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(ids[i], float(scores[i])) for i in best]
+
+    def memory_bytes(self) -> int:
+        """저장된 벡터가 차지하는 바이트 수 (scale 포함, 예비 용량 제외)"""
+        if self.dim is None:
+            return 0
+        itemsize = np.dtype(self.dtype).itemsize
+        return len(self._ids) * (self.dim * itemsize + np.dtype(np.float32).itemsize)
+
+    def flush(self):
+        """파일에 기록 (메모리 전용이면 아무것도 하지 않음)"""
+        if not self.path or self._mmap is None:
+            return
+        with self._lock:
+            self._write_header(self._mmap)
+            self._mmap.flush()
+            self._write_index()
+
+    def close(self):
+        """파일에 기록 후 메모리 맵 해제"""
+        self.flush()
+        with self._lock:
+            self._mmap = self._vectors = self._scales = None
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.dtype == DTYPE_INT8:
+            return quantize_int8(vectors)
+        return vectors.astype(np.float32), np.ones(len(vectors), dtype=np.float32)
+
+    def _decode(self, vectors: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        if self.dtype == DTYPE_INT8:
+            return vectors.astype(np.float32) * scales[:, None]
+        return np.array(vectors, dtype=np.float32)
+
+    def _scores(self, vectors: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """질의와의 내적 (int8은 정수 내적 후 scale 곱)"""
+        if self.dtype == DTYPE_INT8:
+            return (vectors.astype(np.float32) @ query) * scales
+        return vectors @ query
+
+    def _allocate(self, capacity: int):
+        """저장 공간 할당/확장 (파일이면 새 파일에 복사 후 교체)"""
+        old_vectors, old_scales, count = self._vectors, self._scales, len(self._ids)
+
+        if self.path:
+            self._mmap = None
+            self._vectors = self._scales = None
+            tmp_path = self.path + ".tmp"
+            mmap = self._create_file(tmp_path, capacity)
+            scales, vectors = self._views(mmap, capacity)
+            if old_vectors is not None and count:
+                scales[:count] = old_scales[:count]
+                vectors[:count] = old_vectors[:count]
+            mmap.flush()
+            del mmap, scales, vectors, old_vectors, old_scales
+            os.replace(tmp_path, self.path)
+            self._mmap = np.memmap(self.path, dtype=np.uint8, mode="r+")
+            self._scales, self._vectors = self._views(self._mmap, capacity)
+            # 새 파일의 헤더 개수와 ID 색인을 맞춰 flush() 전에 종료돼도 다시 열 수 있게 함
+            self._write_index()
+        else:
+            scales = np.ones(capacity, dtype=np.float32)
+            vectors = np.zeros((capacity, self.dim), dtype=self.dtype)
+            if old_vectors is not None and count:
+                scales[:count] = old_scales[:count]
+                vectors[:count] = old_vectors[:count]
+            self._scales, self._vectors = scales, vectors
+        self._capacity = capacity
+
+    def _create_file(self, path: str, capacity: int) -> np.memmap:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        size = HEADER_BYTES + capacity * 4 + capacity * self.dim * np.dtype(self.dtype).itemsize
+        mmap = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+        self._capacity = capacity
+        self._write_header(mmap)
+        return mmap
+
+    def _views(self, mmap: np.memmap, capacity: int) -> Tuple[np.ndarray, np.ndarray]:
+        """메모리 맵 위의 scale/벡터 배열 뷰"""
+        scales_end = HEADER_BYTES + capacity * 4
+        scales = mmap[HEADER_BYTES:scales_end].view(np.float32)
+        vectors = mmap[scales_end:scales_end + capacity * self.dim * np.dtype(self.dtype).itemsize]
+        return scales, vectors.view(self.dtype).reshape(capacity, self.dim)
+
+    def _write_header(self, mmap: np.memmap):
+        header = _HEADER.pack(_MAGIC, _DTYPE_CODES[self.dtype], self.dim, self._capacity, len(self._ids))
+        mmap[:len(header)] = np.frombuffer(header, dtype=np.uint8)
+
+    def _write_index(self):
+        """ID 색인 파일 기록 (임시 파일에 쓴 뒤 교체)"""
+        index = {"dtype": self.dtype, "dim": self.dim, "ids": self._ids}
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _open(self):
+        """기존 파일 열기 (헤더의 형식/차원 사용, ID 색인이 없거나 개수가 다르면 손상으로 간주)"""
+        mmap = np.memmap(self.path, dtype=np.uint8, mode="r+")
+        magic, dtype_code, dim, capacity, count = _HEADER.unpack(bytes(mmap[:_HEADER.size]))
+        if magic != _MAGIC:
+            raise ValueError(f"임베딩 저장소 파일 형식이 아닙니다: {self.path}")
+
+        with open(self.index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        ids = index["ids"]
+        if len(ids) != count:
+            raise ValueError(f"임베딩 저장소 색인이 파일과 맞지 않습니다: {len(ids)} != {count}")
+
+        self.dtype = {code: name for name, code in _DTYPE_CODES.items()}[dtype_code]
+        self.dim = dim
+        self._capacity = capacity
+        self._mmap = mmap
+        self._scales, self._vectors = self._views(mmap, capacity)
+        self._ids = ids
+        self._rows = {item_id: row for row, item_id in enumerate(ids)}
+        logger.info(f"임베딩 저장소 로드: {count}개 ({self.dtype}, {dim}차원)")
@@ -0,0 +1,260 @@
+"""
+리뷰/가이드 기록 저장소 모듈
+생성한 환경 설정 가이드와 코드 리뷰를 로컬 SQLite에 보관하여
+- 같은 입력(줄 끝 공백만 다른 README/코드 + 같은 OS/언어/옵션 + 같은 모델/프롬프트 버전)은 LLM 호출 없이 바로 반환하고
+- UI의 기록 패널에서 종류/언어/OS별로 페이지 단위 조회 (요청한 세션의 기록만)
+
+시맨틱 캐시(메모리, 유사도 기반)와 달리 재시작 후에도 유지되며 정확히 같은 입력만 재사용
+(들여쓰기나 대소문자가 다르면 다른 코드이므로 다른 입력으로 취급)
+모델 배포나 프롬프트가 바뀌면(version) 이전 기록은 목록에는 남지만 재사용하지 않음
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from modules.cache_keys import normalize_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DB = os.path.join(".bluebell", "history.db")
+
+# 기록 종류
+KIND_GUIDE = "guide"
+KIND_REVIEW = "review"
+
+# 기본 보관 개수 (초과 시 오래된 기록부터 삭제)
+DEFAULT_MAX_ENTRIES = 5000
+
+# 목록 제목 길이
+TITLE_MAX_CHARS = 60
+
+
+def content_hash(content: str) -> str:
+    """입력의 해시 (줄 끝 공백과 줄바꿈 문자 차이만 같은 입력으로 취급)"""
+    return hashlib.sha256(normalize_text(content).encode("utf-8")).hexdigest()
+
+
+def version_key(version: Dict[str, str] = None) -> str:
+    """버전 딕셔너리(cache_version)의 짧은 해시 (없으면 빈 문자열)"""
+    if not version:
+        return ""
+    return hashlib.sha256(json.dumps(version, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def make_title(content: str) -> str:
+    """목록에 표시할 제목 (내용이 있는 첫 줄, 마크다운 제목 기호 제거)"""
+    for line in content.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            return line[:TITLE_MAX_CHARS]
+    return "(빈 입력)"
+
+
+class HistoryStore:
+    """
+    가이드/리뷰 기록 SQLite 저장소
+    여러 워커 스레드에서 동시에 접근하므로 내부 락으로 직렬화
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = DEFAULT_MAX_ENTRIES, version: Dict[str, str] = None):
+        """
+        초기화
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:" 가능)
+            max_entries: 최대 보관 기록 수
+            version: 결과 버전 키 (cache_version으로 생성, 다른 버전으로 만든 기록은 재사용하지 않음)
+        """
+        self.db_path = db_path or os.getenv("BLUEBELL_HISTORY_DB", DEFAULT_HISTORY_DB)
+        self.max_entries = max_entries
+        self.version = version_key(version)
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_table()
+
+    def _create_table(self):
+        """테이블 및 인덱스 생성"""
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    language TEXT,
+                    os_type TEXT,
+                    owner TEXT,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    version TEXT NOT NULL DEFAULT ''
+                )
+                """
+            )
+            # 이전 버전 DB에는 version 컬럼이 없음
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(history)")}
+            if "version" not in columns:
+                self._conn.execute("ALTER TABLE history ADD COLUMN version TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_hash ON history(content_hash, scope)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_language ON history(kind, language, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_os ON history(kind, os_type, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_created ON history(created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_history_owner ON history(owner, created_at)")
+            self._conn.commit()
+
+    def add(
+        self,
+        kind: str,
+        content: str,
+        scope: str,
+        result: Any,
+        language: str = None,
+        os_type: str = None,
+        owner: str = None
+    ) -> int:
+        """
+        기록 추가 (같은 입력/범위의 이전 기록은 새 결과로 교체)
+
+        Args:
+            kind: 기록 종류 (KIND_GUIDE, KIND_REVIEW)
+            content: 원본 입력 (README 또는 코드)
+            scope: make_scope로 만든 범위 문자열
+            result: 결과 (마크다운 문자열 또는 구조화된 리뷰 딕셔너리)
+            language: 코드 언어 (리뷰)
+            os_type: 대상 OS (가이드)
+            owner: 요청한 세션 ID
+
+        Returns:
+            기록 ID
+        """
+        digest = content_hash(content)
+        with self._lock:
+            self._conn.execute("DELETE FROM history WHERE content_hash = ? AND scope = ?", (digest, scope))
+            cursor = self._conn.execute(
+                "INSERT INTO history (kind, content_hash, scope, title, language, os_type, owner, result, created_at, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, digest, scope, make_title(content), language, os_type, owner,
+                 json.dumps(result, ensure_ascii=False), time.time(), self.version)
+            )
+            self._trim()
+            self._conn.commit()
+        return cursor.lastrowid
+
+    def find(self, content: str, scope: str) -> Optional[Dict]:
+        """같은 입력/범위/버전의 기록 조회 (해시 인덱스 사용, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM history WHERE content_hash = ? AND scope = ? AND version = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (content_hash(content), scope, self.version)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def get(self, entry_id: int, owner: str = None) -> Optional[Dict]:
+        """기록 ID로 조회 (owner를 주면 그 세션의 기록만)"""
+        query, params = "SELECT * FROM history WHERE id = ?", [entry_id]
+        if owner is not None:
+            query += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list(
+        self,
+        kind: str = None,
+        language: str = None,
+        os_type: str = None,
+        page: int = 1,
+        page_size: int = 20,
+        owner: str = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        기록 목록 (최신순, 결과 본문 제외)
+
+        Args:
+            kind: 기록 종류 필터
+            language: 언어 필터
+            os_type: OS 필터
+            page: 페이지 번호 (1부터)
+            page_size: 페이지당 기록 수
+            owner: 세션 ID 필터 (None이면 모든 세션)
+
+        Returns:
+            (기록 목록, 필터에 맞는 전체 기록 수)
+        """
+        conditions, params = [], []
+        for column, value in (("kind", kind), ("language", language), ("os_type", os_type)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if owner is not None:
+            conditions.append("owner = ?")
+            params.append(owner)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT id, kind, title, language, os_type, owner, created_at FROM history {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (max(page, 1) - 1) * page_size]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def delete(self, entry_id: int, owner: str = None) -> bool:
+        """기록 삭제 (owner를 주면 그 세션의 기록만)"""
+        query, params = "DELETE FROM history WHERE id = ?", [entry_id]
+        if owner is not None:
+            query += " AND owner = ?"
+            params.append(owner)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _trim(self):
+        """보관 개수 초과분 삭제 (락을 잡은 상태에서 호출)"""
+        self._conn.execute(
+            "DELETE FROM history WHERE id IN ("
+            "SELECT id FROM history ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict:
+        """DB 레코드를 딕셔너리로 변환"""
+        entry = dict(row)
+        entry["result"] = json.loads(entry["result"])
+        return entry
+
+
+def create_history_store(version: Dict[str, str] = None) -> Optional[HistoryStore]:
+    """
+    환경 변수 설정으로 기록 저장소 생성
+    BLUEBELL_HISTORY=0 이면 사용하지 않음 (None)
+
+    Args:
+        version: 결과 버전 키 (채팅 모델 배포, 프롬프트 버전 등)
+    """
+    if os.getenv("BLUEBELL_HISTORY", "1") == "0":
+        return None
+    try:
+        return HistoryStore(
+            max_entries=int(os.getenv("BLUEBELL_HISTORY_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+            version=version
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"기록 저장소 초기화 실패: {str(e)}")
+        return None
@@ -0,0 +1,75 @@
+"""
+검색 인덱스 스키마 프로필 모듈
+HNSW 파라미터(m, efConstruction, efSearch)와 벡터 압축 방식을 프로필로 묶어 설정으로 선택
+
+- fast: 작은 그래프와 좁은 탐색 범위 (색인/질의가 빠르고 recall은 낮음)
+- balanced: 기본값
+- accurate: 큰 그래프와 넓은 탐색 범위 (recall 우선)
+
+파라미터는 tests/benchmark_hnsw_profiles.py로 전수 비교 대비 recall@k와 지연을 측정해 조정
+"""
+
+import os
+from typing import Dict
+
+# HNSW 파라미터 허용 범위 (Azure AI Search 제한)
+HNSW_M_RANGE = (4, 10)
+HNSW_EF_RANGE = (100, 1000)
+
+INDEX_PROFILES = {
+    "fast": {"m": 4, "ef_construction": 100, "ef_search": 100},
+    "balanced": {"m": 8, "ef_construction": 400, "ef_search": 200},
+    "accurate": {"m": 10, "ef_construction": 800, "ef_search": 500},
+}
+DEFAULT_INDEX_PROFILE = "balanced"
+
+# 벡터 압축 방식
+COMPRESSION_NONE = "none"
+COMPRESSION_SCALAR = "scalar"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_SCALAR)
+
+# 스칼라 양자화 시 원본 벡터로 다시 점수를 매길 후보 배수
+DEFAULT_OVERSAMPLING = 4.0
+
+
+def _check_range(name: str, value: int, value_range: tuple):
+    low, high = value_range
+    if not low <= value <= high:
+        raise ValueError(f"{name}는 {low}~{high} 사이여야 합니다: {value}")
+
+
+def resolve_index_profile(name: str = None, compression: str = None) -> Dict:
+    """
+    인덱스 프로필 결정
+    인자가 없으면 BLUEBELL_INDEX_PROFILE/BLUEBELL_INDEX_COMPRESSION 환경 변수 사용,
+    BLUEBELL_HNSW_M/BLUEBELL_HNSW_EF_CONSTRUCTION/BLUEBELL_HNSW_EF_SEARCH로 개별 값 재정의
+
+    Args:
+        name: 프로필 이름 (fast, balanced, accurate)
+        compression: 압축 방식 (none, scalar)
+
+    Returns:
+        {"name", "m", "ef_construction", "ef_search", "compression", "oversampling"}
+    """
+    name = (name or os.getenv("BLUEBELL_INDEX_PROFILE") or DEFAULT_INDEX_PROFILE).strip().lower()
+    if name not in INDEX_PROFILES:
+        raise ValueError(f"알 수 없는 인덱스 프로필입니다: {name} (사용 가능: {', '.join(INDEX_PROFILES)})")
+
+    compression = (compression or os.getenv("BLUEBELL_INDEX_COMPRESSION") or COMPRESSION_NONE).strip().lower()
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"알 수 없는 벡터 압축 방식입니다: {compression} (사용 가능: {', '.join(COMPRESSIONS)})")
+
+    profile = dict(INDEX_PROFILES[name], name=name, compression=compression)
+    for key, env_name in [
+        ("m", "BLUEBELL_HNSW_M"),
+        ("ef_construction", "BLUEBELL_HNSW_EF_CONSTRUCTION"),
+        ("ef_search", "BLUEBELL_HNSW_EF_SEARCH"),
+    ]:
+        if os.getenv(env_name):
+            profile[key] = int(os.getenv(env_name))
+    profile["oversampling"] = float(os.getenv("BLUEBELL_INDEX_OVERSAMPLING", str(DEFAULT_OVERSAMPLING)))
+
+    _check_range("m", profile["m"], HNSW_M_RANGE)
+    _check_range("efConstruction", profile["ef_construction"], HNSW_EF_RANGE)
+    _check_range("efSearch", profile["ef_search"], HNSW_EF_RANGE)
+    return profile
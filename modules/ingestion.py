@@ -0,0 +1,178 @@
+"""
+문서 일괄 색인 모듈
+문서를 청크로 나누고 청크 batch_size개마다 임베딩 1회 + 업로드 1회로 색인
+(문서를 순회하며 처리하므로 한 번에 배치 하나만 메모리에 유지)
+
+임베딩에 실패한 배치는 건너뛰고 실패 수로 집계 (0 벡터로 올리면 검색 결과를 오염시킴)
+
+같은 문서를 다시 색인하면 이번에 만들지 않은 이전 청크(청크 수가 줄어 남은 번호, 청크 분할 전의 문서 전체)를
+parent_id로 찾아 삭제 (중복/오래된 검색 결과 방지)
+새 청크를 모두 올린 문서만 정리하고, 임베딩/업로드에 실패한 문서는 이전 청크를 그대로 둠 (문서가 사라지지 않도록)
+
+청크 필드(parent_id, chunk_index, section)가 없는 기존 인덱스에는 업로드가 실패하므로
+청크 색인 전에 인덱스를 삭제 후 다시 생성해야 함 (AzureSearchClient.delete_index → create_*_index)
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+import logging
+
+from modules.document_chunker import CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS, chunk_document, embedding_text
+from modules.tenant_router import normalize_tenant
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 요청 1회에 묶는 청크 수
+EMBED_BATCH_SIZE = 16
+
+
+class BulkIngestor:
+    """
+    청크 분할 → 일괄 임베딩 → 일괄 업로드
+    """
+
+    def __init__(
+        self,
+        search_client,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        batch_size: int = EMBED_BATCH_SIZE,
+        max_chars: int = CHUNK_MAX_CHARS,
+        overlap_chars: int = CHUNK_OVERLAP_CHARS
+    ):
+        """
+        초기화
+
+        Args:
+            search_client: AzureSearchClient (upload_documents, tenant_router 사용)
+            embed_batch: 텍스트 리스트 → 벡터 리스트 (예: AzureOpenAIClient.create_embeddings)
+            batch_size: 임베딩/업로드 배치 크기 (청크 수)
+            max_chars: 청크 최대 길이
+            overlap_chars: 청크 겹침 길이
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size는 1 이상이어야 합니다")
+        self.search_client = search_client
+        self.embed_batch = embed_batch
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.overlap_chars = overlap_chars
+
+    def ingest_conventions(self, documents: Iterable[Dict]) -> Dict:
+        """
+        코딩 컨벤션 색인 (회사별 라우팅에 따라 인덱스 결정)
+        company는 검색 필터와 같은 값이 되도록 정규화해서 저장 (OData eq는 대소문자 구분)
+        """
+        router = self.search_client.tenant_router
+        documents = (
+            dict(doc, company=normalize_tenant(doc["company"])) if doc.get("company") else doc
+            for doc in documents
+        )
+        return self.ingest(documents, lambda doc: router.indexes_for_document(doc.get("company")))
+
+    def ingest_templates(self, documents: Iterable[Dict]) -> Dict:
+        """환경 설정 템플릿 색인"""
+        index_name = self.search_client.templates_index
+        return self.ingest(documents, lambda doc: [index_name])
+
+    def ingest(self, documents: Iterable[Dict], index_for: Callable[[Dict], List[str]]) -> Dict:
+        """
+        문서 색인
+
+        Args:
+            documents: 원본 문서 (이터러블이면 순회하며 처리)
+            index_for: 문서 → 업로드할 인덱스 이름 리스트
+
+        Returns:
+            {"documents", "chunks", "uploaded", "failed", "deleted"}
+        """
+        stats = {"documents": 0, "chunks": 0, "uploaded": 0, "failed": 0, "deleted": 0}
+        pending: List[tuple] = []
+        # (인덱스, 원본 id) → 새 청크 id 집합
+        keep_ids: Dict[Tuple[str, str], set] = {}
+        # 청크를 모두 배치에 넣은 문서 (다음 배치를 올린 뒤 이전 청크 정리)
+        ready: Set[Tuple[str, str]] = set()
+        # 청크 하나라도 올리지 못한 문서 (이전 청크 유지)
+        failed: Set[Tuple[str, str]] = set()
+
+        for document in documents:
+            stats["documents"] += 1
+            indexes = index_for(document)
+            chunks = chunk_document(document, self.max_chars, self.overlap_chars)
+            for index_name in indexes:
+                keep_ids[(index_name, document["id"])] = {chunk["id"] for chunk in chunks}
+            for chunk in chunks:
+                pending.append((chunk, indexes))
+                if len(pending) >= self.batch_size:
+                    self._flush_and_clean(pending, stats, keep_ids, ready, failed)
+                    pending = []
+            ready.update((index_name, document["id"]) for index_name in indexes)
+        self._flush_and_clean(pending, stats, keep_ids, ready, failed)
+
+        logger.info(
+            f"일괄 색인 완료: 문서 {stats['documents']}개, 청크 {stats['chunks']}개, "
+            f"업로드 {stats['uploaded']}개, 실패 {stats['failed']}개, 이전 청크 삭제 {stats['deleted']}개"
+        )
+        return stats
+
+    def _flush_and_clean(
+        self,
+        pending: List[tuple],
+        stats: Dict,
+        keep_ids: Dict[Tuple[str, str], set],
+        ready: Set[Tuple[str, str]],
+        failed: Set[Tuple[str, str]]
+    ):
+        """배치 업로드 후, 청크를 모두 올린 문서의 이전 청크 삭제"""
+        if pending:
+            batch = {(index_name, chunk["parent_id"]) for chunk, indexes in pending for index_name in indexes}
+            failed |= batch - self._flush(pending, stats)
+        self._delete_stale(keep_ids, ready, failed, stats)
+
+    def _delete_stale(
+        self,
+        keep_ids: Dict[Tuple[str, str], set],
+        ready: Set[Tuple[str, str]],
+        failed: Set[Tuple[str, str]],
+        stats: Dict
+    ):
+        """청크를 모두 올린 문서들의 이전 청크 삭제 (새 청크 id는 남김, 실패한 문서는 건너뜀)"""
+        by_index: Dict[str, Dict[str, set]] = defaultdict(dict)
+        for index_name, parent_id in ready:
+            ids = keep_ids.pop((index_name, parent_id))
+            if (index_name, parent_id) in failed:
+                failed.discard((index_name, parent_id))
+                logger.warning(f"청크 업로드 실패로 이전 청크 유지: {index_name}/{parent_id}")
+                continue
+            by_index[index_name][parent_id] = ids
+        ready.clear()
+        for index_name, parents in by_index.items():
+            stats["deleted"] += self.search_client.delete_stale_chunks(index_name, parents)
+
+    def _flush(self, pending: List[tuple], stats: Dict) -> Set[Tuple[str, str]]:
+        """
+        배치 하나 임베딩 후 인덱스별로 묶어 업로드
+
+        Returns:
+            이 배치의 청크를 모두 올린 (인덱스, 원본 id) 집합 (인덱스 배치 일부만 올라가면 그 인덱스는 제외)
+        """
+        stats["chunks"] += len(pending)
+        try:
+            vectors = self.embed_batch([embedding_text(chunk) for chunk, _ in pending])
+        except Exception as e:
+            logger.error(f"배치 임베딩 실패 ({len(pending)}개 건너뜀): {str(e)}")
+            stats["failed"] += len(pending)
+            return set()
+
+        by_index = defaultdict(list)
+        for (chunk, indexes), vector in zip(pending, vectors):
+            for index_name in indexes:
+                by_index[index_name].append(dict(chunk, content_vector=vector))
+
+        uploaded_pairs = set()
+        for index_name, chunks in by_index.items():
+            uploaded = self.search_client.upload_documents(index_name, chunks)
+            stats["uploaded"] += uploaded
+            stats["failed"] += len(chunks) - uploaded
+            if uploaded == len(chunks):
+                uploaded_pairs.update((index_name, chunk["parent_id"]) for chunk in chunks)
+        return uploaded_pairs
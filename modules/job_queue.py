@@ -0,0 +1,534 @@
+"""
+백그라운드 작업 큐 모듈
+긴 코드 리뷰/가이드 생성 작업을 큐에 넣고 제한된 수의 워커로 처리
+결과는 로컬 SQLite 저장소에 TTL과 함께 보관
+
+같은 호스트의 여러 워커 프로세스가 저장소 파일을 공유할 수 있으므로 작업마다 만든 프로세스(instance)를 기록하고,
+프로세스는 주기적으로 instances 테이블에 생존 신호(heartbeat)를 남김
+시작 시에는 이 인스턴스 ID로 남은 작업(같은 PID로 재시작한 경우)과 생존 신호가 끊긴 인스턴스의 작업만 중단 처리
+(실행 중인 작업은 끝날 때까지 updated_at이 바뀌지 않으므로 작업 갱신 시각으로는 판단하지 않음)
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from modules.deadlines import CANCEL_REASON_USER, CancellationToken, RequestCancelledError, request_deadline, request_scope
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# 더 이상 바뀌지 않는 상태
+JOB_FINISHED_STATUSES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+DEFAULT_JOB_DB = os.path.join(".bluebell", "jobs.db")
+
+# 이 시간(초) 이상 생존 신호가 없는 인스턴스는 죽은 프로세스로 간주
+DEFAULT_STALE_JOB_SECONDS = 3600
+
+# 생존 신호 기록 주기(초) (stale 기준의 1/3을 넘지 않음)
+DEFAULT_HEARTBEAT_SECONDS = 60
+
+
+def default_instance_id() -> str:
+    """작업을 만든 프로세스 식별자 (BLUEBELL_INSTANCE_ID, 없으면 호스트명:PID)"""
+    return os.getenv("BLUEBELL_INSTANCE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueueFullError(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생"""
+
+
+class JobStore:
+    """
+    작업 상태와 결과를 저장하는 SQLite 저장소
+    여러 워커 스레드에서 동시에 접근하므로 내부 락으로 직렬화
+    """
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = 3600, instance_id: str = None):
+        """
+        초기화
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:" 가능)
+            ttl_seconds: 완료된 작업 결과 보관 시간(초)
+            instance_id: 이 프로세스의 식별자 (None이면 default_instance_id())
+        """
+        self.db_path = db_path or os.getenv("BLUEBELL_JOB_DB", DEFAULT_JOB_DB)
+        self.ttl_seconds = ttl_seconds
+        self.instance_id = instance_id or default_instance_id()
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_table()
+        self.heartbeat()
+
+    def _create_table(self):
+        """테이블 및 인덱스 생성"""
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    owner TEXT,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL,
+                    instance TEXT
+                )
+                """
+            )
+            # 이전 버전 DB에는 instance 컬럼이 없음
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "instance" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN instance TEXT")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS instances (id TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs(expires_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs(owner, created_at)")
+            self._conn.commit()
+
+    def heartbeat(self):
+        """이 인스턴스의 생존 신호 기록 (다른 프로세스가 시작할 때 이 인스턴스의 작업을 중단 처리하지 않도록)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO instances (id, heartbeat_at) VALUES (?, ?)",
+                (self.instance_id, time.time())
+            )
+            self._conn.commit()
+
+    def create(self, job_id: str, kind: str, priority: int, owner: str = None):
+        """대기 상태의 작업 레코드 생성"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, owner, status, priority, created_at, updated_at, instance) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, owner, JOB_PENDING, priority, now, now, self.instance_id)
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, status: str, result: Any = None, error: str = None):
+        """
+        작업 상태 갱신
+
+        완료/실패/취소 상태가 되면 TTL 기준으로 만료 시각을 기록
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds if status in JOB_FINISHED_STATUSES else None
+        result_json = json.dumps(result, ensure_ascii=False) if result is not None else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, expires_at = ? "
+                "WHERE id = ?",
+                (status, result_json, error, now, expires_at, job_id)
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 조회 (만료된 작업은 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+        if row["expires_at"] is not None and row["expires_at"] < time.time():
+            return None
+        return self._row_to_dict(row)
+
+    def list_by_owner(self, owner: str, limit: int = 20) -> List[Dict]:
+        """특정 사용자(세션)의 최근 작업 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE owner = ? AND (expires_at IS NULL OR expires_at >= ?) "
+                "ORDER BY created_at DESC LIMIT ?",
+                (owner, time.time(), limit)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def mark_interrupted(self, stale_seconds: float = DEFAULT_STALE_JOB_SECONDS) -> int:
+        """
+        이전 프로세스에서 처리 중이던 작업을 실패로 표시
+        (메모리 큐는 재시작 시 사라지므로 다시 처리할 수 없음)
+
+        저장소를 공유하는 다른 살아 있는 프로세스의 작업은 건드리지 않도록
+        - 이 인스턴스 ID로 남은 작업 (같은 호스트명/PID로 재시작한 경우)
+        - stale_seconds 이상 생존 신호가 없는 인스턴스의 작업
+        - 인스턴스 기록이 없는 이전 버전 작업 중 stale_seconds 이상 상태가 바뀌지 않은 작업
+        만 실패로 표시
+
+        Returns:
+            실패로 표시한 작업 수
+        """
+        now = time.time()
+        cutoff = now - stale_seconds
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ?, expires_at = ? "
+                "WHERE status IN (?, ?) AND ("
+                "instance = ? "
+                "OR (instance IS NULL AND updated_at < ?) "
+                "OR (instance IS NOT NULL AND instance NOT IN (SELECT id FROM instances WHERE heartbeat_at >= ?)))",
+                (JOB_FAILED, "서버 재시작으로 작업이 중단되었습니다", now, now + self.ttl_seconds,
+                 JOB_PENDING, JOB_RUNNING, self.instance_id, cutoff, cutoff)
+            )
+            # 죽은 인스턴스의 생존 신호 기록 정리
+            self._conn.execute(
+                "DELETE FROM instances WHERE heartbeat_at < ? AND id != ?", (cutoff, self.instance_id)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """만료된 작업 삭제"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict:
+        """DB 레코드를 딕셔너리로 변환"""
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+
+class _JobControl:
+    """실행 중인 작업의 취소 토큰과 요청 범위 (사용 토큰 집계용)"""
+    __slots__ = ("token", "scope")
+
+    def __init__(self, token: CancellationToken):
+        self.token = token
+        self.scope = None
+
+
+def _run_in_scope(control: _JobControl, func: Callable[..., Any], *args, **kwargs):
+    """
+    작업의 취소 토큰과 요청 마감 시간(BLUEBELL_REQUEST_DEADLINE)을 요청 범위로 걸고 실행
+    검색/LLM 단계가 취소 여부와 남은 시간을 확인 (RAG 외의 리뷰/가이드 작업도 마감 시간 적용)
+    """
+    with request_scope(timeout=request_deadline(), token=control.token) as scope:
+        control.scope = scope
+        return func(*args, **kwargs)
+
+
+class JobQueue:
+    """
+    우선순위 기반 작업 큐
+    제한된 수의 워커 스레드가 작업을 꺼내 처리하므로
+    요청이 몰려도 동시에 실행되는 작업 수가 max_workers를 넘지 않음
+
+    같은 우선순위 안에서는 소유자별로 번갈아 처리 (진행 중인 작업이 적은 소유자의 작업이 먼저)
+    cancel()로 대기 중인 작업은 실행하지 않고, 실행 중인 작업은 다음 검색/LLM 호출 전에 중단
+    """
+
+    def __init__(
+        self,
+        store: JobStore = None,
+        max_workers: int = 2,
+        max_pending: int = 100,
+        purge_interval: int = 300,
+        max_pending_per_owner: int = None,
+        stale_job_seconds: float = DEFAULT_STALE_JOB_SECONDS
+    ):
+        """
+        초기화
+
+        Args:
+            store: 결과 저장소 (없으면 기본 경로의 JobStore 생성)
+            max_workers: 동시에 처리할 최대 작업 수
+            max_pending: 대기열 최대 길이 (초과 시 JobQueueFullError)
+            purge_interval: 만료 작업 정리 주기(초)
+            max_pending_per_owner: 소유자별 대기/실행 중 작업 수 상한 (None이면 제한 없음)
+            stale_job_seconds: 시작 시 이 시간(초) 이상 생존 신호가 없는 다른 프로세스의 작업을 중단 처리
+        """
+        self.store = store or JobStore()
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.purge_interval = purge_interval
+        self.max_pending_per_owner = max_pending_per_owner
+        self.heartbeat_interval = min(DEFAULT_HEARTBEAT_SECONDS, stale_job_seconds / 3)
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()  # 같은 우선순위/순번은 제출 순서대로
+        self._outstanding: Dict[str, int] = {}  # 소유자별 대기 + 실행 중 작업 수
+        self._queued = 0  # 대기열에 넣었거나 넣기로 예약한 작업 수 (max_pending 확인용)
+        self._subscribers: Dict[str, List[Callable[[Dict], None]]] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._controls: Dict[str, _JobControl] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_purge = time.time()
+
+        interrupted = self.store.mark_interrupted(stale_job_seconds)
+        if interrupted:
+            logger.warning(f"중단된 작업 {interrupted}개를 실패로 표시")
+
+    def start(self):
+        """워커 스레드 시작 (이미 시작된 경우 무시)"""
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"bluebell-job-worker-{i}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="bluebell-job-heartbeat", daemon=True)
+            self._heartbeat.start()
+        logger.info(f"작업 큐 워커 {self.max_workers}개 시작")
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        *args,
+        priority: int = PRIORITY_NORMAL,
+        owner: str = None,
+        alive_check: Callable[[], bool] = None,
+        **kwargs
+    ) -> str:
+        """
+        작업 제출
+
+        Args:
+            kind: 작업 종류 ("review", "guide" 등)
+            func: 실행할 함수 (반환값은 JSON 직렬화 가능해야 함)
+            priority: 우선순위 (작을수록 먼저)
+            owner: 작업 소유자 (세션 ID 등)
+            alive_check: 요청한 클라이언트가 아직 연결되어 있는지 (False이면 작업 취소)
+
+        Returns:
+            작업 ID
+        """
+        with self._lock:
+            # 확인과 예약을 같은 락 안에서 해야 동시에 제출해도 max_pending을 넘지 않음
+            if self._queued >= self.max_pending:
+                raise JobQueueFullError(f"대기 중인 작업이 너무 많습니다 ({self.max_pending}개)")
+            # 소유자의 n번째 미완료 작업은 다른 소유자들의 n번째 작업과 같은 순번으로 배치
+            owner_rank = self._outstanding.get(owner, 0)
+            limit = self.max_pending_per_owner
+            if limit is not None and owner is not None and owner_rank >= limit:
+                raise JobQueueFullError(
+                    f"이미 진행 중인 작업이 {owner_rank}개 있습니다. 이전 작업이 끝난 뒤 다시 요청해주세요."
+                )
+            self._outstanding[owner] = owner_rank + 1
+            self._queued += 1
+
+        self.start()
+
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, kind, priority, owner)
+        control = _JobControl(CancellationToken(alive_check))
+        with self._lock:
+            self._events[job_id] = threading.Event()
+            self._controls[job_id] = control
+
+        # 제출 시점의 contextvars(사용량 라벨, 상위 span 등)를 워커 스레드에서도 유지
+        func = functools.partial(contextvars.copy_context().run, _run_in_scope, control, func)
+        self._queue.put(((priority, owner_rank, next(self._sequence)), job_id, owner, func, args, kwargs))
+        logger.info(f"작업 제출: {job_id} ({kind}, 우선순위 {priority})")
+        return job_id
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 조회 (폴링용)"""
+        return self.store.get(job_id)
+
+    def pending_count(self) -> int:
+        """대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def cancel(self, job_id: str, reason: str = CANCEL_REASON_USER) -> bool:
+        """
+        작업 취소
+
+        대기 중인 작업은 바로 취소 상태가 되고, 실행 중인 작업은 진행 중인 호출이 끝나는 대로 중단
+
+        Returns:
+            취소 요청 여부 (이미 끝났거나 없는 작업이면 False)
+        """
+        with self._lock:
+            control = self._controls.get(job_id)
+        if control is None:
+            return False
+
+        control.token.cancel(reason)
+        job = self.store.get(job_id)
+        if job is not None and job["status"] == JOB_PENDING:
+            self.store.update(job_id, JOB_CANCELLED, error=reason)
+            self._notify(job_id)
+        logger.info(f"작업 취소 요청: {job_id} ({reason})")
+        return True
+
+    def position(self, job_id: str) -> int:
+        """
+        대기 중인 작업의 처리 순서 (1이면 다음 차례, 대기 중이 아니면 0, 취소된 작업은 세지 않음)
+        """
+        with self._lock:
+            controls = dict(self._controls)
+        with self._queue.mutex:
+            keys = [(item[0], item[1]) for item in self._queue.queue
+                    if item[1] is not None and item[1] in controls]
+        keys = [(key, queued_id) for key, queued_id in keys if not controls[queued_id].token.cancelled]
+        target = next((key for key, queued_id in keys if queued_id == job_id), None)
+        if target is None:
+            return 0
+        return sum(1 for key, _ in keys if key < target) + 1
+
+    def wait(self, job_id: str, timeout: float = None) -> Optional[Dict]:
+        """
+        작업 완료까지 대기 후 상태 반환
+
+        Args:
+            job_id: 작업 ID
+            timeout: 최대 대기 시간(초), None이면 완료될 때까지
+
+        Returns:
+            작업 상태 (timeout 시 진행 중 상태 그대로)
+        """
+        with self._lock:
+            event = self._events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.store.get(job_id)
+
+    def subscribe(self, job_id: str, callback: Callable[[Dict], None]):
+        """
+        작업 완료 시 호출될 콜백 등록
+        이미 끝난 작업이면 즉시 호출
+        """
+        with self._lock:
+            job = self.store.get(job_id)
+            finished = job is not None and job["status"] in JOB_FINISHED_STATUSES
+            if not finished:
+                self._subscribers.setdefault(job_id, []).append(callback)
+        if finished:
+            callback(job)
+
+    def shutdown(self, timeout: float = 5.0):
+        """워커 종료"""
+        self._stopped.set()
+        for _ in self._workers:
+            self._queue.put(((float("inf"), 0, next(self._sequence)), None, None, None, (), {}))
+        for worker in self._workers:
+            worker.join(timeout)
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout)
+        self._workers = []
+        self._heartbeat = None
+
+    def _heartbeat_loop(self):
+        """생존 신호 기록 스레드 (실행 중인 작업이 길어도 다른 프로세스가 중단 처리하지 않도록)"""
+        while True:
+            try:
+                self.store.heartbeat()
+            except Exception as e:
+                logger.error(f"작업 큐 생존 신호 기록 실패: {str(e)}")
+            if self._stopped.wait(self.heartbeat_interval):
+                break
+
+    def _worker_loop(self):
+        """워커 스레드 본체"""
+        while not self._stopped.is_set():
+            _, job_id, owner, func, args, kwargs = self._queue.get()
+            if job_id is None:
+                break
+
+            with self._lock:
+                control = self._controls[job_id]
+                self._queued -= 1
+            try:
+                if control.token.cancelled:
+                    raise RequestCancelledError(control.token.reason)
+                self.store.update(job_id, JOB_RUNNING)
+                result = func(*args, **kwargs)
+                if control.token.cancelled:
+                    raise RequestCancelledError(control.token.reason)
+                self.store.update(job_id, JOB_DONE, result=result)
+                logger.info(f"작업 완료: {job_id}")
+            except Exception as e:
+                if control.token.cancelled:
+                    # 취소 전후에 쓴 토큰은 결과를 버리므로 함께 안내
+                    used = control.scope.tokens_used if control.scope is not None else 0
+                    message = f"{control.token.reason} (사용된 토큰 {used:,}개)" if used else control.token.reason
+                    logger.info(f"작업 취소: {job_id} - {message}")
+                    self.store.update(job_id, JOB_CANCELLED, error=message)
+                else:
+                    logger.error(f"작업 실패: {job_id} - {str(e)}")
+                    self.store.update(job_id, JOB_FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+                with self._lock:
+                    self._controls.pop(job_id, None)
+                    remaining = self._outstanding.get(owner, 1) - 1
+                    if remaining > 0:
+                        self._outstanding[owner] = remaining
+                    else:
+                        self._outstanding.pop(owner, None)
+
+            self._notify(job_id)
+            self._maybe_purge()
+
+    def _notify(self, job_id: str):
+        """대기자 및 구독자에게 완료 알림"""
+        with self._lock:
+            event = self._events.pop(job_id, None)
+            callbacks = self._subscribers.pop(job_id, [])
+        if event is not None:
+            event.set()
+
+        job = self.store.get(job_id)
+        for callback in callbacks:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"작업 콜백 실패: {job_id} - {str(e)}")
+
+    def _maybe_purge(self):
+        """주기적으로 만료된 결과 정리"""
+        now = time.time()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        purged = self.store.purge_expired()
+        if purged:
+            logger.info(f"만료된 작업 {purged}개 삭제")
@@ -0,0 +1,100 @@
+"""
+범용 LRU 캐시 모듈
+검색 결과처럼 같은 키로 반복 조회되는 값을 메모리에 보관 (스레드 안전, 선택적 TTL)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    최대 개수와 TTL이 있는 LRU 캐시
+    - max_entries 초과 시 가장 오래 사용하지 않은 항목부터 제거
+    - ttl_seconds가 지나면 조회 시 만료 처리
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = None):
+        """
+        초기화
+
+        Args:
+            max_entries: 최대 보관 항목 수
+            ttl_seconds: 항목 유효 시간(초), None이면 만료 없음
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """조회 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and entry[1] < time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """저장"""
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+    def items(self) -> List[Tuple[Hashable, Any, Optional[float]]]:
+        """만료되지 않은 (키, 값, 만료 시각) 목록 (오래 사용하지 않은 항목부터, 스냅샷 저장용)"""
+        now = time.time()
+        with self._lock:
+            return [(key, value, expires_at) for key, (value, expires_at) in self._entries.items()
+                    if expires_at is None or expires_at >= now]
+
+    def restore(self, items: Iterable[Tuple[Hashable, Any, Optional[float]]]) -> int:
+        """
+        items()로 저장한 항목 복원 (이미 만료된 항목은 건너뜀, 만료 시각은 유지)
+
+        Returns:
+            복원한 항목 수
+        """
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for key, value, expires_at in items:
+                if expires_at is not None and expires_at < now:
+                    continue
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+                restored += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return restored
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,143 @@
+"""
+모델 계층(tier) 선택 모듈
+입력 크기, 작업 종류, 리뷰 옵션에 따라 작고 빠른 배포(small)와 기본 배포(large) 중 선택하고
+계층별 지연 시간/품질 지표(응답 잘림, 이어 생성, 오류 비율)를 집계
+
+small 계층 배포가 설정되지 않은 경우 모든 요청은 large 계층으로 전달됨
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List
+
+from modules.deployment_router import TIER_LARGE, TIER_SMALL
+
+# 작은 모델로도 충분한 리뷰 항목 (이 외 항목이 하나라도 있으면 large)
+SMALL_REVIEW_OPTIONS = {"check_naming", "check_structure"}
+
+# small 계층으로 보낼 입력 크기 상한 (문자 수)
+SMALL_MAX_CODE_CHARS = 3000
+SMALL_MAX_README_CHARS = 2000
+
+# 계층별 지연 시간 보관 개수 (백분위수 계산용)
+LATENCY_WINDOW = 500
+
+# README 기술 스택 키워드 (기술 → README에 나타나는 단어)
+TECH_KEYWORDS = {
+    "react": ["react", "jsx", "tsx"],
+    "vue": ["vue", "vuejs"],
+    "angular": ["angular"],
+    "node": ["node", "nodejs", "npm", "yarn"],
+    "python": ["python", "pip", "requirements.txt", "django", "flask", "fastapi"],
+    "java": ["java", "maven", "gradle", "spring"],
+    "docker": ["docker", "dockerfile", "docker-compose"],
+    "typescript": ["typescript", "ts", "tsx"],
+    "javascript": ["javascript", "js", "jsx"],
+    "express": ["express", "expressjs"],
+    "mongodb": ["mongodb", "mongo"],
+    "postgresql": ["postgresql", "postgres"],
+    "mysql": ["mysql"],
+    "redis": ["redis"]
+}
+
+
+def choose_review_tier(code: str, options: Dict = None) -> str:
+    """
+    코드 리뷰 계층 선택
+    네이밍/구조만 보는 짧은 코드는 small, 버그/보안/성능/리팩토링 검토가 포함되면 large
+
+    Args:
+        code: 리뷰할 코드
+        options: 리뷰 옵션 (None이면 전체 검토로 간주)
+
+    Returns:
+        계층 이름
+    """
+    if options is None:
+        return TIER_LARGE
+    enabled = {key for key, value in options.items() if value}
+    if enabled - SMALL_REVIEW_OPTIONS or len(code) > SMALL_MAX_CODE_CHARS:
+        return TIER_LARGE
+    return TIER_SMALL
+
+
+def extract_tech_stack(readme_content: str) -> List[str]:
+    """README에서 기술 스택 추출 (가이드 계층 선택과 템플릿 검색에 사용)"""
+    content_lower = readme_content.lower()
+    return [
+        tech for tech, keywords in TECH_KEYWORDS.items()
+        if any(keyword in content_lower for keyword in keywords)
+    ]
+
+
+def choose_guide_tier(readme_content: str, os_type: str = "all", tech_stack: List[str] = None) -> str:
+    """
+    환경 설정 가이드 계층 선택
+    단일 OS용이고 README가 짧으며 기술 스택이 단순하면 small
+
+    Args:
+        readme_content: README 내용
+        os_type: 타겟 OS
+        tech_stack: 추출된 기술 스택
+
+    Returns:
+        계층 이름
+    """
+    single_os = (os_type or "all").lower() not in ("all", "전체")
+    simple_stack = len(tech_stack or []) <= 2
+    if single_os and simple_stack and len(readme_content) <= SMALL_MAX_README_CHARS:
+        return TIER_SMALL
+    return TIER_LARGE
+
+
+class TierMetrics:
+    """
+    계층별 호출 지표 집계 (여러 워커 스레드에서 기록)
+    - 지연 시간 p50/p95 (최근 LATENCY_WINDOW건)
+    - 품질 지표: 응답 잘림(finish_reason == "length") 비율, 이어 생성 비율, 오류 비율
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict] = {}
+
+    def record(self, tier: str, latency_ms: float, finish_reason: str = None, continuations: int = 0, error: bool = False):
+        """호출 1건 기록"""
+        with self._lock:
+            stats = self._tiers.setdefault(tier, {
+                "calls": 0, "errors": 0, "truncated": 0, "continued": 0,
+                "latencies": deque(maxlen=LATENCY_WINDOW)
+            })
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["truncated"] += int(finish_reason == "length")
+            stats["continued"] += int(continuations > 0)
+            if not error:
+                stats["latencies"].append(latency_ms)
+
+    def stats(self) -> Dict[str, Dict]:
+        """계층별 지표"""
+        with self._lock:
+            snapshot = {tier: dict(stats, latencies=sorted(stats["latencies"])) for tier, stats in self._tiers.items()}
+
+        report = {}
+        for tier, stats in snapshot.items():
+            latencies = stats["latencies"]
+            calls = stats["calls"]
+            report[tier] = {
+                "calls": calls,
+                "p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+                "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+                "error_rate": round(stats["errors"] / calls, 3),
+                "truncated_rate": round(stats["truncated"] / calls, 3),
+                "continued_rate": round(stats["continued"] / calls, 3),
+            }
+        return report
+
+
+_tier_metrics = TierMetrics()
+
+
+def get_tier_metrics() -> TierMetrics:
+    """프로세스 전역 계층 지표 반환"""
+    return _tier_metrics
@@ -0,0 +1,77 @@
+"""
+응답 길이(max_tokens) 추정 모듈
+Azure OpenAI는 요청의 max_tokens만큼 TPM 쿼터를 미리 차감하므로
+작업별 예상 출력 크기에 맞춰 max_tokens를 정하고, 부족하면 이어 생성(continuation)으로 보완
+"""
+
+from typing import Dict, List
+
+# max_tokens 범위
+MIN_OUTPUT_TOKENS = 600
+MAX_OUTPUT_TOKENS = 4000
+
+# 응답이 잘렸을 때 이어서 생성할 최대 횟수
+MAX_CONTINUATIONS = 2
+
+# 코드 리뷰: 머리말/요약 + 리뷰 항목별 분량 + 코드 길이에 비례한 개선 코드 예시
+REVIEW_BASE_TOKENS = 300
+REVIEW_TOKENS_PER_OPTION = 220
+REVIEW_CODE_CHAR_LIMIT = 2000  # 프롬프트에 포함되는 코드 길이와 동일
+
+# 환경 설정 가이드: 공통 부분 + OS별 설치/실행 절차 + 기술 스택별 설정
+GUIDE_BASE_TOKENS = 500
+GUIDE_TOKENS_PER_OS = 450
+GUIDE_TOKENS_PER_TECH = 60
+ALL_OS_TYPES = ("all", "전체")
+ALL_OS_COUNT = 3
+
+# 입력 토큰 수 추정 비율 (영문/코드는 약 4자당 1토큰, 한글 등 비ASCII 문자는 보수적으로 1자당 1토큰)
+ASCII_CHARS_PER_TOKEN = 4
+NON_ASCII_TOKENS_PER_CHAR = 1
+
+
+def _clamp(tokens: int) -> int:
+    return max(MIN_OUTPUT_TOKENS, min(MAX_OUTPUT_TOKENS, int(tokens)))
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 추정 (토크나이저 없이)
+    한글은 1자가 1토큰 이상인 경우가 많아 4자당 1토큰으로 계산하면 2~4배 적게 추정되므로 따로 계산
+    """
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    ascii_chars = len(text) - non_ascii
+    return -(-ascii_chars // ASCII_CHARS_PER_TOKEN) + non_ascii * NON_ASCII_TOKENS_PER_CHAR
+
+
+def estimate_review_tokens(code: str, options: Dict = None) -> int:
+    """
+    코드 리뷰 응답에 필요한 max_tokens 추정
+
+    Args:
+        code: 리뷰할 코드
+        options: 리뷰 옵션 (None이면 모든 항목 검사로 간주)
+
+    Returns:
+        max_tokens
+    """
+    option_count = sum(1 for enabled in options.values() if enabled) if options is not None else 6
+    # 개선 코드 예시는 원본 코드 길이(4자 ≈ 1토큰)에 비례
+    code_tokens = min(len(code), REVIEW_CODE_CHAR_LIMIT) // 4
+    return _clamp(REVIEW_BASE_TOKENS + REVIEW_TOKENS_PER_OPTION * max(1, option_count) + code_tokens)
+
+
+def estimate_guide_tokens(os_type: str = "all", tech_stack: List[str] = None) -> int:
+    """
+    환경 설정 가이드 응답에 필요한 max_tokens 추정
+
+    Args:
+        os_type: 타겟 OS ("all"이면 모든 OS별 절차 포함)
+        tech_stack: README에서 추출한 기술 스택
+
+    Returns:
+        max_tokens
+    """
+    os_count = ALL_OS_COUNT if (os_type or "all").lower() in ALL_OS_TYPES else 1
+    tech_count = len(tech_stack) if tech_stack else 0
+    return _clamp(GUIDE_BASE_TOKENS + GUIDE_TOKENS_PER_OS * os_count + GUIDE_TOKENS_PER_TECH * tech_count)
@@ -3,36 +3,88 @@ RAG (Retrieval-Augmented Generation) 서비스
 코딩 컨벤션과 환경 설정 템플릿을 검색하여 AI 응답에 통합
 """
 
+import functools
 import re
 from typing import Dict, List, Optional, Tuple
 from modules.azure_search_client import AzureSearchClient
 from modules.azure_client import AzureOpenAIClient
+from modules.deadlines import request_deadline, request_scope
+from modules.model_tiering import choose_guide_tier, choose_review_tier, extract_tech_stack
+from modules.prompt_builder import build_review_messages, build_setup_messages, prefix_fingerprint
+from modules.reranker import RERANK_FETCH_TOP, RERANK_KEEP_TOP, Reranker
+from modules.output_budget import MAX_CONTINUATIONS, estimate_guide_tokens, estimate_review_tokens
+from modules.tracing import get_tracer
+from modules.usage_tracker import get_usage_tracker
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 코드 패턴 추출 규칙 (패턴 이름, 정규식) - 모듈 로드 시 한 번만 컴파일
+_LANGUAGE_CODE_PATTERNS = {
+    "python": [
+        ("function_naming", re.compile(r'def\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\(')),
+        ("class_naming", re.compile(r'class\s+[a-zA-Z_][a-zA-Z0-9_]*\s*[\(:]')),
+        ("import_style", re.compile(r'import\s+|from\s+.*\s+import')),
+        ("constant_naming", re.compile(r'[A-Z_]{2,}\s*=')),
+    ],
+    "javascript": [
+        ("function_naming", re.compile(r'function\s+\w+|const\s+\w+\s*=.*=>')),
+        ("class_naming", re.compile(r'class\s+\w+')),
+        ("variable_naming", re.compile(r'(let|const|var)\s+\w+')),
+    ],
+}
+_LANGUAGE_CODE_PATTERNS["typescript"] = _LANGUAGE_CODE_PATTERNS["javascript"]
+
+# 모든 언어 공통 규칙
+_COMMON_CODE_PATTERNS = [
+    ("comments", re.compile(r'//.*|#.*|/\*.*\*/')),
+    ("logging", re.compile(r'console\.log|print\(|logger\.|logging\.')),
+    ("error_handling", re.compile(r'try\s*{|except\s|catch\s*\(')),
+]
+
+def _within_request_deadline(method):
+    """메서드 전체(검색 → 프롬프트 → 응답 생성, 폴백 포함)를 요청 마감 시간 안에서 실행"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # 작업 큐의 취소 토큰과 바깥 마감 시간은 그대로 이어받음
+        with request_scope(timeout=self.request_timeout):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class RAGService:
     """
     검색 증강 생성 서비스
     Azure AI Search + Azure OpenAI 통합
     """
     
-    def __init__(self, azure_client: AzureOpenAIClient, search_client: AzureSearchClient):
+    def __init__(
+        self,
+        azure_client: AzureOpenAIClient,
+        search_client: AzureSearchClient,
+        reranker: Reranker = None,
+        request_timeout: float = None
+    ):
         """
         초기화
         
         Args:
             azure_client: Azure OpenAI 클라이언트
             search_client: Azure AI Search 클라이언트
+            reranker: 검색 결과 재정렬기 (없으면 기본 설정으로 생성)
+            request_timeout: 검색부터 응답 생성까지의 마감 시간(초) (None이면 BLUEBELL_REQUEST_DEADLINE, 0이면 없음)
         """
         self.azure_client = azure_client
         self.search_client = search_client
+        self.reranker = reranker or Reranker()
+        self.request_timeout = request_deadline() if request_timeout is None else request_timeout
         
+    @_within_request_deadline
     def enhance_code_review(
         self,
         code: str,
         language: str,
-        company: str = "ktds"
+        company: str = "ktds",
+        options: Dict = None
     ) -> Dict[str, any]:
         """
         RAG를 사용한 코드 리뷰 개선
@@ -40,31 +92,44 @@ class RAGService:
         Args:
             code: 리뷰할 코드
             language: 프로그래밍 언어
-            company: 회사명 (컨벤션 필터용)
+            company: 회사명 (회사별 인덱스/company 필터로 그 회사 컨벤션만 검색)
+            options: 리뷰 옵션 (검사 항목/모델 계층 선택용, None이면 전체 검토)
             
         Returns:
             향상된 코드 리뷰 결과 딕셔너리
         """
+        tracer = get_tracer()
         try:
             # 1. 코드에서 패턴 및 키워드 추출
-            patterns = self._extract_code_patterns(code, language)
+            with tracer.span("rag.extract_patterns", code_chars=len(code)) as span:
+                patterns = self._extract_code_patterns(code, language)
+                span.set("pattern_count", len(patterns))
             logger.info(f"추출된 패턴: {patterns}")
             
             # 2. 관련 코딩 컨벤션 검색
-            conventions = self._search_relevant_conventions(
-                patterns, language, company
-            )
+            with tracer.span("rag.search", kind="conventions") as span:
+                conventions = self._search_relevant_conventions(
+                    patterns, language, company
+                )
+                span.set("result_count", len(conventions))
             logger.info(f"검색된 컨벤션: {len(conventions)}개")
             
             # 3. 컨벤션 정보를 포함한 향상된 프롬프트 생성
-            enhanced_prompt = self._create_enhanced_review_prompt(
-                code, language, conventions
-            )
+            with tracer.span("rag.build_prompt") as span:
+                enhanced_prompt = self._create_enhanced_review_prompt(
+                    code, language, conventions, options
+                )
+                span.set("prompt_chars", sum(len(m["content"]) for m in enhanced_prompt))
+                span.set("prompt_prefix", prefix_fingerprint(enhanced_prompt))
             
             # 4. AI 리뷰 생성
-            review_result = self.azure_client.get_completion(
-                enhanced_prompt, temperature=0.3
-            )
+            with tracer.span("rag.completion"):
+                review_result = self.azure_client.get_completion(
+                    enhanced_prompt, temperature=0.3,
+                    max_tokens=estimate_review_tokens(code, options),
+                    max_continuations=MAX_CONTINUATIONS,
+                    tier=choose_review_tier(code, options)
+                )
             
             # 5. 결과 포맷팅
             return {
@@ -86,6 +151,21 @@ class RAGService:
                 "error": str(e)
             }
     
+    @_within_request_deadline
+    def find_conventions(self, code: str, language: str, company: str = "ktds") -> List[Dict]:
+        """
+        코드에 관련된 코딩 컨벤션만 검색 (구조화된 리뷰처럼 프롬프트를 직접 조립하는 경우용)
+
+        Returns:
+            검색된 컨벤션 리스트 (실패 시 빈 리스트)
+        """
+        with get_tracer().span("rag.search", kind="conventions") as span:
+            patterns = self._extract_code_patterns(code, language)
+            conventions = self._search_relevant_conventions(patterns, language, company)
+            span.set("result_count", len(conventions))
+        return conventions
+
+    @_within_request_deadline
     def enhance_setup_guide(
         self,
         readme_content: str,
@@ -101,26 +181,39 @@ class RAGService:
         Returns:
             향상된 환경 설정 가이드 딕셔너리
         """
+        tracer = get_tracer()
+        tech_stack = None
         try:
             # 1. README에서 기술 스택 추출
-            tech_stack = self._extract_tech_stack(readme_content)
+            with tracer.span("rag.extract_tech_stack", readme_chars=len(readme_content)) as span:
+                tech_stack = self._extract_tech_stack(readme_content)
+                span.set("tech_count", len(tech_stack))
             logger.info(f"추출된 기술 스택: {tech_stack}")
             
             # 2. 관련 환경 설정 템플릿 검색
-            templates = self._search_relevant_templates(
-                tech_stack, os_type
-            )
+            with tracer.span("rag.search", kind="templates") as span:
+                templates = self._search_relevant_templates(
+                    tech_stack, os_type
+                )
+                span.set("result_count", len(templates))
             logger.info(f"검색된 템플릿: {len(templates)}개")
             
             # 3. 템플릿 정보를 포함한 향상된 프롬프트 생성
-            enhanced_prompt = self._create_enhanced_setup_prompt(
-                readme_content, os_type, templates
-            )
+            with tracer.span("rag.build_prompt") as span:
+                enhanced_prompt = self._create_enhanced_setup_prompt(
+                    readme_content, os_type, templates
+                )
+                span.set("prompt_chars", sum(len(m["content"]) for m in enhanced_prompt))
+                span.set("prompt_prefix", prefix_fingerprint(enhanced_prompt))
             
             # 4. AI 가이드 생성
-            guide_result = self.azure_client.get_completion(
-                enhanced_prompt, temperature=0.3
-            )
+            with tracer.span("rag.completion"):
+                guide_result = self.azure_client.get_completion(
+                    enhanced_prompt, temperature=0.3,
+                    max_tokens=estimate_guide_tokens(os_type, tech_stack),
+                    max_continuations=MAX_CONTINUATIONS,
+                    tier=choose_guide_tier(readme_content, os_type, tech_stack)
+                )
             
             # 5. 결과 포맷팅
             return {
@@ -133,7 +226,7 @@ class RAGService:
         except Exception as e:
             logger.error(f"RAG 환경 설정 가이드 실패: {str(e)}")
             # 폴백: 기본 가이드 생성
-            fallback_guide = self.azure_client.analyze_readme(readme_content, os_type)
+            fallback_guide = self.azure_client.analyze_readme(readme_content, os_type, tech_stack)
             return {
                 "guide": fallback_guide,
                 "referenced_templates": [],
@@ -144,50 +237,8 @@ class RAGService:
     
     def _extract_code_patterns(self, code: str, language: str) -> List[str]:
         """코드에서 리뷰 관련 패턴 추출"""
-        patterns = []
-        
-        # 언어별 패턴 추출 규칙
-        if language.lower() == "python":
-            # 함수 정의
-            if re.search(r'def\s+[a-zA-Z_][a-zA-Z0-9_]*\s*\(', code):
-                patterns.append("function_naming")
-            
-            # 클래스 정의
-            if re.search(r'class\s+[a-zA-Z_][a-zA-Z0-9_]*\s*[\(:]', code):
-                patterns.append("class_naming")
-            
-            # Import 문
-            if re.search(r'import\s+|from\s+.*\s+import', code):
-                patterns.append("import_style")
-            
-            # 상수 (대문자)
-            if re.search(r'[A-Z_]{2,}\s*=', code):
-                patterns.append("constant_naming")
-                
-        elif language.lower() in ["javascript", "typescript"]:
-            # 함수 선언
-            if re.search(r'function\s+\w+|const\s+\w+\s*=.*=>', code):
-                patterns.append("function_naming")
-            
-            # 클래스 정의
-            if re.search(r'class\s+\w+', code):
-                patterns.append("class_naming")
-            
-            # 변수 선언
-            if re.search(r'(let|const|var)\s+\w+', code):
-                patterns.append("variable_naming")
-        
-        # 공통 패턴
-        if re.search(r'//.*|#.*|/\*.*\*/', code):
-            patterns.append("comments")
-        
-        if re.search(r'console\.log|print\(|logger\.|logging\.', code):
-            patterns.append("logging")
-        
-        if re.search(r'try\s*{|except\s|catch\s*\(', code):
-            patterns.append("error_handling")
-        
-        return patterns
+        rules = _LANGUAGE_CODE_PATTERNS.get(language.lower(), []) + _COMMON_CODE_PATTERNS
+        return [name for name, pattern in rules if pattern.search(code)]
     
     def _search_relevant_conventions(
         self,
@@ -216,14 +267,14 @@ class RAGService:
             
             query = " ".join(query_terms) if query_terms else f"{language} 코딩 컨벤션"
             
-            # Azure AI Search에서 검색
+            # 후보를 넉넉히 가져와 로컬에서 재정렬 (예산 한도 근접 시 프롬프트에 넣는 문서 수 축소)
             results = self.search_client.search_conventions(
                 query=query,
                 language=language if language != "auto" else None,
-                top=3
+                top=RERANK_FETCH_TOP,
+                company=company
             )
-            
-            return results
+            return self._rerank(results, patterns, language)
             
         except Exception as e:
             logger.error(f"컨벤션 검색 실패: {str(e)}")
@@ -231,32 +282,7 @@ class RAGService:
     
     def _extract_tech_stack(self, readme_content: str) -> List[str]:
         """README에서 기술 스택 추출"""
-        tech_stack = []
-        content_lower = readme_content.lower()
-        
-        # 기술 스택 키워드 매칭
-        tech_keywords = {
-            "react": ["react", "jsx", "tsx"],
-            "vue": ["vue", "vuejs"],
-            "angular": ["angular"],
-            "node": ["node", "nodejs", "npm", "yarn"],
-            "python": ["python", "pip", "requirements.txt", "django", "flask", "fastapi"],
-            "java": ["java", "maven", "gradle", "spring"],
-            "docker": ["docker", "dockerfile", "docker-compose"],
-            "typescript": ["typescript", "ts", "tsx"],
-            "javascript": ["javascript", "js", "jsx"],
-            "express": ["express", "expressjs"],
-            "mongodb": ["mongodb", "mongo"],
-            "postgresql": ["postgresql", "postgres"],
-            "mysql": ["mysql"],
-            "redis": ["redis"]
-        }
-        
-        for tech, keywords in tech_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
-                tech_stack.append(tech)
-        
-        return tech_stack
+        return extract_tech_stack(readme_content)
     
     def _search_relevant_templates(
         self,
@@ -282,56 +308,39 @@ class RAGService:
             
             os_filter = os_map.get(os_type, None)
             
-            # Azure AI Search에서 검색
+            # 후보를 넉넉히 가져와 로컬에서 재정렬 (예산 한도 근접 시 프롬프트에 넣는 문서 수 축소)
             results = self.search_client.search_templates(
                 query=query,
                 tech_stack=tech_stack if tech_stack else None,
                 os_type=os_filter,
-                top=3
+                top=RERANK_FETCH_TOP
             )
-            
-            return results
+            return self._rerank(results, tech_stack)
             
         except Exception as e:
             logger.error(f"템플릿 검색 실패: {str(e)}")
             return []
     
+    def _rerank(self, results: List[Dict], keywords: List[str], language: str = None) -> List[Dict]:
+        """검색 후보 재정렬 후 토큰 예산 안에서 상위 문서 선택"""
+        with get_tracer().span("rag.rerank", candidates=len(results)) as span:
+            selected = self.reranker.rerank(
+                results, keywords,
+                language=language if language != "auto" else None,
+                top=get_usage_tracker().check_budget().limit_top(RERANK_KEEP_TOP)
+            )
+            span.set("selected", len(selected))
+        return selected
+
     def _create_enhanced_review_prompt(
         self,
         code: str,
         language: str,
-        conventions: List[Dict]
+        conventions: List[Dict],
+        options: Dict = None
     ) -> List[Dict[str, str]]:
-        """향상된 코드 리뷰 프롬프트 생성"""
-        
-        # 컨벤션 정보 요약
-        conventions_text = ""
-        if conventions:
-            conventions_text = "\n\n참조할 코딩 컨벤션:\n"
-            for i, conv in enumerate(conventions, 1):
-                conventions_text += f"{i}. {conv['title']}\n"
-                conventions_text += f"   {conv['content'][:200]}...\n"
-        
-        system_prompt = f"""당신은 {language} 전문 코드 리뷰어입니다.
-주어진 코드를 분석하고 다음 컨벤션을 참조하여 개선 사항을 제안해주세요.
-{conventions_text}
-
-리뷰 항목:
-- 네이밍 컨벤션 검사
-- 코드 구조와 가독성
-- 잠재적 버그 및 에러 처리
-- 성능 최적화 가능 부분
-- 보안 취약점
-
-각 항목에 대해 구체적인 예시와 개선 코드를 제시해주세요.
-심각도를 🔴 (심각), 🟡 (주의), 🟢 (권장) 로 표시해주세요."""
-
-        user_prompt = f"다음 {language} 코드를 리뷰해주세요:\n\n```{language}\n{code[:2000]}\n```"
-
-        return [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        """향상된 코드 리뷰 프롬프트 생성 (정적 지시문 뒤에 검색된 컨벤션 배치)"""
+        return build_review_messages(code, language, options, conventions)
     
     def _create_enhanced_setup_prompt(
         self,
@@ -339,36 +348,8 @@ class RAGService:
         os_type: str,
         templates: List[Dict]
     ) -> List[Dict[str, str]]:
-        """향상된 환경 설정 가이드 프롬프트 생성"""
-        
-        # 템플릿 정보 요약
-        templates_text = ""
-        if templates:
-            templates_text = "\n\n참조할 환경 설정 템플릿:\n"
-            for i, template in enumerate(templates, 1):
-                templates_text += f"{i}. {template['title']}\n"
-                templates_text += f"   {template['content'][:300]}...\n"
-        
-        system_prompt = f"""당신은 숙련된 DevOps 엔지니어입니다.
-주어진 README 파일을 분석하여 {os_type} 운영체제용 개발 환경 설정 가이드를 작성해주세요.
-{templates_text}
-
-포함해야 할 내용:
-1. 필수 소프트웨어 설치
-2. 프로젝트 클론 및 설정
-3. 의존성 패키지 설치
-4. 환경변수 설정
-5. 실행 방법
-6. 자주 발생하는 문제와 해결법
-
-위의 참조 템플릿을 활용하여 더 구체적이고 실용적인 가이드를 만들어주세요."""
-
-        user_prompt = f"다음 README를 분석하여 환경설정 가이드를 작성해주세요:\n\n{readme_content[:3000]}"
-
-        return [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        """향상된 환경 설정 가이드 프롬프트 생성 (정적 지시문 뒤에 검색된 템플릿 배치)"""
+        return build_setup_messages(readme_content, os_type, templates)
 
 def test_rag_service():
     """RAG 서비스 테스트"""
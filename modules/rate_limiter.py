@@ -0,0 +1,337 @@
+"""
+사용자별 요청 속도 제한 모듈 (토큰 버킷)
+세션/IP 같은 식별자마다 두 개의 버킷을 둠
+- 요청 버킷: 요청 1회에 1개 소모, 분당 requests_per_minute개 충전 (최대 request_burst개)
+- 토큰 버킷: LLM 호출이 끝난 뒤 실제 사용 토큰만큼 차감, 분당 tokens_per_minute개 충전 (최대 token_burst개)
+  요청 시점에는 잔량이 남아 있는지만 확인하므로 큰 요청 뒤에는 버킷이 음수가 되고, 다시 충전될 때까지 거부
+
+버킷 상태는 기본적으로 프로세스 메모리에 두고, BLUEBELL_RATE_LIMIT_DB를 지정하면
+같은 서버의 여러 워커 프로세스가 SQLite 파일 하나를 공유
+
+IP 식별자는 신뢰하는 프록시가 붙인 X-Forwarded-For 항목에서만 읽음 (client_ip_from_headers)
+왼쪽 항목은 클라이언트가 마음대로 채울 수 있으므로 그대로 쓰면 버킷을 바꿔 가며 우회하거나
+다른 사람의 IP를 넣어 그 사람의 버킷을 소진시킬 수 있음
+
+사용 예:
+    limiter = get_rate_limiter()
+    limiter.acquire(["session:abc", "ip:10.0.0.1"])   # 초과 시 RateLimitExceededError
+    with usage_context(rate_limit_keys=keys):
+        ...                                           # LLM 호출마다 사용 토큰이 차감됨
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 버킷 이름 접미사 (식별자 "session:abc"의 요청 버킷은 "session:abc|requests")
+BUCKET_REQUESTS = "requests"
+BUCKET_TOKENS = "tokens"
+
+# 오래 쓰지 않은 버킷 정리 주기(초) - 가득 찬 버킷은 지워도 결과가 같음
+PURGE_INTERVAL = 600
+
+# (버킷 키, 필요한 최소 잔량, 소모량, 최대 용량, 초당 충전량)
+BucketSpec = Tuple[str, float, float, float, float]
+
+
+class RateLimitExceededError(RuntimeError):
+    """요청 속도 또는 토큰 사용량 한도를 넘었을 때 발생"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _refill(tokens: float, updated_at: float, capacity: float, rate: float, now: float) -> float:
+    """마지막 갱신 이후 충전된 잔량"""
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+def _apply(states: Dict[str, Tuple[float, float]], specs: List[BucketSpec], now: float, force: bool):
+    """
+    여러 버킷에서 한 번에 소모 (하나라도 부족하면 아무것도 소모하지 않음)
+
+    Args:
+        states: 버킷 키 → (잔량, 갱신 시각), 없는 버킷은 가득 찬 것으로 취급
+        force: True면 잔량과 관계없이 차감 (최대 용량만큼의 음수까지)
+
+    Returns:
+        (갱신된 상태, 기다려야 하는 시간(초) - 소모했으면 0)
+    """
+    levels = {}
+    wait = 0.0
+    for key, required, cost, capacity, rate in specs:
+        tokens, updated_at = states.get(key, (capacity, now))
+        level = _refill(tokens, updated_at, capacity, rate, now)
+        levels[key] = level
+        if not force and level < required:
+            wait = max(wait, (required - level) / rate if rate > 0 else float("inf"))
+    if wait > 0:
+        return {}, wait
+
+    updated = {}
+    for key, required, cost, capacity, rate in specs:
+        updated[key] = (max(-capacity, levels[key] - cost), now)
+    return updated, 0.0
+
+
+class MemoryBucketStore:
+    """프로세스 메모리에 버킷 상태 보관 (단일 프로세스 배포용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, specs: List[BucketSpec], now: float, force: bool = False) -> float:
+        """버킷 소모 (기다려야 하는 시간 반환, 0이면 소모 완료)"""
+        with self._lock:
+            states = {spec[0]: self._buckets[spec[0]] for spec in specs if spec[0] in self._buckets}
+            updated, wait = _apply(states, specs, now, force)
+            self._buckets.update(updated)
+            return wait
+
+    def purge(self, older_than: float) -> int:
+        """older_than 이전에 마지막으로 쓰인 버킷 삭제"""
+        with self._lock:
+            stale = [key for key, (_, updated_at) in self._buckets.items() if updated_at < older_than]
+            for key in stale:
+                del self._buckets[key]
+            return len(stale)
+
+
+class SQLiteBucketStore:
+    """
+    SQLite 파일에 버킷 상태 보관 (같은 서버의 여러 워커 프로세스가 공유)
+    BEGIN IMMEDIATE로 쓰기 잠금을 잡은 상태에서 읽고 갱신하므로 프로세스 간에도 원자적
+    """
+
+    def __init__(self, db_path: str):
+        """
+        초기화
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:" 가능)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        # 트랜잭션을 직접 관리 (isolation_level=None), 다른 프로세스의 잠금은 timeout까지 대기
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=5)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def take(self, specs: List[BucketSpec], now: float, force: bool = False) -> float:
+        """버킷 소모 (기다려야 하는 시간 반환, 0이면 소모 완료)"""
+        keys = [spec[0] for spec in specs]
+        placeholders = ", ".join("?" for _ in keys)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT key, tokens, updated_at FROM rate_buckets WHERE key IN ({placeholders})", keys
+                ).fetchall()
+                updated, wait = _apply({key: (tokens, updated_at) for key, tokens, updated_at in rows},
+                                       specs, now, force)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    [(key, tokens, updated_at) for key, (tokens, updated_at) in updated.items()]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def purge(self, older_than: float) -> int:
+        """older_than 이전에 마지막으로 쓰인 버킷 삭제"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM rate_buckets WHERE updated_at < ?", (older_than,))
+            return cursor.rowcount
+
+
+class RateLimiter:
+    """
+    식별자별 요청/토큰 버킷 속도 제한기
+    한도가 0인 버킷은 검사하지 않으며, 둘 다 0이면 비활성
+    """
+
+    def __init__(
+        self,
+        store=None,
+        requests_per_minute: float = 0,
+        request_burst: int = None,
+        tokens_per_minute: float = 0,
+        token_burst: int = None
+    ):
+        """
+        초기화
+
+        Args:
+            store: MemoryBucketStore 또는 SQLiteBucketStore (None이면 메모리)
+            requests_per_minute: 식별자당 분당 요청 수 (0이면 제한 없음)
+            request_burst: 연속으로 허용하는 요청 수 (None이면 requests_per_minute)
+            tokens_per_minute: 식별자당 분당 LLM 토큰 수 (0이면 제한 없음)
+            token_burst: 토큰 버킷 최대 용량 (None이면 tokens_per_minute)
+        """
+        if requests_per_minute < 0 or tokens_per_minute < 0:
+            raise ValueError("속도 제한 값은 0 이상이어야 합니다")
+        self.store = store or MemoryBucketStore()
+        self.requests_per_minute = requests_per_minute
+        self.request_burst = request_burst or max(1, requests_per_minute)
+        self.tokens_per_minute = tokens_per_minute
+        self.token_burst = token_burst or max(1, tokens_per_minute)
+        self._last_purge = time.time()
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0 or self.tokens_per_minute > 0
+
+    def acquire(self, identities: Iterable[str]):
+        """
+        요청 1회 허용 여부 확인 후 요청 버킷 소모
+
+        모든 식별자의 요청 버킷과 토큰 버킷에 1개 이상 남아 있어야 통과 (토큰은 호출 후 charge로 차감)
+        (하나라도 부족하면 어느 버킷도 소모하지 않음)
+
+        Args:
+            identities: 식별자 목록 (예: ["session:abc", "ip:10.0.0.1"])
+
+        Raises:
+            RateLimitExceededError: 한도 초과 (retry_after에 대기 시간)
+        """
+        identities = [identity for identity in identities if identity]
+        if not self.enabled or not identities:
+            return
+
+        specs: List[BucketSpec] = []
+        for identity in identities:
+            if self.requests_per_minute > 0:
+                specs.append((f"{identity}|{BUCKET_REQUESTS}", 1, 1,
+                              self.request_burst, self.requests_per_minute / 60))
+            if self.tokens_per_minute > 0:
+                specs.append((f"{identity}|{BUCKET_TOKENS}", 1, 0,
+                              self.token_burst, self.tokens_per_minute / 60))
+
+        wait = self._take(specs, force=False)
+        if wait > 0:
+            logger.warning(f"요청 속도 제한: {', '.join(identities)} ({wait:.1f}초 후 가능)")
+            raise RateLimitExceededError(
+                f"요청이 너무 잦습니다. {max(1, int(wait + 0.999))}초 후 다시 시도해주세요.",
+                retry_after=wait
+            )
+
+    def charge(self, identities: Optional[Iterable[str]], tokens: int):
+        """
+        LLM 호출 1회의 사용 토큰을 토큰 버킷에서 차감 (잔량이 부족해도 차감, 다음 요청부터 거부)
+        """
+        if self.tokens_per_minute <= 0 or not identities or tokens <= 0:
+            return
+        specs = [(f"{identity}|{BUCKET_TOKENS}", 0, tokens, self.token_burst, self.tokens_per_minute / 60)
+                 for identity in identities if identity]
+        if specs:
+            self._take(specs, force=True)
+
+    def _take(self, specs: List[BucketSpec], force: bool) -> float:
+        now = time.time()
+        try:
+            wait = self.store.take(specs, now, force=force)
+        except Exception as e:
+            # 저장소 오류로 서비스 전체가 막히지 않도록 허용
+            logger.error(f"속도 제한 저장소 오류: {str(e)}")
+            return 0.0
+        if now - self._last_purge > PURGE_INTERVAL:
+            self._last_purge = now
+            self._purge(now)
+        return wait
+
+    def _purge(self, now: float):
+        # 가장 느리게 차는 버킷도 가득 찰 만큼 지난 버킷만 삭제 (삭제해도 가득 찬 것으로 취급되므로 결과 동일)
+        refill_seconds = [
+            60 * burst * 2 / per_minute
+            for burst, per_minute in ((self.request_burst, self.requests_per_minute),
+                                      (self.token_burst, self.tokens_per_minute))
+            if per_minute > 0
+        ]
+        try:
+            self.store.purge(now - max(refill_seconds + [PURGE_INTERVAL]))
+        except Exception as e:
+            logger.error(f"속도 제한 버킷 정리 실패: {str(e)}")
+
+
+def client_ip_from_headers(headers: Dict[str, str], trusted_hops: int) -> Optional[str]:
+    """
+    신뢰하는 프록시가 기록한 클라이언트 IP
+
+    Args:
+        headers: 요청 헤더
+        trusted_hops: 앱 앞단의 신뢰하는 리버스 프록시 수 (BLUEBELL_TRUSTED_PROXY_HOPS)
+                      프록시마다 X-Forwarded-For 끝에 접속한 주소를 붙이므로 오른쪽에서 trusted_hops번째 항목 사용
+                      0이면 헤더를 믿지 않음
+
+    Returns:
+        IP 문자열 (알 수 없으면 None)
+    """
+    if trusted_hops <= 0:
+        return None
+    forwarded = [entry.strip() for entry in (headers.get("X-Forwarded-For") or "").split(",") if entry.strip()]
+    if forwarded:
+        if len(forwarded) < trusted_hops:
+            # 설정한 프록시 수보다 항목이 적으면 프록시를 거치지 않은 요청
+            return None
+        ip = forwarded[-trusted_hops]
+    else:
+        ip = (headers.get("X-Real-Ip") or "").strip()
+    # App Service 등은 "IPv4:포트" 형식으로 기록
+    if ip.count(":") == 1:
+        ip = ip.split(":", 1)[0]
+    return ip or None
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """프로세스 전역 속도 제한기 (최초 호출 시 환경 변수로 생성)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                db_path = os.getenv("BLUEBELL_RATE_LIMIT_DB", "")
+                _limiter = RateLimiter(
+                    store=SQLiteBucketStore(db_path) if db_path else MemoryBucketStore(),
+                    requests_per_minute=float(os.getenv("BLUEBELL_RATE_LIMIT_REQUESTS_PER_MINUTE") or "0"),
+                    request_burst=int(os.getenv("BLUEBELL_RATE_LIMIT_REQUEST_BURST") or "0") or None,
+                    tokens_per_minute=float(os.getenv("BLUEBELL_RATE_LIMIT_TOKENS_PER_MINUTE") or "0"),
+                    token_burst=int(os.getenv("BLUEBELL_RATE_LIMIT_TOKEN_BURST") or "0") or None
+                )
+    return _limiter
+
+
+def configure_rate_limiter(limiter: RateLimiter = None) -> RateLimiter:
+    """
+    전역 속도 제한기 교체 (테스트 또는 설정 변경용)
+
+    Args:
+        limiter: 사용할 제한기 (None이면 다음 호출 시 환경 변수로 다시 생성)
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+    return limiter
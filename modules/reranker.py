@@ -0,0 +1,188 @@
+"""
+검색 결과 재정렬(rerank) 모듈
+Azure AI Search에서 넉넉하게(RERANK_FETCH_TOP) 가져온 문서를 LLM 호출 없이 가벼운 특징으로 다시 점수화하고
+MMR(Maximal Marginal Relevance)로 중복을 줄인 뒤 프롬프트 토큰 예산에 들어가는 문서만 남김
+
+특징 (문서 수 x 특징 수 행렬로 한 번에 계산):
+- search: 검색 점수 (최대값으로 정규화)
+- overlap: 코드 패턴/기술 스택 중 문서 태그·제목과 겹치는 항목의 비율
+- language: 언어 일치 (일치 1.0, general 0.5)
+- priority: 문서 priority 필드 (1이 가장 중요)
+
+벡터 유사도 특징은 쓰지 않음: 후보 20개의 content_vector(1536차원)를 함께 받으면 검색 응답과 결과 캐시가
+문서당 수십 KB씩 커지고 검색마다 질의 임베딩 호출이 추가되므로, 위 특징만으로 재정렬
+"""
+
+import re
+from typing import Dict, Iterable, List
+import logging
+
+import numpy as np
+
+from modules.output_budget import estimate_text_tokens
+from modules.prompt_builder import CONTEXT_CHAR_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# 검색 시 가져올 후보 수와 프롬프트에 넣을 최대 문서 수
+RERANK_FETCH_TOP = 20
+RERANK_KEEP_TOP = 3
+
+# 참조 문서에 쓸 프롬프트 토큰 예산 (한국어 문서 기준 본문 CONTEXT_CHAR_LIMIT자 ≈ 300토큰, 약 3개 분량)
+CONTEXT_TOKEN_BUDGET = 900
+
+# 특징별 가중치
+DEFAULT_WEIGHTS = {
+    "search": 0.30,
+    "overlap": 0.40,
+    "language": 0.18,
+    "priority": 0.12,
+}
+FEATURES = list(DEFAULT_WEIGHTS)
+
+# MMR 관련도 비중 (1.0이면 다양성 고려 안 함)
+DEFAULT_MMR_LAMBDA = 0.7
+
+# 최고 점수 대비 이 비율 미만인 문서는 주제와 무관한 것으로 보고 제외
+MIN_RELATIVE_SCORE = 0.5
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def keyword_set(values: Iterable[str]) -> set:
+    """키워드 집합 (function_naming → {function_naming, function, naming})"""
+    keywords = set()
+    for value in values:
+        value = str(value).lower()
+        keywords.add(value)
+        keywords.update(_TOKEN_PATTERN.findall(value))
+    return keywords
+
+
+def estimate_context_tokens(document: Dict) -> int:
+    """프롬프트에 들어갈 참조 문서의 토큰 수 추정 (prompt_builder가 본문을 CONTEXT_CHAR_LIMIT로 자름)"""
+    text = document.get("title", "") + document.get("content", "")[:CONTEXT_CHAR_LIMIT]
+    return estimate_text_tokens(text) + 8
+
+
+class Reranker:
+    """
+    검색 결과 재정렬기
+    rerank()에 검색 결과와 질의 정보를 넘기면 관련도·다양성·토큰 예산을 고려해 골라낸 문서 반환
+    """
+
+    def __init__(
+        self,
+        weights: Dict[str, float] = None,
+        mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        min_relative_score: float = MIN_RELATIVE_SCORE
+    ):
+        """
+        초기화
+
+        Args:
+            weights: 특징별 가중치 (없는 특징은 DEFAULT_WEIGHTS 사용)
+            mmr_lambda: MMR 관련도 비중 (0.0~1.0)
+            token_budget: 선택한 문서의 추정 토큰 합 상한
+            min_relative_score: 최고 점수 대비 최소 점수 비율 (0이면 제외하지 않음)
+        """
+        self.weights = np.array([{**DEFAULT_WEIGHTS, **(weights or {})}[name] for name in FEATURES])
+        self.mmr_lambda = mmr_lambda
+        self.token_budget = token_budget
+        self.min_relative_score = min_relative_score
+
+    def rerank(
+        self,
+        documents: List[Dict],
+        keywords: Iterable[str] = (),
+        language: str = None,
+        top: int = RERANK_KEEP_TOP
+    ) -> List[Dict]:
+        """
+        문서 재정렬 및 선택
+
+        Args:
+            documents: 검색 결과 (id, title, content, score, tags/tech_stack, language, priority)
+            keywords: 코드 패턴 또는 기술 스택
+            language: 코드 언어
+            top: 최대 선택 문서 수
+
+        Returns:
+            선택된 문서 (rerank_score 추가, 선택 순서대로)
+        """
+        if not documents or top <= 0:
+            return []
+
+        doc_keywords = [self._document_keywords(doc) for doc in documents]
+        features = self._features(documents, doc_keywords, list(keywords), language)
+        relevance = features @ self.weights
+        similarity = self._similarity(doc_keywords)
+
+        selected: List[int] = []
+        used_tokens = 0
+        threshold = relevance.max() * self.min_relative_score
+        remaining = {i for i in range(len(documents)) if relevance[i] >= threshold}
+        while remaining and len(selected) < top:
+            candidates = sorted(remaining)
+            redundancy = similarity[np.ix_(candidates, selected)].max(axis=1) if selected else np.zeros(len(candidates))
+            mmr = self.mmr_lambda * relevance[candidates] - (1 - self.mmr_lambda) * redundancy
+            best = candidates[int(np.argmax(mmr))]
+            remaining.discard(best)
+
+            # 예산을 넘는 문서는 건너뛰고 다음 후보 검토 (첫 문서는 예산과 관계없이 포함)
+            tokens = estimate_context_tokens(documents[best])
+            if selected and used_tokens + tokens > self.token_budget:
+                continue
+            selected.append(best)
+            used_tokens += tokens
+
+        logger.info(f"재정렬: 후보 {len(documents)}개 → {len(selected)}개 선택 (추정 {used_tokens} 토큰)")
+        return [dict(documents[i], rerank_score=round(float(relevance[i]), 4)) for i in selected]
+
+    def _document_keywords(self, document: Dict) -> set:
+        """문서 태그/기술 스택/제목 키워드"""
+        values = list(document.get("tags") or []) + list(document.get("tech_stack") or [])
+        values.append(document.get("title", ""))
+        return keyword_set(values)
+
+    def _features(self, documents, doc_keywords, keywords, language) -> np.ndarray:
+        """문서 x 특징 행렬 (각 특징은 0~1)"""
+        features = np.zeros((len(documents), len(FEATURES)), dtype=np.float32)
+
+        scores = np.array([float(doc.get("score") or 0.0) for doc in documents])
+        if scores.max() > 0:
+            features[:, FEATURES.index("search")] = scores / scores.max()
+
+        if keywords:
+            # 패턴 하나(function_naming)는 그 단어 중 하나라도 문서 키워드에 있으면 일치로 봄
+            pattern_keywords = [keyword_set([keyword]) for keyword in keywords]
+            features[:, FEATURES.index("overlap")] = [
+                sum(1 for pattern in pattern_keywords if pattern & document) / len(pattern_keywords)
+                for document in doc_keywords
+            ]
+
+        if language:
+            language = language.lower()
+            features[:, FEATURES.index("language")] = [
+                1.0 if str(doc.get("language", "")).lower() == language
+                else 0.5 if doc.get("language") in (None, "general") else 0.0
+                for doc in documents
+            ]
+
+        features[:, FEATURES.index("priority")] = [
+            1.0 / doc["priority"] if isinstance(doc.get("priority"), int) and doc["priority"] > 0 else 0.5
+            for doc in documents
+        ]
+        return features
+
+    def _similarity(self, doc_keywords: List[set]) -> np.ndarray:
+        """문서 간 유사도 행렬 (키워드 자카드)"""
+        count = len(doc_keywords)
+        similarity = np.zeros((count, count), dtype=np.float32)
+        for i in range(count):
+            for j in range(i + 1, count):
+                union = doc_keywords[i] | doc_keywords[j]
+                if union:
+                    similarity[i, j] = similarity[j, i] = len(doc_keywords[i] & doc_keywords[j]) / len(union)
+        return similarity
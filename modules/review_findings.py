@@ -0,0 +1,316 @@
+"""
+구조화된(JSON) 코드 리뷰 결과 모듈
+리뷰 결과를 하나의 마크다운 대신 "지적 사항(finding)" 목록으로 다뤄서
+- 코드 영역(region)별로 나눠 병렬 리뷰한 결과를 정렬/중복 제거만으로 합치고
+- 영역 단위로 결과를 캐시하여 바뀐 영역만 다시 리뷰하고
+- UI에서는 심각도별로 필터링하고 페이지 단위로 나눠 그릴 수 있게 함
+
+지적 사항 형식 (REVIEW_JSON_SCHEMA):
+    {"file", "line_start", "line_end", "rule", "severity", "message", "suggestion", "patch"}
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 심각도 (정렬 순서 = 목록 순서)
+SEVERITY_CRITICAL = "critical"
+SEVERITY_WARNING = "warning"
+SEVERITY_INFO = "info"
+SEVERITY_ORDER = [SEVERITY_CRITICAL, SEVERITY_WARNING, SEVERITY_INFO]
+SEVERITY_ICONS = {SEVERITY_CRITICAL: "🔴", SEVERITY_WARNING: "🟡", SEVERITY_INFO: "🟢"}
+
+# 모델이 아이콘이나 한글로 답해도 받아들이기 위한 별칭
+_SEVERITY_ALIASES = {
+    "🔴": SEVERITY_CRITICAL, "심각": SEVERITY_CRITICAL, "high": SEVERITY_CRITICAL, "error": SEVERITY_CRITICAL,
+    "🟡": SEVERITY_WARNING, "주의": SEVERITY_WARNING, "medium": SEVERITY_WARNING,
+    "🟢": SEVERITY_INFO, "권장": SEVERITY_INFO, "low": SEVERITY_INFO, "suggestion": SEVERITY_INFO,
+}
+
+# 영역 분할 기준 (줄 수, 최상위 줄 약 1/REGION_CUT_MODULUS가 경계 후보) 및 영역별 결과 캐시 크기
+REGION_MIN_LINES = 30
+REGION_MAX_LINES = 120
+REGION_CUT_MODULUS = 4
+REGION_CACHE_SIZE = 512
+
+# Structured Outputs용 JSON 스키마 (response_format={"type": "json_schema", ...})
+REVIEW_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "file": {"type": "string"},
+                    "line_start": {"type": "integer"},
+                    "line_end": {"type": "integer"},
+                    "rule": {"type": "string"},
+                    "severity": {"type": "string", "enum": SEVERITY_ORDER},
+                    "message": {"type": "string"},
+                    "suggestion": {"type": "string"},
+                    "patch": {"type": "string"},
+                },
+                "required": ["file", "line_start", "line_end", "rule", "severity", "message", "suggestion", "patch"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["summary", "findings"],
+    "additionalProperties": False,
+}
+
+REVIEW_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "code_review", "strict": True, "schema": REVIEW_JSON_SCHEMA},
+}
+
+
+def normalize_severity(value) -> Optional[str]:
+    """심각도 값을 critical/warning/info 중 하나로 변환 (알 수 없으면 None)"""
+    text = str(value or "").strip().lower()
+    if text in SEVERITY_ICONS:
+        return text
+    for alias, severity in _SEVERITY_ALIASES.items():
+        if alias in text:
+            return severity
+    return None
+
+
+def validate_finding(item: Dict, file_path: str = "", line_range: Tuple[int, int] = None) -> Optional[Dict]:
+    """
+    지적 사항 1건 검증 및 정규화
+
+    Args:
+        item: 모델이 생성한 지적 사항
+        file_path: 파일 경로 (지정하면 모델이 적은 경로보다 우선)
+        line_range: 허용 줄 범위 (start, end), 범위를 벗어난 줄 번호는 범위 안으로 보정
+
+    Returns:
+        정규화된 지적 사항 (필수 값이 없거나 형식이 틀리면 None)
+    """
+    if not isinstance(item, dict):
+        return None
+
+    severity = normalize_severity(item.get("severity"))
+    message = str(item.get("message") or "").strip()
+    try:
+        line_start = int(item.get("line_start"))
+        line_end = int(item.get("line_end", line_start))
+    except (TypeError, ValueError):
+        return None
+    if severity is None or not message:
+        return None
+
+    if line_range:
+        low, high = line_range
+        line_start = min(max(line_start, low), high)
+        line_end = min(max(line_end, line_start), high)
+    line_end = max(line_end, line_start)
+
+    return {
+        "file": str(file_path or item.get("file") or ""),
+        "line_start": line_start,
+        "line_end": line_end,
+        "rule": str(item.get("rule") or "general").strip(),
+        "severity": severity,
+        "message": message,
+        "suggestion": str(item.get("suggestion") or "").strip(),
+        "patch": str(item.get("patch") or "").strip(),
+    }
+
+
+def parse_review_json(text: str, file_path: str = "", line_range: Tuple[int, int] = None) -> Dict:
+    """
+    모델 응답(JSON 문자열)을 검증된 리뷰 결과로 변환
+
+    Args:
+        text: 모델 응답 (```json 코드 블록으로 감싸져 있어도 됨)
+        file_path: 파일 경로
+        line_range: 허용 줄 범위
+
+    Returns:
+        {"summary": str, "findings": [지적 사항], "dropped": 형식 오류로 버린 항목 수}
+
+    Raises:
+        ValueError: 응답이 JSON 객체가 아닌 경우
+    """
+    body = text.strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", body, re.DOTALL)
+    if fenced:
+        body = fenced.group(1)
+
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"리뷰 응답이 JSON 형식이 아닙니다: {e}") from e
+    if not isinstance(payload, dict):
+        raise ValueError("리뷰 응답이 JSON 객체가 아닙니다")
+
+    raw_findings = payload.get("findings") or []
+    findings = [f for f in (validate_finding(item, file_path, line_range) for item in raw_findings) if f]
+    dropped = len(raw_findings) - len(findings)
+    if dropped:
+        logger.warning(f"형식이 맞지 않는 지적 사항 {dropped}건 제외")
+
+    return {"summary": str(payload.get("summary") or "").strip(), "findings": findings, "dropped": dropped}
+
+
+def _sort_key(finding: Dict):
+    return (SEVERITY_ORDER.index(finding["severity"]), finding["file"], finding["line_start"], finding["rule"])
+
+
+def merge_findings(*finding_lists: List[Dict]) -> List[Dict]:
+    """
+    여러 영역/파일의 지적 사항 병합 (같은 위치·규칙·내용은 하나로, 심각도 → 파일 → 줄 순 정렬)
+    """
+    merged = {}
+    for findings in finding_lists:
+        for finding in findings:
+            key = (finding["file"], finding["line_start"], finding["line_end"],
+                   finding["rule"], finding["message"])
+            current = merged.get(key)
+            # 중복이면 더 심각한 쪽을 남김
+            if current is None or _sort_key(finding) < _sort_key(current):
+                merged[key] = finding
+    return sorted(merged.values(), key=_sort_key)
+
+
+def count_by_severity(findings: List[Dict]) -> Dict[str, int]:
+    """심각도별 지적 사항 수"""
+    counts = dict.fromkeys(SEVERITY_ORDER, 0)
+    for finding in findings:
+        counts[finding["severity"]] += 1
+    return counts
+
+
+def _is_region_boundary(line: str) -> bool:
+    """
+    영역 경계 후보 여부 (들여쓰기 없는 최상위 줄 중 내용 해시로 약 1/REGION_CUT_MODULUS만 선택)
+    경계를 줄 위치가 아닌 내용으로 정하므로 앞쪽에 코드가 추가되어도 뒤쪽 영역은 그대로 유지되어 캐시 재사용 가능
+    """
+    if not line or line[0].isspace():
+        return False
+    return int(hashlib.md5(line.encode("utf-8")).hexdigest()[:8], 16) % REGION_CUT_MODULUS == 0
+
+
+def split_code_regions(
+    code: str,
+    min_lines: int = REGION_MIN_LINES,
+    max_lines: int = REGION_MAX_LINES
+) -> List[Tuple[int, str]]:
+    """
+    코드를 리뷰 영역으로 분할 (내용 기반 경계, 경계 후보가 없으면 max_lines에서 자름)
+
+    Returns:
+        [(시작 줄 번호(1부터), 영역 코드)]
+    """
+    lines = code.splitlines()
+    regions = []
+    start = 0
+    for i in range(1, len(lines) + 1):
+        size = i - start
+        at_boundary = i < len(lines) and size >= min_lines and _is_region_boundary(lines[i])
+        if i == len(lines) or at_boundary or size >= max_lines:
+            regions.append((start + 1, "\n".join(lines[start:i])))
+            start = i
+    return regions or [(1, code)]
+
+
+def number_lines(code: str, start_line: int = 1) -> str:
+    """모델이 정확한 줄 번호를 쓰도록 각 줄 앞에 줄 번호 표시"""
+    return "\n".join(f"{start_line + i:>5}| {line}" for i, line in enumerate(code.splitlines()))
+
+
+def region_cache_key(region_code: str, scope: str) -> str:
+    """영역 코드 + 리뷰 범위(언어/옵션) 기반 캐시 키 (줄 위치와 무관)"""
+    return hashlib.sha256(f"{scope}\n{region_code}".encode("utf-8")).hexdigest()
+
+
+def shift_findings(findings: List[Dict], offset: int, file_path: str = None) -> List[Dict]:
+    """지적 사항의 줄 번호를 offset만큼 이동 (캐시에는 영역 기준 상대 줄 번호로 보관)"""
+    shifted = []
+    for finding in findings:
+        moved = dict(finding, line_start=finding["line_start"] + offset, line_end=finding["line_end"] + offset)
+        if file_path is not None:
+            moved["file"] = file_path
+        shifted.append(moved)
+    return shifted
+
+
+class FindingsCache:
+    """
+    코드 영역별 지적 사항 캐시 (LRU, 스레드 안전)
+    같은 함수/클래스가 다른 파일이나 다른 위치에 있어도 재사용되도록 상대 줄 번호로 저장
+    """
+
+    def __init__(self, max_entries: int = REGION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            findings = self._entries.get(key)
+            if findings is not None:
+                self._entries.move_to_end(key)
+            return findings
+
+    def put(self, key: str, findings: List[Dict]):
+        with self._lock:
+            self._entries[key] = findings
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def render_findings_markdown(result: Dict) -> str:
+    """구조화된 리뷰 결과를 마크다운으로 변환 (다운로드/기존 화면 호환용)"""
+    findings = result.get("findings", [])
+    counts = count_by_severity(findings)
+    lines = [
+        "#### 📝 코드 리뷰 결과",
+        "",
+        f"**언어**: {result.get('language', 'unknown')}",
+        "**지적 사항**: " + " / ".join(f"{SEVERITY_ICONS[s]} {counts[s]}" for s in SEVERITY_ORDER),
+        "",
+    ]
+    if result.get("summary"):
+        lines += [result["summary"], ""]
+    if result.get("skipped_regions"):
+        lines += [
+            f"> ⚠️ 코드가 길어 {result['skipped_from_line']}번째 줄부터 "
+            f"(영역 {result['skipped_regions']}개)는 리뷰하지 않았습니다.",
+            ""
+        ]
+
+    for finding in findings:
+        lines.append(format_finding_title(finding))
+        lines.append(f"  - 문제: {finding['message']}")
+        if finding["suggestion"]:
+            lines.append(f"  - 개선: {finding['suggestion']}")
+        if finding["patch"]:
+            lines += ["", "```diff", finding["patch"], "```"]
+        lines.append("")
+
+    if not findings:
+        lines.append("지적 사항이 없습니다.")
+    return "\n".join(lines)
+
+
+def format_finding_title(finding: Dict) -> str:
+    """지적 사항 한 줄 요약 (예: 🔴 [security] app.py:10-12)"""
+    location = f"{finding['file']}:{finding['line_start']}"
+    if finding["line_end"] != finding["line_start"]:
+        location += f"-{finding['line_end']}"
+    return f"- {SEVERITY_ICONS[finding['severity']]} **[{finding['rule']}]** {location}"
@@ -0,0 +1,101 @@
+"""
+Azure AI Search OData 필터 생성 모듈
+- 값의 작은따옴표를 이스케이프하여 필터 인젝션 방지 (language eq 'x' or 1 eq 1 같은 입력 무력화)
+- 조건과 값을 정렬해 같은 의미의 필터는 항상 같은 문자열이 되도록 정규화 (결과 캐시 키로 사용)
+- 여러 값 중 하나와 일치하는 조건은 긴 or 체인 대신 search.in 사용 (서비스 측 파싱 비용 감소)
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
+
+# search.in 구분자 후보 (값에 포함되지 않은 첫 구분자 사용)
+_IN_DELIMITERS = (",", "|", ";", "~", "^")
+
+# 정규화된 필터 문자열 캐시 크기
+FILTER_CACHE_SIZE = 1024
+
+
+def escape_value(value) -> str:
+    """OData 문자열 리터럴 이스케이프 (작은따옴표를 두 번 씀)"""
+    return str(value).replace("'", "''")
+
+
+def _in_delimiter(values: Iterable[str]) -> str:
+    joined = "".join(values)
+    for delimiter in _IN_DELIMITERS:
+        if delimiter not in joined:
+            return delimiter
+    raise ValueError("search.in에 사용할 수 있는 구분자가 없습니다")
+
+
+class ODataFilter:
+    """
+    OData 필터 빌더
+    조건을 추가한 순서와 관계없이 build() 결과는 항상 같은 정규화된 문자열
+
+    예:
+        ODataFilter().eq("language", "python").any_in("tech_stack", ["react", "python"]).build()
+        -> "language eq 'python' and tech_stack/any(t: search.in(t, 'python,react', ','))"
+    """
+
+    def __init__(self):
+        self._clauses: List[str] = []
+
+    def eq(self, field: str, value) -> "ODataFilter":
+        """field eq 'value' (값이 None/빈 문자열이면 무시)"""
+        if value not in (None, ""):
+            self._clauses.append(f"{field} eq '{escape_value(value)}'")
+        return self
+
+    def in_(self, field: str, values: Iterable[str]) -> "ODataFilter":
+        """단일 값 필드가 values 중 하나와 일치 (search.in)"""
+        values = sorted({str(v) for v in values or [] if v not in (None, "")})
+        if len(values) == 1:
+            return self.eq(field, values[0])
+        if values:
+            delimiter = _in_delimiter(values)
+            self._clauses.append(f"search.in({field}, '{escape_value(delimiter.join(values))}', '{delimiter}')")
+        return self
+
+    def any_in(self, field: str, values: Iterable[str]) -> "ODataFilter":
+        """컬렉션 필드의 원소 중 하나가 values 중 하나와 일치"""
+        values = sorted({str(v) for v in values or [] if v not in (None, "")})
+        if len(values) == 1:
+            self._clauses.append(f"{field}/any(t: t eq '{escape_value(values[0])}')")
+        elif values:
+            delimiter = _in_delimiter(values)
+            self._clauses.append(
+                f"{field}/any(t: search.in(t, '{escape_value(delimiter.join(values))}', '{delimiter}'))"
+            )
+        return self
+
+    def build(self) -> Optional[str]:
+        """정규화된 필터 문자열 (조건이 없으면 None)"""
+        if not self._clauses:
+            return None
+        return " and ".join(sorted(set(self._clauses)))
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _conventions_filter(language: Optional[str], category: Optional[str], companies: Tuple[str, ...]) -> Optional[str]:
+    return ODataFilter().eq("language", language).eq("category", category).in_("company", companies).build()
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _templates_filter(tech_stack: Tuple[str, ...], os_type: Optional[str]) -> Optional[str]:
+    return ODataFilter().any_in("tech_stack", tech_stack).any_in("os_support", [os_type] if os_type else []).build()
+
+
+def conventions_filter(
+    language: str = None,
+    category: str = None,
+    company: Union[str, Iterable[str]] = None
+) -> Optional[str]:
+    """코딩 컨벤션 검색 필터 (company는 회사명 하나 또는 여러 개, 같은 입력은 캐시된 문자열 반환)"""
+    companies = [company] if isinstance(company, str) else company or []
+    return _conventions_filter(language or None, category or None, tuple(sorted(set(companies))))
+
+
+def templates_filter(tech_stack: Iterable[str] = None, os_type: str = None) -> Optional[str]:
+    """환경 설정 템플릿 검색 필터 (기술 스택 순서/중복과 관계없이 같은 문자열)"""
+    return _templates_filter(tuple(sorted(set(tech_stack or []))), os_type or None)
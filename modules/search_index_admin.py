@@ -0,0 +1,205 @@
+"""
+Azure AI Search 인덱스 관리 모듈
+인덱스 생성/삭제 등 관리자 작업 담당 (검색 경로와 분리해 앱 시작 시 import 비용 절감)
+"""
+
+from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import (
+    SearchIndex,
+    SearchField,
+    SearchFieldDataType,
+    SimpleField,
+    SearchableField,
+    VectorSearch,
+    VectorSearchProfile,
+    VectorSearchAlgorithmKind,
+    VectorSearchAlgorithmMetric,
+    HnswAlgorithmConfiguration,
+    HnswParameters
+)
+from typing import Dict
+import logging
+
+from modules.index_profiles import COMPRESSION_SCALAR, resolve_index_profile
+
+logger = logging.getLogger(__name__)
+
+class SearchIndexAdmin:
+    """
+    Azure AI Search 인덱스 관리 클라이언트
+    """
+    
+    def __init__(self, search_endpoint: str, credential, conventions_index: str, templates_index: str,
+                 profile: Dict = None):
+        """
+        초기화
+        
+        Args:
+            search_endpoint: Azure AI Search 엔드포인트
+            credential: AzureKeyCredential
+            conventions_index: 코딩 컨벤션 인덱스 이름
+            templates_index: 환경 설정 템플릿 인덱스 이름
+            profile: 인덱스 프로필 (None이면 resolve_index_profile()로 환경 변수에서 결정)
+        """
+        self.conventions_index = conventions_index
+        self.templates_index = templates_index
+        self.profile = profile or resolve_index_profile()
+        self.index_client = SearchIndexClient(
+            endpoint=search_endpoint,
+            credential=credential
+        )
+    
+    def _vector_search(self, prefix: str) -> VectorSearch:
+        """
+        벡터 검색 설정 생성
+        스칼라 양자화는 이를 지원하는 SDK(azure-search-documents 11.5 이상)에서만 적용,
+        그 외에는 경고 후 압축 없이 생성
+        """
+        profile = self.profile
+        algorithm = HnswAlgorithmConfiguration(
+            name=f"{prefix}-hnsw",
+            kind=VectorSearchAlgorithmKind.HNSW,
+            parameters=HnswParameters(
+                m=profile["m"],
+                ef_construction=profile["ef_construction"],
+                ef_search=profile["ef_search"],
+                metric=VectorSearchAlgorithmMetric.COSINE
+            )
+        )
+        
+        compressions = []
+        compression_name = None
+        if profile["compression"] == COMPRESSION_SCALAR:
+            try:
+                from azure.search.documents.indexes.models import (
+                    ScalarQuantizationCompression,
+                    ScalarQuantizationParameters
+                )
+                compression_name = f"{prefix}-sq"
+                compressions.append(ScalarQuantizationCompression(
+                    compression_name=compression_name,
+                    rerank_with_original_vectors=True,
+                    default_oversampling=profile["oversampling"],
+                    parameters=ScalarQuantizationParameters(quantized_data_type="int8")
+                ))
+            except ImportError:
+                logger.warning("설치된 azure-search-documents가 스칼라 양자화를 지원하지 않아 압축 없이 생성합니다")
+        
+        profile_kwargs = {"compression_name": compression_name} if compression_name else {}
+        vector_search_kwargs = {"compressions": compressions} if compressions else {}
+        logger.info(
+            f"인덱스 프로필 {profile['name']}: m={profile['m']}, efConstruction={profile['ef_construction']}, "
+            f"efSearch={profile['ef_search']}, 압축={compression_name or 'none'}"
+        )
+        return VectorSearch(
+            profiles=[
+                VectorSearchProfile(
+                    name=f"{prefix}-profile",
+                    algorithm_configuration_name=f"{prefix}-hnsw",
+                    **profile_kwargs
+                )
+            ],
+            algorithms=[algorithm],
+            **vector_search_kwargs
+        )
+    
+    def _chunk_fields(self) -> list:
+        """청크 문서 필드 (원본 문서 id, 청크 순번, 제목 경로)"""
+        return [
+            SimpleField(name="parent_id", type=SearchFieldDataType.String, filterable=True),
+            SimpleField(name="chunk_index", type=SearchFieldDataType.Int32, sortable=True),
+            SearchableField(name="section", type=SearchFieldDataType.String),
+        ]
+    
+    def create_conventions_index(self, index_name: str = None) -> bool:
+        """코딩 컨벤션 인덱스 생성 (index_name을 주면 테넌트 전용 인덱스로 생성)"""
+        try:
+            # 벡터 검색 설정 (인덱스 프로필의 HNSW 파라미터/압축 방식)
+            vector_search = self._vector_search("conventions")
+            
+            # 필드 정의
+            fields = [
+                SimpleField(name="id", type=SearchFieldDataType.String, key=True),
+                SearchableField(name="title", type=SearchFieldDataType.String),
+                SearchableField(name="content", type=SearchFieldDataType.String),
+                SimpleField(name="category", type=SearchFieldDataType.String, filterable=True),
+                SimpleField(name="language", type=SearchFieldDataType.String, filterable=True),
+                SimpleField(name="company", type=SearchFieldDataType.String, filterable=True),
+                SimpleField(name="project_type", type=SearchFieldDataType.String, filterable=True),
+                SimpleField(name="tags", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
+                SimpleField(name="priority", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
+                *self._chunk_fields(),
+                SearchField(
+                    name="content_vector",
+                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                    searchable=True,
+                    vector_search_dimensions=1536,
+                    vector_search_profile_name="conventions-profile"
+                )
+            ]
+            
+            # 인덱스 생성
+            index = SearchIndex(
+                name=index_name or self.conventions_index,
+                fields=fields,
+                vector_search=vector_search
+            )
+            
+            result = self.index_client.create_or_update_index(index)
+            logger.info(f"코딩 컨벤션 인덱스 생성 완료: {result.name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"인덱스 생성 실패: {str(e)}")
+            return False
+    
+    def create_templates_index(self) -> bool:
+        """환경 설정 템플릿 인덱스 생성"""
+        try:
+            # 벡터 검색 설정 (인덱스 프로필의 HNSW 파라미터/압축 방식)
+            vector_search = self._vector_search("templates")
+            
+            # 필드 정의
+            fields = [
+                SimpleField(name="id", type=SearchFieldDataType.String, key=True),
+                SearchableField(name="title", type=SearchFieldDataType.String),
+                SearchableField(name="content", type=SearchFieldDataType.String),
+                SimpleField(name="category", type=SearchFieldDataType.String, filterable=True),
+                SimpleField(name="tech_stack", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
+                SimpleField(name="os_support", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
+                SimpleField(name="prerequisites", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
+                SimpleField(name="difficulty", type=SearchFieldDataType.String, filterable=True),
+                *self._chunk_fields(),
+                SearchField(
+                    name="content_vector",
+                    type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                    searchable=True,
+                    vector_search_dimensions=1536,
+                    vector_search_profile_name="templates-profile"
+                )
+            ]
+            
+            # 인덱스 생성
+            index = SearchIndex(
+                name=self.templates_index,
+                fields=fields,
+                vector_search=vector_search
+            )
+            
+            result = self.index_client.create_or_update_index(index)
+            logger.info(f"환경 설정 템플릿 인덱스 생성 완료: {result.name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"인덱스 생성 실패: {str(e)}")
+            return False
+    
+    def delete_index(self, index_name: str) -> bool:
+        """인덱스 삭제"""
+        try:
+            self.index_client.delete_index(index_name)
+            logger.info(f"인덱스 삭제 완료: {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"인덱스 삭제 실패: {str(e)}")
+            return False
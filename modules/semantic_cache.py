@@ -0,0 +1,285 @@
+"""
+시맨틱 캐시 모듈
+거의 같은 README/코드(보일러플레이트 등)에 대해 이전에 생성한 가이드/리뷰를 재사용
+정규화된 입력의 임베딩을 메모리 벡터 행렬에 보관하고 코사인 유사도로 검색
+
+디스크 스냅샷에는 버전 키(채팅/임베딩 모델, 프롬프트 버전, 인덱스 버전)를 함께 기록하여
+설정이 바뀐 뒤에는 예전 결과를 불러오지 않음 (modules/cache_snapshot.py)
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from modules.cache_keys import make_scope, normalize_text
+from modules.cache_snapshot import read_snapshot, write_snapshot
+from modules.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(".bluebell", "semantic_cache.snap")
+SNAPSHOT_KIND = "semantic_cache"
+
+# 입력 해시별 임베딩 보관 개수 (조회 실패 후 같은 입력을 저장할 때 임베딩을 다시 호출하지 않도록)
+DEFAULT_EMBEDDING_CACHE_SIZE = 256
+
+# 임베딩 모델 입력 한도를 넘지 않도록 앞부분만 임베딩
+MAX_EMBED_CHARS = 8000
+
+
+class SemanticCache:
+    """
+    임베딩 유사도 기반 캐시
+    - 완전히 같은 입력은 임베딩 호출 없이 해시로 바로 조회
+    - 그 외에는 같은 범위(scope)의 항목 중 코사인 유사도가 threshold 이상인 결과 반환
+    - max_entries 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        threshold: float = 0.97,
+        max_entries: int = 1000,
+        persist_path: str = None,
+        autosave_every: int = 20,
+        version: Dict[str, str] = None,
+        embedding_cache_size: int = DEFAULT_EMBEDDING_CACHE_SIZE
+    ):
+        """
+        초기화
+
+        Args:
+            embed_fn: 텍스트를 임베딩 벡터로 변환하는 함수
+            threshold: 캐시 적중으로 판단할 최소 코사인 유사도
+            max_entries: 최대 보관 항목 수
+            persist_path: 디스크 저장 경로 (None이면 저장하지 않음)
+            autosave_every: 이 횟수만큼 저장될 때마다 디스크에 기록
+            version: 스냅샷 버전 키 (cache_version으로 생성, 다르면 디스크 스냅샷을 무시)
+            embedding_cache_size: 입력 해시별 임베딩 보관 개수
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.autosave_every = autosave_every
+        self.version = version or {}
+        self.embedding_cache = LRUCache(max_entries=embedding_cache_size)
+
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None   # (max_entries, dim) float32, 정규화된 벡터
+        self._scope_ids = np.full(max_entries, -1, dtype=np.int32)  # 빈 슬롯은 -1
+        self._scopes: Dict[str, int] = {}
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()  # 슬롯 -> 항목 (LRU 순서)
+        self._hash_index: Dict[Tuple[str, str], int] = {}
+        self._dirty_writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        if persist_path and os.path.exists(persist_path):
+            self.load()
+
+    def get(self, text: str, scope: str) -> Optional[str]:
+        """
+        캐시 조회
+
+        Args:
+            text: 원본 입력 (README 또는 코드)
+            scope: make_scope로 만든 범위 문자열
+
+        Returns:
+            캐시된 결과 (없으면 None)
+        """
+        match = self.lookup(text, scope)
+        return match["value"] if match else None
+
+    def lookup(self, text: str, scope: str) -> Optional[Dict]:
+        """
+        캐시 조회 (유사도 정보 포함)
+
+        Returns:
+            {"value", "similarity", "exact"} 또는 None
+        """
+        normalized = normalize_text(text)
+        content_hash = self._hash(normalized)
+
+        with self._lock:
+            slot = self._hash_index.get((scope, content_hash))
+            if slot is not None:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                return {"value": self._entries[slot]["value"], "similarity": 1.0, "exact": True}
+
+            scope_id = self._scopes.get(scope)
+            if scope_id is None or self._vectors is None:
+                self.misses += 1
+                return None
+
+        # 임베딩 호출은 락 밖에서 수행
+        query = self._embed(normalized, content_hash)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._vectors is None or query.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+            candidates = np.flatnonzero(self._scope_ids == scope_id)
+            if candidates.size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[candidates] @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            slot = int(candidates[best])
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            logger.info(f"시맨틱 캐시 적중 (유사도 {similarity:.3f}, 범위 {scope})")
+            return {"value": self._entries[slot]["value"], "similarity": similarity, "exact": False}
+
+    def put(self, text: str, scope: str, value: str):
+        """
+        결과 저장
+
+        Args:
+            text: 원본 입력
+            scope: 범위 문자열
+            value: 저장할 결과
+        """
+        normalized = normalize_text(text)
+        content_hash = self._hash(normalized)
+        vector = self._embed(normalized, content_hash)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            elif vector.shape[0] != self._vectors.shape[1]:
+                logger.warning("임베딩 차원이 캐시와 달라 저장하지 않습니다")
+                return
+
+            slot = self._hash_index.get((scope, content_hash))
+            if slot is None:
+                slot = self._allocate_slot()
+
+            scope_id = self._scopes.setdefault(scope, len(self._scopes))
+            self._vectors[slot] = vector
+            self._scope_ids[slot] = scope_id
+            self._entries[slot] = {"scope": scope, "hash": content_hash, "value": value}
+            self._entries.move_to_end(slot)
+            self._hash_index[(scope, content_hash)] = slot
+            self._dirty_writes += 1
+            should_save = self.persist_path and self._dirty_writes >= self.autosave_every
+
+        if should_save:
+            self.save()
+
+    def stats(self) -> Dict:
+        """적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+    def save(self):
+        """디스크에 스냅샷 저장 (항목 + 입력별 임베딩, 임시 파일에 쓴 뒤 교체)"""
+        if not self.persist_path:
+            return
+        with self._lock:
+            if self._vectors is None:
+                return
+            slots = list(self._entries.keys())  # LRU 순서 유지
+            vectors = self._vectors[slots].copy()
+            metadata = json.dumps([self._entries[slot] for slot in slots], ensure_ascii=False)
+            self._dirty_writes = 0
+
+        embeddings = [(key, vector) for key, vector, _ in self.embedding_cache.items()
+                      if vector.shape[0] == vectors.shape[1]]
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            vectors=vectors,
+            metadata=np.array(metadata),
+            embedding_hashes=np.array(json.dumps([key for key, _ in embeddings])),
+            embedding_vectors=np.array([vector for _, vector in embeddings], dtype=np.float32).reshape(
+                len(embeddings), vectors.shape[1]
+            )
+        )
+        write_snapshot(self.persist_path, SNAPSHOT_KIND, self.version, buffer.getvalue(), entries=len(slots))
+
+    def load(self):
+        """디스크 스냅샷 불러오기 (버전 키가 다르거나 손상된 파일은 무시)"""
+        payload = read_snapshot(self.persist_path, SNAPSHOT_KIND, self.version)
+        if payload is None:
+            return
+        try:
+            with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+                vectors = data["vectors"].astype(np.float32)
+                entries = json.loads(str(data["metadata"]))
+                embedding_hashes = json.loads(str(data["embedding_hashes"]))
+                embedding_vectors = data["embedding_vectors"].astype(np.float32)
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 로드 실패: {str(e)}")
+            return
+
+        # 최근 사용 항목이 뒤에 있으므로 용량 초과 시 앞쪽을 버림
+        entries = entries[-self.max_entries:]
+        vectors = vectors[-self.max_entries:]
+
+        with self._lock:
+            self._vectors = np.zeros((self.max_entries, vectors.shape[1]), dtype=np.float32)
+            for slot, (vector, entry) in enumerate(zip(vectors, entries)):
+                scope_id = self._scopes.setdefault(entry["scope"], len(self._scopes))
+                self._vectors[slot] = vector
+                self._scope_ids[slot] = scope_id
+                self._entries[slot] = entry
+                self._hash_index[(entry["scope"], entry["hash"])] = slot
+        self.embedding_cache.restore(
+            (key, vector, None) for key, vector in zip(embedding_hashes, embedding_vectors)
+        )
+        logger.info(f"시맨틱 캐시 로드 완료: {len(entries)}개 항목, 임베딩 {len(embedding_hashes)}개")
+
+    def _allocate_slot(self) -> int:
+        """빈 슬롯 할당 (가득 찼으면 LRU 항목 제거)"""
+        # 항목은 LRU 제거 시에만 빠지고 그 슬롯을 바로 재사용하므로 0..n-1이 항상 채워져 있음
+        if len(self._entries) < self.max_entries:
+            return len(self._entries)
+
+        slot, evicted = self._entries.popitem(last=False)
+        self._hash_index.pop((evicted["scope"], evicted["hash"]), None)
+        self._scope_ids[slot] = -1
+        return slot
+
+    def _embed(self, normalized: str, content_hash: str) -> Optional[np.ndarray]:
+        """임베딩 생성 후 단위 벡터로 정규화 (같은 입력은 보관한 임베딩 재사용)"""
+        cached = self.embedding_cache.get(content_hash)
+        if cached is not None:
+            return cached
+        try:
+            vector = np.asarray(self.embed_fn(normalized[:MAX_EMBED_CHARS]), dtype=np.float32)
+        except Exception as e:
+            logger.error(f"시맨틱 캐시 임베딩 실패: {str(e)}")
+            return None
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm > 0 else vector
+        self.embedding_cache.put(content_hash, vector)
+        return vector
+
+    def _hash(self, normalized: str) -> str:
+        """정규화된 입력의 해시"""
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
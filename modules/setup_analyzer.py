@@ -2,6 +2,12 @@ import re
 from typing import Dict, List, Optional
 import logging
 
+from modules.azure_client import COMPLETION_ERROR_PREFIX
+from modules.cache_keys import make_scope
+from modules.tracing import get_tracer
+from modules.history_store import KIND_GUIDE
+from modules.usage_tracker import current_usage_labels, usage_context
+
 logger = logging.getLogger(__name__)
 
 class SetupAnalyzer:
@@ -9,16 +15,20 @@ class SetupAnalyzer:
     README 파일을 분석하여 환경 설정 가이드를 생성하는 클래스
     """
 
-    def __init__(self, azure_client, rag_service=None):
+    def __init__(self, azure_client, rag_service=None, semantic_cache=None, history_store=None):
         """
         초기화
         
         Args:
             azure_client: AzureOpenAIClient 인스턴스
             rag_service: RAGService 인스턴스 (선택사항)
+            semantic_cache: SemanticCache 인스턴스 (선택사항)
+            history_store: HistoryStore 인스턴스 (선택사항)
         """
         self.azure_client = azure_client
         self.rag_service = rag_service
+        self.semantic_cache = semantic_cache
+        self.history_store = history_store
         
     def generate_guide(self, readme_content: str, os_type: str = "all") -> str:
         """
@@ -30,32 +40,69 @@ class SetupAnalyzer:
         Returns:
             생성된 개발 환경 세팅 가이드
         """
-        try:
-            # RAG 서비스가 있으면 RAG 사용, 없으면 기본 방식
-            if self.rag_service:
-                logger.info("RAG 서비스를 사용하여 가이드 생성")
-                result = self.rag_service.enhance_setup_guide(readme_content, os_type)
+        with usage_context(feature="setup_guide"), \
+                get_tracer().span("setup_guide.generate", readme_chars=len(readme_content), os_type=os_type) as span:
+            try:
+                # 시맨틱 캐시 조회 (보일러플레이트 README는 이전 가이드 재사용)
+                cache_scope = make_scope(kind="guide", os_type=os_type)
+
+                # 기록 저장소 조회 (같은 README/OS로 생성한 가이드가 있으면 재사용)
+                if self.history_store:
+                    entry = self.history_store.find(readme_content, cache_scope)
+                    span.set("history_hit", entry is not None)
+                    if entry:
+                        logger.info("기록 저장소에서 가이드 반환")
+                        return entry["result"]
+
+                if self.semantic_cache:
+                    cached = self.semantic_cache.get(readme_content, cache_scope)
+                    span.set("cache_hit", cached is not None)
+                    if cached:
+                        logger.info("시맨틱 캐시에서 가이드 반환")
+                        return cached
+
+                # RAG 서비스가 있으면 RAG 사용, 없으면 기본 방식
+                if self.rag_service:
+                    logger.info("RAG 서비스를 사용하여 가이드 생성")
+                    result = self.rag_service.enhance_setup_guide(readme_content, os_type)
                 
-                if result["success"]:
-                    # RAG 결과 포맷팅
-                    guide = self._format_rag_guide(result, os_type)
-                    return guide
+                    span.set("mode", "rag" if result["success"] else "rag_fallback")
+                    if result["success"]:
+                        # RAG 결과 포맷팅
+                        guide = self._format_rag_guide(result, os_type)
+                        self._cache_guide(readme_content, cache_scope, guide, os_type)
+                        return guide
+                    else:
+                        logger.warning("RAG 실패, 기본 방식으로 폴백")
+                        # 폴백: 기본 방식
+                        guide = self.azure_client.analyze_readme(readme_content, os_type)
                 else:
-                    logger.warning("RAG 실패, 기본 방식으로 폴백")
-                    # 폴백: 기본 방식
+                    logger.info("기본 방식으로 가이드 생성")
+                    span.set("mode", "basic")
+                    # 기본 Azure OpenAI 방식
                     guide = self.azure_client.analyze_readme(readme_content, os_type)
-            else:
-                logger.info("기본 방식으로 가이드 생성")
-                # 기본 Azure OpenAI 방식
-                guide = self.azure_client.analyze_readme(readme_content, os_type)
             
-            # 포맷팅 개선
-            guide = self._format_guide(guide, os_type)
-            return guide
+                # 포맷팅 개선
+                guide = self._format_guide(guide, os_type)
+                self._cache_guide(readme_content, cache_scope, guide, os_type)
+                return guide
         
-        except Exception as e:
-            logger.error(f"가이드 생성 오류: {str(e)}")
-            return self._generate_fallback_guide(readme_content, os_type)
+            except Exception as e:
+                span.record_error(e)
+                logger.error(f"가이드 생성 오류: {str(e)}")
+                return self._generate_fallback_guide(readme_content, os_type)
+
+    def _cache_guide(self, readme_content: str, cache_scope: str, guide: str, os_type: str = None):
+        """정상 생성된 가이드만 시맨틱 캐시와 기록 저장소에 저장"""
+        if COMPLETION_ERROR_PREFIX in guide:
+            return
+        if self.semantic_cache:
+            self.semantic_cache.put(readme_content, cache_scope, guide)
+        if self.history_store:
+            self.history_store.add(
+                KIND_GUIDE, readme_content, cache_scope, guide,
+                os_type=os_type, owner=current_usage_labels().get("session_id")
+            )
 
     def _format_rag_guide(self, rag_result: Dict, os_type: str) -> str:
         """RAG 결과를 포맷팅"""
@@ -0,0 +1,117 @@
+"""
+테넌트(회사)별 코딩 컨벤션 검색 라우터
+회사마다 어느 인덱스를 검색할지와 어떤 company 필터를 붙일지 결정
+
+- 기본: 모든 회사가 공용 인덱스(coding-conventions)를 쓰고 company 필터로 자기 문서만 검색
+- 전용 인덱스: 문서가 많은 회사는 별도 인덱스로 분리 (필터 없이 그 인덱스만 검색)
+- 공용 규칙: shared 회사의 문서는 모든 회사의 검색 결과에 포함
+
+설정은 BLUEBELL_TENANTS_FILE(JSON)로 지정:
+    {
+        "shared": "common",
+        "indexes": {"acme": "coding-conventions-acme"}
+    }
+파일이 없으면 모든 회사가 공용 인덱스 + company 필터 사용
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONVENTIONS_INDEX = "coding-conventions"
+
+
+def normalize_tenant(company: Optional[str]) -> Optional[str]:
+    """회사명 정규화 (대소문자/공백 차이 무시, 빈 값은 None)"""
+    if company is None:
+        return None
+    company = str(company).strip().lower()
+    return company or None
+
+
+class TenantRouter:
+    """
+    회사 → (검색 인덱스, company 필터 값) 라우터
+    """
+
+    def __init__(
+        self,
+        default_index: str = DEFAULT_CONVENTIONS_INDEX,
+        tenant_indexes: Dict[str, str] = None,
+        shared_company: str = None
+    ):
+        """
+        초기화
+
+        Args:
+            default_index: 공용 인덱스 이름
+            tenant_indexes: 회사명 → 전용 인덱스 이름
+            shared_company: 모든 회사가 함께 보는 공용 규칙의 company 값
+        """
+        self.default_index = default_index
+        self.tenant_indexes = {
+            normalize_tenant(company): index for company, index in (tenant_indexes or {}).items()
+        }
+        self.shared_company = normalize_tenant(shared_company)
+
+    def route(self, company: Optional[str]) -> Tuple[str, Tuple[str, ...]]:
+        """
+        검색 경로 결정
+
+        Args:
+            company: 회사명 (None이면 회사 구분 없이 공용 인덱스 전체 검색)
+
+        Returns:
+            (인덱스 이름, company 필터 값 - 비어 있으면 필터 없음)
+        """
+        tenant = normalize_tenant(company)
+        if tenant is None:
+            return self.default_index, ()
+        if tenant in self.tenant_indexes:
+            # 전용 인덱스에는 그 회사 문서(와 복제된 공용 규칙)만 있으므로 필터 불필요
+            return self.tenant_indexes[tenant], ()
+        companies = {tenant}
+        if self.shared_company:
+            companies.add(self.shared_company)
+        return self.default_index, tuple(sorted(companies))
+
+    def indexes_for_document(self, company: Optional[str]) -> List[str]:
+        """
+        문서를 업로드할 인덱스 목록
+        공용 규칙 문서는 공용 인덱스와 모든 전용 인덱스에 복제
+        """
+        tenant = normalize_tenant(company)
+        if tenant is not None and tenant == self.shared_company:
+            return [self.default_index] + sorted(set(self.tenant_indexes.values()))
+        return [self.tenant_indexes.get(tenant, self.default_index)]
+
+    def all_indexes(self) -> List[str]:
+        """관리 대상 컨벤션 인덱스 전체"""
+        return [self.default_index] + sorted(set(self.tenant_indexes.values()) - {self.default_index})
+
+
+def load_tenant_router(config_path: str = None, default_index: str = DEFAULT_CONVENTIONS_INDEX) -> TenantRouter:
+    """
+    BLUEBELL_TENANTS_FILE(JSON)에서 라우터 생성
+    파일이 없거나 읽지 못하면 공용 인덱스만 쓰는 라우터 반환
+    """
+    config_path = config_path or os.getenv("BLUEBELL_TENANTS_FILE")
+    if not config_path:
+        return TenantRouter(default_index)
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.error(f"테넌트 설정 로드 실패 ({config_path}): {str(e)}")
+        return TenantRouter(default_index)
+
+    indexes = config.get("indexes") or {}
+    if not isinstance(indexes, dict):
+        raise ValueError(f"테넌트 설정의 indexes는 회사명 → 인덱스 이름 객체여야 합니다: {config_path}")
+
+    logger.info(f"테넌트 라우터: 전용 인덱스 {len(indexes)}개, 공용 규칙 {config.get('shared') or '없음'}")
+    return TenantRouter(default_index, indexes, config.get("shared"))
@@ -0,0 +1,233 @@
+"""
+지연 시간 추적(트레이싱) 모듈
+코드 리뷰/가이드 생성 파이프라인의 단계별 소요 시간, 토큰 수, 캐시 적중, 재시도 횟수를
+span 단위로 기록하고 교체 가능한 exporter(log/JSONL/OpenTelemetry)로 내보냄
+
+사용 예:
+    tracer = get_tracer()
+    with tracer.span("rag.search", index="coding-conventions") as span:
+        results = search(...)
+        span.set("result_count", len(results))
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.path.join(".bluebell", "traces.jsonl")
+
+# 현재 실행 중인 span (스레드/작업별로 분리됨)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("bluebell_current_span", default=None)
+
+
+class Span:
+    """
+    하나의 처리 단계
+    시작/종료 시각과 속성(attributes)을 가지며 부모 span과 같은 trace_id를 공유
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter()
+        self.end_ns: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+
+    def set(self, key: str, value: Any):
+        """속성 설정"""
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float = 1):
+        """숫자 속성 누적 (토큰 수, 재시도 횟수 등)"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def record_error(self, error: Exception):
+        """오류 기록"""
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def finish(self):
+        """종료 시각 기록"""
+        self.end_ns = time.time_ns()
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+
+    def to_dict(self) -> Dict:
+        """
+        OpenTelemetry span 필드명과 호환되는 딕셔너리로 변환
+        (trace_id/span_id는 OTLP와 같은 32/16자리 hex)
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.error},
+        }
+
+
+class LoggingSpanExporter:
+    """span을 로그로 출력"""
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def export(self, span: Span):
+        logger.log(
+            self.level,
+            f"[trace] {span.name} {span.duration_ms:.1f}ms "
+            f"status={span.status} attrs={json.dumps(span.attributes, ensure_ascii=False, default=str)}"
+        )
+
+
+class JsonlSpanExporter:
+    """span을 한 줄씩 JSONL 파일에 추가 (오프라인 분석용)"""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("BLUEBELL_TRACE_FILE", DEFAULT_TRACE_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class OpenTelemetrySpanExporter:
+    """
+    완료된 span을 OpenTelemetry SDK로 전달
+    opentelemetry 패키지가 설치되어 있고 TracerProvider가 설정된 경우에만 사용 가능
+    """
+
+    def __init__(self, instrumentation_name: str = "bluebell"):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetry exporter를 사용하려면 opentelemetry-sdk를 설치해주세요") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer(instrumentation_name)
+
+    def export(self, span: Span):
+        attributes = {key: value for key, value in span.attributes.items()
+                      if isinstance(value, (str, bool, int, float))}
+        attributes["bluebell.trace_id"] = span.trace_id
+        attributes["bluebell.span_id"] = span.span_id
+        if span.parent_id:
+            attributes["bluebell.parent_span_id"] = span.parent_id
+
+        otel_span = self._tracer.start_span(span.name, start_time=span.start_ns, attributes=attributes)
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.end_ns)
+
+
+class Tracer:
+    """
+    span 생성 및 exporter 호출 담당
+    exporter가 없으면 span은 만들어지지만 어디에도 기록되지 않음
+    """
+
+    def __init__(self, exporters: List = None):
+        self.exporters = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        span 시작 (with 블록 종료 시 자동으로 종료 및 내보내기)
+
+        Args:
+            name: 단계 이름 (예: "rag.search")
+            attributes: 초기 속성
+        """
+        parent = _current_span.get()
+        span = Span(
+            name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.finish()
+            self._export(span)
+
+    def _export(self, span: Span):
+        """exporter 오류가 본 처리에 영향을 주지 않도록 격리"""
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.error(f"span 내보내기 실패 ({type(exporter).__name__}): {str(e)}")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 전역 tracer 반환"""
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    """현재 실행 중인 span (없으면 None)"""
+    return _current_span.get()
+
+
+def configure_tracing(exporters: List = None) -> Tracer:
+    """
+    전역 tracer의 exporter 설정
+
+    Args:
+        exporters: exporter 리스트 (None이면 BLUEBELL_TRACE_EXPORTERS 환경변수 사용)
+                   예: BLUEBELL_TRACE_EXPORTERS=log,jsonl,otel
+
+    Returns:
+        설정된 전역 tracer
+    """
+    if exporters is None:
+        exporters = []
+        names = [name.strip() for name in os.getenv("BLUEBELL_TRACE_EXPORTERS", "").split(",") if name.strip()]
+        for name in names:
+            if name == "log":
+                exporters.append(LoggingSpanExporter())
+            elif name == "jsonl":
+                exporters.append(JsonlSpanExporter())
+            elif name == "otel":
+                try:
+                    exporters.append(OpenTelemetrySpanExporter())
+                except ImportError as e:
+                    logger.warning(str(e))
+            else:
+                logger.warning(f"알 수 없는 trace exporter: {name}")
+
+    _tracer.exporters = list(exporters)
+    return _tracer
@@ -0,0 +1,349 @@
+"""
+토큰/비용 사용량 추적 모듈
+LLM 호출마다 토큰 수(프롬프트/응답/캐시), 모델, 지연 시간을 로컬 SQLite에 기록하고
+기능별(가이드/리뷰), 세션별, 일별로 집계
+예산 한도에 가까워지면 응답 길이/검색 문서 수를 줄이고, 초과하면 호출을 거부
+
+사용 예:
+    with usage_context(feature="review", session_id=session_id):
+        result = reviewer.review(code)
+"""
+
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USAGE_DB = os.path.join(".bluebell", "usage.db")
+
+# 예산 판단 결과
+BUDGET_ALLOW = "allow"
+BUDGET_DOWNGRADE = "downgrade"
+BUDGET_REJECT = "reject"
+
+# 현재 요청의 기능/세션 정보 (스레드/작업별로 분리됨)
+_usage_context: contextvars.ContextVar = contextvars.ContextVar("bluebell_usage_context", default={})
+
+
+@contextmanager
+def usage_context(**labels):
+    """
+    이 블록 안의 LLM 호출에 기능/세션 라벨 부여 (바깥 라벨과 병합)
+
+    Args:
+        labels: feature, session_id 등
+    """
+    token = _usage_context.set({**_usage_context.get(), **labels})
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+def current_usage_labels() -> Dict[str, str]:
+    """현재 적용된 사용량 라벨"""
+    return dict(_usage_context.get())
+
+
+class BudgetDecision:
+    """예산 확인 결과 (downgrade일 때 max_tokens/search_top 상한 포함)"""
+
+    def __init__(self, action: str = BUDGET_ALLOW, reason: str = "", max_tokens: int = None, search_top: int = None):
+        self.action = action
+        self.reason = reason
+        self.max_tokens = max_tokens
+        self.search_top = search_top
+
+    def limit_max_tokens(self, max_tokens: int) -> int:
+        """downgrade 상태면 응답 토큰 상한 적용"""
+        return min(max_tokens, self.max_tokens) if self.max_tokens else max_tokens
+
+    def limit_top(self, top: int) -> int:
+        """downgrade 상태면 검색 문서 수 상한 적용"""
+        return min(top, self.search_top) if self.search_top else top
+
+
+class UsageStore:
+    """
+    호출별 사용량을 저장하는 SQLite 저장소
+    여러 워커 스레드에서 동시에 접근하므로 내부 락으로 직렬화
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        초기화
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:" 가능)
+        """
+        self.db_path = db_path or os.getenv("BLUEBELL_USAGE_DB", DEFAULT_USAGE_DB)
+        self._lock = threading.Lock()
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_table()
+
+    def _create_table(self):
+        """테이블 및 인덱스 생성"""
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    feature TEXT,
+                    session_id TEXT,
+                    model TEXT,
+                    prompt_tokens INTEGER NOT NULL,
+                    completion_tokens INTEGER NOT NULL,
+                    cached_tokens INTEGER NOT NULL,
+                    latency_ms REAL,
+                    cost REAL NOT NULL,
+                    wasted INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            # 이전 버전 DB에는 wasted 컬럼이 없음
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(usage)")}
+            if "wasted" not in columns:
+                self._conn.execute("ALTER TABLE usage ADD COLUMN wasted INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_day ON usage(day, feature)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_session ON usage(session_id)")
+            self._conn.commit()
+
+    def add(self, record: Dict):
+        """사용량 레코드 추가"""
+        now = record.get("created_at", time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO usage (created_at, day, feature, session_id, model, prompt_tokens, "
+                "completion_tokens, cached_tokens, latency_ms, cost, wasted) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, datetime.fromtimestamp(now).strftime("%Y-%m-%d"),
+                 record.get("feature"), record.get("session_id"), record.get("model"),
+                 record.get("prompt_tokens", 0), record.get("completion_tokens", 0),
+                 record.get("cached_tokens", 0), record.get("latency_ms"), record.get("cost", 0.0),
+                 int(bool(record.get("wasted"))))
+            )
+            self._conn.commit()
+
+    def totals(self, day: str = None, feature: str = None, session_id: str = None) -> Dict:
+        """
+        조건에 맞는 사용량 합계
+
+        Returns:
+            {"calls", "prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens", "cached_ratio", "cost",
+             "wasted_tokens"(취소된 요청에서 응답을 쓰지 못한 토큰)}
+        """
+        conditions, params = [], []
+        for column, value in (("day", day), ("feature", feature), ("session_id", session_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS calls, COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens, "
+                "COALESCE(SUM(completion_tokens), 0) AS completion_tokens, "
+                "COALESCE(SUM(cached_tokens), 0) AS cached_tokens, COALESCE(SUM(cost), 0) AS cost, "
+                "COALESCE(SUM(CASE WHEN wasted THEN prompt_tokens + completion_tokens ELSE 0 END), 0) AS wasted_tokens "
+                f"FROM usage {where}",
+                params
+            ).fetchone()
+
+        totals = dict(row)
+        totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+        totals["cached_ratio"] = _cached_ratio(totals)
+        return totals
+
+    def summary(self, days: int = 7) -> List[Dict]:
+        """최근 days일의 일별/기능별 사용량"""
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, feature, COUNT(*) AS calls, SUM(prompt_tokens) AS prompt_tokens, "
+                "SUM(completion_tokens) AS completion_tokens, SUM(cached_tokens) AS cached_tokens, "
+                "SUM(cost) AS cost, AVG(latency_ms) AS avg_latency_ms "
+                "FROM usage WHERE day >= ? GROUP BY day, feature ORDER BY day DESC, feature",
+                (since,)
+            ).fetchall()
+        return [dict(row, cached_ratio=_cached_ratio(row)) for row in rows]
+
+
+def _cached_ratio(row) -> float:
+    """프롬프트 토큰 중 서버 측 캐시에서 처리된 비율"""
+    return round(row["cached_tokens"] / row["prompt_tokens"], 3) if row["prompt_tokens"] else 0.0
+
+
+class UsageTracker:
+    """
+    사용량 기록 + 예산 확인
+    store가 없으면 아무것도 기록하지 않고 항상 허용
+    """
+
+    def __init__(
+        self,
+        store: UsageStore = None,
+        daily_token_budget: int = 0,
+        session_token_budget: int = 0,
+        daily_cost_budget: float = 0.0,
+        soft_limit_ratio: float = 0.8,
+        downgrade_max_tokens: int = 1500,
+        downgrade_search_top: int = 2,
+        prompt_price_per_1k: float = 0.0,
+        cached_price_per_1k: float = 0.0,
+        completion_price_per_1k: float = 0.0
+    ):
+        """
+        초기화
+
+        Args:
+            store: 사용량 저장소
+            daily_token_budget: 하루 전체 토큰 한도 (0이면 제한 없음)
+            session_token_budget: 세션별 토큰 한도 (0이면 제한 없음)
+            daily_cost_budget: 하루 비용 한도 (0이면 제한 없음)
+            soft_limit_ratio: 이 비율을 넘으면 downgrade
+            downgrade_max_tokens: downgrade 시 응답 토큰 상한
+            downgrade_search_top: downgrade 시 검색 문서 수 상한
+            *_price_per_1k: 1K 토큰당 가격 (비용 계산용)
+        """
+        self.store = store
+        self.daily_token_budget = daily_token_budget
+        self.session_token_budget = session_token_budget
+        self.daily_cost_budget = daily_cost_budget
+        self.soft_limit_ratio = soft_limit_ratio
+        self.downgrade_max_tokens = downgrade_max_tokens
+        self.downgrade_search_top = downgrade_search_top
+        self.prompt_price_per_1k = prompt_price_per_1k
+        self.cached_price_per_1k = cached_price_per_1k
+        self.completion_price_per_1k = completion_price_per_1k
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+        """토큰 수로 비용 계산 (캐시된 프롬프트 토큰은 할인 가격 적용)"""
+        uncached = max(0, prompt_tokens - cached_tokens)
+        return (
+            uncached * self.prompt_price_per_1k
+            + cached_tokens * self.cached_price_per_1k
+            + completion_tokens * self.completion_price_per_1k
+        ) / 1000
+
+    def record(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int = 0,
+        latency_ms: float = None,
+        wasted: bool = False
+    ):
+        """LLM 호출 1회의 사용량 기록 (현재 usage_context 라벨 포함, wasted는 취소되어 버려진 호출)"""
+        if not self.enabled:
+            return
+        labels = current_usage_labels()
+        try:
+            self.store.add({
+                "feature": labels.get("feature"),
+                "session_id": labels.get("session_id"),
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cached_tokens": cached_tokens,
+                "latency_ms": latency_ms,
+                "cost": self.cost(prompt_tokens, completion_tokens, cached_tokens),
+                "wasted": wasted,
+            })
+        except Exception as e:
+            logger.error(f"사용량 기록 실패: {str(e)}")
+
+    def check_budget(self) -> BudgetDecision:
+        """
+        현재 세션/오늘 사용량을 한도와 비교
+
+        Returns:
+            allow / downgrade(soft_limit_ratio 이상) / reject(한도 초과)
+        """
+        if not self.enabled or not (self.daily_token_budget or self.session_token_budget or self.daily_cost_budget):
+            return BudgetDecision()
+
+        ratios = []
+        try:
+            today = self.store.totals(day=datetime.now().strftime("%Y-%m-%d"))
+            if self.daily_token_budget:
+                ratios.append(("일일 토큰", today["total_tokens"] / self.daily_token_budget))
+            if self.daily_cost_budget:
+                ratios.append(("일일 비용", today["cost"] / self.daily_cost_budget))
+            session_id = current_usage_labels().get("session_id")
+            if self.session_token_budget and session_id:
+                session = self.store.totals(session_id=session_id)
+                ratios.append(("세션 토큰", session["total_tokens"] / self.session_token_budget))
+        except Exception as e:
+            logger.error(f"예산 확인 실패: {str(e)}")
+            return BudgetDecision()
+
+        if not ratios:
+            return BudgetDecision()
+
+        name, ratio = max(ratios, key=lambda item: item[1])
+        if ratio >= 1.0:
+            return BudgetDecision(BUDGET_REJECT, f"{name} 한도를 초과했습니다. 잠시 후 다시 시도해주세요.")
+        if ratio >= self.soft_limit_ratio:
+            return BudgetDecision(
+                BUDGET_DOWNGRADE,
+                f"{name} 한도의 {ratio:.0%} 사용",
+                max_tokens=self.downgrade_max_tokens,
+                search_top=self.downgrade_search_top
+            )
+        return BudgetDecision()
+
+
+_tracker = UsageTracker()
+
+
+def get_usage_tracker() -> UsageTracker:
+    """프로세스 전역 사용량 추적기 반환"""
+    return _tracker
+
+
+def configure_usage_tracking(tracker: UsageTracker = None) -> UsageTracker:
+    """
+    전역 사용량 추적기 설정
+
+    Args:
+        tracker: 사용할 추적기 (None이면 환경변수로 생성)
+                 BLUEBELL_USAGE_TRACKING=1 일 때만 기록
+                 예산: BLUEBELL_DAILY_TOKEN_BUDGET, BLUEBELL_SESSION_TOKEN_BUDGET, BLUEBELL_DAILY_COST_BUDGET
+                 가격: BLUEBELL_PRICE_PROMPT_PER_1K, BLUEBELL_PRICE_CACHED_PER_1K, BLUEBELL_PRICE_COMPLETION_PER_1K
+
+    Returns:
+        설정된 전역 추적기
+    """
+    global _tracker
+    if tracker is None:
+        store = UsageStore() if os.getenv("BLUEBELL_USAGE_TRACKING", "0") == "1" else None
+        tracker = UsageTracker(
+            store=store,
+            daily_token_budget=int(os.getenv("BLUEBELL_DAILY_TOKEN_BUDGET", "0")),
+            session_token_budget=int(os.getenv("BLUEBELL_SESSION_TOKEN_BUDGET", "0")),
+            daily_cost_budget=float(os.getenv("BLUEBELL_DAILY_COST_BUDGET", "0")),
+            soft_limit_ratio=float(os.getenv("BLUEBELL_BUDGET_SOFT_RATIO", "0.8")),
+            prompt_price_per_1k=float(os.getenv("BLUEBELL_PRICE_PROMPT_PER_1K", "0")),
+            cached_price_per_1k=float(os.getenv("BLUEBELL_PRICE_CACHED_PER_1K", "0")),
+            completion_price_per_1k=float(os.getenv("BLUEBELL_PRICE_COMPLETION_PER_1K", "0"))
+        )
+    _tracker = tracker
+    return _tracker
@@ -0,0 +1,299 @@
+"""
+시작 워밍업 모듈
+프로세스가 뜬 직후 첫 사용자 요청이 치르던 초기화 비용을 미리 치르고, 준비 상태를 HTTP로 알림
+
+워밍업 단계:
+- Azure OpenAI: 라우터의 모든 배포에 SDK 클라이언트를 만들고 가벼운 GET 요청으로 연결(TLS) 풀 확보
+- Azure AI Search: 인덱스마다 top=1 검색을 한 번씩 보내 연결 풀과 서비스 측 캐시 예열
+- 로컬 리소스: 디스크 캐시, 기록 저장소 등 호출자가 넘긴 preloader 실행
+
+각 단계의 실패는 기록만 하고 예외를 올리지 않음 (Azure 장애 때 모든 인스턴스가 빠지지 않도록
+워밍업이 끝나면 일부 단계가 실패해도 degraded 상태로 트래픽을 받음)
+
+준비 상태 엔드포인트 (BLUEBELL_HEALTH_PORT):
+- /health/live: 프로세스가 살아 있으면 항상 200
+- /health, /health/ready: 워밍업이 끝나면 200, 진행 중이면 503 (App Service 상태 검사 경로로 사용)
+
+설정 (환경 변수):
+- BLUEBELL_WARMUP: 0이면 워밍업 생략 (기본 1)
+- BLUEBELL_WARMUP_TIMEOUT: 워밍업 요청 하나의 타임아웃(초, 기본 10)
+- BLUEBELL_HEALTH_PORT: 준비 상태 엔드포인트 포트 (0이면 끔)
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "running"
+WARMUP_READY = "ready"
+WARMUP_DEGRADED = "degraded"
+
+DEFAULT_WARMUP_TIMEOUT = 10.0
+
+# 인증 실패는 연결이 되었어도 설정 오류이므로 워밍업 실패로 기록
+_AUTH_ERROR_STATUSES = (401, 403)
+
+
+class WarmupState:
+    """워밍업 진행 상태와 단계별 결과 (준비 상태 엔드포인트가 읽음)"""
+
+    def __init__(self):
+        self.status = WARMUP_PENDING
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.checks: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        """워밍업이 끝났는지 (일부 단계 실패 포함)"""
+        return self.status in (WARMUP_READY, WARMUP_DEGRADED)
+
+    def begin(self):
+        with self._lock:
+            self.status = WARMUP_RUNNING
+            self.started_at = time.time()
+            self.finished_at = None
+            self.checks = []
+
+    def record(self, name: str, ok: bool, duration_ms: float, detail: str = ""):
+        """단계 결과 기록"""
+        with self._lock:
+            self.checks.append({
+                "name": name,
+                "ok": ok,
+                "duration_ms": round(duration_ms, 1),
+                "detail": detail,
+            })
+
+    def finish(self):
+        with self._lock:
+            failed = [check for check in self.checks if not check["ok"]]
+            self.status = WARMUP_DEGRADED if failed else WARMUP_READY
+            self.finished_at = time.time()
+
+    def mark_ready(self):
+        """워밍업 없이 바로 준비 상태로 전환 (BLUEBELL_WARMUP=0)"""
+        with self._lock:
+            self.status = WARMUP_READY
+            self.finished_at = time.time()
+
+    def snapshot(self) -> Dict:
+        """엔드포인트 응답용 상태 사본"""
+        with self._lock:
+            duration = None
+            if self.started_at is not None and self.finished_at is not None:
+                duration = round(self.finished_at - self.started_at, 3)
+            return {
+                "status": self.status,
+                "ready": self.status in (WARMUP_READY, WARMUP_DEGRADED),
+                "duration_seconds": duration,
+                "checks": [dict(check) for check in self.checks],
+            }
+
+
+def _run_step(state: WarmupState, name: str, func: Callable[[], str]):
+    """단계 하나 실행 및 결과 기록 (실패해도 예외를 올리지 않음)"""
+    start = time.perf_counter()
+    try:
+        result = func()
+        detail = result if isinstance(result, str) else ""
+        ok = True
+    except Exception as e:
+        detail = str(e)
+        ok = False
+        logger.error(f"워밍업 실패 ({name}): {detail}")
+    state.record(name, ok, (time.perf_counter() - start) * 1000, detail)
+
+
+def _probe_openai(backend, timeout: float) -> str:
+    """배포 하나의 SDK 클라이언트 생성 + 토큰을 쓰지 않는 GET 요청으로 연결 확보"""
+    from openai import APIStatusError
+
+    client = backend.client.with_options(max_retries=0, timeout=timeout)
+    try:
+        client.models.list()
+    except APIStatusError as e:
+        # 응답을 받았다면 연결은 이미 풀에 들어감 (모델 목록 API를 막아 둔 리소스 등)
+        if e.status_code in _AUTH_ERROR_STATUSES:
+            raise
+        return f"연결됨 (HTTP {e.status_code})"
+    return "연결됨"
+
+
+def _probe_index(search_client, index_name: str, timeout: float) -> str:
+    """인덱스 하나에 top=1 검색 (결과 캐시는 거치지 않음)"""
+    results = search_client.get_search_client(index_name).search(
+        search_text="*",
+        top=1,
+        timeout=timeout
+    )
+    found = next(iter(results), None)
+    return "문서 있음" if found is not None else "빈 인덱스"
+
+
+def _openai_backends(azure_client) -> List:
+    """모든 계층 라우터의 배포 (중복 제거, 기본 배포 포함)"""
+    backends = [azure_client.default_backend]
+    for router in azure_client.routers.values():
+        backends.extend(router.backends)
+    unique = {}
+    for backend in backends:
+        unique.setdefault((backend.endpoint, backend.deployment), backend)
+    return list(unique.values())
+
+
+def _search_indexes(search_client) -> List[str]:
+    """워밍업할 검색 인덱스 (회사별 컨벤션 인덱스 + 템플릿 인덱스)"""
+    indexes = list(search_client.tenant_router.all_indexes())
+    if search_client.templates_index not in indexes:
+        indexes.append(search_client.templates_index)
+    return indexes
+
+
+def run_warmup(
+    azure_client=None,
+    search_client=None,
+    preloaders: Dict[str, Callable[[], object]] = None,
+    state: WarmupState = None,
+    timeout: float = None
+) -> WarmupState:
+    """
+    워밍업 실행 (동기)
+
+    Args:
+        azure_client: AzureOpenAIClient (None이면 생략)
+        search_client: AzureSearchClient (None이면 생략)
+        preloaders: {이름: 함수} 디스크 캐시 등 미리 불러올 로컬 리소스
+        state: 결과를 기록할 상태 (None이면 프로세스 전역 상태)
+        timeout: 워밍업 요청 하나의 타임아웃(초, None이면 BLUEBELL_WARMUP_TIMEOUT)
+
+    Returns:
+        WarmupState
+    """
+    state = state or get_warmup_state()
+    if timeout is None:
+        timeout = float(os.getenv("BLUEBELL_WARMUP_TIMEOUT") or DEFAULT_WARMUP_TIMEOUT)
+    state.begin()
+
+    for name, loader in (preloaders or {}).items():
+        _run_step(state, f"preload:{name}", loader)
+
+    if azure_client is not None:
+        for backend in _openai_backends(azure_client):
+            _run_step(state, f"openai:{backend.name}", lambda backend=backend: _probe_openai(backend, timeout))
+
+    if search_client is not None:
+        for index_name in _search_indexes(search_client):
+            _run_step(state, f"search:{index_name}",
+                      lambda index_name=index_name: _probe_index(search_client, index_name, timeout))
+
+    state.finish()
+    snapshot = state.snapshot()
+    failed = [check["name"] for check in snapshot["checks"] if not check["ok"]]
+    logger.info(
+        f"워밍업 완료: {snapshot['status']} ({snapshot['duration_seconds']}초, "
+        f"단계 {len(snapshot['checks'])}개, 실패 {len(failed)}개{': ' + ', '.join(failed) if failed else ''})"
+    )
+    return state
+
+
+def start_warmup(
+    azure_client=None,
+    search_client=None,
+    preloaders: Dict[str, Callable[[], object]] = None,
+    state: WarmupState = None
+) -> Optional[threading.Thread]:
+    """
+    백그라운드 스레드에서 워밍업 시작 (BLUEBELL_WARMUP=0이면 바로 준비 상태)
+
+    Returns:
+        워밍업 스레드 (생략한 경우 None)
+    """
+    state = state or get_warmup_state()
+    if (os.getenv("BLUEBELL_WARMUP") or "1") == "0":
+        state.mark_ready()
+        return None
+
+    thread = threading.Thread(
+        target=run_warmup,
+        args=(azure_client, search_client, preloaders, state),
+        name="bluebell-warmup",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def start_health_server(port: int, state: WarmupState = None, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    준비 상태 HTTP 엔드포인트를 데몬 스레드에서 시작
+
+    Args:
+        port: 포트 (0이면 빈 포트 자동 선택, server.server_address로 확인)
+        state: 응답할 워밍업 상태 (None이면 프로세스 전역 상태)
+        host: 바인딩 주소
+
+    Returns:
+        ThreadingHTTPServer (종료 시 shutdown() 호출)
+    """
+    state = state or get_warmup_state()
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path == "/health/live":
+                self._send(200, {"status": "alive"})
+            elif path in ("/health", "/health/ready"):
+                snapshot = state.snapshot()
+                self._send(200 if snapshot["ready"] else 503, snapshot)
+            else:
+                self._send(404, {"error": f"unknown path {path}"})
+
+        def _send(self, status: int, payload: Dict):
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="bluebell-health", daemon=True)
+    thread.start()
+    logger.info(f"준비 상태 엔드포인트 시작: {host}:{server.server_address[1]}/health")
+    return server
+
+
+_warmup_state: Optional[WarmupState] = None
+_state_lock = threading.Lock()
+
+
+def get_warmup_state() -> WarmupState:
+    """프로세스 전역 워밍업 상태"""
+    global _warmup_state
+    if _warmup_state is None:
+        with _state_lock:
+            if _warmup_state is None:
+                _warmup_state = WarmupState()
+    return _warmup_state
+
+
+def configure_warmup_state(state: WarmupState = None) -> WarmupState:
+    """프로세스 전역 워밍업 상태 교체 (테스트용, None이면 새 상태)"""
+    global _warmup_state
+    with _state_lock:
+        _warmup_state = state or WarmupState()
+    return _warmup_state
@@ -0,0 +1,30 @@
+"""
+🧚‍♂️ BlueBell 실행 스크립트 (App Service 시작 명령으로 사용)
+streamlit이 트래픽을 받기 전에 워밍업과 준비 상태 엔드포인트(BLUEBELL_HEALTH_PORT)를 먼저 시작하여
+첫 사용자가 접속하기 전부터 /health/ready가 응답하고, 상태 검사를 통과한 인스턴스만 트래픽을 받음
+
+$ python serve.py [streamlit run 옵션...]
+예: python serve.py --server.port 8000 --server.address 0.0.0.0
+"""
+
+import sys
+from pathlib import Path
+
+from modules.app_resources import configure_process, start_process_warmup
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+
+
+def main():
+    configure_process()
+    # 백그라운드에서 진행 (같은 프로세스에서 실행되는 app.py는 이 리소스를 그대로 사용)
+    start_process_warmup()
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", "run", str(APP_PATH)] + sys.argv[1:]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
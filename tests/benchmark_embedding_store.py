@@ -0,0 +1,135 @@
+"""
+임베딩 저장 형식 벤치마크 (Azure 연결 불필요)
+create_embedding 반환 형식(파이썬 float 리스트) 대비 float32/int8 EmbeddingStore의
+recall@k, 질의 지연, 메모리 사용량을 비교
+
+정답은 float64 전수 비교 결과, 임베딩은 군집 구조를 흉내 낸 난수 벡터
+
+$ python tests/benchmark_embedding_store.py
+$ python tests/benchmark_embedding_store.py --count 50000 --dim 1536 --queries 200 --top 10 --json embeddings.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.embedding_store import DTYPE_FLOAT32, DTYPE_INT8, EmbeddingStore
+
+
+def make_corpus(count: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """군집 중심 + 잡음으로 만든 임베딩 (실제 문서 임베딩처럼 유사 문서끼리 모임)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    labels = rng.integers(0, clusters, count)
+    return centers[labels] + 0.6 * rng.standard_normal((count, dim))
+
+
+def list_memory_bytes(vectors: np.ndarray) -> int:
+    """파이썬 float 리스트로 보관할 때의 메모리 (tracemalloc 측정)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    as_lists = [[float(x) for x in row] for row in vectors]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del as_lists
+    return used
+
+
+def exact_top(vectors: np.ndarray, queries: np.ndarray, top: int) -> List[List[int]]:
+    """float64 전수 비교 정답"""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    results = []
+    for query in queries:
+        scores = normalized @ (query / np.linalg.norm(query))
+        results.append(list(np.argsort(-scores)[:top]))
+    return results
+
+
+def measure(search: Callable, queries: np.ndarray, truth: List[List[int]], top: int) -> Dict:
+    """질의별 지연과 recall@top"""
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        found = search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(len(set(found) & set(expected)) / top)
+    latencies.sort()
+    return {
+        "recall": round(statistics.mean(recalls), 4),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell 임베딩 저장 형식 벤치마크")
+    parser.add_argument("--count", type=int, default=20000, help="문서 수")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--clusters", type=int, default=200, help="군집 수")
+    parser.add_argument("--queries", type=int, default=100, help="질의 수")
+    parser.add_argument("--top", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    vectors = make_corpus(args.count, args.dim, args.clusters, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = vectors[rng.integers(0, args.count, args.queries)] + 0.3 * rng.standard_normal((args.queries, args.dim))
+    truth = exact_top(vectors, queries, args.top)
+    ids = [str(i) for i in range(args.count)]
+
+    print(f"🚀 문서 {args.count}개 x {args.dim}차원, 질의 {args.queries}개, recall@{args.top}\n")
+    report = []
+
+    # 기준: 파이썬 float 리스트 (메모리만 측정, 검색은 float64 전수 비교)
+    sample = min(args.count, 2000)
+    list_bytes = list_memory_bytes(vectors[:sample]) * args.count // sample
+    float64 = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    baseline = measure(lambda q: list(np.argsort(-(float64 @ q))[:args.top]), queries, truth, args.top)
+    report.append(dict(baseline, format="list[float] / float64", memory_bytes=list_bytes))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype in (DTYPE_FLOAT32, DTYPE_INT8):
+            path = str(Path(tmp) / f"{dtype}.bin")
+            store = EmbeddingStore(path, dim=args.dim, dtype=dtype, capacity=args.count)
+            started = time.perf_counter()
+            store.add_many(ids, vectors)
+            store.flush()
+            build_ms = (time.perf_counter() - started) * 1000
+
+            stats = measure(
+                lambda q: [int(item_id) for item_id, _ in store.search(q, top=args.top)],
+                queries, truth, args.top
+            )
+            report.append(dict(stats, format=f"EmbeddingStore {dtype}", memory_bytes=store.memory_bytes(),
+                               build_ms=round(build_ms, 1)))
+            store.close()
+
+    print(f"{'format':<26}{'MiB':>10}{'x':>7}{'recall':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for row in report:
+        ratio = list_bytes / row["memory_bytes"]
+        print(f"{row['format']:<26}{row['memory_bytes'] / 2**20:>10.1f}{ratio:>7.1f}"
+              f"{row['recall']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
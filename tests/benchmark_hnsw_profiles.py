@@ -0,0 +1,229 @@
+"""
+HNSW 인덱스 프로필 벤치마크 (Azure 연결 불필요)
+modules/index_profiles.py의 프로필(fast/balanced/accurate)과 기존 고정값(m=4, efConstruction=400, efSearch=500)으로
+로컬 HNSW 그래프를 만들어 전수 비교 정답 대비 recall@k, 질의 지연, 질의당 거리 계산 수, 색인 시간을 비교
+--compression scalar를 주면 int8 스칼라 양자화 벡터로 그래프를 탐색하고 원본 벡터로 재점수화 (oversampling 배수만큼 후보)
+
+지연은 파이썬 구현 기준이라 Azure AI Search의 절대값과 다르며, 프로필 간 상대 비교와 거리 계산 수를 참고
+
+코퍼스:
+- --store: EmbeddingStore 파일 (실제 문서 임베딩)
+- --npy: (문서 수, 차원) numpy 배열 파일
+- 지정하지 않으면 군집 구조를 흉내 낸 난수 벡터
+
+$ python tests/benchmark_hnsw_profiles.py
+$ python tests/benchmark_hnsw_profiles.py --store .bluebell/embeddings.bin --queries 200 --top 5 --compression scalar
+"""
+
+import argparse
+import heapq
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.embedding_store import EmbeddingStore, quantize_int8
+from modules.index_profiles import COMPRESSION_NONE, COMPRESSION_SCALAR, DEFAULT_OVERSAMPLING, INDEX_PROFILES
+from tests.benchmark_embedding_store import exact_top, make_corpus
+
+# 변경 전 인덱스 설정
+LEGACY_PROFILE = {"m": 4, "ef_construction": 400, "ef_search": 500}
+
+
+class LocalHNSW:
+    """
+    벤치마크용 HNSW 구현 (코사인 유사도, Azure와 같은 m/efConstruction/efSearch 의미)
+    레이어 0은 이웃 2m개, 그 위 레이어는 m개까지 연결
+    """
+
+    def __init__(self, vectors: np.ndarray, m: int, ef_construction: int, seed: int = 0):
+        self.vectors = vectors
+        self.m = m
+        self.level_mult = 1 / math.log(m)
+        self.layers: List[Dict[int, List[int]]] = []
+        self.entry = None
+        self.max_level = -1
+        self.distance_count = 0
+        rng = np.random.default_rng(seed)
+        for node in range(len(vectors)):
+            self._insert(node, ef_construction, int(-math.log(1.0 - rng.random()) * self.level_mult))
+
+    def _distances(self, nodes: List[int], query: np.ndarray) -> np.ndarray:
+        self.distance_count += len(nodes)
+        return 1.0 - self.vectors[nodes] @ query
+
+    def _search_layer(self, query: np.ndarray, entries: List[int], ef: int, level: int) -> List[tuple]:
+        """레이어 하나에서 ef개 후보를 유지하며 탐색 → (거리, 노드) 오름차순"""
+        graph = self.layers[level]
+        visited = set(entries)
+        distances = self._distances(entries, query)
+        candidates = [(float(d), n) for d, n in zip(distances, entries)]
+        heapq.heapify(candidates)
+        results = [(-d, n) for d, n in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -results[0][0] and len(results) >= ef:
+                break
+            neighbors = [n for n in graph[node] if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            for d, n in zip(self._distances(neighbors, query), neighbors):
+                d = float(d)
+                if len(results) < ef or d < -results[0][0]:
+                    heapq.heappush(candidates, (d, n))
+                    heapq.heappush(results, (-d, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted((-d, n) for d, n in results)
+
+    def _insert(self, node: int, ef_construction: int, level: int):
+        while len(self.layers) <= level:
+            self.layers.append({})
+        for layer in range(level + 1):
+            self.layers[layer][node] = []
+        if self.entry is None:
+            self.entry, self.max_level = node, level
+            return
+
+        query = self.vectors[node]
+        entries = [self.entry]
+        for layer in range(self.max_level, level, -1):
+            entries = [self._search_layer(query, entries, 1, layer)[0][1]]
+
+        for layer in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(query, entries, ef_construction, layer)
+            capacity = self.m * 2 if layer == 0 else self.m
+            neighbors = [n for _, n in found if n != node][:self.m]
+            self.layers[layer][node] = neighbors
+            for neighbor in neighbors:
+                links = self.layers[layer][neighbor]
+                links.append(node)
+                if len(links) > capacity:
+                    scores = self.vectors[links] @ self.vectors[neighbor]
+                    self.layers[layer][neighbor] = [links[i] for i in np.argsort(-scores)[:capacity]]
+            entries = [n for _, n in found]
+
+        if level > self.max_level:
+            self.entry, self.max_level = node, level
+
+    def search(self, query: np.ndarray, top: int, ef_search: int) -> List[int]:
+        entries = [self.entry]
+        for layer in range(self.max_level, 0, -1):
+            entries = [self._search_layer(query, entries, 1, layer)[0][1]]
+        return [n for _, n in self._search_layer(query, entries, max(ef_search, top), 0)[:top]]
+
+
+def load_corpus(args) -> np.ndarray:
+    """벤치마크 코퍼스 로드"""
+    if args.store:
+        store = EmbeddingStore(args.store)
+        vectors = np.stack([store.get(item_id) for item_id in store.ids()])
+        store.close()
+        return vectors
+    if args.npy:
+        return np.load(args.npy)
+    return make_corpus(args.count, args.dim, args.clusters, args.seed)
+
+
+def run_profile(name: str, profile: Dict, vectors: np.ndarray, queries: np.ndarray, truth, args) -> Dict:
+    """프로필 하나로 그래프를 만들고 질의 측정"""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    if args.compression == COMPRESSION_SCALAR:
+        quantized, scales = quantize_int8(normalized)
+        graph_vectors = quantized.astype(np.float32) * scales[:, None]
+        graph_vectors /= np.linalg.norm(graph_vectors, axis=1, keepdims=True)
+    else:
+        graph_vectors = normalized.astype(np.float32)
+
+    started = time.perf_counter()
+    index = LocalHNSW(graph_vectors, profile["m"], profile["ef_construction"], seed=args.seed)
+    build_s = time.perf_counter() - started
+    index.distance_count = 0
+
+    fetch = args.top
+    if args.compression == COMPRESSION_SCALAR:
+        fetch = int(args.top * args.oversampling)
+
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        query = (query / np.linalg.norm(query)).astype(np.float32)
+        started = time.perf_counter()
+        found = index.search(query, fetch, profile["ef_search"])
+        if fetch > args.top:
+            # 원본 벡터로 재점수화
+            found = [found[i] for i in np.argsort(-(normalized[found] @ query))[:args.top]]
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(len(set(found) & set(expected)) / args.top)
+    latencies.sort()
+
+    return {
+        "profile": name,
+        "m": profile["m"],
+        "ef_construction": profile["ef_construction"],
+        "ef_search": profile["ef_search"],
+        "recall": round(statistics.mean(recalls), 4),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "distances_per_query": round(index.distance_count / len(queries)),
+        "build_s": round(build_s, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell HNSW 인덱스 프로필 벤치마크")
+    parser.add_argument("--store", default=None, help="EmbeddingStore 파일 (실제 코퍼스)")
+    parser.add_argument("--npy", default=None, help="numpy 임베딩 배열 파일")
+    parser.add_argument("--count", type=int, default=3000, help="난수 코퍼스 문서 수")
+    parser.add_argument("--dim", type=int, default=256, help="난수 코퍼스 차원")
+    parser.add_argument("--clusters", type=int, default=50, help="난수 코퍼스 군집 수")
+    parser.add_argument("--queries", type=int, default=100, help="질의 수")
+    parser.add_argument("--top", type=int, default=10, help="recall@k의 k")
+    parser.add_argument("--compression", choices=[COMPRESSION_NONE, COMPRESSION_SCALAR], default=COMPRESSION_NONE)
+    parser.add_argument("--oversampling", type=float, default=DEFAULT_OVERSAMPLING, help="스칼라 양자화 재점수화 배수")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    vectors = np.asarray(load_corpus(args), dtype=np.float64)
+    rng = np.random.default_rng(args.seed + 1)
+    noise = 0.3 * rng.standard_normal((args.queries, vectors.shape[1])) * np.abs(vectors).mean()
+    queries = vectors[rng.integers(0, len(vectors), args.queries)] + noise
+    truth = exact_top(vectors, queries, args.top)
+
+    print(f"🚀 문서 {len(vectors)}개 x {vectors.shape[1]}차원, 질의 {args.queries}개, "
+          f"recall@{args.top}, 압축={args.compression}\n")
+
+    profiles = dict(INDEX_PROFILES, legacy=LEGACY_PROFILE)
+    report = [run_profile(name, profile, vectors, queries, truth, args) for name, profile in profiles.items()]
+
+    print(f"{'profile':<10}{'m':>4}{'efC':>6}{'efS':>6}{'recall':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'dist/q':>9}{'build s':>9}")
+    for row in report:
+        print(f"{row['profile']:<10}{row['m']:>4}{row['ef_construction']:>6}{row['ef_search']:>6}"
+              f"{row['recall']:>9}{row['p50_ms']:>9}{row['p95_ms']:>9}"
+              f"{row['distances_per_query']:>9}{row['build_s']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+모듈 import 시간 벤치마크 (python -X importtime 기반)
+App Service 콜드 스타트에서 첫 페이지 지연의 원인이 되는 import 비용 추적용
+
+$ python tests/benchmark_import_time.py
+$ python tests/benchmark_import_time.py --runs 7 --budget-ms 150 --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+# 측정 대상 모듈 (app.py가 시작 시 import하는 경로)
+TARGET_MODULES = [
+    "modules.config",
+    "modules.azure_client",
+    "modules.azure_search_client",
+    "modules.rag_service",
+    "modules.setup_analyzer",
+    "modules.code_reviewer",
+    "modules.job_queue",
+    "modules.semantic_cache",
+    "modules.app_resources",
+]
+
+# importtime 출력 형식: "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    새 인터프리터에서 모듈을 import하고 누적 시간 측정
+
+    Args:
+        module: 측정할 모듈 이름
+
+    Returns:
+        (모듈 누적 import 시간(ms), [(하위 패키지, 누적 시간(ms))] 상위 목록)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            entries.append((match.group(4).strip(), int(match.group(2)) / 1000, depth))
+
+    # 자식 import가 부모보다 먼저 출력되므로 대상 모듈 줄에서 거슬러 올라가며 직계 자식 수집
+    # (인터프리터 시작 시 import되는 site 등은 제외됨)
+    total_ms = 0.0
+    children = []
+    for i, (name, cumulative_ms, depth) in enumerate(entries):
+        if name == module and depth == 0:
+            total_ms = cumulative_ms
+            for child_name, child_ms, child_depth in reversed(entries[:i]):
+                if child_depth == 0:
+                    break
+                if child_depth == 1:
+                    children.append((child_name, child_ms))
+            break
+
+    children.sort(key=lambda item: item[1], reverse=True)
+    return total_ms, children[:5]
+
+
+def run_benchmark(modules: List[str], runs: int) -> Dict[str, Dict]:
+    """모듈별로 runs회 측정해 중앙값 계산"""
+    report = {}
+    for module in modules:
+        samples = []
+        heaviest = []
+        for _ in range(runs):
+            total_ms, heaviest = measure_import(module)
+            samples.append(total_ms)
+        report[module] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+            "max_ms": round(max(samples), 1),
+            "heaviest": [{"module": name, "ms": round(ms, 1)} for name, ms in heaviest]
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell import 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5, help="모듈별 측정 횟수")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="모듈별 중앙값 허용 한도(ms), 초과 시 종료 코드 1")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument("modules", nargs="*", default=TARGET_MODULES, help="측정할 모듈")
+    args = parser.parse_args()
+
+    print(f"⏱️ import 시간 측정 ({args.runs}회 중앙값)\n")
+    report = run_benchmark(args.modules, args.runs)
+
+    over_budget = []
+    for module, stats in report.items():
+        print(f"{module:<32} {stats['median_ms']:>8.1f} ms  (min {stats['min_ms']:.1f} / max {stats['max_ms']:.1f})")
+        for heavy in stats["heaviest"][:3]:
+            print(f"    └ {heavy['module']:<36} {heavy['ms']:>8.1f} ms")
+        if args.budget_ms is not None and stats["median_ms"] > args.budget_ms:
+            over_budget.append(module)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 결과 저장: {args.json}")
+
+    if over_budget:
+        print(f"\n❌ 허용 한도({args.budget_ms} ms) 초과: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+오프라인 파이프라인 벤치마크 (Azure 연결 불필요)
+가짜 Azure OpenAI 서버와 가짜 Search 백엔드로 RAGService/CodeReviewer/SetupAnalyzer를
+여러 동시성 수준에서 실행하고 p50/p95/p99 지연, 처리량, 메모리 사용량을 보고
+
+$ python tests/benchmark_pipeline.py
+$ python tests/benchmark_pipeline.py --concurrency 1,8,32 --requests 100 --latency-ms 300 \
+      --tokens-per-second 400 --error-rate 0.05 --json bench.json
+"""
+
+import argparse
+import json
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, FakeSearchClient, make_azure_client
+
+SAMPLE_CODE = '''
+import os
+def calculateUserAge(userBirthYear):
+    currentYear = 2024
+    return currentYear - userBirthYear
+
+class userManager:
+    def __init__(self):
+        self.users = []
+
+    def addUser(self, user):
+        try:
+            self.users.append(user)
+        except Exception as e:
+            print(e)
+'''
+
+SAMPLE_README = '''
+# My FastAPI Project
+
+Python 3.11 and FastAPI based backend.
+
+## Getting Started
+pip install -r requirements.txt
+uvicorn app.main:app --reload
+docker-compose up for the database
+'''
+
+
+class UsageCollector:
+    """openai.chat_completion span에서 토큰/재시도 수 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.retries = 0
+
+    def export(self, span):
+        if span.name != "openai.chat_completion":
+            return
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += span.attributes.get("prompt_tokens", 0)
+            self.completion_tokens += span.attributes.get("completion_tokens", 0)
+            self.retries += span.attributes.get("retries", 0)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(p / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_scenarios(azure_client, search_client) -> Dict[str, Callable[[], str]]:
+    """벤치마크 시나리오 생성"""
+    from modules.code_reviewer import CodeReviewer
+    from modules.rag_service import RAGService
+    from modules.setup_analyzer import SetupAnalyzer
+
+    rag_service = RAGService(azure_client, search_client)
+    rag_reviewer = CodeReviewer(azure_client, rag_service)
+    basic_reviewer = CodeReviewer(azure_client)
+    analyzer = SetupAnalyzer(azure_client, rag_service)
+
+    naming_only = {"check_naming": True}
+    return {
+        "rag_review": lambda: rag_reviewer.review(SAMPLE_CODE, "python"),
+        "naming_review": lambda: basic_reviewer.review(SAMPLE_CODE, "python", naming_only),
+        "basic_review": lambda: basic_reviewer.review(SAMPLE_CODE, "python"),
+        "rag_guide": lambda: analyzer.generate_guide(SAMPLE_README, "linux"),
+    }
+
+
+def run_scenario(func: Callable[[], str], concurrency: int, requests: int, trace_memory: bool = False) -> Dict:
+    """
+    시나리오를 지정한 동시성으로 실행
+
+    Returns:
+        지연 백분위수, 처리량, 오류 수, 메모리 통계
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            result = func()
+            failed = "오류가 발생했습니다" in result
+        except Exception:
+            failed = True
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            if failed:
+                errors += 1
+
+    if trace_memory:
+        tracemalloc.start()
+
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(requests):
+            executor.submit(call)
+    wall_seconds = time.perf_counter() - wall_started
+
+    peak_kib = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = round(peak / 1024, 1)
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "throughput_rps": round(requests / wall_seconds, 2) if wall_seconds else 0.0,
+        "python_peak_kib": peak_kib,
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell 오프라인 파이프라인 벤치마크")
+    parser.add_argument("--scenarios", default="rag_review,basic_review,naming_review,rag_guide", help="실행할 시나리오")
+    parser.add_argument("--concurrency", default="1,4,16", help="동시성 수준 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=40, help="동시성 수준별 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=200, help="가짜 OpenAI 응답 지연")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="가짜 OpenAI 토큰 생성 속도")
+    parser.add_argument("--completion-tokens", type=int, default=300, help="응답 토큰 수")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--small-latency-ms", type=float, default=None,
+                        help="small 계층 가짜 서버 지연 (지정 시 모델 계층 분리)")
+    parser.add_argument("--search-latency-ms", type=float, default=30, help="가짜 Search 지연")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc으로 파이썬 메모리 피크 측정")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    from modules.deployment_router import TIER_SMALL
+    from modules.model_tiering import get_tier_metrics
+    from modules.tracing import configure_tracing
+
+    server = FakeOpenAIServer(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate
+    )
+    small_server = None
+    if args.small_latency_ms is not None:
+        small_server = FakeOpenAIServer(
+            latency_ms=args.small_latency_ms,
+            tokens_per_second=args.tokens_per_second * 3,
+            completion_tokens=args.completion_tokens
+        ).start()
+
+    report = []
+    with server:
+        azure_client = make_azure_client(server)
+        if small_server:
+            azure_client.routers[TIER_SMALL] = make_azure_client(small_server).router
+        scenarios = build_scenarios(azure_client, FakeSearchClient(latency_ms=args.search_latency_ms))
+        collector = UsageCollector()
+        configure_tracing([collector])
+
+        print(f"🚀 가짜 OpenAI 서버: {server.endpoint} (지연 {args.latency_ms}ms, 429 비율 {args.error_rate})\n")
+        print(f"{'scenario':<14}{'conc':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>8}{'err':>5}{'rss MiB':>9}")
+        for name in args.scenarios.split(","):
+            for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                stats = run_scenario(scenarios[name], concurrency, args.requests, args.trace_memory)
+                stats["scenario"] = name
+                report.append(stats)
+                print(f"{name:<14}{concurrency:>5}{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+                      f"{stats['throughput_rps']:>8}{stats['errors']:>5}{stats['max_rss_mib']:>9}")
+
+        configure_tracing([])
+        print(f"\n📊 LLM 호출 {collector.calls}회, 재시도 {collector.retries}회, 429 응답 {server.throttled_count}회, "
+              f"토큰 {collector.prompt_tokens}+{collector.completion_tokens}")
+        for tier, stats in get_tier_metrics().stats().items():
+            print(f"   [{tier}] 호출 {stats['calls']}회, p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, "
+                  f"잘림 {stats['truncated_rate']:.0%}, 오류 {stats['error_rate']:.0%}")
+
+    if small_server:
+        small_server.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📄 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
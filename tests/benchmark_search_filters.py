@@ -0,0 +1,75 @@
+"""
+검색 필터 생성 벤치마크 (Azure 연결 불필요)
+기존 f-string + or 체인 방식 대비 ODataFilter(캐시 없음) / 캐시된 빌더의
+호출당 생성 시간과 필터 길이를 비교
+
+$ python tests/benchmark_search_filters.py
+$ python tests/benchmark_search_filters.py --stack-size 12 --iterations 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.search_filters import ODataFilter, templates_filter
+
+TECH_NAMES = ["python", "react", "node", "java", "spring", "docker", "postgresql", "redis",
+              "kubernetes", "typescript", "django", "fastapi", "vue", "go", "rust", "nginx"]
+
+
+def legacy_templates_filter(tech_stack, os_type):
+    """기존 방식 (이스케이프 없음, 기술 스택마다 or 조건)"""
+    filters = []
+    if tech_stack:
+        tech_filters = [f"tech_stack/any(t: t eq '{tech}')" for tech in tech_stack]
+        filters.append(f"({' or '.join(tech_filters)})")
+    if os_type:
+        filters.append(f"os_support/any(os: os eq '{os_type}')")
+    return " and ".join(filters) if filters else None
+
+
+def uncached_templates_filter(tech_stack, os_type):
+    """빌더만 사용 (lru_cache 없이 매번 생성)"""
+    return ODataFilter().any_in("tech_stack", tech_stack).any_in("os_support", [os_type]).build()
+
+
+def measure(build, tech_stack, os_type, iterations: int) -> float:
+    """호출당 평균 시간 (마이크로초)"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build(tech_stack, os_type)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BlueBell 검색 필터 생성 벤치마크")
+    parser.add_argument("--stack-size", type=int, default=6, help="기술 스택 개수")
+    parser.add_argument("--iterations", type=int, default=100000, help="반복 횟수")
+    args = parser.parse_args()
+
+    tech_stack = TECH_NAMES[:max(1, min(args.stack_size, len(TECH_NAMES)))]
+    os_type = "linux"
+
+    print(f"🚀 기술 스택 {len(tech_stack)}개, {args.iterations}회 반복\n")
+    print(f"{'method':<22}{'us/call':>10}{'filter chars':>14}")
+    for name, build in [
+        ("legacy f-string", legacy_templates_filter),
+        ("ODataFilter", uncached_templates_filter),
+        ("templates_filter", templates_filter),
+    ]:
+        per_call = measure(build, tech_stack, os_type, args.iterations)
+        print(f"{name:<22}{per_call:>10.2f}{len(build(tech_stack, os_type)):>14}")
+
+    print(f"\n예시 (기존): {legacy_templates_filter(tech_stack, os_type)}")
+    print(f"예시 (빌더): {templates_filter(tech_stack, os_type)}")
+
+
+if __name__ == "__main__":
+    main()
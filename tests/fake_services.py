@@ -0,0 +1,323 @@
+"""
+오프라인 테스트/벤치마크용 Azure 서비스 대역
+- FakeOpenAIServer: Azure OpenAI 호환 HTTP 서버 (지연, 토큰 생성 속도, 429 주입 설정 가능)
+- FakeSearchClient: AzureSearchClient와 같은 인터페이스의 메모리 검색 백엔드
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# 가짜 검색 코퍼스 (data/upload_sample_data.py 샘플 데이터 요약)
+SAMPLE_CONVENTIONS = [
+    {"id": "conv_python_naming", "title": "Python 네이밍 컨벤션 - PEP 8",
+     "content": "함수명과 변수명은 snake_case, 클래스명은 PascalCase, 상수는 UPPER_SNAKE_CASE를 사용합니다.",
+     "language": "python", "category": "coding_convention", "company": "ktds",
+     "tags": ["naming", "pep8", "snake_case"], "priority": 1},
+    {"id": "conv_python_imports", "title": "Python Import 스타일 가이드",
+     "content": "import 순서: 표준 라이브러리, 서드파티 라이브러리, 로컬 애플리케이션 순으로 작성합니다.",
+     "language": "python", "category": "coding_convention", "company": "ktds",
+     "tags": ["import", "organization", "pep8"], "priority": 2},
+    {"id": "conv_javascript_naming", "title": "JavaScript 네이밍 컨벤션",
+     "content": "함수명과 변수명은 camelCase, 클래스명은 PascalCase, 상수는 UPPER_SNAKE_CASE를 사용합니다.",
+     "language": "javascript", "category": "coding_convention", "company": "ktds",
+     "tags": ["naming", "camelCase", "javascript"], "priority": 1},
+    {"id": "conv_logging_style", "title": "로깅 스타일 가이드",
+     "content": "ERROR는 시스템 오류, WARN은 경고, INFO는 주요 이벤트, DEBUG는 디버깅 정보에 사용합니다. logging",
+     "language": "general", "category": "coding_convention", "company": "ktds",
+     "tags": ["logging", "error_handling", "debugging"], "priority": 1},
+    {"id": "conv_error_handling", "title": "에러 처리 베스트 프랙티스",
+     "content": "구체적인 예외 타입을 사용하고 의미 있는 에러 메시지를 제공합니다. error handling",
+     "language": "general", "category": "coding_convention", "company": "ktds",
+     "tags": ["error_handling", "exception", "robustness"], "priority": 1},
+]
+
+SAMPLE_TEMPLATES = [
+    {"id": "template_python_fastapi", "title": "FastAPI 프로젝트 환경 설정",
+     "content": "python -m venv venv 후 pip install fastapi uvicorn, uvicorn app.main:app --reload 로 실행합니다.",
+     "category": "environment_setup", "tech_stack": ["fastapi", "python", "uvicorn"],
+     "os_support": ["windows", "macos", "linux"], "prerequisites": ["python", "pip"], "difficulty": "intermediate"},
+    {"id": "template_react_typescript", "title": "React + TypeScript 프로젝트 설정",
+     "content": "npx create-react-app my-app --template typescript 후 npm start 로 실행합니다.",
+     "category": "environment_setup", "tech_stack": ["react", "typescript", "nodejs"],
+     "os_support": ["windows", "macos", "linux"], "prerequisites": ["nodejs", "npm"], "difficulty": "beginner"},
+    {"id": "template_docker_python", "title": "Docker를 사용한 Python 환경 설정",
+     "content": "Dockerfile과 docker-compose.yml 작성 후 docker-compose up --build 로 실행합니다.",
+     "category": "environment_setup", "tech_stack": ["docker", "python"],
+     "os_support": ["windows", "macos", "linux"], "prerequisites": ["docker", "docker-compose"], "difficulty": "intermediate"},
+]
+
+
+class FakeOpenAIServer:
+    """
+    Azure OpenAI 호환 가짜 서버
+    /openai/deployments/{배포}/chat/completions, /embeddings 요청에 OpenAI 형식으로 응답
+
+    Args:
+        latency_ms: 응답 전 고정 지연 (네트워크 + 첫 토큰까지 시간)
+        tokens_per_second: 출력 토큰 생성 속도 (0이면 즉시)
+        completion_tokens: 응답 토큰 수 (max_tokens가 더 작으면 잘리고 finish_reason=length)
+        error_rate: 429 응답 비율 (0.0~1.0)
+        retry_after_ms: 429 응답의 retry-after-ms 헤더 값
+        embedding_dimensions: 임베딩 차원
+        prompt_cache_min_tokens: 첫 메시지가 이 토큰 수 이상이고 이전 요청과 같으면
+                                 Azure 프롬프트 캐싱처럼 128토큰 단위로 cached_tokens 보고
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        tokens_per_second: float = 0.0,
+        completion_tokens: int = 200,
+        error_rate: float = 0.0,
+        retry_after_ms: int = 50,
+        embedding_dimensions: int = 1536,
+        prompt_cache_min_tokens: int = 1024,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.retry_after_ms = retry_after_ms
+        self.embedding_dimensions = embedding_dimensions
+        self.prompt_cache_min_tokens = prompt_cache_min_tokens
+        self._prompt_prefixes = set()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.throttled_count = 0
+        self.requests: List[Dict] = []
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _should_throttle(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            throttle = self._random.random() < self.error_rate
+            if throttle:
+                self.throttled_count += 1
+            return throttle
+
+    def _chat_response(self, body: Dict) -> Dict:
+        """채팅 응답 생성 (토큰 생성 속도만큼 대기)"""
+        max_tokens = body.get("max_tokens") or self.completion_tokens
+        tokens = min(self.completion_tokens, max_tokens)
+        if self.tokens_per_second > 0:
+            time.sleep(tokens / self.tokens_per_second)
+
+        messages = body.get("messages", [])
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        cached_tokens = self._cached_prefix_tokens(messages)
+        if body.get("response_format"):
+            content = self._json_review_content(messages)
+        else:
+            content = "🟢 권장: 함수명은 snake_case를 사용하세요. " * max(1, tokens // 10)
+        return {
+            "id": f"chatcmpl-fake-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "length" if tokens < self.completion_tokens else "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": tokens,
+                "total_tokens": prompt_chars // 4 + tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens}
+            }
+        }
+
+    def _json_review_content(self, messages: List[Dict]) -> str:
+        """JSON 모드 요청에는 코드 첫 줄에 대한 지적 사항 1건을 JSON으로 응답"""
+        prompt = messages[-1].get("content", "") if messages else ""
+        file_match = re.search(r"^파일: (.+)$", prompt, re.MULTILINE)
+        line_match = re.search(r"^\s*(\d+)\| ", prompt, re.MULTILINE)
+        line = int(line_match.group(1)) if line_match else 1
+        return json.dumps({
+            "summary": "네이밍 컨벤션을 먼저 정리하세요.",
+            "findings": [{
+                "file": file_match.group(1) if file_match else "snippet",
+                "line_start": line, "line_end": line,
+                "rule": "naming", "severity": "warning",
+                "message": "함수명이 snake_case가 아닙니다.",
+                "suggestion": "함수명을 snake_case로 바꾸세요.",
+                "patch": ""
+            }]
+        }, ensure_ascii=False)
+
+    def _cached_prefix_tokens(self, messages: List[Dict]) -> int:
+        """첫 메시지가 이전 요청과 같으면 캐시된 토큰 수 반환 (첫 요청은 캐시에 기록만)"""
+        if not messages:
+            return 0
+        prefix = messages[0].get("content", "")
+        prefix_tokens = len(prefix) // 4
+        if prefix_tokens < self.prompt_cache_min_tokens:
+            return 0
+        with self._lock:
+            if prefix in self._prompt_prefixes:
+                return prefix_tokens // 128 * 128
+            self._prompt_prefixes.add(prefix)
+        return 0
+
+    def _embedding_response(self, body: Dict) -> Dict:
+        """입력 텍스트 해시 기반의 결정적 임베딩 생성"""
+        inputs = body.get("input")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        data = []
+        for i, text in enumerate(inputs):
+            rng = random.Random(str(text))
+            data.append({
+                "object": "embedding",
+                "index": i,
+                "embedding": [rng.uniform(-1, 1) for _ in range(self.embedding_dimensions)]
+            })
+        tokens = sum(len(str(text)) // 4 for text in inputs)
+        return {"object": "list", "data": data, "model": body.get("model", "fake"),
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = urlparse(self.path).path
+                with server._lock:
+                    server.requests.append({"path": path, "body": body})
+
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+
+                if server._should_throttle():
+                    self._send(429, {"error": {"code": "429", "message": "Rate limit exceeded"}},
+                               {"retry-after-ms": str(server.retry_after_ms)})
+                    return
+
+                if re.search(r"/chat/completions$", path):
+                    self._send(200, server._chat_response(body))
+                elif re.search(r"/embeddings$", path):
+                    self._send(200, server._embedding_response(body))
+                else:
+                    self._send(404, {"error": {"code": "404", "message": f"unknown path {path}"}})
+
+            def _send(self, status: int, payload: Dict, headers: Dict = None):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def make_azure_client(server: FakeOpenAIServer, deployment_name: str = "fake-gpt"):
+    """
+    가짜 서버를 바라보는 실제 AzureOpenAIClient 생성
+    (환경변수는 생성 시에만 바꾸고 원래 값으로 복원)
+    """
+    from modules.azure_client import AzureOpenAIClient
+
+    fake_env = {
+        "AZURE_OPENAI_API_KEY": "fake-key",
+        "AZURE_OPENAI_ENDPOINT": server.endpoint,
+        "AZURE_OPENAI_API_VERSION": "2024-12-01-preview",
+        "AZURE_OPENAI_API_TYPE": "azure",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": deployment_name,
+        "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": "fake-embedding",
+    }
+    saved = {key: os.environ.get(key) for key in fake_env}
+    os.environ.update(fake_env)
+    try:
+        return AzureOpenAIClient()
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class FakeSearchClient:
+    """
+    AzureSearchClient 대역
+    키워드 일치 개수로 점수를 매기는 메모리 검색 (지연 시간 설정 가능)
+    """
+
+    def __init__(self, latency_ms: float = 0.0, conventions: List[Dict] = None, templates: List[Dict] = None):
+        self.latency_ms = latency_ms
+        self.conventions_index = "coding-conventions"
+        self.templates_index = "setup-templates"
+        self.conventions = conventions if conventions is not None else SAMPLE_CONVENTIONS
+        self.templates = templates if templates is not None else SAMPLE_TEMPLATES
+        self.queries: List[Dict] = []
+
+    def search_conventions(self, query: str, language: str = None, category: str = None, top: int = 5,
+                           company: str = None) -> List[Dict]:
+        self.queries.append({"index": self.conventions_index, "query": query, "language": language,
+                             "company": company})
+        candidates = [doc for doc in self.conventions
+                      if (not language or doc["language"] == language)
+                      and (not category or doc["category"] == category)
+                      and (not company or doc.get("company", company) == company)]
+        return self._rank(query, candidates, top)
+
+    def search_templates(self, query: str, tech_stack: List[str] = None, os_type: str = None, top: int = 5) -> List[Dict]:
+        self.queries.append({"index": self.templates_index, "query": query, "tech_stack": tech_stack})
+        candidates = [doc for doc in self.templates
+                      if (not tech_stack or set(tech_stack) & set(doc["tech_stack"]))
+                      and (not os_type or os_type in doc["os_support"])]
+        return self._rank(query, candidates, top)
+
+    def _rank(self, query: str, candidates: List[Dict], top: int) -> List[Dict]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        terms = set(query.lower().split())
+        scored = []
+        for doc in candidates:
+            text = f"{doc['title']} {doc['content']} {' '.join(doc.get('tags', []))}".lower()
+            score = float(sum(1 for term in terms if term in text))
+            scored.append({**doc, "score": score})
+        scored.sort(key=lambda doc: doc["score"], reverse=True)
+        return scored[:top]
@@ -0,0 +1,148 @@
+"""
+LLM 호출 승인 제어 테스트 (Azure 연결 불필요)
+$ python tests/test_admission.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.admission import AdmissionController, AdmissionRejectedError, configure_admission
+from modules.azure_client import COMPLETION_ERROR_PREFIX
+from modules.usage_tracker import usage_context
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "조건이 시간 내에 충족되지 않았습니다"
+        time.sleep(0.01)
+
+def test_concurrency_limit():
+    """동시 실행 수가 max_concurrent를 넘지 않음"""
+    controller = AdmissionController(max_concurrent=2, max_waiting=10)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def call(user):
+        with controller.admit(user):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=call, args=(f"user-{i % 3}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    stats = controller.stats()
+    assert peak[0] == 2
+    assert stats["admitted"] == 8 and stats["active"] == 0 and stats["waiting"] == 0
+
+def test_round_robin_between_users():
+    """한 사용자가 호출을 몰아 보내도 다른 사용자와 번갈아 처리"""
+    controller = AdmissionController(max_concurrent=1, max_waiting=10)
+    order = []
+    order_lock = threading.Lock()
+
+    def call(user, label):
+        with controller.admit(user):
+            with order_lock:
+                order.append(label)
+
+    threads = []
+    with controller.admit("holder"):
+        for label in ["a1", "a2", "a3"]:
+            threads.append(threading.Thread(target=call, args=("alice", label)))
+            threads[-1].start()
+            _wait_until(lambda: controller.stats()["waiting"] == len(threads))
+        threads.append(threading.Thread(target=call, args=("bob", "b1")))
+        threads[-1].start()
+        _wait_until(lambda: controller.stats()["waiting"] == 4)
+        assert controller.position("alice") == 1
+        assert controller.position("bob") == 2
+        assert controller.position("carol") == 0
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+def test_shedding_and_timeout():
+    """대기열 상한 초과 시 즉시 거부, 대기 시간 초과 시 거부"""
+    controller = AdmissionController(max_concurrent=1, max_waiting=2, max_waiting_per_user=1)
+    release = threading.Event()
+
+    with controller.admit("holder"):
+        try:
+            with controller.admit("bob", timeout=0.05):
+                assert False, "대기 시간 초과로 거부되어야 합니다"
+        except AdmissionRejectedError as e:
+            assert "대기 시간" in str(e)
+
+        def hold(user):
+            with controller.admit(user):
+                release.wait(5)
+
+        waiter = threading.Thread(target=hold, args=("alice",))
+        waiter.start()
+        _wait_until(lambda: controller.stats()["waiting"] == 1)
+        try:
+            with controller.admit("alice"):
+                assert False, "사용자별 대기 상한으로 거부되어야 합니다"
+        except AdmissionRejectedError:
+            pass
+
+        other = threading.Thread(target=hold, args=("bob",))
+        other.start()
+        _wait_until(lambda: controller.stats()["waiting"] == 2)
+        try:
+            with controller.admit("carol"):
+                assert False, "전체 대기 상한으로 거부되어야 합니다"
+        except AdmissionRejectedError:
+            pass
+
+    release.set()
+    waiter.join(5)
+    other.join(5)
+    stats = controller.stats()
+    assert stats["rejected"] == 2 and stats["timed_out"] == 1
+    assert stats["active"] == 0 and stats["waiting"] == 0
+
+def test_completion_rejected_when_overloaded():
+    """승인이 거부되면 get_completion이 LLM 호출 없이 오류 메시지 반환"""
+    controller = configure_admission(AdmissionController(max_concurrent=1, max_waiting=0))
+    try:
+        with FakeOpenAIServer() as server:
+            client = make_azure_client(server)
+            messages = [{"role": "user", "content": "안녕"}]
+
+            with usage_context(session_id="alice"):
+                assert not client.get_completion(messages).startswith(COMPLETION_ERROR_PREFIX)
+            calls = server.request_count
+
+            with controller.admit("holder"):
+                result = client.get_completion(messages)
+            assert result.startswith(COMPLETION_ERROR_PREFIX)
+            assert server.request_count == calls
+    finally:
+        configure_admission(None)
+
+if __name__ == "__main__":
+    print("🧪 LLM 호출 승인 제어 테스트 시작...\n")
+    for test in [test_concurrency_limit, test_round_robin_between_users,
+                 test_shedding_and_timeout, test_completion_rejected_when_overloaded]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 승인 제어 테스트 완료!")
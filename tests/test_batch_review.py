@@ -0,0 +1,57 @@
+"""
+배치 코드 리뷰 테스트 (로컬 Batch API 대역 사용, Azure 연결 불필요)
+$ python tests/test_batch_review.py
+"""
+
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.batch_review import LocalBatchClient
+from modules.code_reviewer import CodeReviewer
+
+SAMPLE_FILES = {
+    "app/user.py": "def calculateUserAge(userBirthYear):\n    return 2024 - userBirthYear\n",
+    "web/main.js": "function getUser() { console.log('user'); }\n",
+}
+
+def test_review_batch_maps_results_to_files():
+    """배치 결과가 원래 파일 경로에 매핑됨"""
+    def responder(messages):
+        return f"리뷰: {messages[-1]['content'].splitlines()[0]}"
+
+    batch_client = LocalBatchClient(responder)
+    reviewer = CodeReviewer(azure_client=batch_client)
+
+    results = reviewer.review_batch(SAMPLE_FILES, batch_client=batch_client)
+
+    assert set(results) == set(SAMPLE_FILES)
+    assert "python" in results["app/user.py"]
+    assert "javascript" in results["web/main.js"]
+
+def test_review_batch_failed_request_falls_back():
+    """실패한 요청은 오류 메시지를 담은 리뷰로 반환"""
+    def responder(messages):
+        if "javascript" in messages[-1]["content"]:
+            raise RuntimeError("rate limited")
+        return "🟢 문제 없음"
+
+    batch_client = LocalBatchClient(responder)
+    reviewer = CodeReviewer(azure_client=batch_client)
+
+    results = reviewer.review_batch(SAMPLE_FILES, batch_client=batch_client)
+
+    assert "🟢 문제 없음" in results["app/user.py"]
+    assert "rate limited" in results["web/main.js"]
+
+if __name__ == "__main__":
+    print("🧪 배치 코드 리뷰 테스트 시작...\n")
+    for test in [test_review_batch_maps_results_to_files, test_review_batch_failed_request_falls_back]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 배치 리뷰 테스트 완료!")
@@ -0,0 +1,85 @@
+"""
+캐시 스냅샷 저장/복원 테스트 (Azure 연결 불필요)
+$ python tests/test_cache_snapshot.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.cache_snapshot import read_snapshot, write_snapshot
+from modules.lru_cache import LRUCache
+
+def _make_search_client():
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+    return AzureSearchClient()
+
+def test_snapshot_checks():
+    """종류/버전 키/본문 해시가 모두 맞을 때만 본문 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "nested" / "cache.snap")
+        version = {"model": "gpt-4o", "index": "1"}
+        assert read_snapshot(path, "demo", version) is None
+
+        assert write_snapshot(path, "demo", version, b"payload", entries=1)
+        assert read_snapshot(path, "demo", version) == b"payload"
+        assert read_snapshot(path, "other", version) is None
+        assert read_snapshot(path, "demo", {"model": "gpt-4o", "index": "2"}) is None
+
+        Path(path).write_bytes(Path(path).read_bytes()[:-1] + b"X")
+        assert read_snapshot(path, "demo", version) is None
+        assert os.listdir(Path(path).parent) == ["cache.snap"]
+
+def test_lru_items_restore_skips_expired():
+    """만료 시각을 유지해 복원하고, 이미 만료된 항목은 건너뜀"""
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.put(("a",), 1)
+    cache.put(("b",), 2)
+    items = cache.items()
+
+    restored = LRUCache(max_entries=2, ttl_seconds=60)
+    assert restored.restore(items + [(("c",), 3, time.time() - 1)]) == 2
+    assert restored.get(("a",)) == 1 and restored.get(("c",)) is None
+    assert restored.items()[-1][2] == items[0][2]
+
+def test_search_cache_round_trip():
+    """공용/회사별 검색 결과 캐시가 재시작 후에도 적중하고, 인덱스 버전이 바뀌면 버려짐"""
+    documents = [{"id": "1", "title": "네이밍", "content": "snake_case", "score": 1.0}]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "search.snap")
+        client = _make_search_client()
+        client.result_cache.put(("setup-templates", "react", None, 5), documents)
+        client.tenant_cache("Acme").put(("coding-conventions", "naming", "company eq 'acme'", 5), documents)
+        assert client.save_cache_snapshot(path)
+
+        restarted = _make_search_client()
+        assert restarted.load_cache_snapshot(path) == 2
+        assert restarted.result_cache.get(("setup-templates", "react", None, 5)) == documents
+        assert restarted.tenant_cache("acme").get(("coding-conventions", "naming", "company eq 'acme'", 5)) == documents
+
+        saved = os.environ.get("BLUEBELL_INDEX_VERSION")
+        os.environ["BLUEBELL_INDEX_VERSION"] = "reindexed"
+        try:
+            assert _make_search_client().load_cache_snapshot(path) == 0
+        finally:
+            if saved is None:
+                os.environ.pop("BLUEBELL_INDEX_VERSION", None)
+            else:
+                os.environ["BLUEBELL_INDEX_VERSION"] = saved
+
+if __name__ == "__main__":
+    print("🧪 캐시 스냅샷 테스트 시작...\n")
+    for test in [test_snapshot_checks, test_lru_items_restore_skips_expired, test_search_cache_round_trip]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 캐시 스냅샷 테스트 완료!")
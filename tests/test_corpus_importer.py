@@ -0,0 +1,131 @@
+"""
+코퍼스 가져오기 테스트 (Azure 연결 불필요)
+$ python tests/test_corpus_importer.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.corpus_importer import CorpusImporter, ValidationError, validate_document
+from modules.ingestion import BulkIngestor
+from modules.tenant_router import TenantRouter
+
+NAMING_MD = """---
+language: python
+category: coding_convention
+tags: [naming, pep8]
+priority: 1
+---
+# Python 네이밍
+
+함수는 snake_case를 사용합니다.
+"""
+
+TEMPLATES_YAML = """
+- id: tpl_react
+  title: React 환경 설정
+  content: npm install
+  tech_stack: [react, node]
+  os_support: linux, macos
+---
+id: tpl_docker
+title: Docker 환경 설정
+content: docker compose up
+difficulty: intermediate
+"""
+
+class RecordingSearchClient:
+    def __init__(self):
+        self.templates_index = "setup-templates"
+        self.tenant_router = TenantRouter()
+        self.uploaded = []
+
+    def upload_documents(self, index_name, documents):
+        self.uploaded.extend(doc["id"] for doc in documents)
+        return len(documents)
+
+    def delete_stale_chunks(self, index_name, keep_ids):
+        return 0
+
+def write_corpus(root: Path):
+    (root / "python").mkdir()
+    (root / "python" / "naming.md").write_text(NAMING_MD, encoding="utf-8")
+    lines = [
+        {"id": "conv_js", "title": "JS 네이밍", "content": "camelCase", "language": "javascript"},
+        {"id": "conv_bad", "title": "우선순위 오류", "content": "x", "priority": "high"},
+        {"id": "conv_js", "title": "중복", "content": "y"},
+        {"id": "conv_extra", "title": "모르는 필드", "content": "z", "owner": "me"},
+    ]
+    (root / "rules.jsonl").write_text(
+        "\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n{broken\n", encoding="utf-8"
+    )
+    (root / "notes.txt").write_text("무시되는 파일", encoding="utf-8")
+
+def test_validate_document():
+    """스키마 검증: 리스트/정수/회사명 정규화, 키 문자 치환, 모르는 필드와 필수 필드 누락은 오류"""
+    document = validate_document({"id": "naming/python rules", "title": "t", "content": "c",
+                                  "tags": "a, b", "priority": "2", "company": " ACME"}, "conventions")
+    assert document == {"id": "naming_python_rules", "title": "t", "content": "c", "tags": ["a", "b"], "priority": 2,
+                        "company": "acme"}
+    for bad in [{"id": "x", "title": "t"}, {"id": "x", "title": "t", "content": "c", "os_support": ["linux"]}]:
+        try:
+            validate_document(bad, "conventions")
+        except ValidationError:
+            continue
+        raise AssertionError(f"ValidationError가 발생해야 합니다: {bad}")
+
+def test_import_directory_with_errors():
+    """디렉터리의 마크다운/JSONL을 읽고 잘못된 문서는 위치와 함께 건너뜀"""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(Path(tmp))
+        importer = CorpusImporter("conventions", defaults={"company": "acme"})
+        documents = list(importer.iter_documents([tmp]))
+
+    assert [doc["id"] for doc in documents] == ["conv_js", "python_naming"]
+    naming = documents[1]
+    assert naming["title"] == "Python 네이밍" and naming["tags"] == ["naming", "pep8"] and naming["priority"] == 1
+    assert naming["company"] == "acme" and naming["content"].startswith("# Python 네이밍")
+
+    report = importer.report()
+    assert report["files"] == 2 and report["valid"] == 2
+    assert report["invalid"] == 3 and report["duplicates"] == 1
+    assert any(error.startswith("rules.jsonl:2:") and "priority" in error for error in report["errors"])
+    assert any(error.startswith("rules.jsonl:5:") for error in report["errors"])
+
+def test_yaml_templates_stream_into_ingestor():
+    """YAML 문서 리스트/여러 문서를 읽어 BulkIngestor로 바로 색인"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "templates.yaml"
+        path.write_text(TEMPLATES_YAML, encoding="utf-8")
+        importer = CorpusImporter("templates")
+        search = RecordingSearchClient()
+        ingestor = BulkIngestor(search, lambda texts: [[0.0] for _ in texts], batch_size=1)
+        stats = ingestor.ingest_templates(importer.iter_documents([str(path)]))
+
+    assert stats["documents"] == 2 and stats["failed"] == 0
+    assert search.uploaded == ["tpl_react-0", "tpl_docker-0"]
+    assert importer.report()["errors"] == []
+
+def test_unknown_kind():
+    """알 수 없는 코퍼스 종류는 ValueError"""
+    try:
+        CorpusImporter("guides")
+    except ValueError:
+        return
+    raise AssertionError("ValueError가 발생해야 합니다")
+
+if __name__ == "__main__":
+    print("🧪 코퍼스 가져오기 테스트 시작...\n")
+    for test in [test_validate_document, test_import_directory_with_errors, test_yaml_templates_stream_into_ingestor,
+                 test_unknown_kind]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 코퍼스 가져오기 테스트 완료!")
@@ -0,0 +1,169 @@
+"""
+요청 마감 시간/취소 테스트 (Azure 연결 불필요)
+$ python tests/test_deadlines.py
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.azure_client import COMPLETION_ERROR_PREFIX
+from modules.deadlines import (
+    CANCEL_REASON_DISCONNECTED, STAGE_SEARCH, CancellationToken, DeadlineExceededError, RequestCancelledError,
+    configure_stage_timeouts, current_scope, request_scope, stage_timeout
+)
+from modules.job_queue import JOB_CANCELLED, JobQueue, JobStore
+from modules.usage_tracker import UsageStore, UsageTracker, configure_usage_tracking
+
+MESSAGES = [{"role": "user", "content": "리뷰해주세요"}]
+
+def test_stage_timeout_follows_deadline():
+    """단계 타임아웃은 남은 요청 시간을 넘지 않고, 바깥 마감 시간/취소 토큰을 이어받음"""
+    configure_stage_timeouts({STAGE_SEARCH: 5})
+    try:
+        assert stage_timeout(STAGE_SEARCH) == 5
+        token = CancellationToken()
+        with request_scope(timeout=1, token=token):
+            assert stage_timeout(STAGE_SEARCH) <= 1
+            with request_scope(timeout=60) as inner:
+                assert inner.token is token
+                assert inner.remaining() <= 1
+
+        with request_scope(timeout=0.01):
+            time.sleep(0.02)
+            try:
+                stage_timeout(STAGE_SEARCH)
+                assert False, "DeadlineExceededError가 발생해야 합니다"
+            except DeadlineExceededError:
+                pass
+
+        try:
+            configure_stage_timeouts({STAGE_SEARCH: 0})
+            assert False, "ValueError가 발생해야 합니다"
+        except ValueError:
+            pass
+    finally:
+        configure_stage_timeouts()
+
+def test_disconnected_client_cancels():
+    """연결 확인 함수가 False를 반환하면 토큰이 스스로 취소됨"""
+    alive = [True]
+    token = CancellationToken(alive_check=lambda: alive[0])
+    with request_scope(token=token):
+        stage_timeout(STAGE_SEARCH)
+        alive[0] = False
+        try:
+            stage_timeout(STAGE_SEARCH)
+            assert False, "RequestCancelledError가 발생해야 합니다"
+        except RequestCancelledError as e:
+            assert str(e) == CANCEL_REASON_DISCONNECTED
+
+def test_search_receives_timeout():
+    """검색 SDK 호출에 단계 타임아웃이 전달되고, 취소된 요청은 검색하지 않음"""
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+
+    class RecordingSDKClient:
+        def __init__(self):
+            self.calls = []
+
+        def search(self, **kwargs):
+            self.calls.append(kwargs)
+            return []
+
+    client = AzureSearchClient()
+    sdk = RecordingSDKClient()
+    client._search_clients[client.templates_index] = sdk
+    with request_scope(timeout=2):
+        client.search_templates("setup", top=5)
+    assert 0 < sdk.calls[0]["timeout"] <= 2
+
+    token = CancellationToken()
+    token.cancel()
+    with request_scope(token=token):
+        assert client.search_templates("other", top=5) == []
+    assert len(sdk.calls) == 1
+
+def test_cancel_pending_and_running_jobs():
+    """대기 중인 작업은 실행하지 않고, 실행 중인 작업은 다음 LLM 호출 전에 중단"""
+    job_queue = JobQueue(store=JobStore(":memory:", ttl_seconds=60), max_workers=1)
+    first_done, gate = threading.Event(), threading.Event()
+    results = []
+
+    with FakeOpenAIServer() as server:
+        client = make_azure_client(server)
+
+        def review():
+            results.append(client.get_completion(MESSAGES))
+            first_done.set()
+            gate.wait(5)
+            results.append(client.get_completion(MESSAGES))
+            return "done"
+
+        running = job_queue.submit("review", review)
+        pending = job_queue.submit("review", lambda: results.append("실행되면 안 됨"))
+        assert first_done.wait(5)
+
+        assert job_queue.cancel(pending)
+        assert job_queue.get_status(pending)["status"] == JOB_CANCELLED
+        assert job_queue.cancel(running)
+        gate.set()
+
+        job = job_queue.wait(running, timeout=5)
+        assert job["status"] == JOB_CANCELLED
+        assert "사용된 토큰" in job["error"]
+        assert server.request_count == 1
+        assert results[1].startswith(COMPLETION_ERROR_PREFIX) and len(results) == 2
+        assert not job_queue.cancel(running)
+    job_queue.shutdown()
+
+def test_jobs_get_request_deadline():
+    """RAG 외의 작업도 BLUEBELL_REQUEST_DEADLINE 마감 시간 안에서 실행"""
+    job_queue = JobQueue(store=JobStore(":memory:", ttl_seconds=60), max_workers=1)
+    os.environ["BLUEBELL_REQUEST_DEADLINE"] = "30"
+    try:
+        job_id = job_queue.submit("review", lambda: current_scope().remaining())
+        remaining = job_queue.wait(job_id, timeout=5)["result"]
+        assert remaining is not None and 0 < remaining <= 30
+    finally:
+        os.environ.pop("BLUEBELL_REQUEST_DEADLINE", None)
+        job_queue.shutdown()
+
+def test_wasted_tokens_recorded():
+    """호출 중에 클라이언트 연결이 끊기면 그 호출의 토큰을 낭비로 기록"""
+    tracker = configure_usage_tracking(UsageTracker(UsageStore(":memory:")))
+    job_queue = JobQueue(store=JobStore(":memory:", ttl_seconds=60), max_workers=1)
+    try:
+        with FakeOpenAIServer() as server:
+            client = make_azure_client(server)
+            # 첫 요청이 서버에 도착한 뒤부터 연결이 끊긴 것으로 판단
+            job_id = job_queue.submit("review", client.get_completion, MESSAGES,
+                                      alive_check=lambda: server.request_count == 0)
+            job = job_queue.wait(job_id, timeout=5)
+
+        assert job["status"] == JOB_CANCELLED
+        totals = tracker.store.totals()
+        assert totals["calls"] == 1
+        assert totals["wasted_tokens"] == totals["total_tokens"] > 0
+    finally:
+        job_queue.shutdown()
+        configure_usage_tracking(UsageTracker())
+
+if __name__ == "__main__":
+    print("🧪 요청 마감 시간/취소 테스트 시작...\n")
+    for test in [test_stage_timeout_follows_deadline, test_disconnected_client_cancels, test_search_receives_timeout,
+                 test_cancel_pending_and_running_jobs, test_jobs_get_request_deadline, test_wasted_tokens_recorded]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 마감 시간/취소 테스트 완료!")
@@ -0,0 +1,102 @@
+"""
+다중 배포 라우터(가중 순환, 최소 진행 요청, 서킷 브레이커, failover) 테스트 (Azure 연결 불필요)
+$ python tests/test_deployment_router.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.deployment_router import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, STRATEGY_LEAST_OUTSTANDING, STRATEGY_ROUND_ROBIN,
+    Backend, CircuitBreaker, DeploymentRouter, load_backends
+)
+
+def make_backend(name, weight=1, breaker=None):
+    return Backend(name, "http://localhost", "key", "gpt", "2024-12-01-preview", weight=weight, breaker=breaker)
+
+def test_weighted_round_robin():
+    """가중치 비율대로 분산되고 한 백엔드에 몰리지 않음"""
+    router = DeploymentRouter([make_backend("a", 3), make_backend("b", 1)], strategy=STRATEGY_ROUND_ROBIN)
+    picks = []
+    for _ in range(8):
+        backend = router.select()
+        picks.append(backend.name)
+        router.release(backend, success=True)
+    assert Counter(picks) == {"a": 6, "b": 2}
+    assert "bb" not in "".join(picks)
+
+def test_least_outstanding():
+    """진행 중 요청이 적은 백엔드를 우선 선택"""
+    router = DeploymentRouter([make_backend("a"), make_backend("b")], strategy=STRATEGY_LEAST_OUTSTANDING)
+    first = router.select()
+    second = router.select()
+    assert {first.name, second.name} == {"a", "b"}
+    router.release(first, success=True)
+    assert router.select().name == first.name
+
+def test_circuit_breaker_opens_and_recovers():
+    """연속 실패 시 차단되고 reset_timeout 후 시험 요청 1건으로 복구"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN and not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow() and breaker.state == CIRCUIT_HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED and breaker.allow()
+
+def test_failover_to_healthy_deployment():
+    """429만 반환하는 배포는 차단되고 다른 배포로 자동 전환"""
+    with FakeOpenAIServer(error_rate=1.0, retry_after_ms=1) as broken, FakeOpenAIServer() as healthy:
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = Path(tmp) / "deployments.json"
+            config_path.write_text(json.dumps([
+                {"name": "broken", "endpoint": broken.endpoint, "deployment": "gpt"},
+                {"name": "healthy", "endpoint": healthy.endpoint, "deployment": "gpt"},
+            ]))
+            client = make_azure_client(healthy)
+            client.router = DeploymentRouter(
+                load_backends(client.default_backend, str(config_path), failure_threshold=1, reset_timeout=60),
+                strategy=STRATEGY_ROUND_ROBIN
+            )
+            results = [client.get_completion([{"role": "user", "content": "hi"}]) for _ in range(4)]
+
+    assert all("오류가 발생했습니다" not in result for result in results)
+    stats = {backend["name"]: backend for backend in client.router.stats()}
+    assert stats["broken"]["circuit"] == CIRCUIT_OPEN and stats["broken"]["requests"] == 1
+    assert stats["healthy"]["requests"] == 4
+
+def test_single_backend_not_blocked():
+    """배포가 1개뿐이면 연속 실패해도 차단하지 않음 (전환할 배포가 없으므로)"""
+    backend = make_backend("only", breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    router = DeploymentRouter([backend])
+    for _ in range(3):
+        selected = router.select()
+        assert selected is backend
+        router.release(selected, success=False)
+    assert backend.breaker.state == CIRCUIT_CLOSED
+    assert router.stats()[0]["failures"] == 3
+
+if __name__ == "__main__":
+    print("🧪 다중 배포 라우터 테스트 시작...\n")
+    for test in [test_weighted_round_robin, test_least_outstanding,
+                 test_circuit_breaker_opens_and_recovers, test_failover_to_healthy_deployment,
+                 test_single_backend_not_blocked]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 다중 배포 라우터 테스트 완료!")
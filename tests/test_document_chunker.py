@@ -0,0 +1,198 @@
+"""
+문서 청크 분할 및 일괄 색인 테스트 (Azure 연결 불필요)
+$ python tests/test_document_chunker.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.document_chunker import chunk_document, split_content
+from modules.ingestion import BulkIngestor
+from modules.tenant_router import TenantRouter
+
+STYLE_GUIDE = "\n".join([
+    "# 네이밍",
+    "## 함수",
+    "함수 이름은 snake_case를 사용합니다. " + "동사로 시작하는 이름을 권장합니다. " * 12,
+    "",
+    "```python",
+    *[f"def get_user_{i}(user_id):  # 예시 {i}" for i in range(20)],
+    "```",
+    "",
+    "## 클래스",
+    "클래스 이름은 PascalCase를 사용합니다.",
+    "# 로깅",
+    "logging 모듈의 logger를 사용합니다.",
+])
+
+class RecordingSearchClient:
+    """upload_documents 호출을 기록하는 AzureSearchClient 대역"""
+
+    def __init__(self):
+        self.templates_index = "setup-templates"
+        self.tenant_router = TenantRouter("coding-conventions", {"acme": "coding-conventions-acme"}, "common")
+        self.uploads = []
+        self.cleanups = []
+        self.failing_parents = set()
+
+    def upload_documents(self, index_name, documents):
+        self.uploads.append((index_name, documents))
+        if any(doc["parent_id"] in self.failing_parents for doc in documents):
+            return len(documents) - 1
+        return len(documents)
+
+    def delete_stale_chunks(self, index_name, keep_ids):
+        self.cleanups.append((index_name, {parent_id: set(ids) for parent_id, ids in keep_ids.items()}))
+        return 0
+
+class IndexedSDKClient:
+    """검색/삭제 호출을 기록하는 Azure Search SDK 클라이언트 대역"""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.filters = []
+        self.deleted = []
+
+    def search(self, search_text, filter=None, select=None):
+        self.filters.append(filter)
+        return iter(self.documents)
+
+    def delete_documents(self, documents):
+        self.deleted.extend(doc["id"] for doc in documents)
+
+def test_sections_follow_headings():
+    """마크다운 제목 경로별로 섹션이 나뉘고 청크 길이는 상한 이하"""
+    chunks = split_content(STYLE_GUIDE, max_chars=300, overlap_chars=60)
+    sections = [section for section, _ in chunks]
+    assert sections[0] == "네이밍 > 함수"
+    assert "네이밍 > 클래스" in sections and sections[-1] == "로깅"
+    assert all(len(text) <= 300 for _, text in chunks)
+
+def test_code_blocks_stay_fenced():
+    """긴 코드 블록은 줄 단위로 나뉘어도 모든 청크의 펜스가 열고 닫힘"""
+    chunks = split_content(STYLE_GUIDE, max_chars=300, overlap_chars=60)
+    code_chunks = [text for _, text in chunks if "def get_user_" in text]
+    assert len(code_chunks) > 1
+    for text in code_chunks:
+        assert text.count("```") == 2 and text.startswith("```python")
+    joined = "\n".join(code_chunks)
+    assert all(f"def get_user_{i}(" in joined for i in range(20))
+
+def test_long_paragraph_overlaps():
+    """같은 문단을 나눈 연속 청크는 앞 청크 끝부분을 겹쳐 시작"""
+    chunks = split_content("## 규칙\n" + "문장 " * 200, max_chars=200, overlap_chars=40)
+    assert len(chunks) > 2
+    first, second = chunks[0][1], chunks[1][1]
+    assert second[:20] in first
+
+def test_chunk_document_metadata():
+    """청크는 원본 메타데이터와 parent_id/chunk_index/section, 섹션 경로가 포함된 제목을 가짐"""
+    document = {"id": "conv_naming", "title": "네이밍", "content": STYLE_GUIDE, "language": "python",
+                "company": "ktds", "content_vector": [0.0]}
+    chunks = chunk_document(document, max_chars=300, overlap_chars=60)
+    assert [chunk["id"] for chunk in chunks] == [f"conv_naming-{i}" for i in range(len(chunks))]
+    assert all(chunk["parent_id"] == "conv_naming" and chunk["company"] == "ktds" for chunk in chunks)
+    assert chunks[0]["title"] == "네이밍 > 함수" and chunks[-1]["title"] == "네이밍 > 로깅"
+    assert "content_vector" not in chunks[0]
+
+def test_bulk_ingestor_batches_and_routes():
+    """청크를 배치로 임베딩하고 회사별 인덱스로 업로드 (공용 규칙은 모든 인덱스)"""
+    calls = []
+
+    def embed_batch(texts):
+        calls.append(len(texts))
+        return [[float(len(text))] for text in texts]
+
+    search = RecordingSearchClient()
+    documents = [
+        {"id": "acme_rule", "title": "ACME 규칙", "content": STYLE_GUIDE, "company": "ACME "},
+        {"id": "common_rule", "title": "공용 규칙", "content": "짧은 규칙", "company": "common"},
+    ]
+    stats = BulkIngestor(search, embed_batch, batch_size=4).ingest_conventions(iter(documents))
+
+    assert max(calls) <= 4 and sum(calls) == stats["chunks"]
+    assert stats["failed"] == 0 and stats["documents"] == 2
+    indexes = {index_name for index_name, _ in search.uploads}
+    assert indexes == {"coding-conventions", "coding-conventions-acme"}
+    assert {doc["company"] for _, docs in search.uploads for doc in docs} == {"acme", "common"}
+    common = [doc for _, docs in search.uploads for doc in docs if doc["parent_id"] == "common_rule"]
+    assert len(common) == 2 and all("content_vector" in doc for doc in common)
+
+def test_bulk_ingestor_skips_failed_embeddings():
+    """임베딩에 실패한 배치는 업로드하지 않고 실패 수로 집계"""
+    def embed_batch(texts):
+        raise RuntimeError("429")
+
+    search = RecordingSearchClient()
+    stats = BulkIngestor(search, embed_batch).ingest_templates([{"id": "t", "title": "t", "content": "내용"}])
+    assert stats == {"documents": 1, "chunks": 1, "uploaded": 0, "failed": 1, "deleted": 0}
+    assert search.uploads == []
+
+def test_reingest_removes_stale_chunks():
+    """다시 색인하면 새로 만들지 않은 이전 청크와 청크 분할 전 문서를 parent_id로 찾아 삭제"""
+    search = RecordingSearchClient()
+    documents = [{"id": f"rule_{i}", "title": "규칙", "content": "짧은 규칙"} for i in range(3)]
+    BulkIngestor(search, lambda texts: [[0.0] for _ in texts], batch_size=2).ingest_templates(documents)
+    cleaned = {parent_id: ids for _, parents in search.cleanups for parent_id, ids in parents.items()}
+    assert cleaned == {f"rule_{i}": {f"rule_{i}-0"} for i in range(3)}
+
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+
+    client = AzureSearchClient()
+    sdk = IndexedSDKClient([{"id": f"rule_0-{i}", "parent_id": "rule_0"} for i in range(3)])
+    client._search_clients["setup-templates"] = sdk
+    assert client.delete_stale_chunks("setup-templates", {"rule_0": {"rule_0-0"}}) == 3
+    assert sdk.filters == ["parent_id eq 'rule_0'"]
+    assert sdk.deleted == ["rule_0-1", "rule_0-2", "rule_0"]
+
+def test_failed_upload_keeps_previous_chunks():
+    """임베딩/업로드에 실패한 문서는 이전 청크를 지우지 않음 (여러 배치에 걸친 문서는 모두 올린 뒤 정리)"""
+    documents = [{"id": f"rule_{i}", "title": "규칙", "content": "짧은 규칙"} for i in range(3)]
+    documents.append({"id": "guide", "title": "가이드", "content": STYLE_GUIDE})
+
+    search = RecordingSearchClient()
+    search.failing_parents = {"rule_1"}
+    stats = BulkIngestor(search, lambda texts: [[0.0] for _ in texts], batch_size=1,
+                         max_chars=300, overlap_chars=60).ingest_templates(documents)
+    cleaned = {parent_id for _, parents in search.cleanups for parent_id in parents}
+    assert cleaned == {"rule_0", "rule_2", "guide"} and stats["failed"] == 1
+    guide_cleanups = [parents["guide"] for _, parents in search.cleanups if "guide" in parents]
+    assert len(guide_cleanups) == 1 and len(guide_cleanups[0]) > 1
+
+    def embed_batch(texts):
+        raise RuntimeError("429")
+
+    search = RecordingSearchClient()
+    BulkIngestor(search, embed_batch).ingest_templates(documents)
+    assert search.uploads == [] and search.cleanups == []
+
+def test_create_embeddings_single_request():
+    """create_embeddings는 여러 텍스트를 요청 한 번으로 임베딩"""
+    with FakeOpenAIServer(embedding_dimensions=8) as server:
+        client = make_azure_client(server)
+        vectors = client.create_embeddings(["a", "b", "c"])
+        assert len(vectors) == 3 and all(len(vector) == 8 for vector in vectors)
+        assert vectors[0] == client.create_embedding("a")
+        assert sum(1 for request in server.requests if request["path"].endswith("/embeddings")) == 2
+
+if __name__ == "__main__":
+    print("🧪 문서 청크 분할 테스트 시작...\n")
+    for test in [test_sections_follow_headings, test_code_blocks_stay_fenced, test_long_paragraph_overlaps,
+                 test_chunk_document_metadata, test_bulk_ingestor_batches_and_routes,
+                 test_bulk_ingestor_skips_failed_embeddings, test_reingest_removes_stale_chunks,
+                 test_failed_upload_keeps_previous_chunks,
+                 test_create_embeddings_single_request]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 문서 청크 분할 테스트 완료!")
@@ -0,0 +1,90 @@
+"""
+로컬 임베딩 저장소 테스트 (float32/int8, 메모리 맵 파일)
+$ python tests/test_embedding_store.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.embedding_store import DTYPE_FLOAT32, DTYPE_INT8, EmbeddingStore, quantize_int8
+
+def random_vectors(count, dim=64, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+
+def test_int8_quantization_error():
+    """int8 양자화 후 복원한 벡터는 원래 벡터와 거의 같음"""
+    vectors = random_vectors(10)
+    quantized, scales = quantize_int8(vectors)
+    assert quantized.dtype == np.int8
+    restored = quantized.astype(np.float32) * scales[:, None]
+    assert np.abs(restored - vectors).max() <= scales.max() / 2 + 1e-6
+
+def test_search_matches_full_precision():
+    """float32/int8 모두 자기 자신을 가장 유사한 벡터로 찾고, 같은 ID는 덮어씀"""
+    vectors = random_vectors(300)
+    ids = [f"doc-{i}" for i in range(300)]
+    for dtype in (DTYPE_FLOAT32, DTYPE_INT8):
+        store = EmbeddingStore(dtype=dtype, capacity=16)
+        store.add_many(ids, vectors)
+        assert len(store) == 300
+        assert store.search(vectors[42], top=3)[0][0] == "doc-42"
+        assert store.search(vectors[42], top=1, candidates=["doc-1", "doc-42"])[0][0] == "doc-42"
+
+        store.add("doc-42", vectors[7])
+        assert len(store) == 300
+        assert store.search(vectors[7], top=2)[1][1] > 0.99
+
+    assert EmbeddingStore(dtype=DTYPE_INT8).memory_bytes() == 0
+    int8_store = EmbeddingStore(dtype=DTYPE_INT8)
+    int8_store.add_many(ids, vectors)
+    assert int8_store.memory_bytes() == 300 * (64 + 4)
+
+def test_persist_and_reopen():
+    """파일 저장소는 확장/삭제 후에도 다시 열면 같은 ID와 벡터를 가짐"""
+    vectors = random_vectors(50)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "embeddings.bin")
+        store = EmbeddingStore(path, dtype=DTYPE_INT8, capacity=8)
+        store.add_many([f"doc-{i}" for i in range(50)], vectors)
+        assert store.remove("doc-3")
+        expected = store.get("doc-49")
+        store.close()
+
+        reopened = EmbeddingStore(path)
+        assert reopened.dtype == DTYPE_INT8 and reopened.dim == 64
+        assert len(reopened) == 49 and "doc-3" not in reopened
+        assert np.allclose(reopened.get("doc-49"), expected)
+        assert reopened.search(vectors[10], top=1)[0][0] == "doc-10"
+        reopened.close()
+
+def test_reopen_after_growth_without_flush():
+    """확장 직후 flush() 없이 종료돼도 확장 시점까지의 벡터로 다시 열 수 있음"""
+    vectors = random_vectors(10)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "embeddings.bin")
+        store = EmbeddingStore(path, dim=64, capacity=4)
+        assert len(EmbeddingStore(path)) == 0
+        store.add_many([f"doc-{i}" for i in range(10)], vectors)
+
+        reopened = EmbeddingStore(path)
+        assert reopened.ids() == [f"doc-{i}" for i in range(8)]
+        assert reopened.search(vectors[5], top=1)[0][0] == "doc-5"
+        reopened.close()
+        store.close()
+
+if __name__ == "__main__":
+    print("🧪 임베딩 저장소 테스트 시작...\n")
+    for test in [test_int8_quantization_error, test_search_matches_full_precision, test_persist_and_reopen,
+                 test_reopen_after_growth_without_flush]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 임베딩 저장소 테스트 완료!")
@@ -0,0 +1,102 @@
+"""
+가이드/리뷰 기록 저장소 테스트 (Azure 연결 불필요)
+$ python tests/test_history_store.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.code_reviewer import CodeReviewer
+from modules.history_store import KIND_GUIDE, KIND_REVIEW, HistoryStore
+from modules.setup_analyzer import SetupAnalyzer
+
+def test_find_by_exact_hash():
+    """줄 끝 공백만 다른 입력은 같은 기록, 들여쓰기/대소문자/범위가 다르면 조회 안 됨"""
+    store = HistoryStore(":memory:")
+    store.add(KIND_GUIDE, "# My App\npip install -r requirements.txt", "kind=guide|os_type=linux", "가이드", os_type="linux")
+
+    entry = store.find("# My App  \r\npip install -r requirements.txt\n", "kind=guide|os_type=linux")
+    assert entry["result"] == "가이드" and entry["title"] == "My App"
+    assert store.find("# my app\npip install -r requirements.txt", "kind=guide|os_type=linux") is None
+    assert store.find("# My App\n  pip install -r requirements.txt", "kind=guide|os_type=linux") is None
+    assert store.find("# My App\npip install -r requirements.txt", "kind=guide|os_type=windows") is None
+
+def test_version_mismatch_not_reused():
+    """모델/프롬프트 버전이 바뀌면 이전 기록은 목록에만 남고 재사용하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "history.db")
+        HistoryStore(path, version={"chat": "gpt-4o", "prompt": "abc"}).add(KIND_REVIEW, "code", "kind=review", "리뷰")
+
+        assert HistoryStore(path, version={"chat": "gpt-4o", "prompt": "abc"}).find("code", "kind=review")["result"] == "리뷰"
+        changed = HistoryStore(path, version={"chat": "gpt-4o", "prompt": "def"})
+        assert changed.find("code", "kind=review") is None
+        assert changed.list()[1] == 1
+
+def test_list_filters_and_pagination():
+    """종류/언어 필터와 페이지 단위 목록, 보관 개수 초과 시 오래된 기록 삭제"""
+    store = HistoryStore(":memory:", max_entries=20)
+    for i in range(25):
+        store.add(KIND_REVIEW, f"code {i}", "kind=review", {"findings": [], "n": i},
+                  language="python" if i % 2 else "java")
+
+    entries, total = store.list(kind=KIND_REVIEW, page=1, page_size=10)
+    assert total == 20 and len(entries) == 10
+    assert "result" not in entries[0]
+    assert store.get(entries[0]["id"])["result"]["n"] == 24
+
+    python_entries, python_total = store.list(language="python", page=2, page_size=5)
+    assert python_total == 10 and len(python_entries) == 5
+    assert store.find("code 0", "kind=review") is None
+
+def test_owner_filter():
+    """owner를 주면 다른 세션의 기록은 목록/조회/삭제 대상이 아님"""
+    store = HistoryStore(":memory:")
+    mine = store.add(KIND_REVIEW, "code a", "kind=review", "A", owner="session-a")
+    theirs = store.add(KIND_REVIEW, "code b", "kind=review", "B", owner="session-b")
+
+    entries, total = store.list(owner="session-a")
+    assert total == 1 and entries[0]["id"] == mine
+    assert store.get(theirs, owner="session-a") is None
+    assert not store.delete(theirs, owner="session-a")
+    assert store.get(theirs)["result"] == "B"
+    assert store.delete(mine, owner="session-a")
+
+def test_analyzers_reuse_history():
+    """같은 README/코드를 다시 요청하면 LLM 호출 없이 기록 반환"""
+    store = HistoryStore(":memory:")
+    readme = "# Sample\npip install -r requirements.txt\npython app.py"
+    code = "def addUser(u):\n    return u\n"
+    with FakeOpenAIServer() as server:
+        client = make_azure_client(server)
+        analyzer = SetupAnalyzer(client, history_store=store)
+        reviewer = CodeReviewer(client, history_store=store)
+
+        guide = analyzer.generate_guide(readme, "linux")
+        review = reviewer.review(code, "python")
+        structured = reviewer.review_structured(code, "python", file_path="users.py")
+        calls = server.request_count
+
+        assert analyzer.generate_guide(readme, "linux") == guide
+        assert reviewer.review(code, "python") == review
+        assert reviewer.review_structured(code, "python", file_path="users.py") == structured
+        assert server.request_count == calls
+
+    _, total = store.list()
+    assert total == 3
+
+if __name__ == "__main__":
+    print("🧪 기록 저장소 테스트 시작...\n")
+    for test in [test_find_by_exact_hash, test_version_mismatch_not_reused, test_list_filters_and_pagination,
+                 test_owner_filter, test_analyzers_reuse_history]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 기록 저장소 테스트 완료!")
@@ -0,0 +1,68 @@
+"""
+인덱스 프로필 테스트 (Azure 연결 불필요)
+$ python tests/test_index_profiles.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.index_profiles import DEFAULT_INDEX_PROFILE, INDEX_PROFILES, resolve_index_profile
+
+_ENV_NAMES = ["BLUEBELL_INDEX_PROFILE", "BLUEBELL_INDEX_COMPRESSION", "BLUEBELL_HNSW_M",
+              "BLUEBELL_HNSW_EF_CONSTRUCTION", "BLUEBELL_HNSW_EF_SEARCH", "BLUEBELL_INDEX_OVERSAMPLING"]
+
+def _with_env(values: dict, func):
+    saved = {name: os.environ.pop(name, None) for name in _ENV_NAMES}
+    os.environ.update(values)
+    try:
+        return func()
+    finally:
+        for name in _ENV_NAMES:
+            os.environ.pop(name, None)
+            if saved[name] is not None:
+                os.environ[name] = saved[name]
+
+def test_default_and_named_profiles():
+    """기본 프로필과 이름으로 고른 프로필의 HNSW 파라미터"""
+    profile = _with_env({}, resolve_index_profile)
+    assert profile["name"] == DEFAULT_INDEX_PROFILE and profile["compression"] == "none"
+    accurate = resolve_index_profile("accurate", "scalar")
+    assert accurate["m"] == INDEX_PROFILES["accurate"]["m"] and accurate["compression"] == "scalar"
+
+def test_env_overrides_and_validation():
+    """환경 변수로 프로필/개별 값 재정의, 범위를 벗어나거나 모르는 값은 ValueError"""
+    profile = _with_env({"BLUEBELL_INDEX_PROFILE": "fast", "BLUEBELL_HNSW_EF_SEARCH": "300"}, resolve_index_profile)
+    assert profile["name"] == "fast" and profile["ef_search"] == 300
+
+    for env in [{"BLUEBELL_INDEX_PROFILE": "turbo"}, {"BLUEBELL_INDEX_COMPRESSION": "pq"}, {"BLUEBELL_HNSW_M": "64"}]:
+        try:
+            _with_env(env, resolve_index_profile)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError가 발생해야 합니다: {env}")
+
+def test_index_admin_uses_profile():
+    """인덱스 관리자는 프로필의 HNSW 파라미터로 벡터 검색 설정 생성"""
+    from azure.core.credentials import AzureKeyCredential
+    from modules.search_index_admin import SearchIndexAdmin
+
+    admin = SearchIndexAdmin("https://fake.search.windows.net", AzureKeyCredential("fake-key"),
+                             "conventions", "templates", profile=resolve_index_profile("fast"))
+    serialized = admin._vector_search("conventions").serialize()
+    assert serialized["algorithms"][0]["hnswParameters"] == {"m": 4, "efConstruction": 100, "efSearch": 100,
+                                                             "metric": "cosine"}
+    assert serialized["profiles"][0]["algorithm"] == "conventions-hnsw"
+
+if __name__ == "__main__":
+    print("🧪 인덱스 프로필 테스트 시작...\n")
+    for test in [test_default_and_named_profiles, test_env_overrides_and_validation, test_index_admin_uses_profile]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 인덱스 프로필 테스트 완료!")
@@ -0,0 +1,180 @@
+"""
+백그라운드 작업 큐 테스트 (Azure 연결 불필요)
+$ python tests/test_job_queue.py
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.job_queue import (
+    JobQueue, JobStore, JobQueueFullError,
+    JOB_DONE, JOB_FAILED, JOB_RUNNING, PRIORITY_HIGH, PRIORITY_LOW
+)
+
+def make_queue(**kwargs):
+    """메모리 DB를 사용하는 테스트용 큐"""
+    return JobQueue(store=JobStore(":memory:", ttl_seconds=60), **kwargs)
+
+def test_submit_and_wait():
+    """작업 제출 후 결과 조회"""
+    job_queue = make_queue(max_workers=1)
+    job_id = job_queue.submit("review", lambda code: f"리뷰: {code}", "print(1)")
+
+    job = job_queue.wait(job_id, timeout=5)
+    assert job["status"] == JOB_DONE
+    assert job["result"] == "리뷰: print(1)"
+    job_queue.shutdown()
+
+def test_failed_job():
+    """예외가 발생한 작업은 실패로 기록"""
+    job_queue = make_queue(max_workers=1)
+
+    def broken():
+        raise ValueError("잘못된 입력")
+
+    job = job_queue.wait(job_queue.submit("guide", broken), timeout=5)
+    assert job["status"] == JOB_FAILED
+    assert "잘못된 입력" in job["error"]
+    job_queue.shutdown()
+
+def test_priority_order():
+    """워커가 바쁠 때 우선순위가 높은 작업이 먼저 처리됨"""
+    job_queue = make_queue(max_workers=1)
+    gate = threading.Event()
+    order = []
+
+    job_queue.submit("block", gate.wait, 5)
+    low = job_queue.submit("guide", order.append, "low", priority=PRIORITY_LOW)
+    high = job_queue.submit("review", order.append, "high", priority=PRIORITY_HIGH)
+    gate.set()
+
+    job_queue.wait(low, timeout=5)
+    job_queue.wait(high, timeout=5)
+    assert order == ["high", "low"]
+    job_queue.shutdown()
+
+def test_backpressure():
+    """대기열이 가득 차면 제출 거부"""
+    job_queue = make_queue(max_workers=1, max_pending=1)
+    gate = threading.Event()
+
+    job_queue.submit("block", gate.wait, 5)
+    time.sleep(0.1)  # 첫 작업이 워커에 할당될 때까지 대기
+    job_queue.submit("guide", lambda: "ok")
+    try:
+        job_queue.submit("guide", lambda: "ok")
+        assert False, "JobQueueFullError가 발생해야 합니다"
+    except JobQueueFullError:
+        pass
+    finally:
+        gate.set()
+        job_queue.shutdown()
+
+def test_fair_order_between_owners():
+    """같은 우선순위에서는 소유자별로 번갈아 처리, 소유자별 상한 초과 시 거부"""
+    job_queue = make_queue(max_workers=1, max_pending_per_owner=3)
+    gate = threading.Event()
+    order = []
+
+    job_queue.submit("block", gate.wait, 5, owner="holder")
+    time.sleep(0.1)  # 첫 작업이 워커에 할당될 때까지 대기
+    a_ids = [job_queue.submit("guide", order.append, f"a{i}", owner="alice") for i in range(3)]
+    b_id = job_queue.submit("guide", order.append, "b0", owner="bob")
+    try:
+        job_queue.submit("guide", order.append, "a3", owner="alice")
+        assert False, "JobQueueFullError가 발생해야 합니다"
+    except JobQueueFullError:
+        pass
+
+    assert job_queue.position(a_ids[0]) == 1
+    assert job_queue.position(b_id) == 2
+    assert job_queue.position(a_ids[2]) == 4
+
+    gate.set()
+    job_queue.wait(a_ids[2], timeout=5)
+    assert order == ["a0", "b0", "a1", "a2"]
+    assert job_queue.position(a_ids[0]) == 0
+
+    # 완료된 작업은 상한에서 빠짐
+    job_queue.wait(job_queue.submit("guide", order.append, "a4", owner="alice"), timeout=5)
+    job_queue.shutdown()
+
+def test_subscribe_and_ttl():
+    """구독 콜백 호출 및 TTL 만료"""
+    store = JobStore(":memory:", ttl_seconds=0.2)
+    job_queue = JobQueue(store=store, max_workers=1)
+    received = threading.Event()
+
+    job_id = job_queue.submit("guide", lambda: "가이드")
+    job_queue.subscribe(job_id, lambda job: received.set())
+    assert received.wait(5)
+
+    time.sleep(0.3)
+    assert job_queue.get_status(job_id) is None
+    assert store.purge_expired() == 1
+    job_queue.shutdown()
+
+def test_restart_keeps_other_instances_jobs():
+    """시작 시 같은 인스턴스의 작업과 생존 신호가 끊긴 인스턴스의 작업만 실패로 표시"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "jobs.db")
+        other = JobStore(path, instance_id="host:1")
+        other.create("live", "review", PRIORITY_LOW)
+        other.update("live", JOB_RUNNING)
+        JobStore(path, instance_id="host:2").create("restarted", "review", PRIORITY_LOW)
+
+        assert JobStore(path, instance_id="host:2").mark_interrupted() == 1
+        assert other.get("restarted")["status"] == JOB_FAILED
+        assert other.get("live")["status"] == JOB_RUNNING
+
+        # 오래 실행 중인 작업이어도 생존 신호가 있으면 유지
+        time.sleep(0.05)
+        other.heartbeat()
+        assert JobStore(path, instance_id="host:3").mark_interrupted(stale_seconds=0.03) == 0
+        assert other.get("live")["status"] == JOB_RUNNING
+
+        time.sleep(0.05)
+        assert JobStore(path, instance_id="host:4").mark_interrupted(stale_seconds=0.03) == 1
+        assert other.get("live")["status"] == JOB_FAILED
+
+def test_concurrent_submits_respect_max_pending():
+    """동시에 제출해도 대기열 상한을 넘지 않음"""
+    job_queue = make_queue(max_workers=1, max_pending=5)
+    gate = threading.Event()
+    job_queue.submit("block", gate.wait, 5)
+    time.sleep(0.1)  # 첫 작업이 워커에 할당될 때까지 대기
+
+    accepted, rejected = [], []
+
+    def submit():
+        try:
+            accepted.append(job_queue.submit("guide", lambda: "ok"))
+        except JobQueueFullError:
+            rejected.append(True)
+
+    threads = [threading.Thread(target=submit) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gate.set()
+    job_queue.shutdown()
+    assert len(accepted) == 5 and len(rejected) == 15
+
+if __name__ == "__main__":
+    print("🧪 작업 큐 테스트 시작...\n")
+    for test in [test_submit_and_wait, test_failed_job, test_priority_order,
+                 test_backpressure, test_fair_order_between_owners, test_subscribe_and_ttl,
+                 test_restart_keeps_other_instances_jobs, test_concurrent_submits_respect_max_pending]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 작업 큐 테스트 완료!")
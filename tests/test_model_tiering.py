@@ -0,0 +1,91 @@
+"""
+모델 계층(small/large) 선택 및 계층별 지표 테스트 (Azure 연결 불필요)
+$ python tests/test_model_tiering.py
+"""
+
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.code_reviewer import CodeReviewer
+from modules.deployment_router import TIER_LARGE, TIER_SMALL
+from modules.model_tiering import (
+    TierMetrics, choose_guide_tier, choose_review_tier, extract_tech_stack, get_tier_metrics
+)
+
+def test_review_tier_policy():
+    """네이밍/구조만 보는 짧은 코드는 small, 보안·버그 검토나 긴 코드는 large"""
+    short_code = "def addUser(u):\n    pass\n"
+    assert choose_review_tier(short_code, {"check_naming": True, "check_security": False}) == TIER_SMALL
+    assert choose_review_tier(short_code, {"check_naming": True, "check_security": True}) == TIER_LARGE
+    assert choose_review_tier("x = 1\n" * 1000, {"check_naming": True}) == TIER_LARGE
+    assert choose_review_tier(short_code, None) == TIER_LARGE
+
+def test_guide_tier_policy():
+    """단일 OS + 짧은 README는 small, 전체 OS 가이드는 large"""
+    assert choose_guide_tier("# app\npip install -r requirements.txt", "linux", ["python"]) == TIER_SMALL
+    assert choose_guide_tier("# app\npip install -r requirements.txt", "all", ["python"]) == TIER_LARGE
+
+def test_tier_metrics():
+    """계층별 지연 백분위수와 잘림/오류 비율 집계"""
+    metrics = TierMetrics()
+    for latency in (10, 20, 30, 40):
+        metrics.record(TIER_SMALL, latency, "stop")
+    metrics.record(TIER_SMALL, 50, "length", continuations=1)
+    metrics.record(TIER_SMALL, 0, error=True)
+
+    stats = metrics.stats()[TIER_SMALL]
+    assert stats["calls"] == 6
+    assert stats["p50_ms"] == 30
+    assert stats["truncated_rate"] == round(1 / 6, 3)
+    assert stats["error_rate"] == round(1 / 6, 3)
+
+def test_simple_review_uses_small_deployment():
+    """small 계층 배포가 있으면 네이밍 리뷰는 small로, 전체 리뷰는 large로 전달"""
+    with FakeOpenAIServer() as large, FakeOpenAIServer() as small:
+        client = make_azure_client(large)
+        client.routers[TIER_SMALL] = make_azure_client(small).router
+        reviewer = CodeReviewer(client)
+        reviewer.review("def addUser(u):\n    pass\n", "python", {"check_naming": True})
+        reviewer.review("def addUser(u):\n    pass\n", "python")
+
+    assert small.request_count == 1 and large.request_count == 1
+    assert get_tier_metrics().stats()[TIER_SMALL]["calls"] >= 1
+
+def test_basic_guide_routes_by_tech_stack():
+    """기본 방식 가이드도 README의 기술 스택으로 계층 선택 (복잡한 스택은 단일 OS여도 large)"""
+    simple = "# app\npip install -r requirements.txt"
+    complex_stack = "# app\nReact + Express 서버, MongoDB와 Redis 사용, docker-compose up"
+    assert len(extract_tech_stack(simple)) <= 2
+    assert len(extract_tech_stack(complex_stack)) > 2
+
+    with FakeOpenAIServer() as large, FakeOpenAIServer() as small:
+        client = make_azure_client(large)
+        client.routers[TIER_SMALL] = make_azure_client(small).router
+        client.analyze_readme(simple, "linux")
+        client.analyze_readme(complex_stack, "linux")
+
+    assert small.request_count == 1 and large.request_count == 1
+
+def test_missing_small_tier_falls_back_to_large():
+    """small 계층 배포가 없으면 large 배포 사용"""
+    with FakeOpenAIServer() as large:
+        client = make_azure_client(large)
+        result = client.get_completion([{"role": "user", "content": "hi"}], tier=TIER_SMALL)
+    assert "snake_case" in result and large.request_count == 1
+
+if __name__ == "__main__":
+    print("🧪 모델 계층 테스트 시작...\n")
+    for test in [test_review_tier_policy, test_guide_tier_policy, test_tier_metrics,
+                 test_simple_review_uses_small_deployment, test_basic_guide_routes_by_tech_stack,
+                 test_missing_small_tier_falls_back_to_large]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 모델 계층 테스트 완료!")
@@ -0,0 +1,128 @@
+"""
+가짜 Azure 서비스 기반 오프라인 파이프라인 테스트 (Azure 연결 불필요)
+$ python tests/test_offline_pipeline.py
+"""
+
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, FakeSearchClient, make_azure_client
+from modules.code_reviewer import CodeReviewer
+from modules.prompt_builder import REVIEW_SYSTEM_PROMPT
+from modules.output_budget import MAX_OUTPUT_TOKENS, estimate_guide_tokens, estimate_review_tokens
+from modules.rag_service import RAGService
+from modules.tracing import configure_tracing
+
+class CollectingExporter:
+    """내보낸 span을 메모리에 보관"""
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+def test_completion_through_fake_server():
+    """실제 AzureOpenAIClient가 가짜 서버로 응답과 토큰 사용량을 받음"""
+    exporter = CollectingExporter()
+    configure_tracing([exporter])
+    try:
+        with FakeOpenAIServer(completion_tokens=50) as server:
+            client = make_azure_client(server)
+            result = client.get_completion([{"role": "user", "content": "x" * 400}], max_tokens=100)
+    finally:
+        configure_tracing([])
+
+    assert "snake_case" in result
+    span = exporter.spans[-1]
+    assert span.attributes["prompt_tokens"] == 100
+    assert span.attributes["completion_tokens"] == 50
+    assert span.attributes["finish_reason"] == "stop"
+
+def test_throttled_request_is_retried():
+    """429 응답은 SDK 재시도로 복구되고 재시도 횟수가 기록됨"""
+    exporter = CollectingExporter()
+    configure_tracing([exporter])
+    try:
+        with FakeOpenAIServer(error_rate=0.5, retry_after_ms=10, seed=3) as server:
+            client = make_azure_client(server)
+            results = [client.get_completion([{"role": "user", "content": "hi"}]) for _ in range(5)]
+    finally:
+        configure_tracing([])
+
+    assert server.throttled_count > 0
+    assert all("오류가 발생했습니다" not in result for result in results)
+    assert sum(span.attributes["retries"] for span in exporter.spans) == server.throttled_count
+
+def test_rag_review_end_to_end():
+    """가짜 Search + 가짜 OpenAI로 RAG 코드 리뷰 전체 경로 실행"""
+    search_client = FakeSearchClient()
+    with FakeOpenAIServer() as server:
+        reviewer = CodeReviewer(make_azure_client(server), RAGService(make_azure_client(server), search_client))
+        result = reviewer.review("def addUser(userName):\n    print(userName)\n", "python")
+
+    assert "snake_case" in result
+    assert search_client.queries[0]["language"] == "python"
+    # 검색된 컨벤션은 정적 지시문 뒤(user 메시지)에 배치됨
+    messages = server.requests[-1]["body"]["messages"]
+    assert messages[0]["content"] == REVIEW_SYSTEM_PROMPT
+    assert "Python 네이밍 컨벤션" in messages[-1]["content"]
+
+def test_truncated_completion_is_continued():
+    """finish_reason == "length"면 잘린 부분부터 이어서 생성"""
+    exporter = CollectingExporter()
+    configure_tracing([exporter])
+    try:
+        with FakeOpenAIServer(completion_tokens=300) as server:
+            client = make_azure_client(server)
+            result = client.get_completion([{"role": "user", "content": "hi"}], max_tokens=100, max_continuations=2)
+    finally:
+        configure_tracing([])
+
+    assert server.request_count == 3
+    continued = server.requests[1]["body"]["messages"]
+    assert continued[-2]["role"] == "assistant" and continued[-1]["role"] == "user"
+    span = exporter.spans[-1]
+    assert span.attributes["continuations"] == 2
+    assert span.attributes["completion_tokens"] == 300
+    assert result.count("snake_case") == 30
+
+def test_adaptive_max_tokens():
+    """리뷰 항목 수/코드 길이/OS 수에 따라 max_tokens가 달라짐"""
+    few_options = {"check_naming": True, "check_bugs": False}
+    assert estimate_review_tokens("x = 1", few_options) < estimate_review_tokens("x = 1")
+    assert estimate_review_tokens("x = 1\n" * 10) < estimate_review_tokens("x = 1\n" * 500)
+    assert estimate_guide_tokens("linux") < estimate_guide_tokens("all")
+    assert estimate_review_tokens("x" * 100000) <= MAX_OUTPUT_TOKENS
+
+def test_static_prefix_hits_prompt_cache():
+    """옵션/언어/코드가 달라도 정적 지시문이 같아 두 번째 요청부터 캐시 적중"""
+    exporter = CollectingExporter()
+    configure_tracing([exporter])
+    try:
+        with FakeOpenAIServer(prompt_cache_min_tokens=256) as server:
+            reviewer = CodeReviewer(make_azure_client(server))
+            reviewer.review("def addUser(u):\n    pass\n", "python", {"check_naming": True})
+            reviewer.review("function add_user(u) { return u; }", "javascript", {"check_security": True})
+    finally:
+        configure_tracing([])
+
+    first, second = [span for span in exporter.spans if span.name == "openai.chat_completion"]
+    assert first.attributes["cached_tokens"] == 0
+    assert second.attributes["cached_tokens"] > 0
+    assert 0 < second.attributes["cached_ratio"] <= 1
+
+if __name__ == "__main__":
+    print("🧪 오프라인 파이프라인 테스트 시작...\n")
+    for test in [test_completion_through_fake_server, test_throttled_request_is_retried,
+                 test_rag_review_end_to_end, test_truncated_completion_is_continued, test_adaptive_max_tokens,
+                 test_static_prefix_hits_prompt_cache]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 오프라인 파이프라인 테스트 완료!")
@@ -0,0 +1,107 @@
+"""
+사용자별 요청 속도 제한 테스트 (Azure 연결 불필요)
+$ python tests/test_rate_limiter.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.rate_limiter import (
+    RateLimiter, RateLimitExceededError, SQLiteBucketStore, client_ip_from_headers, configure_rate_limiter
+)
+from modules.usage_tracker import usage_context
+
+def _rejected(limiter, identities) -> bool:
+    try:
+        limiter.acquire(identities)
+        return False
+    except RateLimitExceededError as e:
+        assert e.retry_after > 0
+        return True
+
+def test_request_bucket_burst_and_refill():
+    """연속 요청은 burst까지 허용, 이후 거부되고 시간이 지나면 다시 허용"""
+    limiter = RateLimiter(requests_per_minute=600, request_burst=2)  # 초당 10개 충전
+    assert not _rejected(limiter, ["session:a"])
+    assert not _rejected(limiter, ["session:a"])
+    assert _rejected(limiter, ["session:a"])
+    assert not _rejected(limiter, ["session:b"])
+
+    time.sleep(0.15)
+    assert not _rejected(limiter, ["session:a"])
+
+def test_all_identities_checked_atomically():
+    """같은 IP의 다른 세션도 IP 버킷으로 제한, 거부된 요청은 어느 버킷도 소모하지 않음"""
+    limiter = RateLimiter(requests_per_minute=1, request_burst=2)
+    limiter.acquire(["session:a", "ip:10.0.0.1"])
+    limiter.acquire(["session:b", "ip:10.0.0.1"])
+    assert _rejected(limiter, ["session:c", "ip:10.0.0.1"])
+
+    # session:c는 소모되지 않았으므로 다른 IP에서는 2번 허용
+    limiter.acquire(["session:c", "ip:10.0.0.2"])
+    limiter.acquire(["session:c", "ip:10.0.0.3"])
+    assert _rejected(limiter, ["session:c", "ip:10.0.0.4"])
+
+def test_token_bucket_debt():
+    """사용 토큰이 버킷을 넘으면 다시 충전될 때까지 거부"""
+    limiter = RateLimiter(tokens_per_minute=60, token_burst=1000)
+    limiter.acquire(["session:heavy"])
+    limiter.charge(["session:heavy"], 1500)
+    assert _rejected(limiter, ["session:heavy"])
+    assert not _rejected(limiter, ["session:light"])
+
+def test_shared_sqlite_store():
+    """SQLite 저장소를 쓰면 여러 제한기(워커 프로세스)가 버킷을 공유"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "rate.db")
+        first = RateLimiter(SQLiteBucketStore(db_path), requests_per_minute=1, request_burst=2)
+        second = RateLimiter(SQLiteBucketStore(db_path), requests_per_minute=1, request_burst=2)
+
+        first.acquire(["session:a"])
+        second.acquire(["session:a"])
+        assert _rejected(first, ["session:a"])
+        assert _rejected(second, ["session:a"])
+        assert first.store.purge(time.time() + 1) == 1
+
+def test_completion_charges_token_bucket():
+    """LLM 호출이 끝나면 rate_limit_keys 식별자의 토큰 버킷에서 사용량 차감"""
+    limiter = configure_rate_limiter(RateLimiter(tokens_per_minute=1, token_burst=10))
+    try:
+        with FakeOpenAIServer() as server:
+            client = make_azure_client(server)
+            messages = [{"role": "user", "content": "긴 질문 " * 50}]
+            with usage_context(session_id="a", rate_limit_keys=["session:a"]):
+                limiter.acquire(["session:a"])
+                client.get_completion(messages)
+        assert _rejected(limiter, ["session:a"])
+    finally:
+        configure_rate_limiter(None)
+
+def test_client_ip_from_trusted_proxy():
+    """X-Forwarded-For는 신뢰하는 프록시가 붙인 오른쪽 항목만 사용 (클라이언트가 넣은 왼쪽 항목은 무시)"""
+    headers = {"X-Forwarded-For": "6.6.6.6, 203.0.113.7:51234, 10.0.0.2"}
+    assert client_ip_from_headers(headers, 0) is None
+    assert client_ip_from_headers(headers, 1) == "10.0.0.2"
+    assert client_ip_from_headers(headers, 2) == "203.0.113.7"
+    assert client_ip_from_headers(headers, 4) is None
+    assert client_ip_from_headers({"X-Real-Ip": "203.0.113.7"}, 1) == "203.0.113.7"
+    assert client_ip_from_headers({"X-Forwarded-For": "2001:db8::1"}, 1) == "2001:db8::1"
+
+if __name__ == "__main__":
+    print("🧪 요청 속도 제한 테스트 시작...\n")
+    for test in [test_request_bucket_burst_and_refill, test_all_identities_checked_atomically,
+                 test_token_bucket_debt, test_shared_sqlite_store, test_completion_charges_token_bucket,
+                 test_client_ip_from_trusted_proxy]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 속도 제한 테스트 완료!")
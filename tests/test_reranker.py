@@ -0,0 +1,86 @@
+"""
+검색 결과 재정렬(rerank) 테스트 (Azure 연결 불필요)
+$ python tests/test_reranker.py
+"""
+
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import SAMPLE_CONVENTIONS, FakeOpenAIServer, FakeSearchClient, make_azure_client
+from modules.rag_service import RAGService
+from modules.output_budget import estimate_text_tokens
+from modules.reranker import DEFAULT_WEIGHTS, RERANK_FETCH_TOP, Reranker, estimate_context_tokens
+
+def make_doc(doc_id, title, tags, score, language="python", priority=2, content="내용"):
+    return {"id": doc_id, "title": title, "content": content, "tags": tags,
+            "language": language, "priority": priority, "score": score}
+
+def test_pattern_overlap_beats_bm25_score():
+    """검색 점수가 높아도 코드 패턴과 무관한 문서보다 패턴이 겹치는 문서를 우선"""
+    documents = [
+        make_doc("off-topic", "Git 커밋 메시지 규칙", ["git", "commit"], score=9.0),
+        make_doc("naming", "Python 네이밍 컨벤션", ["naming", "snake_case"], score=3.0, priority=1),
+        make_doc("js", "JavaScript 네이밍 컨벤션", ["naming", "camelcase"], score=4.0, language="javascript"),
+    ]
+    selected = Reranker().rerank(documents, ["function_naming"], language="python", top=2)
+    assert selected[0]["id"] == "naming"
+    assert "rerank_score" in selected[0]
+
+def test_mmr_drops_near_duplicates():
+    """거의 같은 문서가 여러 개면 다양성을 위해 다른 주제 문서를 함께 선택"""
+    documents = [
+        make_doc("naming-1", "Python 네이밍 컨벤션", ["naming", "pep8"], score=5.0),
+        make_doc("naming-2", "Python 네이밍 컨벤션 요약", ["naming", "pep8"], score=4.9),
+        make_doc("logging", "로깅 스타일 가이드", ["logging"], score=4.0),
+    ]
+    selected = Reranker(mmr_lambda=0.5).rerank(documents, ["function_naming", "logging"], "python", top=2)
+    assert [doc["id"] for doc in selected] == ["naming-1", "logging"]
+
+def test_token_budget_and_weights():
+    """토큰 예산을 넘는 문서는 제외하고, 특징 가중치 합은 1 (모든 특징이 최대인 문서는 점수 1)"""
+    long_doc = make_doc("long", "긴 문서", ["naming"], score=5.0, content="가" * 1000)
+    short_doc = make_doc("short", "짧은 문서", ["naming"], score=1.0)
+    budget = estimate_context_tokens(long_doc) + estimate_context_tokens(short_doc)
+    selected = Reranker(token_budget=budget).rerank([long_doc, short_doc, dict(short_doc, id="short-2")], ["naming"])
+    assert len(selected) == 2 and "long" in [doc["id"] for doc in selected]
+
+    assert abs(sum(DEFAULT_WEIGHTS.values()) - 1.0) < 1e-9
+    best = make_doc("best", "네이밍", ["naming"], score=1.0, priority=1)
+    assert Reranker().rerank([best], ["naming"], language="python")[0]["rerank_score"] == 1.0
+
+def test_rag_service_over_fetches_and_reranks():
+    """RAG 서비스는 후보를 넉넉히 가져와 재정렬한 상위 문서만 프롬프트에 사용"""
+    corpus = SAMPLE_CONVENTIONS + [
+        dict(make_doc(f"filler-{i}", f"기타 규칙 {i}", ["misc"], 0.0), category="coding_convention", company="ktds")
+        for i in range(10)
+    ]
+    search = FakeSearchClient(conventions=corpus)
+    with FakeOpenAIServer() as server:
+        rag = RAGService(make_azure_client(server), search)
+        conventions = rag.find_conventions("def addUser(u):\n    import os\n    logging.info(u)\n", "python")
+    assert 1 <= len(conventions) <= 3
+    assert all(not doc["id"].startswith("filler") for doc in conventions)
+    assert RERANK_FETCH_TOP > 3
+
+def test_korean_context_tokens():
+    """한글 문서는 4자당 1토큰보다 보수적으로 추정하여 토큰 예산이 실제로 프롬프트 크기를 제한"""
+    korean = make_doc("ko", "네이밍", [], 1.0, content="함수 이름은 동사로 시작합니다. " * 20)
+    english = make_doc("en", "Naming", [], 1.0, content="Function names start with a verb. " * 20)
+    assert estimate_context_tokens(korean) > 2 * estimate_context_tokens(english)
+    assert estimate_text_tokens("가나다") == 3 and estimate_text_tokens("abcd") == 1
+
+if __name__ == "__main__":
+    print("🧪 재정렬 테스트 시작...\n")
+    for test in [test_pattern_overlap_beats_bm25_score, test_mmr_drops_near_duplicates,
+                 test_token_budget_and_weights, test_korean_context_tokens,
+                 test_rag_service_over_fetches_and_reranks]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 재정렬 테스트 완료!")
@@ -0,0 +1,108 @@
+"""
+구조화된(JSON) 코드 리뷰 결과 테스트 (Azure 연결 불필요)
+$ python tests/test_review_findings.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.code_reviewer import CodeReviewer
+from modules.review_findings import (
+    merge_findings, parse_review_json, render_findings_markdown, split_code_regions
+)
+
+SAMPLE_RESPONSE = json.dumps({
+    "summary": "보안 문제를 먼저 고치세요.",
+    "findings": [
+        {"file": "app.py", "line_start": 12, "line_end": 12, "rule": "security", "severity": "🔴",
+         "message": "eval 사용", "suggestion": "ast.literal_eval 사용", "patch": ""},
+        {"file": "app.py", "line_start": 3, "line_end": 99, "rule": "naming", "severity": "warning",
+         "message": "camelCase 함수명", "suggestion": "", "patch": ""},
+        {"file": "app.py", "line_start": "x", "severity": "info", "message": "줄 번호 없음"},
+        {"file": "app.py", "line_start": 4, "severity": "unknown", "message": "심각도 없음"},
+    ]
+}, ensure_ascii=False)
+
+def test_parse_validates_and_normalizes():
+    """심각도 아이콘 정규화, 줄 범위 보정, 형식 오류 항목 제외"""
+    result = parse_review_json(f"```json\n{SAMPLE_RESPONSE}\n```", "app.py", (1, 20))
+    assert result["dropped"] == 2
+    severities = [f["severity"] for f in result["findings"]]
+    assert severities == ["critical", "warning"]
+    assert result["findings"][1]["line_end"] == 20
+
+    try:
+        parse_review_json("리뷰 결과입니다")
+        assert False, "JSON이 아니면 ValueError"
+    except ValueError:
+        pass
+
+def test_merge_dedupes_and_sorts():
+    """영역별 결과 병합 시 중복 제거 후 심각도 → 줄 순 정렬"""
+    findings = parse_review_json(SAMPLE_RESPONSE, "app.py")["findings"]
+    merged = merge_findings(findings[1:], findings, findings[:1])
+    assert len(merged) == 2
+    assert merged[0]["severity"] == "critical"
+    assert "🔴" in render_findings_markdown({"language": "python", "findings": merged})
+
+def test_split_regions_on_top_level_lines():
+    """긴 코드는 최상위 줄의 내용 기반 경계에서 영역으로 분할"""
+    code = "\n".join(f"def f{i}():\n    return {i}\n" for i in range(100))
+    regions = split_code_regions(code, min_lines=10, max_lines=40)
+    assert len(regions) > 1
+    assert all(region.startswith("def ") for _, region in regions)
+    assert "\n".join(region for _, region in regions) == code.rstrip("\n")
+
+    # 앞에 코드가 추가되어도 뒤쪽 영역 경계는 유지
+    shifted = split_code_regions("import os\n\n" + code, min_lines=10, max_lines=40)
+    assert regions[-1][1] == shifted[-1][1] and shifted[-1][0] == regions[-1][0] + 2
+    assert split_code_regions("x = 1") == [(1, "x = 1")]
+
+def test_structured_review_caches_regions():
+    """구조화된 리뷰는 JSON 모드로 요청하고, 바뀌지 않은 영역은 캐시에서 재사용"""
+    code = "\n".join(f"def addUser{i}(u):\n    return u\n" for i in range(90))
+    with FakeOpenAIServer() as server:
+        reviewer = CodeReviewer(make_azure_client(server))
+        first = reviewer.review_structured(code, "python", file_path="users.py")
+        assert server.requests[0]["body"]["response_format"]["type"] == "json_schema"
+        assert first["regions"] > 1 and first["cached_regions"] == 0
+        requests_after_first = server.request_count
+
+        # 앞에 두 줄을 추가해도 뒤쪽 영역은 캐시 재사용, 줄 번호는 새 위치 기준
+        second = reviewer.review_structured("import os\n\n" + code, "python", file_path="users.py")
+
+    assert first["findings"][0]["file"] == "users.py"
+    assert first["findings"][0]["severity"] == "warning"
+    assert server.request_count - requests_after_first < first["regions"]
+    assert second["cached_regions"] >= 1
+    assert json.loads(json.dumps(second)) == second
+
+def test_structured_review_caps_regions():
+    """영역이 max_regions를 넘으면 앞쪽 영역만 리뷰하고 건너뛴 부분을 결과에 표시"""
+    code = "\n".join(f"def addUser{i}(u):\n    return u\n" for i in range(90))
+    with FakeOpenAIServer() as server:
+        reviewer = CodeReviewer(make_azure_client(server), max_regions=1)
+        result = reviewer.review_structured(code, "python", file_path="users.py")
+
+    assert server.request_count == 1
+    assert result["regions"] == 1 and result["skipped_regions"] >= 1
+    assert result["skipped_from_line"] == split_code_regions(code)[1][0]
+    assert f"{result['skipped_from_line']}번째 줄부터" in render_findings_markdown(result)
+
+if __name__ == "__main__":
+    print("🧪 구조화된 리뷰 테스트 시작...\n")
+    for test in [test_parse_validates_and_normalizes, test_merge_dedupes_and_sorts,
+                 test_split_regions_on_top_level_lines, test_structured_review_caches_regions,
+                 test_structured_review_caps_regions]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 구조화된 리뷰 테스트 완료!")
@@ -0,0 +1,94 @@
+"""
+OData 필터 빌더 및 검색 결과 캐시 테스트 (Azure 연결 불필요)
+$ python tests/test_search_filters.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.lru_cache import LRUCache
+from modules.search_filters import ODataFilter, conventions_filter, escape_value, templates_filter
+
+class RecordingSDKClient:
+    """azure SearchClient.search 호출을 기록하는 대역"""
+
+    def __init__(self):
+        self.calls = []
+
+    def search(self, **kwargs):
+        self.calls.append(kwargs)
+        return [{"id": "doc-1", "title": "t", "content": "c", "language": "python", "category": "coding_convention",
+                 "tags": [], "priority": 1, "tech_stack": ["python"], "os_support": ["linux"],
+                 "difficulty": "beginner", "@search.score": 1.0}]
+
+def test_values_are_escaped():
+    """작은따옴표가 포함된 값은 이스케이프되어 필터 구조를 바꾸지 못함"""
+    injected = "python' or language ne 'x"
+    expression = conventions_filter(language=injected)
+    assert expression == "language eq 'python'' or language ne ''x'"
+    assert escape_value("it's") == "it''s"
+
+def test_equivalent_filters_are_identical():
+    """조건 순서/기술 스택 순서·중복과 관계없이 같은 필터 문자열"""
+    a = ODataFilter().eq("category", "coding_convention").eq("language", "python").build()
+    b = ODataFilter().eq("language", "python").eq("category", "coding_convention").build()
+    assert a == b
+    assert templates_filter(["react", "python", "react"], "linux") == templates_filter(["python", "react"], "linux")
+    assert conventions_filter() is None and templates_filter() is None
+
+def test_multi_value_uses_search_in():
+    """여러 기술 스택은 or 체인 대신 search.in 하나로, 구분자는 값에 없는 문자 사용"""
+    expression = templates_filter(["react", "python"], None)
+    assert expression == "tech_stack/any(t: search.in(t, 'python,react', ','))"
+    assert " or " not in expression
+    assert "'|'" in ODataFilter().any_in("tags", ["a,b", "c"]).build()
+    assert templates_filter(["python"]) == "tech_stack/any(t: t eq 'python')"
+
+def test_lru_cache_ttl_and_eviction():
+    """LRU 캐시는 용량 초과 시 오래된 항목 제거, TTL 지나면 만료"""
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+    expired = LRUCache(ttl_seconds=-1)
+    expired.put("a", 1)
+    assert expired.get("a") is None
+
+def test_search_client_uses_filters_and_caches_results():
+    """AzureSearchClient는 정규화된 필터로 검색하고 같은 검색은 캐시에서 반환"""
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+
+    client = AzureSearchClient()
+    sdk = RecordingSDKClient()
+    client._search_clients[client.templates_index] = sdk
+    client._search_clients[client.conventions_index] = sdk
+
+    client.search_templates("setup", tech_stack=["react", "python"], os_type="linux", top=5)
+    client.search_templates("setup", tech_stack=["python", "react"], os_type="linux", top=5)
+    client.search_conventions("naming", language="python", top=3)
+    assert len(sdk.calls) == 2
+    assert sdk.calls[0]["filter"] == (
+        "os_support/any(t: t eq 'linux') and tech_stack/any(t: search.in(t, 'python,react', ','))"
+    )
+    assert sdk.calls[1]["filter"] == "language eq 'python'"
+    assert client.result_cache.stats()["hits"] == 1
+
+if __name__ == "__main__":
+    print("🧪 검색 필터 테스트 시작...\n")
+    for test in [test_values_are_escaped, test_equivalent_filters_are_identical, test_multi_value_uses_search_in,
+                 test_lru_cache_ttl_and_eviction, test_search_client_uses_filters_and_caches_results]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 검색 필터 테스트 완료!")
@@ -0,0 +1,138 @@
+"""
+시맨틱 캐시 테스트 (가짜 임베딩 사용, Azure 연결 불필요)
+$ python tests/test_semantic_cache.py
+"""
+
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.semantic_cache import SemanticCache, make_scope
+
+def fake_embedding(text):
+    """단어 빈도 기반 가짜 임베딩 (비슷한 문장은 비슷한 벡터, 실행마다 달라지는 hash() 대신 crc32)"""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in text.split():
+        vector[zlib.crc32(word.encode("utf-8")) % 64] += 1.0
+    return vector.tolist()
+
+README = "# My App\nThis project was bootstrapped with Create React App.\nRun npm install and npm start to begin."
+NEAR_README = "# Your App\nThis project was bootstrapped with Create React App.\nRun npm install and npm start to begin."
+
+def test_exact_and_near_duplicate_hits():
+    """완전 일치와 유사 입력 모두 적중"""
+    cache = SemanticCache(fake_embedding, threshold=0.8)
+    scope = make_scope(kind="guide", os_type="linux")
+    cache.put(README, scope, "리눅스 가이드")
+
+    assert cache.lookup(README.replace("\n", "  \r\n") + "\n", scope)["exact"]
+    match = cache.lookup(NEAR_README, scope)
+    assert match["value"] == "리눅스 가이드"
+    assert not match["exact"]
+
+def test_case_and_indentation_are_not_exact():
+    """대소문자나 들여쓰기만 다른 코드는 완전 일치로 보지 않음"""
+    cache = SemanticCache(fake_embedding, threshold=0.99)
+    scope = make_scope(kind="review", language="python")
+    cache.put("def f():\n    return X", scope, "X 리뷰")
+
+    assert cache.lookup("def f():\n    return X  \n", scope)["exact"]
+    assert cache.lookup("def f(): return x", scope) is None
+    # 같은 단어로 된 가짜 임베딩은 유사도로만 적중 (완전 일치 아님)
+    assert not cache.lookup("def f():\nreturn X", scope)["exact"]
+
+def test_scope_isolation():
+    """범위(OS/옵션)가 다르면 적중하지 않음"""
+    cache = SemanticCache(fake_embedding, threshold=0.8)
+    cache.put(README, make_scope(kind="guide", os_type="linux"), "리눅스 가이드")
+
+    assert cache.get(README, make_scope(kind="guide", os_type="windows")) is None
+    assert cache.get("완전히 다른 FastAPI 프로젝트", make_scope(kind="guide", os_type="linux")) is None
+
+def test_lru_eviction():
+    """용량을 넘으면 가장 오래 사용하지 않은 항목 제거"""
+    cache = SemanticCache(fake_embedding, threshold=0.99, max_entries=2)
+    scope = make_scope(kind="review", language="python")
+    cache.put("code a", scope, "A")
+    cache.put("code b", scope, "B")
+    cache.get("code a", scope)      # a를 최근 사용으로 갱신
+    cache.put("code c", scope, "C")  # b 제거
+
+    assert cache.get("code a", scope) == "A"
+    assert cache.get("code b", scope) is None
+    assert cache.get("code c", scope) == "C"
+
+def test_persistence():
+    """저장 후 다시 불러와도 적중"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "cache.npz")
+        scope = make_scope(kind="guide", os_type="all")
+
+        cache = SemanticCache(fake_embedding, threshold=0.8, persist_path=path)
+        cache.put(README, scope, "전체 가이드")
+        cache.save()
+
+        restored = SemanticCache(fake_embedding, threshold=0.8, persist_path=path)
+        assert restored.get(NEAR_README, scope) == "전체 가이드"
+
+def test_snapshot_version_and_integrity():
+    """버전 키가 다르거나 파일이 손상되면 스냅샷을 불러오지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "cache.snap")
+        scope = make_scope(kind="guide", os_type="all")
+        version = {"chat": "gpt-4o", "prompt": "abc"}
+
+        cache = SemanticCache(fake_embedding, threshold=0.8, persist_path=path, version=version)
+        cache.put(README, scope, "전체 가이드")
+        cache.save()
+
+        assert SemanticCache(fake_embedding, persist_path=path, version=version).get(README, scope) == "전체 가이드"
+        changed = SemanticCache(fake_embedding, persist_path=path, version={"chat": "gpt-4o", "prompt": "def"})
+        assert changed.stats()["entries"] == 0
+
+        data = bytearray(Path(path).read_bytes())
+        data[-1] ^= 0xFF
+        Path(path).write_bytes(bytes(data))
+        assert SemanticCache(fake_embedding, persist_path=path, version=version).stats()["entries"] == 0
+
+def test_embedding_reused_after_miss():
+    """조회 실패 후 같은 입력을 저장할 때 임베딩을 다시 호출하지 않고, 임베딩도 스냅샷에 포함"""
+    calls = []
+
+    def counting_embedding(text):
+        calls.append(text)
+        return fake_embedding(text)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "cache.snap")
+        scope = make_scope(kind="guide", os_type="all")
+        cache = SemanticCache(counting_embedding, threshold=0.8, persist_path=path)
+        cache.put(README, scope, "전체 가이드")
+        assert cache.get("완전히 다른 FastAPI 프로젝트", scope) is None
+        cache.put("완전히 다른 FastAPI 프로젝트", scope, "FastAPI 가이드")
+        assert cache.get("또 다른 Django 프로젝트", scope) is None
+        assert len(calls) == 3
+        cache.save()
+
+        restored = SemanticCache(counting_embedding, threshold=0.8, persist_path=path)
+        restored.put("또 다른 Django 프로젝트", scope, "Django 가이드")
+        assert restored.get("완전히 다른 FastAPI 프로젝트", scope) == "FastAPI 가이드"
+        assert len(calls) == 3
+
+if __name__ == "__main__":
+    print("🧪 시맨틱 캐시 테스트 시작...\n")
+    for test in [test_exact_and_near_duplicate_hits, test_case_and_indentation_are_not_exact, test_scope_isolation,
+                 test_lru_eviction, test_persistence, test_snapshot_version_and_integrity,
+                 test_embedding_reused_after_miss]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 시맨틱 캐시 테스트 완료!")
@@ -0,0 +1,104 @@
+"""
+회사별 컨벤션 라우팅 테스트 (Azure 연결 불필요)
+$ python tests/test_tenant_router.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeSearchClient
+from modules.tenant_router import TenantRouter, load_tenant_router
+
+class RecordingSDKClient:
+    """azure SearchClient.search 호출을 기록하는 대역"""
+
+    def __init__(self):
+        self.calls = []
+
+    def search(self, **kwargs):
+        self.calls.append(kwargs)
+        return [{"id": "doc-1", "title": "t", "content": "c", "language": "python",
+                 "category": "coding_convention", "tags": [], "priority": 1, "@search.score": 1.0}]
+
+def test_route_shared_and_dedicated():
+    """공용 인덱스는 company 필터(공용 규칙 포함), 전용 인덱스는 필터 없이 검색"""
+    router = TenantRouter("coding-conventions", {"ACME": "coding-conventions-acme"}, shared_company="common")
+    assert router.route(None) == ("coding-conventions", ())
+    assert router.route(" KTDS ") == ("coding-conventions", ("common", "ktds"))
+    assert router.route("acme") == ("coding-conventions-acme", ())
+    assert router.indexes_for_document("common") == ["coding-conventions", "coding-conventions-acme"]
+    assert router.indexes_for_document("acme") == ["coding-conventions-acme"]
+    assert router.all_indexes() == ["coding-conventions", "coding-conventions-acme"]
+
+def test_load_from_file():
+    """BLUEBELL_TENANTS_FILE에서 설정 로드, 형식이 잘못되면 ValueError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tenants.json"
+        path.write_text(json.dumps({"shared": "common", "indexes": {"acme": "conv-acme"}}), encoding="utf-8")
+        router = load_tenant_router(str(path))
+        assert router.route("acme") == ("conv-acme", ())
+
+        path.write_text(json.dumps({"indexes": ["conv-acme"]}), encoding="utf-8")
+        try:
+            load_tenant_router(str(path))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ValueError가 발생해야 합니다")
+
+    assert load_tenant_router(str(Path(tmp) / "missing.json")).route("acme") == ("coding-conventions", ("acme",))
+
+def test_search_client_routes_and_separates_caches():
+    """회사별 인덱스/필터로 검색하고 결과 캐시는 회사마다 분리"""
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+
+    client = AzureSearchClient()
+    client.tenant_router = TenantRouter(client.conventions_index, {"acme": "coding-conventions-acme"})
+    shared, dedicated = RecordingSDKClient(), RecordingSDKClient()
+    client._search_clients[client.conventions_index] = shared
+    client._search_clients["coding-conventions-acme"] = dedicated
+
+    client.search_conventions("naming", language="python", company="ktds")
+    client.search_conventions("naming", language="python", company="KTDS")
+    client.search_conventions("naming", language="python", company="acme")
+    assert len(shared.calls) == 1 and len(dedicated.calls) == 1
+    assert shared.calls[0]["filter"] == "company eq 'ktds' and language eq 'python'"
+    assert dedicated.calls[0]["filter"] == "language eq 'python'"
+    assert client.tenant_cache("ktds").stats()["hits"] == 1
+    assert len(client.tenant_cache("acme")) == 1 and len(client.result_cache) == 0
+
+def test_rag_service_passes_company():
+    """RAG 컨벤션 검색에 회사명이 전달되어 다른 회사 문서는 제외"""
+    from modules.rag_service import RAGService
+
+    corpus = [
+        {"id": "ktds", "title": "함수 네이밍", "content": "snake_case", "language": "python",
+         "category": "coding_convention", "company": "ktds", "tags": ["function_naming"], "priority": 1},
+        {"id": "acme", "title": "함수 네이밍", "content": "camelCase", "language": "python",
+         "category": "coding_convention", "company": "acme", "tags": ["function_naming"], "priority": 1},
+    ]
+    search = FakeSearchClient(conventions=corpus)
+    rag = RAGService(azure_client=None, search_client=search)
+    found = rag.find_conventions("def get_user():\n    pass\n", "python", company="acme")
+    assert [doc["id"] for doc in found] == ["acme"]
+    assert search.queries[0]["company"] == "acme"
+
+if __name__ == "__main__":
+    print("🧪 회사별 컨벤션 라우팅 테스트 시작...\n")
+    for test in [test_route_shared_and_dedicated, test_load_from_file, test_search_client_routes_and_separates_caches,
+                 test_rag_service_passes_company]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 회사별 컨벤션 라우팅 테스트 완료!")
@@ -0,0 +1,100 @@
+"""
+단계별 지연 시간 추적(트레이싱) 테스트 (Azure 연결 불필요)
+$ python tests/test_tracing.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+
+from modules.tracing import JsonlSpanExporter, Tracer, configure_tracing
+from modules.rag_service import RAGService
+
+class CollectingExporter:
+    """내보낸 span을 메모리에 보관"""
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+class FakeAzureClient:
+    def get_completion(self, messages, temperature=0.7, max_tokens=4000, top_p=0.95, max_continuations=0, tier="large",
+                       response_format=None):
+        return "🟢 리뷰 결과"
+
+class FakeSearchClient:
+    def search_conventions(self, query, language=None, category=None, top=5, company=None):
+        return [{"id": "conv_python_naming", "title": "Python 네이밍", "content": "snake_case", "tags": []}]
+
+def test_nested_spans_share_trace():
+    """중첩 span은 같은 trace_id와 부모 관계를 가짐"""
+    exporter = CollectingExporter()
+    tracer = Tracer([exporter])
+
+    with tracer.span("outer") as outer:
+        with tracer.span("inner", step=1) as inner:
+            inner.add("tokens", 10)
+            inner.add("tokens", 5)
+
+    inner_span, outer_span = exporter.spans
+    assert inner_span.trace_id == outer_span.trace_id
+    assert inner_span.parent_id == outer.span_id
+    assert inner_span.attributes == {"step": 1, "tokens": 15}
+    assert outer_span.duration_ms >= inner_span.duration_ms
+
+def test_error_is_recorded_and_reraised():
+    """예외는 span에 기록되고 다시 발생"""
+    exporter = CollectingExporter()
+    tracer = Tracer([exporter])
+    try:
+        with tracer.span("failing"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert exporter.spans[0].status == "error"
+    assert "boom" in exporter.spans[0].error
+
+def test_jsonl_exporter():
+    """JSONL exporter는 OpenTelemetry 호환 필드로 한 줄씩 기록"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "traces.jsonl")
+        tracer = Tracer([JsonlSpanExporter(path)])
+        with tracer.span("rag.search", kind="conventions"):
+            pass
+
+        record = json.loads(Path(path).read_text(encoding="utf-8").strip())
+        assert record["name"] == "rag.search"
+        assert len(record["trace_id"]) == 32 and len(record["span_id"]) == 16
+        assert record["end_time_unix_nano"] >= record["start_time_unix_nano"]
+
+def test_rag_pipeline_stages_are_traced():
+    """RAG 코드 리뷰의 각 단계가 span으로 기록됨"""
+    exporter = CollectingExporter()
+    configure_tracing([exporter])
+    try:
+        rag_service = RAGService(FakeAzureClient(), FakeSearchClient())
+        result = rag_service.enhance_code_review("def add_user(user):\n    pass\n", "python")
+    finally:
+        configure_tracing([])
+
+    assert result["success"]
+    names = [span.name for span in exporter.spans]
+    # 재정렬 span은 검색 span 안에서 먼저 끝남
+    assert names == ["rag.extract_patterns", "rag.rerank", "rag.search", "rag.build_prompt", "rag.completion"]
+    assert exporter.spans[2].attributes["result_count"] == 1
+
+if __name__ == "__main__":
+    print("🧪 트레이싱 테스트 시작...\n")
+    for test in [test_nested_spans_share_trace, test_error_is_recorded_and_reraised,
+                 test_jsonl_exporter, test_rag_pipeline_stages_are_traced]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 트레이싱 테스트 완료!")
@@ -0,0 +1,122 @@
+"""
+토큰/비용 사용량 추적 및 예산 가드 테스트 (Azure 연결 불필요)
+$ python tests/test_usage_tracker.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.job_queue import JobQueue, JobStore
+from modules.usage_tracker import (
+    BUDGET_ALLOW, BUDGET_DOWNGRADE, BUDGET_REJECT,
+    UsageStore, UsageTracker, configure_usage_tracking, usage_context
+)
+
+def test_usage_aggregated_by_feature_and_session():
+    """호출별 사용량이 기능/세션 라벨과 함께 집계됨"""
+    tracker = UsageTracker(UsageStore(":memory:"), prompt_price_per_1k=1.0, completion_price_per_1k=2.0)
+    with usage_context(session_id="s1"):
+        with usage_context(feature="review"):
+            tracker.record("gpt", prompt_tokens=1000, completion_tokens=500)
+        with usage_context(feature="setup_guide"):
+            tracker.record("gpt", prompt_tokens=200, completion_tokens=100, cached_tokens=100)
+    tracker.record("gpt", prompt_tokens=10, completion_tokens=10)
+
+    review = tracker.store.totals(feature="review")
+    assert review["calls"] == 1 and review["total_tokens"] == 1500
+    assert abs(review["cost"] - 2.0) < 1e-9
+    assert tracker.store.totals(session_id="s1")["calls"] == 2
+    assert tracker.store.totals()["cached_tokens"] == 100
+    assert {row["feature"] for row in tracker.store.summary()} == {"review", "setup_guide", None}
+
+def test_budget_downgrade_and_reject():
+    """세션 한도의 80%를 넘으면 downgrade, 초과하면 reject"""
+    tracker = UsageTracker(UsageStore(":memory:"), session_token_budget=1000,
+                           downgrade_max_tokens=500, downgrade_search_top=1)
+    with usage_context(session_id="s1"):
+        assert tracker.check_budget().action == BUDGET_ALLOW
+        tracker.record("gpt", prompt_tokens=700, completion_tokens=150)
+        decision = tracker.check_budget()
+        assert decision.action == BUDGET_DOWNGRADE
+        assert decision.limit_max_tokens(4000) == 500 and decision.limit_top(3) == 1
+        tracker.record("gpt", prompt_tokens=200, completion_tokens=0)
+        assert tracker.check_budget().action == BUDGET_REJECT
+
+    # 다른 세션은 영향 없음
+    with usage_context(session_id="s2"):
+        assert tracker.check_budget().action == BUDGET_ALLOW
+
+def test_completion_records_usage_and_respects_budget():
+    """get_completion이 사용량을 기록하고 한도 초과 시 API를 호출하지 않음"""
+    tracker = configure_usage_tracking(UsageTracker(UsageStore(":memory:"), session_token_budget=250))
+    try:
+        with FakeOpenAIServer(completion_tokens=100) as server:
+            client = make_azure_client(server)
+            messages = [{"role": "user", "content": "x" * 400}]
+            with usage_context(session_id="s1", feature="review"):
+                client.get_completion(messages)
+                client.get_completion(messages)
+                rejected = client.get_completion(messages)
+    finally:
+        configure_usage_tracking(UsageTracker())
+
+    assert server.request_count == 2
+    assert "한도" in rejected
+    totals = tracker.store.totals(session_id="s1", feature="review")
+    assert totals["calls"] == 2 and totals["total_tokens"] == 400
+
+    # 첫 호출 후 한도의 80%에 도달해 두 번째 호출은 응답 길이가 축소됨
+    assert server.requests[0]["body"]["max_tokens"] == 4000
+    assert server.requests[1]["body"]["max_tokens"] == 1500
+
+def test_job_queue_keeps_usage_context():
+    """작업 큐 워커에서도 제출 시점의 세션 라벨이 유지됨"""
+    tracker = UsageTracker(UsageStore(":memory:"))
+    job_queue = JobQueue(JobStore(":memory:"), max_workers=1)
+    try:
+        with usage_context(session_id="s1"):
+            job_id = job_queue.submit("review", lambda: tracker.record("gpt", 10, 10))
+        job_queue.wait(job_id, timeout=5)
+    finally:
+        job_queue.shutdown()
+    assert tracker.store.totals(session_id="s1")["calls"] == 1
+
+def test_existing_db_gets_wasted_column():
+    """이전 버전 DB를 열면 wasted 컬럼이 추가되고 기존 기록은 낭비가 아닌 것으로 집계"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "usage.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE usage (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, day TEXT NOT NULL, "
+            "feature TEXT, session_id TEXT, model TEXT, prompt_tokens INTEGER NOT NULL, "
+            "completion_tokens INTEGER NOT NULL, cached_tokens INTEGER NOT NULL, latency_ms REAL, cost REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO usage (created_at, day, prompt_tokens, completion_tokens, cached_tokens, cost) "
+                     "VALUES (0, '1970-01-01', 10, 5, 0, 0)")
+        conn.commit()
+        conn.close()
+
+        tracker = UsageTracker(UsageStore(db_path))
+        tracker.record("gpt", prompt_tokens=20, completion_tokens=10, wasted=True)
+        totals = tracker.store.totals()
+        assert totals["total_tokens"] == 45 and totals["wasted_tokens"] == 30
+        tracker.store._conn.close()
+
+if __name__ == "__main__":
+    print("🧪 사용량 추적 테스트 시작...\n")
+    for test in [test_usage_aggregated_by_feature_and_session, test_budget_downgrade_and_reject,
+                 test_completion_records_usage_and_respects_budget, test_job_queue_keeps_usage_context,
+                 test_existing_db_gets_wasted_column]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 사용량 추적 테스트 완료!")
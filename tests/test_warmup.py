@@ -0,0 +1,158 @@
+"""
+시작 워밍업/준비 상태 엔드포인트 테스트 (Azure 연결 불필요)
+$ python tests/test_warmup.py
+"""
+
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# 경로 설정
+current_dir = Path(__file__).resolve().parent
+project_root = current_dir.parent
+
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(current_dir))
+
+from fake_services import FakeOpenAIServer, make_azure_client
+from modules.app_resources import create_session_analyzers, process_singleton
+from modules.rag_service import RAGService
+from modules.warmup import (
+    WARMUP_DEGRADED, WARMUP_READY, WarmupState, run_warmup, start_health_server
+)
+
+class RecordingSDKClient:
+    def __init__(self, documents=None, error=None):
+        self.calls = []
+        self.documents = documents or []
+        self.error = error
+
+    def search(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error:
+            raise self.error
+        return iter(self.documents)
+
+def _make_search_client(error_index=None):
+    os.environ.setdefault("AZURE_SEARCH_ENDPOINT", "https://fake.search.windows.net")
+    os.environ.setdefault("AZURE_SEARCH_KEY", "fake-key")
+    from modules.azure_search_client import AzureSearchClient
+
+    client = AzureSearchClient()
+    for index_name in [client.conventions_index, client.templates_index]:
+        error = ConnectionError("연결 실패") if index_name == error_index else None
+        client._search_clients[index_name] = RecordingSDKClient([{"id": "1"}], error=error)
+    return client
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_warmup_probes_every_dependency():
+    """모든 배포/인덱스에 한 번씩 연결하고 preloader를 실행한 뒤 준비 상태로 전환"""
+    search_client = _make_search_client()
+    loaded = []
+    with FakeOpenAIServer() as server:
+        azure_client = make_azure_client(server)
+        state = run_warmup(azure_client, search_client, {"cache": lambda: loaded.append("cache")},
+                           state=WarmupState())
+        openai_calls = server.request_count
+
+    assert state.status == WARMUP_READY and state.is_ready
+    names = [check["name"] for check in state.snapshot()["checks"]]
+    assert names == ["preload:cache", "openai:default", "search:coding-conventions", "search:setup-templates"]
+    assert loaded == ["cache"]
+    # 모델 목록 GET은 채팅/임베딩 요청이 아니므로 토큰을 쓰지 않음
+    assert openai_calls == 0
+    assert azure_client.default_backend._client is not None
+    for sdk in search_client._search_clients.values():
+        assert sdk.calls[0]["top"] == 1
+    assert len(search_client.result_cache) == 0
+
+def test_failures_are_recorded_not_raised():
+    """단계가 실패해도 예외 없이 degraded 상태로 끝나고 실패 단계를 남김"""
+    search_client = _make_search_client(error_index="setup-templates")
+
+    def broken():
+        raise OSError("디스크 없음")
+
+    state = run_warmup(search_client=search_client, preloaders={"broken": broken}, state=WarmupState())
+    assert state.status == WARMUP_DEGRADED and state.is_ready
+    failed = {check["name"]: check["detail"] for check in state.snapshot()["checks"] if not check["ok"]}
+    assert failed == {"preload:broken": "디스크 없음", "search:setup-templates": "연결 실패"}
+
+def test_health_endpoint_reports_readiness():
+    """워밍업 완료 전에는 /health/ready가 503, 완료 후 200 (/health/live는 항상 200)"""
+    state = WarmupState()
+    server = start_health_server(0, state=state, host="127.0.0.1")
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert _get(f"{base}/health/live")[0] == 200
+        status, body = _get(f"{base}/health/ready")
+        assert status == 503 and body["status"] == "pending"
+
+        run_warmup(preloaders={"noop": lambda: None}, state=state)
+        status, body = _get(f"{base}/health")
+        assert status == 200 and body["ready"] and body["checks"][0]["name"] == "preload:noop"
+        assert _get(f"{base}/unknown")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_precompiled_code_patterns():
+    """미리 컴파일한 코드 패턴 규칙이 언어별/공통 패턴을 기존 순서대로 추출"""
+    rag = RAGService(azure_client=None, search_client=None)
+    python_code = "import os\nMAX_SIZE = 3\nclass Foo:\n    def bar(self):\n        try:\n            print(1)\n        except ValueError:\n            pass  # 무시\n"
+    assert rag._extract_code_patterns(python_code, "Python") == [
+        "function_naming", "class_naming", "import_style", "constant_naming", "comments", "logging", "error_handling"
+    ]
+    assert rag._extract_code_patterns("const f = () => console.log(1)", "typescript") == [
+        "function_naming", "variable_naming", "logging"
+    ]
+    assert rag._extract_code_patterns("SELECT 1", "sql") == []
+
+def test_process_singleton_caches_success_only():
+    """프로세스 전역 리소스는 한 번만 만들고, 생성에 실패하면 다음 호출에서 다시 시도"""
+    calls = []
+
+    @process_singleton
+    def resource():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("환경 변수 누락")
+        return object()
+
+    try:
+        resource()
+        raise AssertionError("ValueError가 발생해야 합니다")
+    except ValueError:
+        pass
+    assert resource() is resource()
+    assert len(calls) == 2
+
+def test_create_session_analyzers():
+    """app.py와 같은 방식으로 가이드 생성기/코드 리뷰어 생성 (리뷰 영역 상한은 코드 리뷰어에만)"""
+    os.environ["BLUEBELL_REVIEW_MAX_REGIONS"] = "3"
+    try:
+        with FakeOpenAIServer() as server:
+            client = make_azure_client(server)
+            setup_analyzer, code_reviewer = create_session_analyzers(client, None, None, None)
+    finally:
+        os.environ.pop("BLUEBELL_REVIEW_MAX_REGIONS", None)
+    assert setup_analyzer.azure_client is client and code_reviewer.azure_client is client
+    assert code_reviewer.max_regions == 3
+
+if __name__ == "__main__":
+    print("🧪 시작 워밍업 테스트 시작...\n")
+    for test in [test_warmup_probes_every_dependency, test_failures_are_recorded_not_raised,
+                 test_health_endpoint_reports_readiness, test_precompiled_code_patterns,
+                 test_process_singleton_caches_success_only, test_create_session_analyzers]:
+        test()
+        print(f"✅ {test.__doc__}")
+    print("\n🎉 모든 워밍업 테스트 완료!")